@@ -1,6 +1,20 @@
 # -*- coding: utf-8 -*-
 """CLI-facing apply capability wrappers."""
 
-from data_juicer_agents.tools.apply import ApplyResult, ApplyUseCase
+from data_juicer_agents.tools.apply import (
+    ApplyResult,
+    ApplyUseCase,
+    BatchPlan,
+    load_batch_plans,
+    read_batch_file,
+    run_apply_batch,
+)
 
-__all__ = ["ApplyResult", "ApplyUseCase"]
+__all__ = [
+    "ApplyResult",
+    "ApplyUseCase",
+    "BatchPlan",
+    "load_batch_plans",
+    "read_batch_file",
+    "run_apply_batch",
+]
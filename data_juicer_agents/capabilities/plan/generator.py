@@ -6,6 +6,7 @@ from __future__ import annotations
 import json
 from typing import Any, Dict
 
+from data_juicer_agents.tools.context.inspect_dataset import summarize_full_profile
 from data_juicer_agents.utils.llm_gateway import call_model_json
 
 
@@ -34,7 +35,17 @@ class ProcessOperatorGenerator:
         dataset_profile: Dict[str, Any] | None = None,
     ) -> str:
         candidates = retrieval_payload.get("candidates", [])
-        profile_payload = dataset_profile if isinstance(dataset_profile, dict) else {}
+        profile_payload = dict(dataset_profile) if isinstance(dataset_profile, dict) else {}
+        # Histograms are too verbose for the prompt; pass the quantile summary instead.
+        full_profile = profile_payload.pop("full_profile", None)
+        statistics = ""
+        if isinstance(full_profile, dict) and full_profile.get("fields"):
+            statistics = (
+                "dataset_statistics (full scan of every record):\n"
+                f"{json.dumps(summarize_full_profile(full_profile), ensure_ascii=False, indent=2)}\n"
+                "Derive length, ratio and deduplication thresholds from dataset_statistics "
+                "(e.g. min_len/max_len near the low/high text_length_quantiles) instead of guessing.\n"
+            )
         dataset_binding = {}
         if isinstance(dataset_spec, dict):
             binding = dataset_spec.get("binding", {})
@@ -51,6 +62,7 @@ class ProcessOperatorGenerator:
             f"dataset_binding:\n{json.dumps(dataset_binding, ensure_ascii=False, indent=2)}\n"
             f"retrieved_candidates:\n{json.dumps(candidates, ensure_ascii=False, indent=2)}\n"
             f"dataset_profile:\n{json.dumps(profile_payload, ensure_ascii=False, indent=2)}\n"
+            f"{statistics}"
         )
 
     def generate(
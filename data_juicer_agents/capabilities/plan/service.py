@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import os
+from pathlib import Path
 from typing import Any, Dict, Iterable
 
 from data_juicer_agents.tools.context import inspect_dataset_schema
@@ -44,7 +45,11 @@ class PlanOrchestrator:
         llm_api_key: str | None = None,
         llm_base_url: str | None = None,
         llm_thinking: bool | None = None,
+        profile_cache_dir: str | Path | None = None,
     ):
+        # Dataset profiles are only cached when the caller (CLI/session)
+        # names a directory; library use leaves the working tree alone.
+        self.profile_cache_dir = profile_cache_dir
         self.generator = ProcessOperatorGenerator(
             model_name=str(planner_model_name or PLANNER_MODEL_NAME).strip() or PLANNER_MODEL_NAME,
             api_key=llm_api_key,
@@ -71,6 +76,7 @@ class PlanOrchestrator:
             mode=mode,
             dataset_path=dataset_path or None,
             dataset=dataset,
+            profile_cache_dir=self.profile_cache_dir,
         )
 
     def generate_plan(
@@ -85,6 +91,8 @@ class PlanOrchestrator:
         retrieved_candidates: Dict[str, Any] | None = None,
         retrieval_top_k: int = 5,
         retrieval_mode: str = "auto",
+        full_profile: bool = False,
+        validate_media: bool = False,
     ) -> Dict[str, Any]:
         retrieval = self._resolve_retrieval(
             user_intent=user_intent,
@@ -104,6 +112,9 @@ class PlanOrchestrator:
                 dataset_path=dataset_path,
                 sample_size=20,
                 dataset=dataset,
+                cache_dir=self.profile_cache_dir,
+                full_profile=full_profile,
+                validate_media=validate_media,
             )
         else:
             dataset_profile = {}
@@ -134,6 +145,8 @@ class PlanOrchestrator:
 
         system_result = build_system_spec(
             custom_operator_paths=custom_operator_paths,
+            dataset_profile=dataset_profile,
+            operators=process_result["process_spec"].get("operators", []),
         )
         if not system_result.get("ok"):
             raise ValueError("system spec build failed: " + "; ".join(system_result.get("validation_errors", []) or [str(system_result.get("message", "unknown error"))]))
@@ -153,17 +166,23 @@ class PlanOrchestrator:
             raise ValueError("plan validation failed: " + "; ".join(validation.get("validation_errors", []) or [str(validation.get("message", "unknown error"))]))
 
         plan = PlanModel.from_dict(assembled["plan"])
+        planning_meta = {
+            "planner_model": self.generator.model_name,
+            "retrieval_source": str(retrieval.get("retrieval_source", "")).strip() or "unknown",
+            "retrieval_candidate_count": str(len(extract_candidate_names(retrieval))),
+        }
+        media = dataset_profile.get("media_validation")
+        if isinstance(media, dict):
+            planning_meta["media_checked"] = str(media.get("checked", 0))
+            planning_meta["media_missing_rate"] = str(media.get("missing_rate", 0.0))
+            planning_meta["media_invalid_rate"] = str(media.get("invalid_rate", 0.0))
         return {
             "plan": plan,
             "dataset_spec": dataset_result["dataset_spec"],
             "process_spec": process_result["process_spec"],
             "system_spec": system_result["system_spec"],
             "retrieval": retrieval,
-            "planning_meta": {
-                "planner_model": self.generator.model_name,
-                "retrieval_source": str(retrieval.get("retrieval_source", "")).strip() or "unknown",
-                "retrieval_candidate_count": str(len(extract_candidate_names(retrieval))),
-            },
+            "planning_meta": planning_meta,
             "validation": validation,
         }
 
@@ -167,6 +167,9 @@ class DJSessionAgent:
             loop = self._active_react_loop
             if loop is None or loop.is_closed():
                 return False
+        # Stop any subprocess a running tool is waiting on; the agent
+        # interrupt below only takes effect once the tool returns.
+        self._tool_runtime.cancel_event.set()
         # Now perform interrupt outside the lock to avoid blocking other threads
         try:
             fut = asyncio.run_coroutine_threadsafe(self._react_agent.interrupt(), loop)
@@ -220,6 +223,8 @@ class DJSessionAgent:
             "Use retrieved canonical operator names before build_process_spec, then pass an explicit operators array with filled params. "
             "build_process_spec will not canonicalize or repair operator names for you. Do not pass only operator names when a concrete threshold, mode, or option is already known.\n"
             "Use build_system_spec to produce the deterministic minimal runtime profile, then pass the full dataset_spec, process_spec, and system_spec objects into assemble_plan.\n"
+            "Pass the dataset_path (not the dataset_profile; the cached inspect_dataset profile is reused) and the process_spec operators to build_system_spec so it can auto-tune np and batch/partition settings; "
+            "only pass np yourself when the user asks for a specific value.\n"
             "If the default system settings cannot meet user requirements, use list_system_config to discover all available system configuration options before build_system_spec.\n"
             "If the user needs advanced dataset options, call list_dataset_fields first to discover available parameters and their defaults, "
             "then pass the relevant fields directly as additional arguments to build_dataset_spec.\n"
@@ -13,6 +13,7 @@ from uuid import uuid4
 import yaml
 
 from data_juicer_agents.tools.plan import PlanModel
+from data_juicer_agents.utils.process_supervisor import CancelEvent
 from data_juicer_agents.utils.runtime_helpers import (
     normalize_line_idx,
     parse_line_ranges,
@@ -60,6 +61,9 @@ class SessionToolRuntime:
         self.state = state
         self.verbose = bool(verbose)
         self._event_callback = event_callback
+        # Set by the session on user interrupt; subprocess-backed tools
+        # receive it through ToolContext.runtime_values and stop at once.
+        self.cancel_event = CancelEvent()
 
     def debug(self, message: str) -> None:
         if not self.verbose:
@@ -87,6 +91,7 @@ class SessionToolRuntime:
         fn: Callable[[], Dict[str, Any]],
     ) -> Dict[str, Any]:
         call_id = f"tool_{uuid4().hex[:10]}"
+        self.cancel_event.clear()
         self.emit_event(
             "tool_start",
             tool=tool_name,
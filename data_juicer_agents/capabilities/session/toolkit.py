@@ -31,6 +31,10 @@ def _build_tool_context(runtime: SessionToolRuntime) -> ToolContext:
         working_dir=str(runtime.state.working_dir or "./.djx"),
         env=dict(os.environ),
         artifacts_dir=str(runtime.storage_root()),
+        runtime_values={
+            "emit_event": runtime.emit_event,
+            "cancel_event": runtime.cancel_event,
+        },
     )
 
 
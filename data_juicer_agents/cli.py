@@ -127,6 +127,19 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional custom operator directories/files for validation/execution",
     )
+    plan.add_argument(
+        "--full-profile",
+        action="store_true",
+        help=(
+            "Stream the whole dataset to compute length quantiles, null rates and "
+            "duplicate estimates that the planner uses to choose thresholds"
+        ),
+    )
+    plan.add_argument(
+        "--validate-media",
+        action="store_true",
+        help="Check sampled local image references for existence, size and header magic",
+    )
     plan.set_defaults(handler_name="plan")
 
     apply_cmd = sub.add_parser(
@@ -134,7 +147,12 @@ def build_parser() -> argparse.ArgumentParser:
         help="Apply a generated plan",
         parents=[output_parent],
     )
-    apply_cmd.add_argument("--plan", required=True, help="Plan yaml path")
+    apply_target = apply_cmd.add_mutually_exclusive_group(required=True)
+    apply_target.add_argument("--plan", help="Plan yaml path")
+    apply_target.add_argument(
+        "--batch",
+        help="Text file listing plan yaml paths (one per line) to apply concurrently",
+    )
     apply_cmd.add_argument("--yes", action="store_true", help="Skip confirmation")
     apply_cmd.add_argument("--dry-run", action="store_true", help="Do not execute dj-process")
     apply_cmd.add_argument(
@@ -143,6 +161,50 @@ def build_parser() -> argparse.ArgumentParser:
         default=300,
         help="Execution timeout in seconds",
     )
+    apply_cmd.add_argument(
+        "--executor",
+        choices=["subprocess", "inprocess"],
+        default="subprocess",
+        help="Run dj-process as a subprocess, or fork the run from a warm Data-Juicer server",
+    )
+    apply_cmd.add_argument(
+        "--pilot-rows",
+        type=int,
+        default=None,
+        help="Run the plan on N sampled rows first and print a runtime/output-size estimate",
+    )
+    apply_cmd.add_argument(
+        "--pilot-only",
+        action="store_true",
+        help="Stop after the pilot run; do not process the full dataset",
+    )
+    apply_cmd.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Seconds; skip the full run if the pilot estimate exceeds it (implies a pilot)",
+    )
+    apply_cmd.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Run even if an identical recipe was already applied to the unchanged dataset",
+    )
+    apply_cmd.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a timed-out or interrupted checkpointed run from its last completed operator",
+    )
+    apply_cmd.add_argument(
+        "--cpu-budget",
+        type=int,
+        default=None,
+        help="With --batch: CPUs shared by concurrent runs (default: available CPUs)",
+    )
+    apply_cmd.add_argument(
+        "--batch-output",
+        default=None,
+        help="With --batch: JSONL file for the run results (default: .djx/recipes/batch/<timestamp>.jsonl)",
+    )
     apply_cmd.set_defaults(handler_name="apply")
 
     retrieve = sub.add_parser(
@@ -219,6 +281,17 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run an optional local dj-process smoke check using custom_operator_paths",
     )
+    dev.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and incrementally re-index the operator catalog when files in --output-dir change",
+    )
+    dev.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=1.0,
+        help="Quiet period in seconds before re-indexing after a change (default: 1.0)",
+    )
     dev.set_defaults(handler_name="dev")
 
     tool = sub.add_parser(
@@ -3,12 +3,22 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from pathlib import Path
 
 import yaml
 
-from data_juicer_agents.capabilities.apply.service import ApplyUseCase
+from data_juicer_agents.capabilities.apply.service import (
+    ApplyUseCase,
+    load_batch_plans,
+    read_batch_file,
+    run_apply_batch,
+)
 from data_juicer_agents.commands.output_control import emit, emit_json, enabled
+from data_juicer_agents.tools.apply.apply_recipe.checkpoint import checkpoint_unsupported_reason
+from data_juicer_agents.tools.apply.apply_recipe.pilot import PilotError, format_pilot_estimate
+from data_juicer_agents.tools.apply.apply_recipe.progress import format_progress_event
+from data_juicer_agents.utils.resource_usage import format_resources
 
 
 def _format_dataset_source(recipe: dict) -> str:
@@ -54,10 +64,89 @@ def _confirm(plan_data: dict) -> bool:
     return answer in {"y", "yes"}
 
 
+def _run_apply_batch(args, pilot_rows, time_budget) -> int:
+    batch_path = Path(args.batch)
+    if not batch_path.exists():
+        print(f"Batch file not found: {batch_path}")
+        return 2
+    cpu_budget = getattr(args, "cpu_budget", None)
+    if cpu_budget is not None and cpu_budget <= 0:
+        print("cpu-budget must be > 0")
+        return 2
+    plans = load_batch_plans(read_batch_file(batch_path))
+    if not plans:
+        print(f"Batch file lists no plans: {batch_path}")
+        return 2
+
+    if not args.yes:
+        print(f"About to execute {len(plans)} plans from: {batch_path}")
+        for plan in plans:
+            print(f"- {plan.plan_path}" + (f" ({plan.error})" if plan.error else ""))
+        if input("Proceed? [y/N]: ").strip().lower() not in {"y", "yes"}:
+            print("Execution canceled")
+            return 1
+
+    runtime_dir = Path(".djx") / "recipes"
+    output_path = Path(
+        getattr(args, "batch_output", None)
+        or runtime_dir / "batch" / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    )
+    finished = []
+
+    def on_record(record: dict) -> None:
+        finished.append(record)
+        print(
+            f"[{len(finished)}/{len(plans)}] {record.get('plan_id') or record.get('plan_path')}: "
+            f"{record.get('status')} (np={record.get('np')}, "
+            f"{float(record.get('duration_seconds') or 0.0):.1f}s)",
+            flush=True,
+        )
+        if record.get("error_message") and enabled(args, "verbose"):
+            print(f"  Error: {record['error_message']}")
+
+    records = run_apply_batch(
+        plans,
+        runtime_dir,
+        output_path,
+        cpu_budget=cpu_budget,
+        cancel_event=getattr(args, "cancel_event", None),
+        on_record=on_record,
+        dry_run=args.dry_run,
+        timeout_seconds=args.timeout,
+        cancel_check=getattr(args, "cancel_check", None),
+        executor=getattr(args, "executor", "subprocess"),
+        pilot_rows=pilot_rows,
+        pilot_only=bool(getattr(args, "pilot_only", False)),
+        time_budget_seconds=time_budget,
+        use_cache=not bool(getattr(args, "no_cache", False)),
+        resume=bool(getattr(args, "resume", False)),
+    )
+
+    counts: dict = {}
+    for record in records:
+        counts[record.get("status")] = counts.get(record.get("status"), 0) + 1
+    print("Batch Summary:")
+    print(f"Plans: {len(records)}")
+    print("Status: " + ", ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+    print(f"Results: {output_path}")
+    ok = {"success", "cached", "pilot"}
+    return 0 if all(record.get("status") in ok for record in records) else 1
+
+
 def run_apply(args) -> int:
     if args.timeout <= 0:
         print("timeout must be > 0")
         return 2
+    pilot_rows = getattr(args, "pilot_rows", None)
+    if pilot_rows is not None and pilot_rows <= 0:
+        print("pilot-rows must be > 0")
+        return 2
+    time_budget = getattr(args, "time_budget", None)
+    if time_budget is not None and time_budget <= 0:
+        print("time-budget must be > 0")
+        return 2
+    if getattr(args, "batch", None):
+        return _run_apply_batch(args, pilot_rows, time_budget)
 
     plan_path = Path(args.plan)
     if not plan_path.exists():
@@ -71,19 +160,44 @@ def run_apply(args) -> int:
         print(f"Plan file is not a mapping: {plan_path}")
         return 2
 
+    resume = bool(getattr(args, "resume", False))
+    recipe = plan_data.get("recipe") if isinstance(plan_data.get("recipe"), dict) else {}
+    if resume and checkpoint_unsupported_reason(recipe):
+        print(f"Cannot resume: {checkpoint_unsupported_reason(recipe)}")
+        return 2
+
     if not args.yes and not _confirm(plan_data):
         print("Execution canceled")
         return 1
 
+    progress_callback = None
+    if enabled(args, "verbose"):
+
+        def progress_callback(event: dict) -> None:
+            label = "Pilot progress" if event.get("phase") in {"calibration", "pilot"} else "Progress"
+            print(f"{label}: {format_progress_event(event)}", flush=True)
+
     runtime_dir = Path(".djx") / "recipes"
     executor = ApplyUseCase()
-    result, returncode, stdout, stderr = executor.execute(
-        plan_payload=plan_data,
-        runtime_dir=runtime_dir,
-        dry_run=args.dry_run,
-        timeout_seconds=args.timeout,
-        cancel_check=getattr(args, "cancel_check", None),
-    )
+    try:
+        result, returncode, stdout, stderr = executor.execute(
+            plan_payload=plan_data,
+            runtime_dir=runtime_dir,
+            dry_run=args.dry_run,
+            timeout_seconds=args.timeout,
+            cancel_check=getattr(args, "cancel_check", None),
+            progress_callback=progress_callback,
+            cancel_event=getattr(args, "cancel_event", None),
+            executor=getattr(args, "executor", "subprocess"),
+            pilot_rows=pilot_rows,
+            pilot_only=bool(getattr(args, "pilot_only", False)),
+            time_budget_seconds=time_budget,
+            use_cache=not bool(getattr(args, "no_cache", False)),
+            resume=resume,
+        )
+    except PilotError as exc:
+        print(f"Pilot run not possible: {exc}")
+        return 2
 
     interrupted = str(getattr(result, "error_type", "")).strip() == "interrupted"
     if interrupted:
@@ -102,6 +216,17 @@ def run_apply(args) -> int:
     print(f"Execution ID: {result.execution_id}")
     print(f"Status: {result.status}")
     print(f"Recipe: {result.generated_recipe_path}")
+    if result.pilot.get("dataset_rows") is not None:
+        print(f"Pilot: {format_pilot_estimate(result.pilot)}")
+    if result.resources:
+        print(f"Resources: {format_resources(result.resources)}")
+    for name in ("stdout_log", "stderr_log", "cache_entry", "resumed_from", "checkpoint_dir"):
+        if result.artifacts.get(name):
+            print(f"{name.replace('_', ' ').title()}: {result.artifacts[name]}")
+    if resume and not args.dry_run and result.status != "cached" and not result.artifacts.get("resumed_from"):
+        print("Resume: no checkpoint found; ran from the first operator")
+    if result.artifacts.get("checkpoint_dir"):
+        print(f"Resume: djx apply --plan {plan_path} --resume")
     if result.error_type not in {"", "none"}:
         print(f"Error Type: {result.error_type}")
     if result.error_message:
@@ -3,7 +3,69 @@
 
 from __future__ import annotations
 
+import threading
+from pathlib import Path
+
 from data_juicer_agents.capabilities.dev.service import DevUseCase
+from data_juicer_agents.tools.dev import ScaffoldResult, run_smoke_check
+
+
+def _print_sync_result(result: dict) -> None:
+    registered = result.get("registered", [])
+    unregistered = result.get("unregistered", [])
+    if registered:
+        print(f"Re-indexed operators: {', '.join(registered)}")
+    if unregistered:
+        print(f"Removed operators: {', '.join(unregistered)}")
+    for error in result.get("errors", []):
+        print(f"Failed to load {error.get('path')}: {error.get('error')}")
+
+
+def _scaffold_from_result(result: dict, output_dir: str) -> ScaffoldResult:
+    return ScaffoldResult(
+        operator_name=str(result.get("operator_name", "")),
+        operator_type=str(result.get("operator_type", "")),
+        class_name=str(result.get("class_name", "")),
+        output_dir=Path(output_dir),
+        generated_files=list(result.get("generated_files", [])),
+        summary_path=Path(str(result.get("summary_path", ""))),
+        notes=list(result.get("notes", [])),
+    )
+
+
+def _wait_until_interrupted() -> None:
+    threading.Event().wait()
+
+
+def _watch_output_dir(output_dir: str, debounce: float, result: dict | None = None, code: int = 0) -> int:
+    """Re-index and smoke-check the operator on every change until Ctrl-C.
+
+    Returns the code of the last smoke check (*code* if none ran).
+    """
+    from data_juicer_agents.tools.retrieve import watch_custom_operators
+
+    scaffold = _scaffold_from_result(result or {}, output_dir)
+    state = {"code": code}
+
+    def _on_change(sync_result: dict) -> None:
+        _print_sync_result(sync_result)
+        ok, message = run_smoke_check(scaffold)
+        print(message)
+        state["code"] = 0 if ok else 1
+
+    watcher = watch_custom_operators(
+        [output_dir],
+        on_change=_on_change,
+        debounce=debounce,
+    )
+    print(f"Watching {output_dir} for operator changes (Ctrl-C to stop)...")
+    try:
+        _wait_until_interrupted()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return state["code"]
 
 
 def run_dev(args) -> int:
@@ -25,7 +87,9 @@ def run_dev(args) -> int:
         from_retrieve=args.from_retrieve,
         smoke_check=args.smoke_check,
     )
-    if not result.get("ok"):
+    # A failed smoke check still produced a scaffold: report it (exit 1)
+    # and keep watching so the operator can be fixed in place.
+    if not result.get("ok") and "smoke_check" not in result:
         print(str(result.get("message", "dev scaffold generation failed")))
         return 2
 
@@ -41,9 +105,17 @@ def run_dev(args) -> int:
     for note in result.get("notes", []):
         print(f"Note: {note}")
 
+    code = 0
     if args.smoke_check:
         smoke = result.get("smoke_check", {})
         print(str(smoke.get("message", "")))
-        return 0 if bool(smoke.get("ok")) else 1
+        code = 0 if bool(smoke.get("ok")) else 1
 
-    return 0
+    if getattr(args, "watch", False):
+        return _watch_output_dir(
+            str(result.get("output_dir", args.output_dir)),
+            debounce=float(getattr(args, "watch_debounce", 1.0)),
+            result=result,
+            code=code,
+        )
+    return code
@@ -10,6 +10,7 @@ import yaml
 
 from data_juicer_agents.capabilities.plan.service import PlanOrchestrator
 from data_juicer_agents.commands.output_control import emit, emit_json, enabled
+from data_juicer_agents.tools.context import default_profile_cache_dir
 
 
 def _parse_json_object_arg(raw_value: Any, *, arg_name: str) -> tuple[Dict[str, Any] | None, Dict[str, Any] | None]:
@@ -101,6 +102,7 @@ def execute_plan(args) -> Dict[str, Any]:
         llm_api_key=getattr(args, "llm_api_key", None),
         llm_base_url=getattr(args, "llm_base_url", None),
         llm_thinking=getattr(args, "llm_thinking", None),
+        profile_cache_dir=default_profile_cache_dir(),
     )
 
     try:
@@ -111,6 +113,8 @@ def execute_plan(args) -> Dict[str, Any]:
             dataset=dataset_config,
             generated_dataset_config=generated_dataset_config,
             custom_operator_paths=custom_operator_paths,
+            full_profile=bool(getattr(args, "full_profile", False)),
+            validate_media=bool(getattr(args, "validate_media", False)),
         )
     except Exception as exc:
         return _error_result(
@@ -156,9 +160,16 @@ def run_plan(args) -> int:
     print(f"Plan generated: {result['plan_path']}")
     print(f"Modality: {plan_data.get('modality')}")
     print(f"Operators: {result.get('operator_names', [])}")
+    planning_meta = result.get("planning_meta", {})
+    if "media_checked" in planning_meta:
+        print(
+            "Media check: "
+            f"checked={planning_meta.get('media_checked')}, "
+            f"missing_rate={planning_meta.get('media_missing_rate')}, "
+            f"invalid_rate={planning_meta.get('media_invalid_rate')}"
+        )
 
     if enabled(args, "verbose"):
-        planning_meta = result.get("planning_meta", {})
         print(
             "Planning meta: "
             f"planner_model={planning_meta.get('planner_model')}, "
@@ -6,6 +6,7 @@ from __future__ import annotations
 import json
 from typing import List
 
+from data_juicer_agents.tools.context import default_profile_cache_dir
 from data_juicer_agents.tools.retrieve import retrieve_operator_candidates
 
 
@@ -57,6 +58,7 @@ def run_retrieve(args) -> int:
             op_type=op_type,
             tags=tags if tags else None,
             dataset_path=dataset_path,
+            profile_cache_dir=default_profile_cache_dir(),
         )
     except Exception as exc:
         print(f"Retrieve failed: {exc}")
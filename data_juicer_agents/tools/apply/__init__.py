@@ -1,7 +1,15 @@
 # -*- coding: utf-8 -*-
 """Apply tools."""
 
-from .apply_recipe import ApplyRecipeInput, ApplyResult, ApplyUseCase
+from .apply_recipe import (
+    ApplyRecipeInput,
+    ApplyResult,
+    ApplyUseCase,
+    BatchPlan,
+    load_batch_plans,
+    read_batch_file,
+    run_apply_batch,
+)
 from .registry import APPLY_RECIPE, TOOL_SPECS
 
 __all__ = [
@@ -9,5 +17,9 @@ __all__ = [
     "ApplyRecipeInput",
     "ApplyResult",
     "ApplyUseCase",
+    "BatchPlan",
     "TOOL_SPECS",
+    "load_batch_plans",
+    "read_batch_file",
+    "run_apply_batch",
 ]
@@ -1,8 +1,21 @@
 # -*- coding: utf-8 -*-
 """apply_recipe tool package."""
 
+from .batch import BatchPlan, load_batch_plans, read_batch_file, run_apply_batch
 from .input import ApplyRecipeInput, GenericOutput
 from .logic import ApplyResult, ApplyUseCase
+from .pilot import PilotError
 from .tool import APPLY_RECIPE
 
-__all__ = ["APPLY_RECIPE", "ApplyRecipeInput", "ApplyResult", "ApplyUseCase", "GenericOutput"]
+__all__ = [
+    "APPLY_RECIPE",
+    "ApplyRecipeInput",
+    "ApplyResult",
+    "ApplyUseCase",
+    "BatchPlan",
+    "GenericOutput",
+    "PilotError",
+    "load_batch_plans",
+    "read_batch_file",
+    "run_apply_batch",
+]
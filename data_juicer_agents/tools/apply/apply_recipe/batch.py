@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""Concurrent batch apply with a shared CPU budget.
+
+Nightly jobs apply dozens of plans; running them one ``djx apply`` at a
+time leaves most cores idle while a single-process recipe runs.
+:func:`run_apply_batch` runs several :meth:`ApplyUseCase.execute` calls at
+once instead:
+
+* every run asks for its recipe's ``np`` (default 1), capped at the
+  budget, and the recipe is rewritten with the granted value;
+* runs start in submission order as soon as enough CPUs of the budget
+  are free; a run that does not fit yet holds back the ones behind it, so
+  large plans are not starved by a stream of small ones;
+* each finished run is appended to a JSONL file as one record (the
+  ``ApplyResult.to_dict()`` fields plus ``index``, ``plan_path``,
+  ``returncode`` and the granted ``np``), so a crashed batch still leaves
+  the results so far.
+
+Plans that cannot be loaded, raise, or are not started because the batch
+was cancelled get a record with ``status`` ``"failed"``/``"interrupted"``
+and no execution.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import yaml
+
+from data_juicer_agents.utils import json_codec
+
+from .logic import ApplyUseCase
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchPlan:
+    """One entry of a batch: where the plan came from and its payload."""
+
+    plan_path: str
+    payload: Optional[Dict[str, Any]] = None
+    error: str = ""
+
+
+def default_cpu_budget() -> int:
+    """CPUs available to this process (affinity-aware)."""
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except (AttributeError, OSError):
+        return max(os.cpu_count() or 1, 1)
+
+
+def read_batch_file(batch_path: str | Path) -> List[str]:
+    """Plan paths listed in *batch_path*, one per line.
+
+    Blank lines and ``#`` comments are skipped; relative paths are resolved
+    against the batch file's directory.
+    """
+    batch_file = Path(batch_path).expanduser()
+    paths: List[str] = []
+    for raw in batch_file.read_text(encoding="utf-8").splitlines():
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        path = Path(line).expanduser()
+        if not path.is_absolute():
+            path = batch_file.parent / path
+        paths.append(str(path))
+    return paths
+
+
+def load_batch_plans(plan_paths: Sequence[str]) -> List[BatchPlan]:
+    plans: List[BatchPlan] = []
+    for plan_path in plan_paths:
+        try:
+            with open(plan_path, "r", encoding="utf-8") as handle:
+                payload = yaml.safe_load(handle)
+        except (OSError, yaml.YAMLError) as exc:
+            plans.append(BatchPlan(plan_path, error=f"failed to load plan file: {exc}"))
+            continue
+        if not isinstance(payload, dict):
+            plans.append(BatchPlan(plan_path, error=f"plan file is not a mapping: {plan_path}"))
+            continue
+        plans.append(BatchPlan(plan_path, payload=payload))
+    return plans
+
+
+def requested_np(payload: Dict[str, Any]) -> int:
+    recipe = payload.get("recipe") if isinstance(payload.get("recipe"), dict) else {}
+    try:
+        return max(int(recipe.get("np") or 1), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+class CpuBudget:
+    """Counting allocator that grants CPUs to waiters in arrival order."""
+
+    def __init__(self, total: int) -> None:
+        self.total = max(int(total), 1)
+        self._free = self.total
+        self._cond = threading.Condition()
+
+    def acquire(self, amount: int, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Block until *amount* CPUs are free; ``False`` if cancelled first."""
+        amount = min(max(int(amount), 1), self.total)
+        with self._cond:
+            while self._free < amount:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                self._cond.wait(0.25 if cancel_event is not None else None)
+            self._free -= amount
+            return True
+
+    def release(self, amount: int) -> None:
+        with self._cond:
+            self._free = min(self._free + min(max(int(amount), 1), self.total), self.total)
+            self._cond.notify_all()
+
+
+def _failure_record(index: int, plan: BatchPlan, status: str, error_type: str, message: str) -> Dict[str, Any]:
+    payload = plan.payload or {}
+    return {
+        "index": index,
+        "plan_path": plan.plan_path,
+        "plan_id": str(payload.get("plan_id", "")).strip(),
+        "np": 0,
+        "returncode": 130 if status == "interrupted" else 1,
+        "status": status,
+        "error_type": error_type,
+        "error_message": message,
+    }
+
+
+def run_apply_batch(
+    plans: Sequence[BatchPlan],
+    runtime_dir: Path,
+    output_path: Path,
+    *,
+    cpu_budget: Optional[int] = None,
+    cancel_event: Optional[threading.Event] = None,
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
+    use_case: Optional[ApplyUseCase] = None,
+    **execute_kwargs: Any,
+) -> List[Dict[str, Any]]:
+    """Apply *plans* concurrently within *cpu_budget* CPUs.
+
+    *execute_kwargs* are passed to every :meth:`ApplyUseCase.execute` call
+    (``timeout_seconds``, ``executor``, ``use_cache``, ...).  Records are
+    appended to *output_path* as runs finish and also passed to
+    *on_record*; the returned list is in submission order.
+    """
+    budget = CpuBudget(cpu_budget or default_cpu_budget())
+    use_case = use_case or ApplyUseCase()
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    records: Dict[int, Dict[str, Any]] = {}
+    write_lock = threading.Lock()
+    threads: List[threading.Thread] = []
+    seen_plan_ids: Dict[str, int] = {}
+
+    with open(output_path, "a", encoding="utf-8") as sink:
+
+        def emit(record: Dict[str, Any]) -> None:
+            with write_lock:
+                records[record["index"]] = record
+                sink.write(json_codec.dumps(record, default=str) + "\n")
+                sink.flush()
+            if callable(on_record):
+                on_record(record)
+
+        def run_one(index: int, plan: BatchPlan, granted: int) -> None:
+            payload = copy.deepcopy(plan.payload or {})
+            payload["recipe"] = dict(payload.get("recipe") or {}, np=granted)
+            try:
+                result, returncode, _stdout, _stderr = use_case.execute(
+                    plan_payload=payload,
+                    runtime_dir=runtime_dir,
+                    cancel_event=cancel_event,
+                    **execute_kwargs,
+                )
+                record = {
+                    "index": index,
+                    "plan_path": plan.plan_path,
+                    "np": granted,
+                    "returncode": returncode,
+                    **result.to_dict(),
+                }
+            except Exception as exc:
+                _logger.debug("batch apply of %s failed: %s", plan.plan_path, exc)
+                record = _failure_record(index, plan, "failed", "apply_failed", str(exc))
+                record["np"] = granted
+            finally:
+                budget.release(granted)
+            emit(record)
+
+        for index, plan in enumerate(plans):
+            if plan.payload is None:
+                emit(_failure_record(index, plan, "failed", "plan_not_found", plan.error))
+                continue
+            plan_id = str(plan.payload.get("plan_id", "")).strip()
+            if plan_id in seen_plan_ids:
+                # Same recipe file and export path: the runs would clobber each other.
+                emit(
+                    _failure_record(
+                        index,
+                        plan,
+                        "failed",
+                        "duplicate_plan_id",
+                        f"plan_id {plan_id!r} already scheduled as entry {seen_plan_ids[plan_id]}",
+                    )
+                )
+                continue
+            seen_plan_ids[plan_id] = index
+            granted = min(requested_np(plan.payload), budget.total)
+            if not budget.acquire(granted, cancel_event):
+                emit(_failure_record(index, plan, "interrupted", "interrupted", "batch cancelled before start"))
+                continue
+            thread = threading.Thread(
+                target=run_one,
+                args=(index, plan, granted),
+                name=f"djx-batch-{index}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+        for thread in threads:
+            thread.join()
+
+    return [records[index] for index in sorted(records)]
+
+
+__all__ = [
+    "BatchPlan",
+    "CpuBudget",
+    "default_cpu_budget",
+    "load_batch_plans",
+    "read_batch_file",
+    "requested_np",
+    "run_apply_batch",
+]
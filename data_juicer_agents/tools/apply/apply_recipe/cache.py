@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed cache of successful apply results.
+
+Re-applying an unchanged plan to an unchanged dataset used to rerun
+``dj-process`` from scratch.  A successful run is recorded under
+``<runtime_dir>/cache/`` keyed by:
+
+* the normalized recipe bytes written by ``ApplyUseCase._write_recipe``;
+* the absolute path, size and mtime of every local dataset file (all
+  files below a directory source, every match of a glob);
+* the custom operator files (see :func:`.forkserver.custom_operator_fingerprint`);
+* the installed Data-Juicer version.
+
+A hit is only served while the export recorded with it is intact (same
+size and mtime), so deleting or editing the output forces a rerun.
+Recipes whose data cannot be fingerprinted locally (generated datasets,
+remote sources) are never cached.  Storage and LRU eviction are shared
+with the dataset profile cache.
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from data_juicer_agents.tools.context.inspect_dataset.profile_cache import ProfileCache
+
+from .forkserver import custom_operator_fingerprint
+
+# Bump when the key material or the stored payload changes shape.
+APPLY_CACHE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+@lru_cache(maxsize=1)
+def _data_juicer_version() -> Optional[str]:
+    from importlib import metadata
+
+    try:
+        return metadata.version("py-data-juicer")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _fingerprint_files(path_value: str) -> Optional[List[Any]]:
+    """``[abspath, size, mtime_ns]`` for every file a local source covers."""
+    expanded = os.path.expanduser(path_value)
+    if any(ch in path_value for ch in "*?["):
+        candidates = sorted(glob.glob(expanded, recursive=True))
+    elif os.path.isdir(expanded):
+        candidates = sorted(
+            os.path.join(root, name)
+            for root, _dirs, names in os.walk(expanded)
+            for name in names
+        )
+    else:
+        candidates = [expanded]
+    files: List[Any] = []
+    for candidate in candidates:
+        try:
+            stat = os.stat(candidate)
+        except OSError:
+            return None
+        if os.path.isfile(candidate):
+            files.append([os.path.abspath(candidate), int(stat.st_size), int(stat.st_mtime_ns)])
+    return files or None
+
+
+def dataset_fingerprint(recipe: Dict[str, Any]) -> Optional[List[Any]]:
+    """Fingerprint the recipe's local data sources, or ``None`` if any is not local."""
+    if recipe.get("generated_dataset_config"):
+        return None
+    dataset = recipe.get("dataset")
+    if isinstance(dataset, dict):
+        paths: List[str] = []
+        for cfg in dataset.get("configs") or []:
+            if not isinstance(cfg, dict) or str(cfg.get("type", "local")).strip() != "local":
+                return None
+            paths.append(str(cfg.get("path", "")).strip())
+    else:
+        paths = [str(recipe.get("dataset_path", "")).strip()]
+    fingerprints: List[Any] = []
+    for path_value in paths:
+        files = _fingerprint_files(path_value) if path_value else None
+        if files is None:
+            return None
+        fingerprints.append(files)
+    return fingerprints
+
+
+def export_fingerprint(export_path: str) -> Optional[Dict[str, int]]:
+    """Total size and newest mtime of the export file (or export directory)."""
+    files = _fingerprint_files(export_path) if export_path else None
+    if files is None:
+        return None
+    return {
+        "files": len(files),
+        "size": sum(item[1] for item in files),
+        "mtime_ns": max(item[2] for item in files),
+    }
+
+
+def apply_cache_key(recipe_path: Path, recipe: Dict[str, Any]) -> Optional[str]:
+    """Return the cache key for a written recipe, or ``None`` if uncacheable."""
+    sources = dataset_fingerprint(recipe)
+    if sources is None:
+        return None
+    try:
+        recipe_bytes = Path(recipe_path).read_bytes()
+    except OSError:
+        return None
+    custom_paths = [
+        str(item).strip()
+        for item in (recipe.get("custom_operator_paths") or [])
+        if str(item).strip()
+    ]
+    material = {
+        "version": APPLY_CACHE_VERSION,
+        "recipe_sha256": hashlib.sha256(recipe_bytes).hexdigest(),
+        "sources": sources,
+        "custom_operators": custom_operator_fingerprint(custom_paths),
+        "data_juicer": _data_juicer_version(),
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ApplyResultCache:
+    """Successful ``ApplyResult`` payloads keyed by :func:`apply_cache_key`."""
+
+    def __init__(self, root: str | Path, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._store = ProfileCache(root, max_entries=max_entries)
+
+    def path_for(self, key: str) -> Path:
+        return self._store.path_for(key)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result payload if its export is still intact."""
+        entry = self._store.get(key)
+        if not entry or entry.get("version") != APPLY_CACHE_VERSION:
+            return None
+        result = entry.get("result")
+        if not isinstance(result, dict):
+            return None
+        export_path = str((result.get("artifacts") or {}).get("export_path", ""))
+        if export_fingerprint(export_path) != entry.get("export"):
+            return None
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> Optional[Path]:
+        """Record a successful result; skipped when its export is missing."""
+        export_path = str((result.get("artifacts") or {}).get("export_path", ""))
+        export = export_fingerprint(export_path)
+        if export is None:
+            return None
+        return self._store.put(
+            key,
+            {"version": APPLY_CACHE_VERSION, "export": export, "result": result},
+        )
+
+
+__all__ = [
+    "APPLY_CACHE_VERSION",
+    "ApplyResultCache",
+    "apply_cache_key",
+    "dataset_fingerprint",
+    "export_fingerprint",
+]
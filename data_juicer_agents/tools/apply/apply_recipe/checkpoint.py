@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Data-Juicer checkpointing for long apply runs.
+
+A run that hits its timeout (124) or is interrupted (130) used to lose all
+finished operators.  Data-Juicer's default executor can checkpoint: with
+``use_checkpoint`` it writes the dataset produced by the last completed
+operator to ``<work_dir>/ckpt`` when processing stops, and a later run
+with the same ``work_dir`` and an unchanged operator prefix loads it and
+skips those operators.  Two details make that usable from ``djx apply``:
+
+* Data-Juicer appends a fresh ``job_id`` to ``work_dir`` on every run, so
+  the checkpoint is only found again if ``job_id`` is pinned.  A recipe
+  that sets ``work_dir`` keeps it, with ``job_id`` pinned to its own value
+  or the plan id (the run uses ``<work_dir>/<job_id>``); otherwise both
+  are set to ``<runtime_dir>/checkpoints/<plan_id>`` and ``<plan_id>``;
+* the checkpoint is written from a ``finally`` block, which a SIGTERM
+  kill skips.  Checkpointed runs are therefore stopped with SIGINT and
+  given :data:`CHECKPOINT_STOP_GRACE` seconds to save before being killed.
+
+The checkpoint only records which operators ran, not which input they
+ran on, so it is reused only when the caller asks to resume; any other
+checkpointed run starts from a clean work dir.
+
+Checkpointing is not free.  Data-Juicer turns dataset cache management
+off whenever ``use_checkpoint`` is set, and it saves the checkpoint on
+success too, so every checkpointed run writes its final dataset twice
+(the extra copy is deleted afterwards unless the recipe asked for
+checkpoints).  It is therefore enabled only when the recipe or caller asks
+for it, or when a pilot estimates the run at
+:data:`CHECKPOINT_MIN_SECONDS` or more; a generous timeout alone does not
+turn it on.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Runs a pilot estimates to take at least this long are checkpointed.
+CHECKPOINT_MIN_SECONDS = 600.0
+# Time a checkpointed run gets to write its checkpoint after SIGINT.
+CHECKPOINT_STOP_GRACE = 60.0
+
+_CHECKPOINT_EXECUTORS = ("default", "local")
+
+
+def checkpoint_unsupported_reason(recipe: Dict[str, Any]) -> str:
+    """Why the recipe cannot use default-executor checkpoints ("" if it can)."""
+    executor_type = str(recipe.get("executor_type") or "default").strip()
+    if executor_type not in _CHECKPOINT_EXECUTORS:
+        return f"executor_type {executor_type!r} does not support use_checkpoint"
+    if recipe.get("op_fusion"):
+        return "op_fusion disables Data-Juicer checkpointing"
+    if recipe.get("use_checkpoint") is False:
+        return "the recipe sets use_checkpoint: false"
+    return ""
+
+
+def should_checkpoint(
+    recipe: Dict[str, Any],
+    *,
+    estimated_seconds: Optional[float] = None,
+    requested: Optional[bool] = None,
+) -> bool:
+    """Decide whether a run checkpoints.
+
+    *requested* ``True``/``False`` forces the decision (subject to support);
+    ``None`` enables it when the recipe sets ``use_checkpoint`` or a pilot
+    *estimated_seconds* reaches :data:`CHECKPOINT_MIN_SECONDS`.
+    """
+    if checkpoint_unsupported_reason(recipe) or requested is False:
+        return False
+    if requested or recipe.get("use_checkpoint") is True:
+        return True
+    return estimated_seconds is not None and float(estimated_seconds) >= CHECKPOINT_MIN_SECONDS
+
+
+def checkpoint_work_dir(runtime_dir: Path, plan_id: str, recipe: Optional[Dict[str, Any]] = None) -> Path:
+    """Job directory a checkpointed run of *recipe* uses.
+
+    A recipe ``work_dir`` is kept; Data-Juicer resolves it to
+    ``<work_dir>/<job_id>`` unless it already ends with the job id.
+    """
+    plan_id = plan_id or "plan_apply"
+    raw = str((recipe or {}).get("work_dir") or "").strip()
+    if not raw:
+        return Path(runtime_dir).resolve() / "checkpoints" / plan_id
+    job_id = str((recipe or {}).get("job_id") or "").strip() or plan_id
+    work_dir = Path(raw.replace("{job_id}", job_id)).expanduser().resolve()
+    return work_dir if str(work_dir).endswith(job_id) else work_dir / job_id
+
+
+def with_checkpoint(recipe: Dict[str, Any], work_dir: Path) -> Dict[str, Any]:
+    """Return *recipe* with checkpointing on and its job directory pinned.
+
+    *work_dir* comes from :func:`checkpoint_work_dir`; a recipe that sets
+    its own ``work_dir`` keeps it and only gets a fixed ``job_id``.
+    """
+    if str(recipe.get("work_dir") or "").strip():
+        return {
+            **recipe,
+            "use_checkpoint": True,
+            "job_id": str(recipe.get("job_id") or "").strip() or work_dir.name,
+        }
+    return {
+        **recipe,
+        "use_checkpoint": True,
+        "work_dir": str(work_dir),
+        "job_id": work_dir.name,
+    }
+
+
+def checkpoint_path(work_dir: Path) -> Path:
+    return Path(work_dir) / "ckpt"
+
+
+def completed_ops(work_dir: Path) -> Optional[List[str]]:
+    """Operator names recorded in the checkpoint, or ``None`` if there is none."""
+    ckpt = checkpoint_path(work_dir)
+    if not (ckpt / "latest").is_dir():
+        return None
+    try:
+        records = json.loads((ckpt / "ckpt_op.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(records, list):
+        return None
+    return [next(iter(item), "") if isinstance(item, dict) else str(item) for item in records]
+
+
+def clear_checkpoint(work_dir: Path) -> None:
+    shutil.rmtree(checkpoint_path(work_dir), ignore_errors=True)
+
+
+__all__ = [
+    "CHECKPOINT_MIN_SECONDS",
+    "CHECKPOINT_STOP_GRACE",
+    "checkpoint_path",
+    "checkpoint_unsupported_reason",
+    "checkpoint_work_dir",
+    "clear_checkpoint",
+    "completed_ops",
+    "should_checkpoint",
+    "with_checkpoint",
+]
@@ -0,0 +1,651 @@
+# -*- coding: utf-8 -*-
+"""Warm Data-Juicer fork server for recipe runs.
+
+Every ``dj-process`` launch pays for interpreter start-up, importing
+``data_juicer`` (torch, datasets, ...) and registering all operators before
+the first sample is touched; for small recipes and operator smoke checks
+that dominates the run.  The fork server pays that cost once:
+
+* the server is a ``python`` child in its own session that imports
+  ``data_juicer.config`` / ``core`` / ``ops`` (registering the built-in
+  operators) and loads the recipe's custom operators at start-up;
+* for each recipe the caller creates fresh stdout/stderr pipes and passes
+  the write ends over a Unix socket pair (``send_handle``); the server
+  forks a child, which starts its own session, ``dup2``s the pipes onto
+  fds 1/2 and runs ``init_configs`` plus the executor exactly like
+  ``dj-process`` does;
+* at most ``pool_size`` children run at once, further requests queue in
+  the server; exit codes and ``rusage`` are reported back as children
+  are reaped.
+
+Forked children start from the same warm state and never share state with
+each other.  Timeout and cancellation kill only the affected child's
+process group; the server stays warm.  Because operator registration is
+process-global, a server is retired (it drains running children, then
+exits) and replaced whenever the custom operator paths or their files
+change.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import importlib
+import itertools
+import json
+import logging
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import recv_handle, send_handle
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from data_juicer_agents.utils.process_supervisor import (
+    CANCELLED,
+    EXITED,
+    TIMEOUT,
+    terminate_process_group,
+    wait_for_readable,
+)
+from data_juicer_agents.utils.resource_usage import ProcessGroupSampler, rusage_to_dict
+from data_juicer_agents.utils.stream_capture import StreamCapture
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+POOL_SIZE_ENV = "DJX_FORKSERVER_POOL_SIZE"
+
+_RUN, _CANCEL, _STOP = "run", "cancel", "stop"
+_READY, _STARTED, _DONE = "ready", "started", "done"
+_KILL_GRACE = 2.0
+_WARM_MODULES = ("datasets", "torch")
+_DEFAULT_RUNNER = f"{__name__}:run_data_juicer_recipe"
+# Started with ``-c`` rather than ``-m``: this module is already imported by
+# the package ``__init__`` and must not be executed a second time.
+_SERVER_BOOTSTRAP = (
+    "import sys\n"
+    "from multiprocessing.connection import Connection\n"
+    f"from {__name__} import _server_main\n"
+    "_server_main(Connection(int(sys.argv[1])), sys.argv[2], int(sys.argv[3]), sys.argv[4])\n"
+)
+
+
+def run_data_juicer_recipe(recipe_path: str) -> None:
+    """Execute one recipe the way ``dj-process --config`` does."""
+    from data_juicer.config import init_configs
+
+    cfg = init_configs(args=["--config", recipe_path])
+    if cfg.executor_type == "default":
+        from data_juicer.core import DefaultExecutor
+
+        executor = DefaultExecutor(cfg)
+    elif cfg.executor_type == "ray":
+        from data_juicer.core.executor.ray_executor import RayExecutor
+
+        executor = RayExecutor(cfg)
+    else:
+        raise ValueError(f"Unsupported executor type: {cfg.executor_type}")
+    executor.run()
+
+
+def resolve_pool_size(pool_size: Optional[int] = None) -> int:
+    """Explicit *pool_size*, else ``$DJX_FORKSERVER_POOL_SIZE``, else the default."""
+    if pool_size is None:
+        try:
+            pool_size = int(os.environ.get(POOL_SIZE_ENV, DEFAULT_POOL_SIZE))
+        except ValueError:
+            pool_size = DEFAULT_POOL_SIZE
+    return max(int(pool_size), 1)
+
+
+def custom_operator_fingerprint(paths: Sequence[str]) -> Tuple[Any, ...]:
+    """Identity of a set of custom operator paths, including file edits."""
+    entries: List[Any] = []
+    for raw in paths:
+        path = os.path.abspath(str(raw))
+        files: List[Tuple[str, int, int]] = []
+        if os.path.isfile(path):
+            candidates = [path]
+        else:
+            candidates = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(path)
+                for name in names
+                if name.endswith(".py")
+            ]
+        for candidate in sorted(candidates):
+            with contextlib.suppress(OSError):
+                stat = os.stat(candidate)
+                files.append((os.path.relpath(candidate, path), stat.st_mtime_ns, stat.st_size))
+        entries.append((path, tuple(files)))
+    return tuple(entries)
+
+
+# ---------------------------------------------------------------------------
+# Server side
+# ---------------------------------------------------------------------------
+
+
+def _preload_data_juicer(custom_operator_paths: Sequence[str]) -> List[str]:
+    """Import Data-Juicer and load custom operators; returns load errors."""
+    errors: List[str] = []
+    try:
+        import data_juicer.config  # noqa: F401
+        import data_juicer.core  # noqa: F401
+        import data_juicer.ops  # noqa: F401
+        from data_juicer.config import config as dj_config
+    except Exception as exc:
+        return [f"data_juicer import failed: {exc}"]
+    # Imported lazily by every run (dataset loading, ``free_models`` after
+    # each op); without this each forked child pays for them again.
+    for module_name in _WARM_MODULES:
+        with contextlib.suppress(Exception):
+            importlib.import_module(module_name)
+
+    original = dj_config.load_custom_operators
+    loaded = set()
+    for raw in custom_operator_paths:
+        path = os.path.abspath(raw)
+        try:
+            original([path])
+            loaded.add(path)
+        except Exception as exc:
+            # Left to the child, so the real error lands in the run's stderr.
+            errors.append(f"{raw}: {exc}")
+    if loaded:
+
+        def load_remaining(paths: Sequence[str]) -> None:
+            original([item for item in paths if os.path.abspath(item) not in loaded])
+
+        # init_configs would otherwise reject the already-imported modules.
+        dj_config.load_custom_operators = load_remaining
+    return errors
+
+
+def _resolve_runner(spec: str) -> Callable[[str], None]:
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _child_main(
+    runner: Callable[[str], None],
+    recipe_path: str,
+    cwd: str,
+    stdout_fd: int,
+    stderr_fd: int,
+) -> None:
+    returncode = 1
+    try:
+        os.setsid()
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        os.close(stdout_fd)
+        os.close(stderr_fd)
+        # Relative dataset/export paths resolve like they would for a
+        # dj-process child started from the caller's current directory.
+        os.chdir(cwd)
+        runner(recipe_path)
+        returncode = 0
+    except SystemExit as exc:
+        code = exc.code
+        returncode = code if isinstance(code, int) else (0 if code is None else 1)
+    except BaseException:
+        with contextlib.suppress(Exception):
+            traceback.print_exc()
+        returncode = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            with contextlib.suppress(Exception):
+                stream.flush()
+        os._exit(returncode)
+
+
+def _server_main(conn: Connection, runner_spec: str, pool_size: int, custom_paths_json: str) -> None:
+    custom_paths = json.loads(custom_paths_json)
+    errors: List[str] = []
+    if runner_spec == _DEFAULT_RUNNER:
+        errors = _preload_data_juicer(custom_paths)
+    runner = _resolve_runner(runner_spec)
+
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+
+    selector = selectors.DefaultSelector()
+    selector.register(conn.fileno(), selectors.EVENT_READ)
+    selector.register(wake_r, selectors.EVENT_READ)
+
+    queue: collections.deque = collections.deque()
+    running: Dict[int, str] = {}
+    kill_at: Dict[int, float] = {}
+    stopping = False
+    conn.send((_READY, {"pid": os.getpid(), "preload_errors": errors}))
+
+    def fork_child(job: Tuple[str, str, str, int, int]) -> None:
+        job_id, recipe_path, cwd, stdout_fd, stderr_fd = job
+        pid = os.fork()
+        if pid == 0:
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            with contextlib.suppress(Exception):
+                selector.close()
+            for fd in (conn.fileno(), wake_r, wake_w):
+                with contextlib.suppress(OSError):
+                    os.close(fd)
+            _child_main(runner, recipe_path, cwd, stdout_fd, stderr_fd)
+        os.close(stdout_fd)
+        os.close(stderr_fd)
+        running[pid] = job_id
+        conn.send((_STARTED, job_id, pid))
+
+    def kill(pid: int, sig: int) -> None:
+        try:
+            os.killpg(pid, sig)
+        except OSError:
+            # The child may not have reached setsid() yet.
+            with contextlib.suppress(OSError):
+                os.kill(pid, sig)
+
+    try:
+        while True:
+            while queue and len(running) < pool_size:
+                fork_child(queue.popleft())
+            if stopping and not running and not queue:
+                return
+            wait = None
+            if kill_at:
+                wait = max(min(kill_at.values()) - time.monotonic(), 0.0)
+            for key, _ in selector.select(wait):
+                if key.fd == wake_r:
+                    with contextlib.suppress(OSError):
+                        while os.read(wake_r, 4096):
+                            pass
+                    continue
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    # The agent is gone; nobody will collect the results.
+                    for pid in running:
+                        kill(pid, signal.SIGKILL)
+                    return
+                kind = message[0]
+                if kind == _RUN:
+                    _, job_id, recipe_path, cwd = message
+                    stdout_fd = recv_handle(conn)
+                    stderr_fd = recv_handle(conn)
+                    queue.append((job_id, recipe_path, cwd, stdout_fd, stderr_fd))
+                elif kind == _CANCEL:
+                    job_id = message[1]
+                    signum, grace = message[2:4] if len(message) > 3 else (signal.SIGTERM, _KILL_GRACE)
+                    for queued in list(queue):
+                        if queued[0] == job_id:
+                            queue.remove(queued)
+                            os.close(queued[3])
+                            os.close(queued[4])
+                            conn.send((_DONE, job_id, None, {}))
+                    for pid, running_id in running.items():
+                        if running_id == job_id and pid not in kill_at:
+                            kill(pid, signum)
+                            kill_at[pid] = time.monotonic() + grace
+                elif kind == _STOP:
+                    stopping = True
+            while running:
+                try:
+                    pid, status, usage = os.wait4(-1, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if pid == 0:
+                    break
+                kill_at.pop(pid, None)
+                job_id = running.pop(pid, None)
+                if job_id is not None:
+                    conn.send((_DONE, job_id, os.waitstatus_to_exitcode(status), rusage_to_dict(usage)))
+            now = time.monotonic()
+            for pid, deadline in list(kill_at.items()):
+                if now >= deadline:
+                    kill(pid, signal.SIGKILL)
+                    del kill_at[pid]
+    finally:
+        with contextlib.suppress(Exception):
+            conn.close()
+
+
+# ---------------------------------------------------------------------------
+# Client side
+# ---------------------------------------------------------------------------
+
+
+class _Job:
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.detail = ""
+        self.usage: Dict[str, Any] = {}
+        self._done_r, self._done_w = os.pipe()
+
+    def finish(
+        self,
+        returncode: Optional[int],
+        detail: str = "",
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.returncode = returncode
+        self.detail = detail
+        self.usage = dict(usage or {})
+        with contextlib.suppress(OSError):
+            os.write(self._done_w, b"\0")
+
+    @property
+    def done_fd(self) -> int:
+        return self._done_r
+
+    def close(self) -> None:
+        for fd in (self._done_r, self._done_w):
+            with contextlib.suppress(OSError):
+                os.close(fd)
+
+
+class ForkServer:
+    """Client handle for one fork server process."""
+
+    def __init__(
+        self,
+        *,
+        pool_size: Optional[int] = None,
+        custom_operator_paths: Sequence[str] = (),
+        runner: str = _DEFAULT_RUNNER,
+    ) -> None:
+        self.pool_size = resolve_pool_size(pool_size)
+        self.custom_operator_paths = tuple(str(item) for item in custom_operator_paths)
+        self.fingerprint = custom_operator_fingerprint(self.custom_operator_paths)
+        self.runner = runner
+        self.preload_errors: List[str] = []
+        self._jobs: Dict[str, _Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._closed = False
+        parent_sock, child_sock = socket.socketpair()
+        try:
+            self._proc = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    _SERVER_BOOTSTRAP,
+                    str(child_sock.fileno()),
+                    runner,
+                    str(self.pool_size),
+                    json.dumps(list(self.custom_operator_paths)),
+                ],
+                pass_fds=(child_sock.fileno(),),
+                stdin=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except Exception:
+            parent_sock.close()
+            raise
+        finally:
+            child_sock.close()
+        self._conn = Connection(parent_sock.detach())
+        self._reader = threading.Thread(target=self._read_loop, name="djx-forkserver", daemon=True)
+        self._reader.start()
+
+    @property
+    def pid(self) -> int:
+        return self._proc.pid
+
+    def is_alive(self) -> bool:
+        return not self._closed and self._proc.poll() is None
+
+    def _read_loop(self) -> None:
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            if kind == _READY:
+                self.preload_errors = list(message[1].get("preload_errors") or [])
+                for error in self.preload_errors:
+                    _logger.debug("fork server preload: %s", error)
+                continue
+            with self._jobs_lock:
+                job = self._jobs.get(message[1])
+            if job is None:
+                continue
+            if kind == _STARTED:
+                job.pid = int(message[2])
+            elif kind == _DONE:
+                with self._jobs_lock:
+                    self._jobs.pop(job.job_id, None)
+                job.finish(message[2], usage=message[3] if len(message) > 3 else None)
+        self._closed = True
+        with contextlib.suppress(Exception):
+            self._proc.wait(timeout=_KILL_GRACE)
+        detail = f"fork server exited unexpectedly (exit code {self._proc.returncode})"
+        with self._jobs_lock:
+            pending, self._jobs = list(self._jobs.values()), {}
+        for job in pending:
+            job.finish(None, detail)
+
+    def _send(self, message: Tuple[Any, ...], *fds: int) -> None:
+        with self._send_lock:
+            self._conn.send(message)
+            for fd in fds:
+                send_handle(self._conn, fd, self._proc.pid)
+
+    def run(
+        self,
+        recipe_path: str,
+        stdout_fd: int,
+        stderr_fd: int,
+        *,
+        timeout: Optional[float],
+        cancel_event: Optional[threading.Event] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        resources: Optional[Dict[str, Any]] = None,
+        stop_signal: int = signal.SIGTERM,
+        stop_grace: float = _KILL_GRACE,
+    ) -> Tuple[str, int, str]:
+        """Run one recipe in a forked child; returns ``(outcome, returncode, detail)``.
+
+        *stdout_fd* / *stderr_fd* are duplicated into the child and may be
+        closed by the caller once this returns.  Time spent queued for a
+        free pool slot counts towards *timeout*.  *detail* explains a server
+        that died mid-run and is empty otherwise.  When *resources* is given
+        it is updated with the child's ``rusage`` and the sampled group
+        peak RSS and PSS (see :mod:`data_juicer_agents.utils.resource_usage`).  On timeout or
+        cancellation the child's process group gets *stop_signal* and is
+        killed *stop_grace* seconds later.
+        """
+        job = _Job(f"job_{next(self._ids)}")
+        with self._jobs_lock:
+            self._jobs[job.job_id] = job
+        sampler = ProcessGroupSampler(lambda: job.pid).start() if resources is not None else None
+        try:
+            if self._closed:
+                return EXITED, 1, "fork server is not running"
+            try:
+                self._send((_RUN, job.job_id, recipe_path, os.getcwd()), stdout_fd, stderr_fd)
+            except OSError as exc:
+                return EXITED, 1, f"fork server unavailable: {exc}"
+            outcome = wait_for_readable(
+                [job.done_fd],
+                timeout=timeout,
+                cancel_event=cancel_event,
+                cancel_check=cancel_check,
+            )
+            if outcome in {TIMEOUT, CANCELLED}:
+                with contextlib.suppress(OSError):
+                    self._send((_CANCEL, job.job_id, int(stop_signal), float(stop_grace)))
+                wait_for_readable([job.done_fd], timeout=float(stop_grace) + _KILL_GRACE + 1)
+                return outcome, 124 if outcome == TIMEOUT else 130, ""
+            if job.returncode is None:
+                return outcome, 1, job.detail or "fork server dropped the run"
+            return outcome, int(job.returncode), ""
+        finally:
+            if sampler is not None:
+                resources.update(job.usage)
+                resources.update(sampler.stop())
+            with self._jobs_lock:
+                self._jobs.pop(job.job_id, None)
+            job.close()
+
+    def stop(self, *, force: bool = False) -> None:
+        """Ask the server to exit once its running children finish.
+
+        With *force*, the server and all of its children are killed.
+        """
+        if not force and self.is_alive():
+            with contextlib.suppress(OSError):
+                self._send((_STOP,))
+            return
+        if self._proc.poll() is None:
+            terminate_process_group(self._proc, _KILL_GRACE)
+        with contextlib.suppress(Exception):
+            self._conn.close()
+
+
+_server_lock = threading.Lock()
+_server: Optional[ForkServer] = None
+
+
+def get_fork_server(
+    *,
+    custom_operator_paths: Sequence[str] = (),
+    pool_size: Optional[int] = None,
+    runner: str = _DEFAULT_RUNNER,
+) -> ForkServer:
+    """Return the shared fork server, replacing it if its setup no longer matches."""
+    global _server
+    paths = tuple(str(item) for item in custom_operator_paths)
+    size = resolve_pool_size(pool_size)
+    with _server_lock:
+        server = _server
+        if server is not None and (
+            not server.is_alive()
+            or server.runner != runner
+            or server.pool_size != size
+            or server.custom_operator_paths != paths
+            or server.fingerprint != custom_operator_fingerprint(paths)
+        ):
+            server.stop()
+            server = None
+        if server is None:
+            server = ForkServer(pool_size=size, custom_operator_paths=paths, runner=runner)
+        _server = server
+        return server
+
+
+def run_recipe_forked(
+    recipe_path: str,
+    stdout_fd: int,
+    stderr_fd: int,
+    *,
+    timeout: Optional[float],
+    custom_operator_paths: Sequence[str] = (),
+    cancel_event: Optional[threading.Event] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    pool_size: Optional[int] = None,
+    runner: str = _DEFAULT_RUNNER,
+    resources: Optional[Dict[str, Any]] = None,
+    stop_signal: int = signal.SIGTERM,
+    stop_grace: float = _KILL_GRACE,
+) -> Tuple[str, int, str]:
+    """Run *recipe_path* on the shared fork server; see :meth:`ForkServer.run`."""
+    server = get_fork_server(
+        custom_operator_paths=custom_operator_paths,
+        pool_size=pool_size,
+        runner=runner,
+    )
+    return server.run(
+        recipe_path,
+        stdout_fd,
+        stderr_fd,
+        timeout=timeout,
+        cancel_event=cancel_event,
+        cancel_check=cancel_check,
+        resources=resources,
+        stop_signal=stop_signal,
+        stop_grace=stop_grace,
+    )
+
+
+def run_recipe_captured(
+    recipe_path: str,
+    *,
+    timeout: Optional[float] = None,
+    custom_operator_paths: Sequence[str] = (),
+    max_chars: int = 64 * 1024,
+    runner: str = _DEFAULT_RUNNER,
+) -> Tuple[int, str, str]:
+    """Run a recipe on the fork server and return ``(returncode, stdout, stderr)``.
+
+    The returned text is the last *max_chars* characters of each stream.
+    Timeouts map to return code 124.
+    """
+    stdout_read, stdout_write = os.pipe()
+    stderr_read, stderr_write = os.pipe()
+    readers = [open(stdout_read, "rb", buffering=0), open(stderr_read, "rb", buffering=0)]
+    captures = [
+        StreamCapture(reader, name=name, max_chars=max_chars).start()
+        for name, reader in zip(("stdout", "stderr"), readers)
+    ]
+    try:
+        try:
+            outcome, returncode, detail = run_recipe_forked(
+                recipe_path,
+                stdout_write,
+                stderr_write,
+                timeout=timeout,
+                custom_operator_paths=custom_operator_paths,
+                runner=runner,
+            )
+        finally:
+            os.close(stdout_write)
+            os.close(stderr_write)
+        for capture in captures:
+            capture.join(5.0)
+        stdout, stderr = captures[0].text(), captures[1].text()
+    finally:
+        for reader in readers:
+            with contextlib.suppress(Exception):
+                reader.close()
+    if outcome == TIMEOUT:
+        stderr = (stderr.rstrip("\n") + f"\nTimeout after {timeout}s").strip()
+    elif detail:
+        stderr = (stderr.rstrip("\n") + f"\n{detail}").strip()
+    return returncode, stdout, stderr
+
+
+def shutdown_fork_server() -> None:
+    """Kill the shared fork server and any runs still in flight."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.stop(force=True)
+            _server = None
+
+
+__all__ = [
+    "DEFAULT_POOL_SIZE",
+    "ForkServer",
+    "POOL_SIZE_ENV",
+    "custom_operator_fingerprint",
+    "get_fork_server",
+    "resolve_pool_size",
+    "run_data_juicer_recipe",
+    "run_recipe_captured",
+    "run_recipe_forked",
+    "shutdown_fork_server",
+]
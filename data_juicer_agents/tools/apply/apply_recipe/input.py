@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -11,6 +13,32 @@ class ApplyRecipeInput(BaseModel):
     dry_run: bool = Field(default=False, description="If true, do not execute dj-process.")
     timeout: int = Field(default=300, ge=1, description="Execution timeout in seconds.")
     confirm: bool = Field(default=False, description="Explicit confirmation required before execution.")
+    executor: Literal["subprocess", "inprocess"] = Field(
+        default="subprocess",
+        description="subprocess launches dj-process; inprocess forks the run from a warm Data-Juicer server.",
+    )
+    pilot_rows: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Run the plan on this many sampled rows first and attach a runtime/output-size estimate.",
+    )
+    pilot_only: bool = Field(
+        default=False,
+        description="Stop after the pilot run and return its estimate without running the full dataset.",
+    )
+    time_budget: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Seconds; skip the full run if the pilot estimate exceeds it (implies a pilot).",
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse the recorded result when the recipe, dataset and export are unchanged since a successful run.",
+    )
+    resume: bool = Field(
+        default=False,
+        description="Continue a timed-out or interrupted checkpointed run from its last completed operator.",
+    )
 
 
 class GenericOutput(BaseModel):
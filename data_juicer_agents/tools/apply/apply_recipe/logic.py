@@ -9,9 +9,9 @@ import os
 import shlex
 import signal
 import subprocess
-import tempfile
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Tuple
@@ -19,26 +19,85 @@ from uuid import uuid4
 
 import yaml
 
+from data_juicer_agents.utils.process_supervisor import (
+    CANCELLED,
+    TIMEOUT,
+    reap_process,
+    terminate_process_group,
+    wait_for_process,
+)
+from data_juicer_agents.utils.resource_usage import ProcessGroupSampler, rusage_to_dict
+from data_juicer_agents.utils.stream_capture import StreamCapture
+
+from .cache import ApplyResultCache, apply_cache_key
+from .checkpoint import (
+    CHECKPOINT_STOP_GRACE,
+    checkpoint_path,
+    checkpoint_unsupported_reason,
+    checkpoint_work_dir,
+    clear_checkpoint,
+    completed_ops,
+    should_checkpoint,
+    with_checkpoint,
+)
+from .forkserver import run_recipe_forked
+from .pilot import (
+    BUDGET_EXCEEDED_RETURNCODE,
+    CALIBRATION_FRACTION,
+    DEFAULT_PILOT_ROWS,
+    PilotError,
+    build_pilot_plan,
+    count_rows,
+    estimate_full_run,
+    export_size_bytes,
+    format_pilot_estimate,
+    pilot_dataset_path,
+    sample_rows,
+    write_sample,
+)
+from .progress import ApplyProgressTracker
+
 
 _DEFAULT_PLANNER_MODEL = os.environ.get("DJA_PLANNER_MODEL", "qwen3-max-2026-01-23")
 
 _logger = logging.getLogger(__name__)
 
+# In-memory output kept per stream; the complete output goes to log files
+# under ``<runtime_dir>/logs`` and is referenced from ``ApplyResult.artifacts``.
+_LOG_TAIL_CHARS = 64 * 1024
+
+EXECUTORS = ("subprocess", "inprocess")
+
 
 def _terminate_process_gracefully(proc: subprocess.Popen) -> None:
     """Terminate a subprocess gracefully with fallback to SIGKILL."""
-    try:
-        os.killpg(proc.pid, signal.SIGTERM)
-    except Exception:
-        with contextlib.suppress(Exception):
-            proc.terminate()
-    with contextlib.suppress(Exception):
-        proc.wait(timeout=2)
-    if proc.poll() is None:
-        with contextlib.suppress(Exception):
-            os.killpg(proc.pid, signal.SIGKILL)
-        with contextlib.suppress(Exception):
-            proc.kill()
+    terminate_process_group(proc)
+
+
+def _drain_captures(
+    captures: List[StreamCapture],
+    log_paths: Dict[str, Path] | None = None,
+    timeout: float = 5.0,
+) -> Tuple[str, str]:
+    """Wait for the output readers to hit EOF and return ``(stdout, stderr)``.
+
+    Readers are given *timeout* seconds in total: a grandchild that inherited
+    the pipes can keep them open after ``dj-process`` itself has exited.
+    Bounded captures that dropped output are prefixed with a pointer to the
+    stream's full log file.
+    """
+    deadline = time.monotonic() + timeout
+    for capture in captures:
+        capture.join(max(deadline - time.monotonic(), 0.0))
+    texts: Dict[str, str] = {}
+    for capture in captures:
+        text = capture.text()
+        if capture.dropped_chars:
+            where = (log_paths or {}).get(capture.name)
+            note = f"; full log: {where}" if where else ""
+            text = f"... [{capture.dropped_chars} earlier chars omitted{note}]\n{text}"
+        texts[capture.name] = text
+    return texts.get("stdout", ""), texts.get("stderr", "")
 
 
 def _classify_error(returncode: int, stderr: str) -> tuple[str, str, List[str]]:
@@ -100,11 +159,18 @@ class ApplyResult:
     error_message: str
     retry_level: str
     next_actions: List[str]
+    pilot: Dict[str, Any] = field(default_factory=dict)
+    resources: Dict[str, Any] = field(default_factory=dict)
 
     @staticmethod
     def new_id() -> str:
         return f"exec_{uuid4().hex[:12]}"
 
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "ApplyResult":
+        known = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in payload.items() if key in known})
+
     def to_dict(self) -> Dict[str, object]:
         return {
             "execution_id": self.execution_id,
@@ -121,6 +187,8 @@ class ApplyResult:
             "error_message": self.error_message,
             "retry_level": self.retry_level,
             "next_actions": list(self.next_actions),
+            **({"pilot": dict(self.pilot)} if self.pilot else {}),
+            **({"resources": dict(self.resources)} if self.resources else {}),
         }
 
 
@@ -209,14 +277,133 @@ class ApplyUseCase:
         timeout_seconds: int = 300,
         command_override: str | Iterable[str] | None = None,
         cancel_check: Callable[[], bool] | None = None,
+        progress_callback: Callable[[Dict[str, Any]], None] | None = None,
+        cancel_event: threading.Event | None = None,
+        executor: str = "subprocess",
+        pilot_rows: int | None = None,
+        pilot_only: bool = False,
+        time_budget_seconds: float | None = None,
+        use_cache: bool = True,
+        record_cache: bool = True,
+        checkpoint: bool | None = None,
+        resume: bool = False,
     ) -> Tuple[ApplyResult, int, str, str]:
+        """Run the plan's recipe through ``dj-process``.
+
+        Output is read incrementally; when *progress_callback* is given it
+        receives ``op_progress`` / ``op_done`` events parsed from the output
+        (see :mod:`.progress`) while the process runs.  Exit, timeout and
+        cancellation are detected without polling by
+        :func:`~data_juicer_agents.utils.process_supervisor.wait_for_process`;
+        pass a :class:`~data_juicer_agents.utils.process_supervisor.CancelEvent`
+        as *cancel_event* for immediate cancellation.
+
+        Only the last ``_LOG_TAIL_CHARS`` characters of each stream are kept
+        in memory and returned; the full output is written to
+        ``<runtime_dir>/logs/<execution_id>.{stdout,stderr}.log`` and listed
+        in ``ApplyResult.artifacts`` as ``stdout_log`` / ``stderr_log``.
+
+        *executor* selects how the recipe runs: ``"subprocess"`` launches
+        ``dj-process``; ``"inprocess"`` runs it in a child forked from a
+        warm Data-Juicer fork server (see :mod:`.forkserver`) with the same
+        output, timeout and cancellation semantics.
+
+        With *pilot_rows*, *pilot_only* or *time_budget_seconds* the recipe
+        first runs on a random sample (see :mod:`.pilot`; default
+        ``DEFAULT_PILOT_ROWS`` rows, preceded by a smaller calibration run)
+        and the extrapolated runtime/output estimate is attached as
+        ``ApplyResult.pilot``.  *pilot_only* stops after the pilot (status
+        ``"pilot"``); if the estimate exceeds *time_budget_seconds* the full
+        run is not started (status ``"blocked"``, return code
+        ``BUDGET_EXCEEDED_RETURNCODE``).  Raises :class:`~.pilot.PilotError`
+        when the dataset cannot be piloted.
+
+        Successful runs are recorded in ``<runtime_dir>/cache`` (see
+        :mod:`.cache`).  With *use_cache*, an unchanged recipe over an
+        unchanged dataset whose export is still intact returns the recorded
+        result with status ``"cached"`` instead of running again; without
+        it the run always executes and refreshes the entry.  With
+        *record_cache* ``False`` the cache is neither read nor written (pilot
+        stages run this way).  Dry runs, *pilot_only* and *command_override*
+        bypass the cache.
+
+        ``ApplyResult.resources`` reports what the run consumed: the
+        ``rusage`` of the reaped root process (CPU, max RSS, block I/O,
+        context switches; absent when a subprocess had to be killed) and
+        the peak RSS and PSS of its whole process group sampled during the
+        run (see :mod:`data_juicer_agents.utils.resource_usage`).
+
+        Long runs use Data-Juicer checkpointing (see :mod:`.checkpoint`):
+        with *checkpoint* ``None`` it is enabled when the recipe sets
+        ``use_checkpoint`` or a pilot estimates the run at
+        ``CHECKPOINT_MIN_SECONDS`` or more; ``True``/``False`` force it.  A
+        checkpointed run that times out or is interrupted is stopped with
+        SIGINT so it can save the output of its last completed operator,
+        and the result lists ``checkpoint_dir`` in its artifacts.
+        *resume* reruns such a plan from that checkpoint (artifact
+        ``resumed_from``); without *resume* a stale checkpoint is discarded.
+        Raises ``ValueError`` if *resume* is set for a recipe that cannot
+        checkpoint.
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}; got {executor!r}")
+        if executor == "inprocess" and command_override is not None:
+            raise ValueError("command_override is not supported with executor='inprocess'")
         plan = self._normalize_plan_payload(plan_payload)
+        recipe = plan.get("recipe") if isinstance(plan.get("recipe"), dict) else {}
+        if resume and checkpoint_unsupported_reason(recipe):
+            raise ValueError(f"cannot resume: {checkpoint_unsupported_reason(recipe)}")
+        cache: ApplyResultCache | None = None
+        cache_key: str | None = None
+        if not dry_run and not pilot_only and command_override is None and record_cache:
+            cache_key = apply_cache_key(self._write_recipe(plan, runtime_dir), plan.get("recipe") or {})
+            if cache_key is not None:
+                cache = ApplyResultCache(runtime_dir / "cache")
+                cached = cache.get(cache_key) if use_cache else None
+                if cached is not None:
+                    return self._cached_result(cached, cache.path_for(cache_key))
+        if not dry_run and (pilot_rows or pilot_only or time_budget_seconds is not None):
+            return self._execute_with_pilot(
+                plan,
+                runtime_dir,
+                rows=int(pilot_rows or DEFAULT_PILOT_ROWS),
+                pilot_only=pilot_only,
+                time_budget_seconds=time_budget_seconds,
+                use_cache=use_cache,
+                checkpoint=checkpoint,
+                resume=resume,
+                timeout_seconds=timeout_seconds,
+                command_override=command_override,
+                cancel_check=cancel_check,
+                progress_callback=progress_callback,
+                cancel_event=cancel_event,
+                executor=executor,
+            )
+        work_dir: Path | None = None
+        resumed_ops: List[str] | None = None
+        if should_checkpoint(recipe, requested=True if resume else checkpoint):
+            work_dir = checkpoint_work_dir(runtime_dir, str(plan.get("plan_id", "")).strip(), recipe)
+            if not dry_run:
+                if resume:
+                    resumed_ops = completed_ops(work_dir)
+                else:
+                    clear_checkpoint(work_dir)
+            plan = {**plan, "recipe": with_checkpoint(recipe, work_dir)}
         recipe_path = self._write_recipe(plan, runtime_dir)
         command_args, command_display = self._normalize_command(recipe_path, command_override)
+        execution_id = ApplyResult.new_id()
+        artifacts = {"export_path": str((plan.get("recipe") or {}).get("export_path", "")).strip()}
+        if work_dir is not None:
+            artifacts["work_dir"] = str(work_dir)
+            if resumed_ops:
+                artifacts["resumed_from"] = str(checkpoint_path(work_dir))
         start_dt = datetime.now(timezone.utc)
+        resources: Dict[str, Any] = {}
 
         if dry_run:
-            if callable(cancel_check) and bool(cancel_check()):
+            if (cancel_event is not None and cancel_event.is_set()) or (
+                callable(cancel_check) and bool(cancel_check())
+            ):
                 returncode = 130
                 stdout = ""
                 stderr = "Interrupted by user."
@@ -226,54 +413,102 @@ class ApplyUseCase:
                 stderr = ""
         else:
             returncode, stdout, stderr = 1, "", ""
-            stdout_f, stderr_f, proc = None, None, None
-            try:
-                stdout_f = tempfile.TemporaryFile(mode="w+")
-                stderr_f = tempfile.TemporaryFile(mode="w+")
-                proc = subprocess.Popen(
-                    command_args,
-                    shell=False,
-                    stdout=stdout_f,
-                    stderr=stderr_f,
-                    text=True,
-                    start_new_session=True,
+            proc = None
+            sampler = None
+            readers: List[Any] = []
+            captures: List[StreamCapture] = []
+            log_paths: Dict[str, Path] = {}
+            log_files: Dict[str, Any] = {}
+            on_line = None
+            if callable(progress_callback):
+                on_line = ApplyProgressTracker(progress_callback).feed
+
+            def start_captures(stdout_stream: Any, stderr_stream: Any) -> None:
+                readers.extend([stdout_stream, stderr_stream])
+                captures.extend(
+                    StreamCapture(
+                        stream,
+                        name=name,
+                        on_line=on_line,
+                        max_chars=_LOG_TAIL_CHARS,
+                        spill=log_files[name],
+                    ).start()
+                    for name, stream in (("stdout", stdout_stream), ("stderr", stderr_stream))
                 )
-                deadline = time.monotonic() + float(timeout_seconds)
-                interrupted = False
-                timed_out = False
-                while True:
-                    if callable(cancel_check) and bool(cancel_check()):
-                        interrupted = True
-                        break
-                    if time.monotonic() >= deadline:
-                        timed_out = True
-                        break
-                    rc = proc.poll()
-                    if rc is not None:
-                        break
-                    time.sleep(0.1)
-
-                if interrupted:
-                    _terminate_process_gracefully(proc)
-                    returncode = 130
-                    stdout_f.seek(0)
-                    stderr_f.seek(0)
-                    stdout = stdout_f.read()
-                    stderr = (stderr_f.read().rstrip("\n") + "\nInterrupted by user.").strip()
-                elif timed_out:
-                    _terminate_process_gracefully(proc)
-                    returncode = 124
-                    stdout_f.seek(0)
-                    stderr_f.seek(0)
-                    stdout = stdout_f.read()
-                    stderr = (stderr_f.read().rstrip("\n") + f"\nTimeout after {timeout_seconds}s").strip()
+
+            try:
+                log_dir = runtime_dir / "logs"
+                log_dir.mkdir(parents=True, exist_ok=True)
+                for name in ("stdout", "stderr"):
+                    log_paths[name] = log_dir / f"{execution_id}.{name}.log"
+                    log_files[name] = open(log_paths[name], "wb")
+                    artifacts[f"{name}_log"] = str(log_paths[name])
+                detail = ""
+                # Checkpointed runs save on SIGINT, then get time to finish writing.
+                stop_kwargs: Dict[str, Any] = {}
+                if work_dir is not None:
+                    stop_kwargs = {"stop_signal": signal.SIGINT, "stop_grace": CHECKPOINT_STOP_GRACE}
+                if executor == "inprocess":
+                    stdout_read, stdout_write = os.pipe()
+                    stderr_read, stderr_write = os.pipe()
+                    try:
+                        start_captures(
+                            open(stdout_read, "rb", buffering=0),
+                            open(stderr_read, "rb", buffering=0),
+                        )
+                        outcome, returncode, detail = run_recipe_forked(
+                            str(recipe_path.resolve()),
+                            stdout_write,
+                            stderr_write,
+                            timeout=float(timeout_seconds),
+                            custom_operator_paths=self._string_list(
+                                (plan.get("recipe") or {}).get("custom_operator_paths")
+                            ),
+                            cancel_event=cancel_event,
+                            cancel_check=cancel_check,
+                            resources=resources,
+                            **stop_kwargs,
+                        )
+                    finally:
+                        # The forked child holds its own copies; closing ours
+                        # lets the readers see EOF once the run has finished.
+                        os.close(stdout_write)
+                        os.close(stderr_write)
                 else:
-                    proc.wait()
+                    proc = subprocess.Popen(
+                        command_args,
+                        shell=False,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        start_new_session=True,
+                    )
+                    start_captures(proc.stdout, proc.stderr)
+                    # start_new_session: the group id is the child's pid.
+                    sampler = ProcessGroupSampler(proc.pid).start()
+                    outcome = wait_for_process(
+                        proc,
+                        timeout=float(timeout_seconds),
+                        cancel_event=cancel_event,
+                        cancel_check=cancel_check,
+                        reap=False,
+                    )
+                    if outcome in {CANCELLED, TIMEOUT} and stop_kwargs:
+                        terminate_process_group(proc, stop_kwargs["stop_grace"], signum=stop_kwargs["stop_signal"])
+                    elif outcome in {CANCELLED, TIMEOUT}:
+                        _terminate_process_gracefully(proc)
+                    else:
+                        resources.update(rusage_to_dict(reap_process(proc)))
+                    resources.update(sampler.stop())
                     returncode = int(proc.returncode or 0)
-                    stdout_f.seek(0)
-                    stderr_f.seek(0)
-                    stdout = stdout_f.read()
-                    stderr = stderr_f.read()
+                stdout, stderr = _drain_captures(captures, log_paths)
+                if outcome == CANCELLED:
+                    returncode = 130
+                    stderr = (stderr.rstrip("\n") + "\nInterrupted by user.").strip()
+                elif outcome == TIMEOUT:
+                    returncode = 124
+                    stderr = (stderr.rstrip("\n") + f"\nTimeout after {timeout_seconds}s").strip()
+                elif detail:
+                    stderr = (stderr.rstrip("\n") + f"\n{detail}").strip()
             except Exception as exc:
                 _logger.debug("Subprocess execution failed: %s", exc)
                 if proc is not None:
@@ -282,41 +517,175 @@ class ApplyUseCase:
                 stdout = ""
                 stderr = f"Execution failed: {exc}"
             finally:
-                try:
-                    if stdout_f is not None:
-                        stdout_f.close()
-                except Exception:
-                    pass
-                try:
-                    if stderr_f is not None:
-                        stderr_f.close()
-                except Exception:
-                    pass
+                if sampler is not None:
+                    sampler.stop()
+                for pipe in readers:
+                    with contextlib.suppress(Exception):
+                        pipe.close()
+                for handle in log_files.values():
+                    with contextlib.suppress(Exception):
+                        handle.close()
 
         end_dt = datetime.now(timezone.utc)
         duration = (end_dt - start_dt).total_seconds()
         status = "success" if returncode == 0 else ("interrupted" if returncode == 130 else "failed")
         error_type, retry_level, next_actions = _classify_error(returncode, stderr)
         result = ApplyResult(
-            execution_id=ApplyResult.new_id(),
+            execution_id=execution_id,
             plan_id=str(plan.get("plan_id", "")).strip(),
             start_time=start_dt.isoformat(),
             end_time=end_dt.isoformat(),
             duration_seconds=duration,
             model_info={
                 "planner": _DEFAULT_PLANNER_MODEL,
-                "executor": "deterministic-cli",
+                "executor": "deterministic-inprocess" if executor == "inprocess" else "deterministic-cli",
             },
             generated_recipe_path=str(recipe_path),
             command=command_display,
             status=status,
-            artifacts={"export_path": str((plan.get("recipe") or {}).get("export_path", "")).strip()},
+            artifacts=artifacts,
             error_type=error_type,
             error_message="" if returncode == 0 else stderr.strip(),
             retry_level=retry_level,
             next_actions=next_actions,
+            resources=resources,
+        )
+        if work_dir is not None and not dry_run:
+            left = completed_ops(work_dir)
+            if returncode == 0:
+                # Keep a checkpoint the recipe asked for; ours has served its purpose.
+                if recipe.get("use_checkpoint") is not True:
+                    clear_checkpoint(work_dir)
+            elif left:
+                result.artifacts["checkpoint_dir"] = str(checkpoint_path(work_dir))
+                result.next_actions = [
+                    f"Resume after the {len(left)} completed operator(s) with resume (djx apply --resume)",
+                    *result.next_actions,
+                ]
+        if cache is not None and cache_key is not None and returncode == 0:
+            cache.put(cache_key, result.to_dict())
+        return result, returncode, stdout, stderr
+
+    @staticmethod
+    def _cached_result(payload: Dict[str, Any], entry_path: Path) -> Tuple[ApplyResult, int, str, str]:
+        result = ApplyResult.from_dict(payload)
+        result.status = "cached"
+        result.artifacts = {**result.artifacts, "cache_entry": str(entry_path)}
+        stdout = (
+            f"cached: recipe and dataset unchanged since {result.execution_id} "
+            f"({result.end_time}); export {result.artifacts.get('export_path', '')} is intact"
+        )
+        return result, 0, stdout, ""
+
+    def _execute_with_pilot(
+        self,
+        plan: Dict[str, Any],
+        runtime_dir: Path,
+        *,
+        rows: int,
+        pilot_only: bool,
+        time_budget_seconds: float | None,
+        use_cache: bool,
+        checkpoint: bool | None,
+        resume: bool,
+        progress_callback: Callable[[Dict[str, Any]], None] | None,
+        **run_kwargs: Any,
+    ) -> Tuple[ApplyResult, int, str, str]:
+        recipe = plan.get("recipe")
+        if not isinstance(recipe, dict):
+            raise ValueError("plan must contain a 'recipe' dict")
+        dataset_path = pilot_dataset_path(recipe)
+        sampled, sampling_info = sample_rows(dataset_path, rows)
+        if not sampled:
+            raise PilotError(f"pilot sampling found no rows in {dataset_path}")
+
+        plan_id = str(plan.get("plan_id", "")).strip()
+        pilot_dir = runtime_dir / "pilot" / (plan_id or "plan_apply")
+        export_suffix = "".join(Path(str(recipe.get("export_path", ""))).suffixes) or ".jsonl"
+        calibration_rows = max(int(len(sampled) * CALIBRATION_FRACTION), 1)
+        stages = [("pilot", sampled)]
+        if calibration_rows < len(sampled):
+            stages.insert(0, ("calibration", sampled[:calibration_rows]))
+
+        measurements: List[Dict[str, Any]] = []
+        for stage, stage_rows in stages:
+            stage_dir = pilot_dir / stage
+            sample_path = write_sample(stage_rows, stage_dir / "sample.jsonl")
+            stage_export = stage_dir / f"export{export_suffix}"
+            if stage_export.is_file():
+                stage_export.unlink()
+            events: List[Dict[str, Any]] = []
+
+            def collect(event: Dict[str, Any], stage: str = stage, events: List[Dict[str, Any]] = events) -> None:
+                events.append(event)
+                if callable(progress_callback):
+                    progress_callback({**event, "phase": stage})
+
+            result, returncode, stdout, stderr = self.execute(
+                build_pilot_plan(plan, sample_path, stage_export),
+                stage_dir,
+                progress_callback=collect,
+                use_cache=False,
+                record_cache=False,
+                checkpoint=False,
+                **run_kwargs,
+            )
+            result.plan_id = plan_id
+            if returncode != 0:
+                result.pilot = {"stage": stage, "sample_path": str(sample_path), "sample_rows": len(stage_rows)}
+                result.error_message = f"pilot run failed: {result.error_message}".strip()
+                return result, returncode, stdout, stderr
+            measurements.append(
+                {
+                    "sample_rows": len(stage_rows),
+                    "pilot_seconds": result.duration_seconds,
+                    "events": events,
+                    "export_bytes": export_size_bytes(stage_export),
+                    "export_rows": count_rows(stage_export) if stage_export.suffix == ".jsonl" and stage_export.is_file() else None,
+                }
+            )
+
+        pilot_info: Dict[str, Any] = {"sample_path": str(sample_path), "sampling": sampling_info}
+        pilot_info.update(
+            estimate_full_run(
+                dataset_rows=count_rows(dataset_path),
+                measurements=measurements,
+                time_budget_seconds=time_budget_seconds,
+            )
+        )
+        if pilot_only:
+            return replace(result, status="pilot", pilot=pilot_info), 0, stdout, stderr
+        if pilot_info["within_budget"] is False:
+            message = f"pilot estimate exceeds the time budget: {format_pilot_estimate(pilot_info)}"
+            blocked = replace(
+                result,
+                status="blocked",
+                pilot=pilot_info,
+                error_type="time_budget_exceeded",
+                error_message=message,
+                retry_level="none",
+                next_actions=[
+                    "Raise the time budget or run with more workers (np)",
+                    "Reduce the dataset or drop expensive operators and retry",
+                ],
+            )
+            return blocked, BUDGET_EXCEEDED_RETURNCODE, stdout, message
+
+        result, returncode, stdout, stderr = self.execute(
+            plan,
+            runtime_dir,
+            progress_callback=progress_callback,
+            use_cache=use_cache,
+            checkpoint=should_checkpoint(
+                recipe,
+                estimated_seconds=pilot_info.get("est_seconds"),
+                requested=True if resume else checkpoint,
+            ),
+            resume=resume,
+            **run_kwargs,
         )
+        result.pilot = pilot_info
         return result, returncode, stdout, stderr
 
 
-__all__ = ["ApplyResult", "ApplyUseCase"]
+__all__ = ["ApplyResult", "ApplyUseCase", "EXECUTORS"]
@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+"""Sample-first pilot runs for ``apply``.
+
+A full apply over a large dataset can take hours, and neither runtime nor
+output size is known until it finishes.  A pilot runs the same recipe on
+a random sample of the dataset first and extrapolates what it measured:
+
+* per-op wall time and surviving rows come from the ``op_done`` progress
+  events (see :mod:`.progress`);
+* on pilot-sized inputs an op's wall time is dominated by fixed set-up
+  cost (worker start, ``datasets.map`` fingerprinting), so scaling it
+  linearly overestimates by orders of magnitude.  The pilot therefore
+  also runs a calibration sample of a quarter of the rows; two points fit
+  ``seconds = fixed + per_row * rows`` for every op, and for the time
+  outside the ops (start-up, loading, export);
+* output rows follow the pilot's retained-row ratio, output bytes the
+  pilot export's bytes per row.
+
+With a single measurement (or mismatched op lists) times are scaled
+linearly.  Ops whose cost grows faster than the row count (e.g. global
+deduplication) are underestimated.
+
+Only a single local ``dataset_path`` in JSONL or CSV/TSV form (optionally
+compressed) can be piloted; other sources raise :class:`PilotError`.
+"""
+
+from __future__ import annotations
+
+import copy
+import csv
+import os
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from data_juicer_agents.tools.context.inspect_dataset.compression import (
+    data_suffix,
+    detect_compression,
+    open_binary,
+    open_text,
+)
+from data_juicer_agents.tools.context.inspect_dataset.sampling import (
+    sample_csv_random,
+    sample_jsonl_random,
+)
+from data_juicer_agents.utils import json_codec
+
+DEFAULT_PILOT_ROWS = 1000
+# The calibration run uses this fraction of the pilot sample.
+CALIBRATION_FRACTION = 0.25
+# Returned by ``ApplyUseCase.execute`` when the pilot estimate exceeds the
+# time budget and the full run is not started.
+BUDGET_EXCEEDED_RETURNCODE = 3
+
+_PILOT_SEED = 0
+_ROW_SUFFIXES = (".jsonl", ".csv", ".tsv")
+_COUNT_CHUNK = 1024 * 1024
+
+
+class PilotError(ValueError):
+    """The plan cannot be piloted (unsupported or unreadable dataset source)."""
+
+
+def pilot_dataset_path(recipe: Dict[str, Any]) -> Path:
+    """Return the local dataset file a pilot can sample, or raise :class:`PilotError`."""
+    if recipe.get("generated_dataset_config") or recipe.get("dataset"):
+        raise PilotError("pilot runs support a single local dataset_path only")
+    raw = str(recipe.get("dataset_path", "")).strip()
+    if not raw:
+        raise PilotError("pilot runs require recipe.dataset_path")
+    path = Path(raw).expanduser()
+    if not path.is_file():
+        raise PilotError(f"pilot dataset_path is not a local file: {raw}")
+    if data_suffix(path) not in _ROW_SUFFIXES:
+        raise PilotError(
+            f"pilot runs support {', '.join(_ROW_SUFFIXES)} datasets; got {path.name}"
+        )
+    return path
+
+
+def _head_rows(path: Path, rows: int) -> List[Dict[str, Any]]:
+    suffix = data_suffix(path)
+    picked: List[Dict[str, Any]] = []
+    with open_text(path, newline="" if suffix != ".jsonl" else None) as handle:
+        if suffix == ".jsonl":
+            for line in handle:
+                if len(picked) >= rows:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    obj = json_codec.loads(line)
+                except Exception:
+                    continue
+                if isinstance(obj, dict):
+                    picked.append(obj)
+        else:
+            reader = csv.DictReader(handle, delimiter="\t" if suffix == ".tsv" else ",")
+            for row in reader:
+                if len(picked) >= rows:
+                    break
+                picked.append(dict(row))
+    return picked
+
+
+def sample_rows(path: Path, rows: int, seed: int = _PILOT_SEED) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Draw up to *rows* records from *path*.
+
+    Plain files are sampled at random offsets so the pilot sees the whole
+    file, not just its head; compressed files fall back to head sampling.
+    """
+    suffix = data_suffix(path)
+    if detect_compression(path) is None:
+        rng = random.Random(seed)
+        if suffix == ".jsonl":
+            picked, _scanned, info = sample_jsonl_random(path, rows, rng, seed=seed)
+        else:
+            delimiter = "\t" if suffix == ".tsv" else ","
+            picked, _scanned, info = sample_csv_random(path, rows, rng, delimiter=delimiter, seed=seed)
+        return picked, info
+    return _head_rows(path, rows), {"method": "head", "compression": detect_compression(path)}
+
+
+def count_rows(path: Path) -> int:
+    """Count data rows in a JSONL/CSV/TSV file.
+
+    JSONL is counted by streaming its newlines.  CSV/TSV go through
+    :mod:`csv` so quoted fields spanning several lines count once; blank
+    lines and the header row are not counted, as in :func:`csv.DictReader`.
+    """
+    suffix = data_suffix(path)
+    if suffix in {".csv", ".tsv"}:
+        with open_text(path, newline="") as handle:
+            reader = csv.reader(handle, delimiter="\t" if suffix == ".tsv" else ",")
+            rows = sum(1 for row in reader if row)
+        return max(rows - 1, 0)
+    lines = 0
+    last = b"\n"
+    with open_binary(path) as handle:
+        while True:
+            chunk = handle.read(_COUNT_CHUNK)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1
+    return lines
+
+
+def write_sample(rows: Sequence[Dict[str, Any]], out_path: Path) -> Path:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json_codec.dumps(row) + "\n")
+    return out_path
+
+
+def build_pilot_plan(plan: Dict[str, Any], sample_path: Path, export_path: Path) -> Dict[str, Any]:
+    """Copy *plan* so that it reads *sample_path* and exports to *export_path*."""
+    pilot = copy.deepcopy(plan)
+    plan_id = str(plan.get("plan_id", "")).strip() or "plan_apply"
+    pilot["plan_id"] = f"{plan_id}_pilot"
+    recipe = dict(pilot.get("recipe") or {})
+    recipe["dataset_path"] = str(sample_path)
+    recipe["export_path"] = str(export_path)
+    recipe["project_name"] = f"{plan_id}_pilot"
+    recipe.pop("use_checkpoint", None)
+    recipe.pop("checkpoint_dir", None)
+    pilot["recipe"] = recipe
+    return pilot
+
+
+def export_size_bytes(export_path: Path) -> Optional[int]:
+    """Bytes written to *export_path* (a file or a directory of shards)."""
+    if export_path.is_file():
+        return export_path.stat().st_size
+    if export_path.is_dir():
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _dirs, files in os.walk(export_path)
+            for name in files
+        )
+    return None
+
+
+def _fit(points: Sequence[Tuple[float, float]]) -> Tuple[float, float]:
+    """Return ``(fixed, per_row)`` through the smallest and largest point."""
+    small_rows, small_seconds = points[0]
+    rows, seconds = points[-1]
+    if len(points) < 2 or rows <= small_rows:
+        return 0.0, seconds / rows if rows > 0 else 0.0
+    per_row = max((seconds - small_seconds) / (rows - small_rows), 0.0)
+    return max(seconds - per_row * rows, 0.0), per_row
+
+
+def _op_rows(measurement: Dict[str, Any]) -> List[Dict[str, Any]]:
+    rows_in = int(measurement["sample_rows"])
+    ops: List[Dict[str, Any]] = []
+    for event in measurement.get("events", []):
+        if event.get("kind") != "op_done":
+            continue
+        rows_out = int(event.get("samples_left", rows_in))
+        ops.append(
+            {
+                "op": str(event.get("op", "")),
+                "seconds": float(event.get("seconds", 0.0)),
+                "rows_in": rows_in,
+                "rows_out": rows_out,
+            }
+        )
+        rows_in = rows_out
+    return ops
+
+
+def estimate_full_run(
+    *,
+    dataset_rows: int,
+    measurements: Sequence[Dict[str, Any]],
+    time_budget_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Extrapolate pilot measurements to *dataset_rows* rows.
+
+    *measurements* are ordered by sample size; each holds ``sample_rows``,
+    ``pilot_seconds`` and the run's progress ``events``, and the last one
+    may carry ``export_bytes`` / ``export_rows``.
+    """
+    pilot = measurements[-1]
+    sample_rows = int(pilot["sample_rows"])
+    scale = float(dataset_rows) / float(sample_rows) if sample_rows > 0 else 0.0
+    op_runs = [_op_rows(measurement) for measurement in measurements]
+    ops = op_runs[-1]
+    fitted_runs = [
+        run
+        for run in op_runs
+        if [op["op"] for op in run] == [op["op"] for op in ops]
+    ]
+
+    est_seconds = 0.0
+    for idx, op in enumerate(ops):
+        fixed, per_row = _fit([(run[idx]["rows_in"], run[idx]["seconds"]) for run in fitted_runs])
+        est = fixed + per_row * op["rows_in"] * scale
+        op.update(
+            {
+                "seconds": round(op["seconds"], 4),
+                "retained_ratio": round(op["rows_out"] / op["rows_in"], 4) if op["rows_in"] else 0.0,
+                "fixed_seconds": round(fixed, 4),
+                "seconds_per_row": round(per_row, 8),
+                "est_seconds": round(est, 2),
+            }
+        )
+        est_seconds += est
+
+    # Whole-run time minus op time: start-up, loading and export.
+    overhead_points = [
+        (
+            float(measurement["sample_rows"]),
+            max(float(measurement["pilot_seconds"]) - sum(op["seconds"] for op in run), 0.0),
+        )
+        for measurement, run in zip(measurements, op_runs)
+    ]
+    overhead_fixed, overhead_per_row = _fit(overhead_points)
+    est_overhead = overhead_fixed + overhead_per_row * dataset_rows
+    est_seconds += est_overhead
+
+    retained_rows = ops[-1]["rows_out"] if ops else pilot.get("export_rows")
+    estimate: Dict[str, Any] = {
+        "sample_rows": sample_rows,
+        "dataset_rows": dataset_rows,
+        "scale": round(scale, 4),
+        "pilot_seconds": round(float(pilot["pilot_seconds"]), 3),
+        "calibration_rows": int(measurements[0]["sample_rows"]) if len(measurements) > 1 else None,
+        "est_overhead_seconds": round(est_overhead, 2),
+        "ops": ops,
+        "est_seconds": round(est_seconds, 2),
+        "retained_ratio": None,
+        "est_output_rows": None,
+        "est_output_bytes": None,
+        "time_budget_seconds": time_budget_seconds,
+        "within_budget": None if time_budget_seconds is None else est_seconds <= float(time_budget_seconds),
+    }
+    if retained_rows is not None and sample_rows > 0:
+        ratio = retained_rows / sample_rows
+        estimate["retained_ratio"] = round(ratio, 4)
+        estimate["est_output_rows"] = int(round(dataset_rows * ratio))
+        export_bytes = pilot.get("export_bytes")
+        if export_bytes is not None and retained_rows > 0:
+            estimate["est_output_bytes"] = int(round(export_bytes / retained_rows * estimate["est_output_rows"]))
+    return estimate
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+def _format_bytes(size: float) -> str:
+    if size < 1024:
+        return f"{size:.0f} B"
+    for unit in ("KiB", "MiB", "GiB"):
+        size /= 1024.0
+        if size < 1024 or unit == "GiB":
+            break
+    return f"{size:.1f} {unit}"
+
+
+def format_pilot_estimate(estimate: Dict[str, Any]) -> str:
+    """One-line human-readable summary of a pilot estimate."""
+    text = (
+        f"{estimate.get('sample_rows')}/{estimate.get('dataset_rows')} rows in "
+        f"{float(estimate.get('pilot_seconds', 0.0)):.1f}s, "
+        f"est. runtime {_format_seconds(float(estimate.get('est_seconds', 0.0)))}"
+    )
+    if estimate.get("est_output_rows") is not None:
+        text += f", est. output {estimate['est_output_rows']} rows"
+        if estimate.get("est_output_bytes") is not None:
+            text += f" ({_format_bytes(float(estimate['est_output_bytes']))})"
+    if estimate.get("time_budget_seconds") is not None:
+        verdict = "within" if estimate.get("within_budget") else "exceeds"
+        text += f", {verdict} budget {_format_seconds(float(estimate['time_budget_seconds']))}"
+    return text
+
+
+__all__ = [
+    "BUDGET_EXCEEDED_RETURNCODE",
+    "CALIBRATION_FRACTION",
+    "DEFAULT_PILOT_ROWS",
+    "PilotError",
+    "build_pilot_plan",
+    "count_rows",
+    "estimate_full_run",
+    "export_size_bytes",
+    "format_pilot_estimate",
+    "pilot_dataset_path",
+    "sample_rows",
+    "write_sample",
+]
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Parse Data-Juicer progress output into structured apply events.
+
+``dj-process`` reports progress in two forms:
+
+* tqdm bars from ``datasets.map``/``filter`` such as
+  ``text_length_filter_compute_stats (num_proc=4):  45%|####  | 450/1000
+  [00:01<00:02, 300.00 examples/s]``;
+* executor log lines such as
+  ``[2/3] OP [text_length_filter] Done in 1.234s. Left 950 samples.``
+
+:func:`parse_progress_line` turns either into an ``op_progress`` or
+``op_done`` event dict; :class:`ApplyProgressTracker` throttles bar updates
+before forwarding events to a callback.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+_BAR_RE = re.compile(
+    r"(?P<desc>[^|:\r\n]*?):?\s*(?P<percent>\d{1,3})%\|[^|]*\|\s*"
+    r"(?P<done>\d+)/(?P<total>\d+)\s*\[(?P<timing>[^\]]*)\]"
+)
+_RATE_RE = re.compile(r"(?P<rate>\d+(?:\.\d+)?)\s*(?P<unit>[A-Za-z_]+)/s")
+_OP_DONE_RE = re.compile(
+    r"(?:\[(?P<index>\d+)/(?P<count>\d+)\]\s*)?OP \[(?P<op>[^\]]+)\] Done in "
+    r"(?P<seconds>\d+(?:\.\d+)?)s\. Left (?P<left>\d+) samples"
+)
+_NUM_PROC_RE = re.compile(r"\s*\(num_proc=\d+\)\s*$")
+_STAGE_SUFFIXES = ("_compute_stats", "_compute_hash", "_process")
+
+DEFAULT_PROGRESS_INTERVAL = 0.5
+
+
+def _split_stage(desc: str) -> tuple[str, str]:
+    name = _NUM_PROC_RE.sub("", desc).strip()
+    for suffix in _STAGE_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[: -len(suffix)], suffix[1:]
+    return name, ""
+
+
+def parse_progress_line(line: str) -> Optional[Dict[str, Any]]:
+    """Return a progress event for one output line, or ``None``."""
+    done = _OP_DONE_RE.search(line)
+    if done is not None:
+        event: Dict[str, Any] = {
+            "kind": "op_done",
+            "op": done.group("op"),
+            "seconds": float(done.group("seconds")),
+            "samples_left": int(done.group("left")),
+        }
+        if done.group("index"):
+            event["index"] = int(done.group("index"))
+            event["count"] = int(done.group("count"))
+        return event
+
+    bar = _BAR_RE.search(line)
+    if bar is None:
+        return None
+    op, stage = _split_stage(bar.group("desc"))
+    event = {
+        "kind": "op_progress",
+        "op": op,
+        "stage": stage,
+        "percent": min(int(bar.group("percent")), 100),
+        "processed": int(bar.group("done")),
+        "total": int(bar.group("total")),
+    }
+    rate = _RATE_RE.search(bar.group("timing"))
+    if rate is not None:
+        event["rate"] = float(rate.group("rate"))
+        event["rate_unit"] = f"{rate.group('unit')}/s"
+    return event
+
+
+def format_progress_event(event: Dict[str, Any]) -> str:
+    """One-line human-readable rendering of a progress event."""
+    op = str(event.get("op", "")).strip() or "dj-process"
+    if event.get("kind") == "op_done":
+        position = ""
+        if event.get("index") and event.get("count"):
+            position = f"[{event['index']}/{event['count']}] "
+        return (
+            f"{position}{op} done in {float(event.get('seconds', 0.0)):.2f}s, "
+            f"{event.get('samples_left')} samples left"
+        )
+    stage = f" {event['stage']}" if event.get("stage") else ""
+    text = (
+        f"{op}{stage} {event.get('percent', 0)}% "
+        f"({event.get('processed', 0)}/{event.get('total', 0)})"
+    )
+    if "rate" in event:
+        text += f" {event['rate']:g} {event.get('rate_unit', '')}".rstrip()
+    return text
+
+
+class ApplyProgressTracker:
+    """Feed output lines, forward parsed events at a bounded rate.
+
+    ``op_done`` events and bars reaching 100% are always forwarded; other
+    bar updates at most once per *min_interval* seconds for each op stage.
+    Safe to call from several reader threads.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[Dict[str, Any]], None],
+        *,
+        min_interval: float = DEFAULT_PROGRESS_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._callback = callback
+        self._min_interval = float(min_interval)
+        self._clock = clock
+        self._last_emit: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def feed(self, stream: str, line: str) -> None:
+        event = parse_progress_line(line)
+        if event is None:
+            return
+        if event["kind"] == "op_progress" and event["percent"] < 100:
+            key = (event["op"], event["stage"])
+            now = self._clock()
+            with self._lock:
+                last = self._last_emit.get(key)
+                if last is not None and now - last < self._min_interval:
+                    return
+                self._last_emit[key] = now
+        event["stream"] = stream
+        self._callback(event)
+
+
+__all__ = [
+    "ApplyProgressTracker",
+    "DEFAULT_PROGRESS_INTERVAL",
+    "format_progress_event",
+    "parse_progress_line",
+]
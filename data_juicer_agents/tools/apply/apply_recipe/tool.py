@@ -10,8 +10,10 @@ from data_juicer_agents.core.tool import ToolContext, ToolResult, ToolSpec
 from data_juicer_agents.utils.runtime_helpers import short_log, to_bool, to_int
 import yaml
 
+from .checkpoint import checkpoint_unsupported_reason
 from .input import ApplyRecipeInput, GenericOutput
 from .logic import ApplyUseCase
+from .pilot import BUDGET_EXCEEDED_RETURNCODE, PilotError
 
 
 def _compose_failure_preview(
@@ -98,13 +100,56 @@ def _apply_recipe(ctx: ToolContext, args: ApplyRecipeInput) -> ToolResult:
             },
         )
 
+    progress_callback = None
+    emit_event = ctx.runtime_values.get("emit_event")
+    if callable(emit_event):
+        plan_id = str(plan_payload.get("plan_id", "")).strip()
+
+        def progress_callback(event: dict) -> None:
+            emit_event("apply_progress", plan_id=plan_id, plan_path=resolved_plan, **event)
+
+    resume = to_bool(args.resume, False)
+    recipe = plan_payload.get("recipe") if isinstance(plan_payload.get("recipe"), dict) else {}
+    if resume and checkpoint_unsupported_reason(recipe):
+        reason = checkpoint_unsupported_reason(recipe)
+        return ToolResult.failure(
+            summary=f"cannot resume: {reason}",
+            error_type="resume_unsupported",
+            data={
+                "ok": False,
+                "error_type": "resume_unsupported",
+                "message": reason,
+                "failure_preview": f"cannot resume: {reason}",
+            },
+        )
+
     executor = ApplyUseCase()
-    result, code, stdout, stderr = executor.execute(
-        plan_payload=plan_payload,
-        runtime_dir=ctx.resolve_artifacts_dir() / "recipes",
-        dry_run=to_bool(args.dry_run, False),
-        timeout_seconds=max(to_int(args.timeout, 300), 1),
-    )
+    try:
+        result, code, stdout, stderr = executor.execute(
+            plan_payload=plan_payload,
+            runtime_dir=ctx.resolve_artifacts_dir() / "recipes",
+            dry_run=to_bool(args.dry_run, False),
+            timeout_seconds=max(to_int(args.timeout, 300), 1),
+            progress_callback=progress_callback,
+            cancel_event=ctx.runtime_values.get("cancel_event"),
+            executor=args.executor,
+            pilot_rows=args.pilot_rows,
+            pilot_only=to_bool(args.pilot_only, False),
+            time_budget_seconds=args.time_budget,
+            use_cache=to_bool(args.use_cache, True),
+            resume=resume,
+        )
+    except PilotError as exc:
+        return ToolResult.failure(
+            summary=f"pilot run not possible: {exc}",
+            error_type="pilot_unsupported",
+            data={
+                "ok": False,
+                "error_type": "pilot_unsupported",
+                "message": str(exc),
+                "failure_preview": f"pilot run not possible: {exc}",
+            },
+        )
 
     payload = {
         "ok": code == 0,
@@ -116,21 +161,39 @@ def _apply_recipe(ctx: ToolContext, args: ApplyRecipeInput) -> ToolResult:
         "execution": result.to_dict(),
     }
     if code != 0:
+        resume_hint = ""
+        if result.artifacts.get("checkpoint_dir"):
+            resume_hint = "; completed operators were checkpointed, rerun with resume=true to continue"
         if code == 130:
             payload["error_type"] = "interrupted"
-            payload["message"] = "apply interrupted by user"
-            payload["failure_preview"] = "apply interrupted by user"
+            payload["message"] = f"apply interrupted by user{resume_hint}"
+            payload["failure_preview"] = payload["message"]
             return ToolResult.failure(summary="apply interrupted by user", error_type="interrupted", data=payload)
+        if code == BUDGET_EXCEEDED_RETURNCODE and result.status == "blocked":
+            payload["error_type"] = "time_budget_exceeded"
+            payload["message"] = result.error_message
+            payload["failure_preview"] = result.error_message
+            return ToolResult.failure(
+                summary="apply blocked by pilot time budget",
+                error_type="time_budget_exceeded",
+                data=payload,
+            )
         payload["error_type"] = "apply_failed"
-        payload["message"] = "apply failed"
+        payload["message"] = f"apply failed{resume_hint}"
         payload["failure_preview"] = _compose_failure_preview(
-            message="apply failed",
+            message=payload["message"],
             stderr=payload.get("stderr", ""),
             stdout=payload.get("stdout", ""),
             execution_error_message=str(result.error_message or "").strip(),
         )
         return ToolResult.failure(summary="apply failed", error_type="apply_failed", data=payload)
 
+    if result.status == "cached":
+        payload["message"] = "apply skipped: recipe and dataset unchanged, reused cached result"
+        return ToolResult.success(summary="apply reused cached result", data=payload)
+    if result.status == "pilot":
+        payload["message"] = "pilot run succeeded; full run not started"
+        return ToolResult.success(summary="pilot run succeeded", data=payload)
     payload["message"] = "apply succeeded"
     return ToolResult.success(summary="apply succeeded", data=payload)
 
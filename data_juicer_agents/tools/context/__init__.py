@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 """Context-oriented tools."""
 
-from .inspect_dataset import InspectDatasetInput, inspect_dataset_schema
+from .inspect_dataset import InspectDatasetInput, default_profile_cache_dir, inspect_dataset_schema
 from .list_dataset_fields import ListDatasetFieldsInput, list_dataset_fields
 from .list_dataset_formatters import ListDatasetFormattersInput, list_dataset_formatters
 from .list_dataset_load_strategies import ListDatasetLoadStrategiesInput, list_dataset_load_strategies
@@ -20,6 +20,7 @@ __all__ = [
     "ListDatasetLoadStrategiesInput",
     "ListSystemConfigInput",
     "TOOL_SPECS",
+    "default_profile_cache_dir",
     "inspect_dataset_schema",
     "list_dataset_fields",
     "list_dataset_formatters",
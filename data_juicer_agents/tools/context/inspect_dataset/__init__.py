@@ -2,7 +2,16 @@
 """inspect_dataset tool package."""
 
 from .input import GenericOutput, InspectDatasetInput
+from .full_profile import summarize_full_profile
 from .logic import inspect_dataset_schema
+from .profile_cache import default_profile_cache_dir
 from .tool import INSPECT_DATASET
 
-__all__ = ["GenericOutput", "INSPECT_DATASET", "InspectDatasetInput", "inspect_dataset_schema"]
+__all__ = [
+    "GenericOutput",
+    "INSPECT_DATASET",
+    "InspectDatasetInput",
+    "default_profile_cache_dir",
+    "inspect_dataset_schema",
+    "summarize_full_profile",
+]
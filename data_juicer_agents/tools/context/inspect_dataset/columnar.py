@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""Arrow-based field-kind statistics for inspection samples.
+
+Computes the same ``key_stats`` entries as the per-row ``_value_kind`` loop
+in :mod:`.logic` (``count``, ``kinds``, ``avg_text_len``) directly on Arrow
+columns: kinds follow from the column type, null counts from the validity
+bitmap, and image-reference detection and text lengths use Arrow string
+kernels, so no value is converted to a Python object.
+
+:func:`python_key_stats` applies the same kernels to samples that are
+already Python rows (JSONL/CSV): values are gathered per key, kinds are
+counted per Python type, and only the string values are handed to Arrow.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple
+
+
+@lru_cache(maxsize=1)
+def _image_patterns() -> Tuple[str, str]:
+    """Return ``(url_pattern, plain_pattern)`` mirroring ``_looks_like_image_value``.
+
+    URLs are matched before their query string, everything else on the full
+    (stripped, lower-cased) value.
+    """
+    from .logic import _IMAGE_SUFFIXES
+
+    group = "(?:" + "|".join(re.escape(suffix) for suffix in _IMAGE_SUFFIXES) + ")"
+    return r"^https?://[^?]*" + group + r"(?:\?|$)", group + r"$"
+
+
+def arrow_type_kind(data_type: Any) -> str:
+    """Map an Arrow type to the ``_value_kind`` of its non-null values.
+
+    String columns map to ``"text"``; telling text from image references
+    needs the values (see :func:`arrow_column_stats`).
+    """
+    import pyarrow as pa
+
+    types = pa.types
+    if types.is_dictionary(data_type):
+        return arrow_type_kind(data_type.value_type)
+    if types.is_null(data_type):
+        return "null"
+    if types.is_boolean(data_type):
+        return "bool"
+    if types.is_integer(data_type) or types.is_floating(data_type):
+        return "number"
+    if types.is_string(data_type) or types.is_large_string(data_type):
+        return "text"
+    if (
+        types.is_list(data_type)
+        or types.is_large_list(data_type)
+        or types.is_fixed_size_list(data_type)
+        or types.is_map(data_type)
+    ):
+        return "array"
+    if types.is_struct(data_type):
+        return "object"
+    return "other"
+
+
+def _image_ref_mask(values: Any) -> Any:
+    """Boolean mask of string *values* that ``_looks_like_image_value`` accepts."""
+    import pyarrow.compute as pc
+
+    url_pattern, plain_pattern = _image_patterns()
+    lowered = pc.utf8_lower(pc.utf8_trim_whitespace(values))
+    is_url = pc.or_(
+        pc.starts_with(lowered, "http://"),
+        pc.starts_with(lowered, "https://"),
+    )
+    return pc.if_else(
+        is_url,
+        pc.match_substring_regex(lowered, url_pattern),
+        pc.match_substring_regex(lowered, plain_pattern),
+    )
+
+
+def arrow_column_stats(column: Any) -> Dict[str, Any]:
+    """Return a ``key_stats`` entry for one Arrow array or chunked array."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+    if pa.types.is_dictionary(column.type):
+        column = column.dictionary_decode()
+
+    total = len(column)
+    nulls = int(column.null_count)
+    stat: Dict[str, Any] = {"count": total, "kinds": {}, "avg_text_len": 0.0}
+    if nulls:
+        stat["kinds"]["null"] = nulls
+    valid = total - nulls
+    if valid <= 0:
+        return stat
+
+    kind = arrow_type_kind(column.type)
+    if kind != "text":
+        stat["kinds"][kind] = valid
+        return stat
+
+    values = column.drop_null() if nulls else column
+    image_mask = _image_ref_mask(values)
+    image_count = int(pc.sum(image_mask).as_py() or 0)
+    text_count = valid - image_count
+    if image_count:
+        stat["kinds"]["image_ref"] = image_count
+    if text_count:
+        stat["kinds"]["text"] = text_count
+        texts = pc.filter(values, pc.invert(image_mask)) if image_count else values
+        total_len = pc.sum(pc.utf8_length(texts)).as_py() or 0
+        stat["avg_text_len"] = float(total_len) / float(text_count)
+    return stat
+
+
+def arrow_key_stats(table: Any) -> Dict[str, Dict[str, Any]]:
+    """Return ``key_stats`` for every column of an Arrow table or record batch."""
+    return {
+        name: arrow_column_stats(column)
+        for name, column in zip(table.column_names, table.columns)
+    }
+
+
+@lru_cache(maxsize=64)
+def _python_type_kind(value_type: type) -> str:
+    """``_value_kind`` for every value of *value_type* (``"str"`` needs the value)."""
+    if value_type is type(None):
+        return "null"
+    if issubclass(value_type, bool):
+        return "bool"
+    if issubclass(value_type, (int, float)):
+        return "number"
+    if issubclass(value_type, str):
+        return "str"
+    if issubclass(value_type, list):
+        return "array"
+    if issubclass(value_type, dict):
+        return "object"
+    return "other"
+
+
+def _python_column_stats(values: List[Any]) -> Dict[str, Any]:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    stat: Dict[str, Any] = {"count": len(values), "kinds": {}, "avg_text_len": 0.0}
+    kinds = stat["kinds"]
+    string_count = 0
+    for value_type, count in Counter(map(type, values)).items():
+        kind = _python_type_kind(value_type)
+        if kind == "str":
+            string_count += count
+            # Reserve the slot so kinds keep first-seen order.
+            kinds.setdefault("text", 0)
+            kinds.setdefault("image_ref", 0)
+        else:
+            kinds[kind] = kinds.get(kind, 0) + count
+    if not string_count:
+        return stat
+
+    strings = values if string_count == len(values) else [v for v in values if isinstance(v, str)]
+    array = pa.array(strings, type=pa.string())
+    image_mask = _image_ref_mask(array)
+    image_count = int(pc.sum(image_mask).as_py() or 0)
+    text_count = string_count - image_count
+    kinds["image_ref"] = image_count
+    kinds["text"] = text_count
+    if text_count:
+        texts = pc.filter(array, pc.invert(image_mask)) if image_count else array
+        total_len = pc.sum(pc.utf8_length(texts)).as_py() or 0
+        stat["avg_text_len"] = float(total_len) / float(text_count)
+    stat["kinds"] = {kind: count for kind, count in kinds.items() if count}
+    return stat
+
+
+def python_key_stats(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Return ``key_stats`` for Python dict rows using Arrow string kernels.
+
+    Columns whose strings Arrow cannot encode (e.g. lone surrogates) fall
+    back to the per-value loop in :mod:`.logic`.
+    """
+    from .logic import _loop_key_stats
+
+    key_counts = Counter(chain.from_iterable(rows))
+    key_stats: Dict[str, Dict[str, Any]] = {}
+    for key, present in key_counts.items():
+        if present == len(rows):
+            values = list(map(itemgetter(key), rows))
+        else:
+            values = [row[key] for row in rows if key in row]
+        try:
+            key_stats[key] = _python_column_stats(values)
+        except (UnicodeError, ValueError, TypeError):
+            key_stats[key] = _loop_key_stats([{key: value} for value in values])[key]
+    return key_stats
+
+
+__all__ = [
+    "arrow_column_stats",
+    "arrow_key_stats",
+    "arrow_type_kind",
+    "python_key_stats",
+]
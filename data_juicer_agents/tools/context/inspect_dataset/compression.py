@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Streaming decompression for compressed dataset files.
+
+Inspect loaders read through :func:`open_text` so ``.jsonl.gz``,
+``.jsonl.zst``, ``.csv.bz2`` and ``.json.xz`` inputs are decoded on the fly;
+only the bytes needed for the sample are ever decompressed.  The codec is
+taken from the file's magic bytes when they are recognised and from its
+suffix otherwise, so mislabelled files still open correctly.
+
+``zstandard`` is optional; the other codecs come from the standard library.
+"""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import IO, Optional
+
+_COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+    ".xz": "xz",
+}
+
+_MAGIC_BYTES = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+
+
+def compression_suffix(path: Path) -> str:
+    """Return the compression suffix of *path* (e.g. ``".gz"``) or ``""``."""
+    suffix = path.suffix.lower()
+    return suffix if suffix in _COMPRESSION_SUFFIXES else ""
+
+
+def data_suffix(path: Path) -> str:
+    """Return the data-format suffix of *path*, ignoring a compression suffix.
+
+    ``data.jsonl.gz`` -> ``".jsonl"``; ``data.csv`` -> ``".csv"``.
+    """
+    if compression_suffix(path):
+        return Path(path.stem).suffix.lower()
+    return path.suffix.lower()
+
+
+def detect_compression(path: Path) -> Optional[str]:
+    """Return the codec name for *path* (``"gzip"``, ``"zstd"``, ...) or ``None``."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(6)
+    except OSError:
+        head = b""
+    for magic, codec in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return codec
+    if head:
+        # Readable content without a known magic is plain data, whatever
+        # the suffix claims.
+        return None
+    return _COMPRESSION_SUFFIXES.get(compression_suffix(path))
+
+
+def open_binary(path: Path, codec: Optional[str] = None) -> IO[bytes]:
+    """Open *path* for streaming binary reads, decompressing if needed."""
+    if codec is None:
+        codec = detect_compression(path)
+    if codec is None:
+        return open(path, "rb")
+    if codec == "gzip":
+        import gzip
+
+        return gzip.open(path, "rb")
+    if codec == "bz2":
+        import bz2
+
+        return bz2.open(path, "rb")
+    if codec == "xz":
+        import lzma
+
+        return lzma.open(path, "rb")
+    if codec == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise RuntimeError(
+                f"reading {path.name} requires the optional 'zstandard' package"
+            ) from exc
+        raw = open(path, "rb")
+        try:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        except Exception:
+            raw.close()
+            raise
+        return io.BufferedReader(reader)
+    raise ValueError(f"unsupported compression codec: {codec}")
+
+
+def open_text(path: Path, encoding: str = "utf-8", newline: Optional[str] = None) -> IO[str]:
+    """Open *path* as text, transparently decompressing compressed files.
+
+    Plain files are opened directly (keeping them seekable); compressed
+    files are wrapped in a streaming decoder.
+    """
+    codec = detect_compression(path)
+    if codec is None:
+        return open(path, "r", encoding=encoding, newline=newline)
+    return io.TextIOWrapper(open_binary(path, codec), encoding=encoding, newline=newline)
+
+
+__all__ = [
+    "compression_suffix",
+    "data_suffix",
+    "detect_compression",
+    "open_binary",
+    "open_text",
+]
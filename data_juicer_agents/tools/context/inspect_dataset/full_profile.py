@@ -0,0 +1,546 @@
+# -*- coding: utf-8 -*-
+"""Opt-in full-dataset streaming profiler.
+
+Sample-based inspection is enough to pick keys and modality, but planning
+thresholds (minimum/maximum text length, deduplication) were guessed from
+20 rows.  :func:`profile_dataset` streams every record of every source
+across worker processes and computes, with memory bounded independently of
+dataset size:
+
+* total row count and per-field null rates;
+* text length histograms (fixed bins) with interpolated quantiles;
+* approximate distinct counts per field and for whole rows (HyperLogLog);
+* a near-duplicate rate for the primary text field, estimated with MinHash
+  + LSH over a bounded reservoir of documents.
+
+Work is split into partitions (byte ranges of large JSONL files, row-group
+ranges of Parquet files, whole files otherwise) whose partial profiles are
+mergeable, so the result does not depend on how many workers ran.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from data_juicer_agents.utils import json_codec
+
+from .compression import data_suffix, detect_compression, open_text
+
+# Plain JSONL files larger than this are split into byte-range partitions.
+_MIN_SPLIT_BYTES = 64 * 1024 * 1024
+_HLL_PRECISION = 12
+# Documents kept (per worker and after merging) for near-duplicate estimation.
+_DEDUP_RESERVOIR = 4000
+_DEDUP_MAX_CHARS = 1000
+_MINHASH_PERMUTATIONS = 64
+_MINHASH_BANDS = 8
+_NEAR_DUP_THRESHOLD = 0.8
+_SHINGLE_CHARS = 5
+_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+def _length_bin_edges() -> List[int]:
+    # Exact bins up to 64 characters, then ~9% wide geometric bins.
+    edges = list(range(0, 64))
+    value = 64.0
+    while value < 2 ** 24:
+        edge = int(round(value))
+        if edge > edges[-1]:
+            edges.append(edge)
+        value *= 2 ** (1 / 8)
+    return edges
+
+
+_LENGTH_EDGES = _length_bin_edges()
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _value_bytes(value: Any) -> bytes:
+    if isinstance(value, str):
+        return value.encode("utf-8", errors="replace")
+    return json_codec.dumps(value, sort_keys=True, default=str).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Sketches
+# ---------------------------------------------------------------------------
+
+
+class HyperLogLog:
+    """Mergeable HyperLogLog distinct-count sketch over 64-bit hashes."""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = _HLL_PRECISION) -> None:
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hash(self, value: int) -> None:
+        index = value >> (64 - self.precision)
+        rest = (value << self.precision) & 0xFFFFFFFFFFFFFFFF
+        rank = (64 - self.precision + 1) if rest == 0 else (65 - rest.bit_length())
+        rank = min(rank, 64 - self.precision + 1)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        registers = self.registers
+        for idx, rank in enumerate(other.registers):
+            if rank > registers[idx]:
+                registers[idx] = rank
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            raw = m * math.log(m / zeros)
+        return int(round(raw))
+
+
+class _LengthHistogram:
+    __slots__ = ("counts", "total", "min", "max", "sum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * len(_LENGTH_EDGES)
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+        self.sum = 0
+
+    def add(self, length: int) -> None:
+        self.counts[bisect.bisect_right(_LENGTH_EDGES, length) - 1] += 1
+        self.total += 1
+        self.sum += length
+        self.min = length if self.min is None else min(self.min, length)
+        self.max = length if self.max is None else max(self.max, length)
+
+    def merge(self, other: "_LengthHistogram") -> None:
+        for idx, count in enumerate(other.counts):
+            self.counts[idx] += count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        target = q * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            if not count:
+                continue
+            if seen + count >= target:
+                lo = float(_LENGTH_EDGES[idx])
+                hi = float(_LENGTH_EDGES[idx + 1]) if idx + 1 < len(_LENGTH_EDGES) else lo
+                lo = max(lo, float(self.min))
+                hi = min(hi, float(self.max) + 1.0)
+                fraction = (target - seen) / count
+                return min(lo + (hi - lo) * fraction, float(self.max))
+            seen += count
+        return float(self.max or 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        used = [idx for idx, count in enumerate(self.counts) if count]
+        return {
+            "count": self.total,
+            "min_len": self.min,
+            "max_len": self.max,
+            "mean_len": round(self.sum / self.total, 2) if self.total else 0.0,
+            "quantiles": {
+                f"p{int(round(q * 100))}": int(round(self.quantile(q))) for q in _QUANTILES
+            },
+            "histogram": {
+                "edges": [_LENGTH_EDGES[idx] for idx in used],
+                "counts": [self.counts[idx] for idx in used],
+            },
+        }
+
+
+class _FieldProfile:
+    __slots__ = ("present", "nulls", "distinct", "lengths")
+
+    def __init__(self) -> None:
+        self.present = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.lengths = _LengthHistogram()
+
+    def add(self, value: Any) -> None:
+        self.present += 1
+        if value is None:
+            self.nulls += 1
+            return
+        self.distinct.add_hash(_hash64(_value_bytes(value)))
+        if isinstance(value, str):
+            self.lengths.add(len(value))
+
+    def merge(self, other: "_FieldProfile") -> None:
+        self.present += other.present
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        self.lengths.merge(other.lengths)
+
+
+class PartialProfile:
+    """Mergeable profile of one partition (picklable across processes)."""
+
+    def __init__(self, dedup_key: Optional[str] = None, seed: int = 0) -> None:
+        self.rows = 0
+        self.fields: Dict[str, _FieldProfile] = {}
+        self.row_distinct = HyperLogLog()
+        self.dedup_key = dedup_key
+        self.dedup_seen = 0
+        self.reservoir: List[str] = []
+        self._rng = random.Random(seed)
+
+    def add_row(self, row: Dict[str, Any]) -> None:
+        self.rows += 1
+        for key, value in row.items():
+            field = self.fields.get(key)
+            if field is None:
+                field = self.fields[key] = _FieldProfile()
+            field.add(value)
+        self.row_distinct.add_hash(_hash64(_value_bytes(row)))
+        if self.dedup_key is not None:
+            text = row.get(self.dedup_key)
+            if isinstance(text, str) and text:
+                self._offer(text[:_DEDUP_MAX_CHARS])
+
+    def _offer(self, text: str) -> None:
+        self.dedup_seen += 1
+        if len(self.reservoir) < _DEDUP_RESERVOIR:
+            self.reservoir.append(text)
+            return
+        slot = self._rng.randrange(self.dedup_seen)
+        if slot < _DEDUP_RESERVOIR:
+            self.reservoir[slot] = text
+
+    def merge(self, other: "PartialProfile") -> None:
+        self.rows += other.rows
+        for key, field in other.fields.items():
+            mine = self.fields.get(key)
+            if mine is None:
+                self.fields[key] = field
+            else:
+                mine.merge(field)
+        self.row_distinct.merge(other.row_distinct)
+        # Weighted reservoir merge keeps each document's inclusion odds equal.
+        total_seen = self.dedup_seen + other.dedup_seen
+        if total_seen > _DEDUP_RESERVOIR:
+            mine = round(_DEDUP_RESERVOIR * self.dedup_seen / total_seen)
+            keep_self = self._rng.sample(self.reservoir, min(mine, len(self.reservoir)))
+            keep_other = self._rng.sample(
+                other.reservoir,
+                min(_DEDUP_RESERVOIR - len(keep_self), len(other.reservoir)),
+            )
+            self.reservoir = keep_self + keep_other
+        else:
+            self.reservoir = self.reservoir + other.reservoir
+        self.dedup_seen = total_seen
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state.pop("_rng", None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._rng = random.Random(self.rows)
+
+
+# ---------------------------------------------------------------------------
+# Near-duplicate estimation
+# ---------------------------------------------------------------------------
+
+
+def _minhash_signatures(texts: Sequence[str]) -> Any:
+    import zlib
+
+    import numpy as np
+
+    rng = np.random.default_rng(1234567)
+    mask = np.uint64(0xFFFFFFFF)
+    a = rng.integers(1, 2 ** 32, size=_MINHASH_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 32, size=_MINHASH_PERMUTATIONS, dtype=np.uint64)
+    signatures = np.empty((len(texts), _MINHASH_PERMUTATIONS), dtype=np.uint64)
+    for row, text in enumerate(texts):
+        normalized = " ".join(text.lower().split())
+        if len(normalized) <= _SHINGLE_CHARS:
+            shingles = {normalized}
+        else:
+            shingles = {
+                normalized[i:i + _SHINGLE_CHARS]
+                for i in range(len(normalized) - _SHINGLE_CHARS + 1)
+            }
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (a[:, None] * hashes[None, :] + b[:, None]) & mask
+        signatures[row] = permuted.min(axis=1)
+    return signatures
+
+
+def estimate_near_duplicates(texts: Sequence[str]) -> Dict[str, Any]:
+    """Return the share of *texts* with a MinHash near-duplicate among them."""
+    if len(texts) < 2:
+        return {"documents": len(texts), "near_duplicate_rate": 0.0}
+    signatures = _minhash_signatures(texts)
+    rows_per_band = _MINHASH_PERMUTATIONS // _MINHASH_BANDS
+    duplicated = set()
+    for band in range(_MINHASH_BANDS):
+        buckets: Dict[bytes, List[int]] = {}
+        chunk = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        for idx in range(len(texts)):
+            buckets.setdefault(chunk[idx].tobytes(), []).append(idx)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            head = members[0]
+            for other in members[1:]:
+                if head in duplicated and other in duplicated:
+                    continue
+                similarity = float((signatures[head] == signatures[other]).mean())
+                if similarity >= _NEAR_DUP_THRESHOLD:
+                    duplicated.add(head)
+                    duplicated.add(other)
+    return {
+        "documents": len(texts),
+        "near_duplicate_rate": round(len(duplicated) / len(texts), 4),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Partitioning and scanning
+# ---------------------------------------------------------------------------
+
+
+def _plan_partitions(files: Sequence[str], workers: int) -> List[Tuple[str, str, int, int]]:
+    """Split *files* into ``(path, kind, start, end)`` scan partitions."""
+    partitions: List[Tuple[str, str, int, int]] = []
+    for file_path in files:
+        path = Path(file_path)
+        suffix = data_suffix(path)
+        if suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            groups = pq.ParquetFile(str(path)).num_row_groups
+            step = max(1, math.ceil(groups / max(workers, 1)))
+            for start in range(0, groups, step):
+                partitions.append((file_path, "parquet", start, min(start + step, groups)))
+            continue
+        if suffix in {".csv", ".tsv", ".json"} or detect_compression(path) is not None:
+            partitions.append((file_path, suffix or ".jsonl", 0, -1))
+            continue
+        size = path.stat().st_size
+        if size <= _MIN_SPLIT_BYTES or workers <= 1:
+            partitions.append((file_path, "jsonl", 0, size))
+            continue
+        step = max(_MIN_SPLIT_BYTES, math.ceil(size / workers))
+        for start in range(0, size, step):
+            partitions.append((file_path, "jsonl", start, min(start + step, size)))
+    return partitions
+
+
+def _iter_jsonl_range(path: Path, start: int, end: int) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as f:
+        if start > 0:
+            # The line straddling ``start`` belongs to the previous range.
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                obj = json_codec.loads(line)
+            except Exception:
+                continue
+            if isinstance(obj, dict):
+                yield obj
+
+
+def _iter_partition_rows(partition: Tuple[str, str, int, int]) -> Iterator[Dict[str, Any]]:
+    from .logic import _iter_json_array_items
+
+    file_path, kind, start, end = partition
+    path = Path(file_path)
+    if kind == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(str(path))
+        for batch in parquet_file.iter_batches(row_groups=list(range(start, end))):
+            yield from batch.to_pylist()
+    elif kind in {".csv", ".tsv"}:
+        import csv
+
+        with open_text(path, newline="") as f:
+            reader = csv.DictReader(f, delimiter="\t" if kind == ".tsv" else ",")
+            for row in reader:
+                yield {k: v for k, v in row.items() if v is not None}
+    elif kind == ".json":
+        with open_text(path) as f:
+            head = f.read(1)
+            while head and head.isspace():
+                head = f.read(1)
+            if head != "[":
+                content = json.loads(head + f.read())
+                if isinstance(content, dict):
+                    yield content
+                return
+            for item in _iter_json_array_items(f, prefix=head):
+                if isinstance(item, dict):
+                    yield item
+    elif end < 0:
+        with open_text(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    obj = json_codec.loads(line)
+                except Exception:
+                    continue
+                if isinstance(obj, dict):
+                    yield obj
+    else:
+        yield from _iter_jsonl_range(path, start, end)
+
+
+def _profile_partition(
+    partition: Tuple[str, str, int, int],
+    dedup_key: Optional[str],
+    seed: int,
+) -> PartialProfile:
+    profile = PartialProfile(dedup_key=dedup_key, seed=seed)
+    for row in _iter_partition_rows(partition):
+        profile.add_row(row)
+    return profile
+
+
+def _finalize(profile: PartialProfile) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {}
+    for key in sorted(profile.fields):
+        field = profile.fields[key]
+        missing = profile.rows - field.present
+        entry: Dict[str, Any] = {
+            "present": field.present,
+            "null_count": field.nulls + missing,
+            "null_rate": round((field.nulls + missing) / profile.rows, 4) if profile.rows else 0.0,
+            "distinct_estimate": min(field.distinct.estimate(), field.present - field.nulls),
+        }
+        if field.lengths.total:
+            entry["text_length"] = field.lengths.to_dict()
+        fields[key] = entry
+
+    distinct_rows = min(profile.row_distinct.estimate(), profile.rows)
+    result: Dict[str, Any] = {
+        "rows": profile.rows,
+        "distinct_rows_estimate": distinct_rows,
+        "duplicate_row_rate": round(1.0 - distinct_rows / profile.rows, 4) if profile.rows else 0.0,
+        "fields": fields,
+    }
+    if profile.dedup_key is not None:
+        near = estimate_near_duplicates(profile.reservoir)
+        near.update(
+            {
+                "key": profile.dedup_key,
+                "method": "minhash_lsh",
+                "similarity_threshold": _NEAR_DUP_THRESHOLD,
+                "documents_seen": profile.dedup_seen,
+            }
+        )
+        result["near_duplicates"] = near
+    return result
+
+
+def profile_dataset(
+    files: Sequence[str],
+    dedup_key: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Stream every record of *files* and return the full profile.
+
+    *dedup_key* selects the text field used for near-duplicate estimation.
+    *workers* defaults to the CPU count; ``1`` profiles in-process.
+    """
+    started = time.monotonic()
+    workers = max(int(workers or os.cpu_count() or 1), 1)
+    partitions = _plan_partitions(files, workers)
+
+    merged = PartialProfile(dedup_key=dedup_key)
+    if workers == 1 or len(partitions) <= 1:
+        for idx, partition in enumerate(partitions):
+            merged.merge(_profile_partition(partition, dedup_key, idx))
+        used_workers = 1
+    else:
+        used_workers = min(workers, len(partitions))
+        with ProcessPoolExecutor(max_workers=used_workers) as pool:
+            futures = [
+                pool.submit(_profile_partition, partition, dedup_key, idx)
+                for idx, partition in enumerate(partitions)
+            ]
+            for future in futures:
+                merged.merge(future.result())
+
+    result = _finalize(merged)
+    result.update(
+        {
+            "files": len(files),
+            "partitions": len(partitions),
+            "workers": used_workers,
+            "elapsed_sec": round(time.monotonic() - started, 3),
+        }
+    )
+    return result
+
+
+def summarize_full_profile(full_profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the compact statistics used in planner prompts (no histograms)."""
+    fields: Dict[str, Any] = {}
+    for key, entry in (full_profile.get("fields") or {}).items():
+        compact: Dict[str, Any] = {
+            "null_rate": entry.get("null_rate"),
+            "distinct_estimate": entry.get("distinct_estimate"),
+        }
+        text_length = entry.get("text_length")
+        if isinstance(text_length, dict):
+            compact["text_length_quantiles"] = text_length.get("quantiles", {})
+            compact["text_length_range"] = [text_length.get("min_len"), text_length.get("max_len")]
+        fields[key] = compact
+    summary: Dict[str, Any] = {
+        "rows": full_profile.get("rows"),
+        "duplicate_row_rate": full_profile.get("duplicate_row_rate"),
+        "fields": fields,
+    }
+    near = full_profile.get("near_duplicates")
+    if isinstance(near, dict):
+        summary["near_duplicate_rate"] = near.get("near_duplicate_rate")
+        summary["near_duplicate_key"] = near.get("key")
+    return summary
+
+
+__all__ = [
+    "HyperLogLog",
+    "PartialProfile",
+    "estimate_near_duplicates",
+    "profile_dataset",
+    "summarize_full_profile",
+]
@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -11,7 +11,8 @@ class InspectDatasetInput(BaseModel):
     dataset_path: str = Field(
         default="",
         description=(
-            "Dataset file path to inspect. Will be converted to the standard "
+            "Dataset file, shard directory or glob pattern (e.g. 'data/part-*.jsonl') "
+            "to inspect. Will be converted to the standard "
             "dataset config format internally. Ignored when 'dataset' is provided."
         ),
     )
@@ -24,6 +25,45 @@ class InspectDatasetInput(BaseModel):
         ),
     )
     sample_size: int = Field(default=20, ge=1, description="Number of samples to inspect.")
+    sampling: Literal["head", "random"] = Field(
+        default="head",
+        description=(
+            "How to pick samples: 'head' reads the first rows; 'random' seeks to "
+            "random offsets (random row groups for Parquet) to cover the whole file."
+        ),
+    )
+    seed: Optional[int] = Field(
+        default=None,
+        description="Random seed for reproducible 'random' sampling.",
+    )
+    refresh: bool = Field(
+        default=False,
+        description="Ignore any cached profile under <working_dir>/profiles and re-inspect.",
+    )
+    full_profile: bool = Field(
+        default=False,
+        description=(
+            "Also stream the entire dataset to compute row count, null rates, text length "
+            "quantiles and distinct/near-duplicate estimates. Slow on large datasets."
+        ),
+    )
+    profile_workers: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Worker processes for full_profile (defaults to the CPU count).",
+    )
+    validate_media: bool = Field(
+        default=False,
+        description=(
+            "Check sampled local image references for existence, size and header magic "
+            "and report missing/invalid rates."
+        ),
+    )
+    media_time_budget: float = Field(
+        default=5.0,
+        gt=0,
+        description="Seconds allowed for validate_media; unchecked references are reported.",
+    )
 
 class GenericOutput(BaseModel):
     ok: bool = True
\ No newline at end of file
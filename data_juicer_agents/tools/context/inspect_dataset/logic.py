@@ -4,9 +4,28 @@
 from __future__ import annotations
 
 import csv
+import glob
 import json
+import logging
+import math
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
+
+from data_juicer_agents.utils import json_codec
+
+from .compression import data_suffix, detect_compression, open_text
+from .full_profile import profile_dataset
+from .media_check import DEFAULT_MEDIA_TIME_BUDGET, validate_media_refs
+from .profile_cache import ProfileCache, profile_cache_key
+from .parquet_profile import profile_parquet
+from .sampling import sample_csv_random, sample_jsonl_random
+
+_logger = logging.getLogger(__name__)
+
+SAMPLING_MODES = ("head", "random")
 
 
 _IMAGE_SUFFIXES = (
@@ -20,6 +39,25 @@ _IMAGE_SUFFIXES = (
     ".svg",
 )
 
+# Read size for the incremental ``.json`` array parser.
+_JSON_CHUNK_SIZE = 64 * 1024
+_JSON_DELIMITERS = frozenset(",]} \t\r\n")
+
+# Multi-source inspection: worker cap and minimum per-source sample budget.
+_MAX_INSPECT_WORKERS = 8
+_MIN_SOURCE_SAMPLE = 5
+
+# Directory / glob sources: listing cap and number of shards actually opened.
+_SHARD_SUFFIXES = (".jsonl", ".json", ".csv", ".tsv", ".parquet")
+_MAX_LISTED_SHARDS = 10000
+_MAX_SAMPLED_SHARDS = 8
+
+# Samples at least this large compute key_stats with Arrow kernels.
+_COLUMNAR_MIN_ROWS = 1000
+
+# Distinct sampled media references checked by ``validate_media``.
+_MAX_MEDIA_REFS = 256
+
 
 def _looks_like_image_value(value: str) -> bool:
     lower = value.strip().lower()
@@ -51,7 +89,7 @@ def _value_kind(value: Any) -> str:
 def _load_jsonl_records(path: Path, sample_size: int) -> Tuple[List[Dict[str, Any]], int]:
     rows: List[Dict[str, Any]] = []
     scanned = 0
-    with open(path, "r", encoding="utf-8") as f:
+    with open_text(path) as f:
         for line in f:
             if len(rows) >= sample_size:
                 break
@@ -60,7 +98,7 @@ def _load_jsonl_records(path: Path, sample_size: int) -> Tuple[List[Dict[str, An
                 continue
             scanned += 1
             try:
-                obj = json.loads(line)
+                obj = json_codec.loads(line)
             except Exception:
                 continue
             if isinstance(obj, dict):
@@ -68,22 +106,105 @@ def _load_jsonl_records(path: Path, sample_size: int) -> Tuple[List[Dict[str, An
     return rows, scanned
 
 
+def _iter_json_array_items(
+    f: Any,
+    chunk_size: int = _JSON_CHUNK_SIZE,
+    prefix: str = "",
+) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array read from *f* in chunks.
+
+    Only as much of the file as needed to decode the yielded elements is
+    read, so callers that stop early never pay for the rest of the array.
+    *prefix* is text already consumed from *f* (so non-seekable streams
+    need not be rewound).
+    Raises ``json.JSONDecodeError`` for malformed content within the part
+    that was read, and ``ValueError`` when the document is not an array.
+    """
+    decoder = json.JSONDecoder()
+    buf = prefix
+    pos = 0
+    eof = False
+
+    def _fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        # Drop the consumed prefix so the buffer stays bounded by one element.
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def _skip_ws() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buf) or not _fill():
+                return
+
+    _skip_ws()
+    if pos >= len(buf):
+        return
+    if buf[pos] != "[":
+        raise ValueError("not a JSON array")
+    pos += 1
+
+    expect_value = True
+    while True:
+        _skip_ws()
+        if pos >= len(buf):
+            raise json.JSONDecodeError("unterminated JSON array", buf, pos)
+        ch = buf[pos]
+        if ch == "]":
+            return
+        if not expect_value:
+            if ch != ",":
+                raise json.JSONDecodeError("expected ',' or ']'", buf, pos)
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not _fill():
+                raise
+            continue
+        if not eof and (end >= len(buf) or buf[end] not in _JSON_DELIMITERS):
+            # A scalar at the buffer edge (e.g. ``12`` of ``123`` or ``3``
+            # of ``3.5``) may be truncated; read more before trusting it.
+            if _fill():
+                continue
+        pos = end
+        expect_value = False
+        yield item
+
+
 def _load_json_records(path: Path, sample_size: int) -> Tuple[List[Dict[str, Any]], int]:
-    with open(path, "r", encoding="utf-8") as f:
-        content = json.load(f)
-    if isinstance(content, list):
-        dict_rows = [item for item in content if isinstance(item, dict)]
-        return dict_rows[:sample_size], min(len(dict_rows), sample_size)
-    if isinstance(content, dict):
-        return [content], 1
-    return [], 0
+    with open_text(path) as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        if head != "[":
+            content = json.loads(head + f.read())
+            if isinstance(content, dict):
+                return [content], 1
+            return [], 0
+        rows: List[Dict[str, Any]] = []
+        for item in _iter_json_array_items(f, prefix=head):
+            if isinstance(item, dict):
+                rows.append(item)
+                if len(rows) >= sample_size:
+                    break
+    return rows, len(rows)
 
 def _load_csv_records(
     path: Path, sample_size: int, delimiter: str = ","
 ) -> Tuple[List[Dict[str, Any]], int]:
     rows: List[Dict[str, Any]] = []
     try:
-        with open(path, "r", encoding="utf-8", newline="") as f:
+        with open_text(path, newline="") as f:
             reader = csv.DictReader(f, delimiter=delimiter)
             # Check if headers are present
             if reader.fieldnames is None:
@@ -94,34 +215,10 @@ def _load_csv_records(
                 # Filter out None values that occur when rows have fewer fields than headers
                 cleaned_row = {k: v for k, v in row.items() if v is not None}
                 rows.append(cleaned_row)
-    except (UnicodeDecodeError, csv.Error, IOError) as e:
+    except (UnicodeDecodeError, csv.Error, IOError, EOFError) as e:
         return [], 0
     return rows, len(rows)
 
-def _load_parquet_records(path: Path, sample_size: int) -> Tuple[List[Dict[str, Any]], int]:
-    try:
-        import pyarrow.parquet as pq
-    except ImportError:
-        return [], 0
-
-    parquet_file = pq.ParquetFile(str(path))
-    # Read only the first batch of up to sample_size rows instead of
-    # materializing the entire file before slicing.
-    batch_iter = parquet_file.iter_batches(batch_size=sample_size)
-    try:
-        first_batch = next(batch_iter)
-    except StopIteration:
-        return [], 0
-
-    rows = first_batch.to_pydict()
-    num_records = len(next(iter(rows.values()))) if rows else 0
-    records: List[Dict[str, Any]] = [
-        {col: values[i] for col, values in rows.items()}
-        for i in range(num_records)
-    ]
-    return records, num_records
-
-
 _UNSUPPORTED_PREFIXES = (
     "hf://",
     "huggingface://",
@@ -168,11 +265,12 @@ def _resolve_dataset_config(
     return {"configs": []}
 
 
-def _pick_inspectable_path(dataset_config: Dict[str, Any]) -> str | None:
-    """Return the first local file path from a dataset config that can be inspected."""
+def _pick_inspectable_paths(dataset_config: Dict[str, Any]) -> List[str]:
+    """Return every distinct local file path in a dataset config, in order."""
     configs = dataset_config.get("configs", [])
     if not isinstance(configs, list):
-        return None
+        return []
+    paths: List[str] = []
     for cfg in configs:
         if not isinstance(cfg, dict):
             continue
@@ -181,15 +279,384 @@ def _pick_inspectable_path(dataset_config: Dict[str, Any]) -> str | None:
         if not path_value:
             continue
         if source_type in {"local", ""}:
-            if not _looks_like_unsupported_source(path_value):
-                return path_value
-    return None
+            if not _looks_like_unsupported_source(path_value) and path_value not in paths:
+                paths.append(path_value)
+    return paths
+
+
+def _pick_inspectable_path(dataset_config: Dict[str, Any]) -> str | None:
+    """Return the first local file path from a dataset config that can be inspected."""
+    paths = _pick_inspectable_paths(dataset_config)
+    return paths[0] if paths else None
+
+
+def _load_records(
+    path: Path,
+    sample_size: int,
+    sampling: str = "head",
+    seed: int | None = None,
+) -> Tuple[List[Dict[str, Any]], int, Dict[str, Any]]:
+    """Load up to *sample_size* records from *path* with the given sampling mode.
+
+    Row-oriented formats only; Parquet is profiled by :func:`profile_parquet`.
+    """
+    suffix = data_suffix(path)
+    codec = detect_compression(path)
+    if sampling == "random" and codec is None:
+        rng = random.Random(seed)
+        if suffix == ".csv":
+            return sample_csv_random(path, sample_size, rng, seed=seed)
+        if suffix == ".tsv":
+            return sample_csv_random(path, sample_size, rng, delimiter="\t", seed=seed)
+        if suffix != ".json":
+            return sample_jsonl_random(path, sample_size, rng, seed=seed)
+
+    if suffix == ".json":
+        rows, scanned = _load_json_records(path, sample_size=sample_size)
+    elif suffix == ".csv":
+        rows, scanned = _load_csv_records(path, sample_size=sample_size)
+    elif suffix == ".tsv":
+        rows, scanned = _load_csv_records(path, sample_size=sample_size, delimiter="\t")
+    else:
+        rows, scanned = _load_jsonl_records(path, sample_size=sample_size)
+
+    info: Dict[str, Any] = {"method": "head"}
+    if codec is not None:
+        info["compression"] = codec
+    if sampling != "head":
+        if codec is not None:
+            # Compressed streams cannot be seeked into cheaply.
+            info["fallback_reason"] = f"{sampling} sampling is not supported for compressed files"
+        else:
+            # A JSON array has no line structure to seek into.
+            info["fallback_reason"] = f"{sampling} sampling is not supported for {suffix} files"
+    return rows, scanned, info
+
+
+def _loop_key_stats(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Reference per-value ``key_stats`` computation (see :func:`_compute_key_stats`)."""
+    key_stats: Dict[str, Dict[str, Any]] = {}
+    text_lengths: Dict[str, int] = {}
+    for row in rows:
+        for key, value in row.items():
+            stat = key_stats.setdefault(
+                key,
+                {
+                    "count": 0,
+                    "kinds": {},
+                    "avg_text_len": 0.0,
+                },
+            )
+            stat["count"] += 1
+            kind = _value_kind(value)
+            stat["kinds"][kind] = int(stat["kinds"].get(kind, 0)) + 1
+            if kind == "text":
+                text_lengths[key] = text_lengths.get(key, 0) + len(str(value))
+    for key, total_len in text_lengths.items():
+        key_stats[key]["avg_text_len"] = float(total_len) / float(key_stats[key]["kinds"]["text"])
+    return key_stats
+
+
+def _compute_key_stats(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Return per-key ``count``/``kinds``/``avg_text_len`` for sampled rows.
+
+    Samples of at least ``_COLUMNAR_MIN_ROWS`` rows use the Arrow kernels in
+    :func:`.columnar.python_key_stats`, which produce the same stats as the
+    per-value loop; smaller samples (or installs without pyarrow) use the loop.
+    """
+    if len(rows) >= _COLUMNAR_MIN_ROWS:
+        try:
+            from .columnar import python_key_stats
+
+            return python_key_stats(rows)
+        except ImportError:
+            pass
+    return _loop_key_stats(rows)
+
+
+def _dominant_kind(stat: Dict[str, Any]) -> str:
+    kinds = {k: v for k, v in stat.get("kinds", {}).items() if k != "null"}
+    if not kinds:
+        return "null"
+    return max(sorted(kinds), key=lambda k: kinds[k])
+
+
+def _merge_key_stats(
+    stat_maps: List[Dict[str, Dict[str, Any]]],
+    source_names: List[str] | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Merge ``key_stats`` maps; with *source_names*, record per-source presence counts."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for pos, key_stats in enumerate(stat_maps):
+        for key, stat in key_stats.items():
+            out = merged.setdefault(key, {"count": 0, "kinds": {}, "avg_text_len": 0.0})
+            prev_text = int(out["kinds"].get("text", 0))
+            new_text = int(stat["kinds"].get("text", 0))
+            if new_text:
+                out["avg_text_len"] = (
+                    float(out["avg_text_len"]) * prev_text
+                    + float(stat["avg_text_len"]) * new_text
+                ) / (prev_text + new_text)
+            out["count"] += int(stat["count"])
+            for kind, cnt in stat["kinds"].items():
+                out["kinds"][kind] = int(out["kinds"].get(kind, 0)) + int(cnt)
+            if source_names is not None:
+                out.setdefault("source_counts", {})[source_names[pos]] = int(stat["count"])
+    return merged
+
+
+def _find_schema_conflicts(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Report keys missing from some sources and keys whose kind differs."""
+    if len(sources) < 2:
+        return []
+    all_keys = set()
+    for source in sources:
+        all_keys.update(source["key_stats"].keys())
+
+    conflicts: List[Dict[str, Any]] = []
+    for source in sources:
+        missing = sorted(all_keys - set(source["key_stats"].keys()))
+        if missing:
+            conflicts.append({"type": "missing_keys", "source": source["path"], "keys": missing})
+    for key in sorted(all_keys):
+        kinds = {
+            source["path"]: _dominant_kind(source["key_stats"][key])
+            for source in sources
+            if key in source["key_stats"]
+        }
+        distinct = {kind for kind in kinds.values() if kind != "null"}
+        if len(distinct) > 1:
+            conflicts.append({"type": "kind_mismatch", "key": key, "kinds": kinds})
+    return conflicts
+
+
+def _is_glob_pattern(path_value: str) -> bool:
+    return any(ch in path_value for ch in "*?[")
+
+
+def _is_shard_file(name: str) -> bool:
+    if name.startswith((".", "_")):
+        return False
+    return data_suffix(Path(name)) in _SHARD_SUFFIXES
+
+
+def _iter_shard_paths(path_value: str) -> Iterator[str]:
+    """Lazily yield data files under a directory or matching a glob pattern."""
+    if _is_glob_pattern(path_value):
+        for match in glob.iglob(os.path.expanduser(path_value), recursive=True):
+            if os.path.isfile(match) and _is_shard_file(os.path.basename(match)):
+                yield match
+        return
+    for root, dirs, files in os.walk(path_value):
+        dirs[:] = sorted(d for d in dirs if not d.startswith((".", "_")))
+        for name in sorted(files):
+            if _is_shard_file(name):
+                yield os.path.join(root, name)
+
+
+def _expand_source(
+    path_value: str,
+    seed: int | None,
+) -> Tuple[List[str], Dict[str, Any] | None]:
+    """Return ``(files, shard_info)`` for one source path.
+
+    Plain files map to themselves with ``shard_info=None``.  Directories
+    and glob patterns are listed lazily (at most ``_MAX_LISTED_SHARDS``
+    entries) and reservoir-sampled down to ``_MAX_SAMPLED_SHARDS`` files,
+    so only the chosen shards are ever opened.
+    """
+    if not _is_glob_pattern(path_value) and not os.path.isdir(path_value):
+        return [path_value], None
+
+    rng = random.Random(0 if seed is None else seed)
+    chosen: List[str] = []
+    listed = 0
+    truncated = False
+    for shard in _iter_shard_paths(path_value):
+        if listed >= _MAX_LISTED_SHARDS:
+            truncated = True
+            break
+        listed += 1
+        if len(chosen) < _MAX_SAMPLED_SHARDS:
+            chosen.append(shard)
+        else:
+            slot = rng.randrange(listed)
+            if slot < _MAX_SAMPLED_SHARDS:
+                chosen[slot] = shard
+    chosen.sort()
+    return chosen, {
+        "listed": listed,
+        "sampled": len(chosen),
+        "listing_truncated": truncated,
+        "paths": chosen,
+    }
+
+
+def _sample_file(
+    inspectable_path: str,
+    sample_size: int,
+    sampling: str,
+    seed: int | None,
+) -> Dict[str, Any]:
+    """Sample one local file; failures are returned, not raised.
+
+    The result carries ``key_stats`` for the sample, the number of
+    ``sampled`` records and the sampled ``rows`` (preview rows only for
+    Parquet, whose statistics are computed column-wise).
+    """
+    path = Path(inspectable_path)
+    if not path.exists():
+        return {
+            "path": inspectable_path,
+            "ok": False,
+            "error_type": "dataset_path_not_found",
+            "error": f"dataset_path does not exist: {inspectable_path}",
+        }
+    try:
+        if data_suffix(path) == ".parquet":
+            result = profile_parquet(path, sample_size, sampling=sampling, seed=seed)
+        else:
+            rows, scanned, sampling_info = _load_records(
+                path, sample_size=sample_size, sampling=sampling, seed=seed
+            )
+            result = {
+                "rows": rows,
+                "sampled": len(rows),
+                "scanned": scanned,
+                "sampling": sampling_info,
+                "key_stats": _compute_key_stats(rows),
+            }
+    except Exception as exc:
+        return {
+            "path": inspectable_path,
+            "ok": False,
+            "error_type": "inspect_failed",
+            "error": f"{type(exc).__name__}: {exc}",
+            "rows": [],
+            "sampled": 0,
+            "scanned": 0,
+            "sampling": {"method": sampling},
+        }
+    result["path"] = inspectable_path
+    result["ok"] = result["sampled"] > 0
+    if not result["ok"]:
+        result["error_type"] = "inspect_failed"
+        result["error"] = f"no valid dict records in {result['scanned']} scanned lines"
+    return result
+
+
+def _combine_shards(
+    path_value: str,
+    shard_results: List[Dict[str, Any]],
+    shard_info: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Aggregate per-shard samples into one source result."""
+    sampled = [shard for shard in shard_results if shard["ok"]]
+    sampling_info = dict(sampled[0]["sampling"]) if sampled else {"method": "head"}
+    sampling_info["shards"] = dict(shard_info)
+    failed = [shard["path"] for shard in shard_results if not shard["ok"]]
+    if failed:
+        sampling_info["shards"]["failed"] = failed
+    result: Dict[str, Any] = {
+        "path": path_value,
+        "ok": bool(sampled),
+        "rows": [row for shard in sampled for row in shard["rows"]],
+        "sampled": sum(int(shard["sampled"]) for shard in sampled),
+        "scanned": sum(int(shard.get("scanned", 0)) for shard in shard_results),
+        "sampling": sampling_info,
+        "key_stats": _merge_key_stats([shard["key_stats"] for shard in sampled]),
+    }
+    if not shard_info["listed"]:
+        result["error_type"] = "dataset_path_not_found"
+        result["error"] = f"no data files found under: {path_value}"
+    elif not sampled:
+        result["error_type"] = "inspect_failed"
+        result["error"] = f"no valid dict records in {shard_info['sampled']} sampled shards"
+    return result
+
+
+def _split_budget(budget: int, parts: int) -> List[int]:
+    """Split *budget* into *parts* near-equal shares (each at least 1)."""
+    base, extra = divmod(budget, parts)
+    return [max(base + (1 if idx < extra else 0), 1) for idx in range(parts)]
+
+
+def _inspect_sources(
+    paths: List[str],
+    sample_size: int,
+    sampling: str,
+    seed: int | None,
+) -> List[Dict[str, Any]]:
+    """Inspect *paths* concurrently, splitting *sample_size* between them.
+
+    Directory and glob sources are expanded to a bounded set of shards
+    first; every file to open becomes one task in a single shared pool.
+    """
+    if len(paths) > 1:
+        budget = min(sample_size, max(math.ceil(sample_size / len(paths)), _MIN_SOURCE_SAMPLE))
+    else:
+        budget = sample_size
+
+    expanded = [_expand_source(path, seed) for path in paths]
+    tasks: List[Tuple[int, str, int]] = []
+    for idx, (files, _shard_info) in enumerate(expanded):
+        if files:
+            shares = _split_budget(budget, len(files))
+            tasks.extend((idx, file_path, share) for file_path, share in zip(files, shares))
+
+    if len(tasks) == 1:
+        results = [_sample_file(tasks[0][1], tasks[0][2], sampling, seed)]
+    elif tasks:
+        workers = min(len(tasks), _MAX_INSPECT_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="djx-inspect") as pool:
+            futures = [
+                pool.submit(_sample_file, file_path, per_file, sampling, seed)
+                for _idx, file_path, per_file in tasks
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = []
+
+    by_source: Dict[int, List[Dict[str, Any]]] = {}
+    for (idx, _file_path, _per_file), result in zip(tasks, results):
+        by_source.setdefault(idx, []).append(result)
+
+    sources: List[Dict[str, Any]] = []
+    for idx, (path_value, (_files, shard_info)) in enumerate(zip(paths, expanded)):
+        if shard_info is None:
+            source = by_source[idx][0]
+        else:
+            source = _combine_shards(path_value, by_source.get(idx, []), shard_info)
+        sources.append(source)
+    return sources
+
+
+def _source_summary(source: Dict[str, Any]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"path": source["path"], "ok": source["ok"]}
+    if "sampled" in source:
+        summary["sampled_records"] = source["sampled"]
+        summary["scanned_lines"] = source["scanned"]
+        summary["sampling"] = source["sampling"]
+    if source.get("key_stats"):
+        summary["keys"] = sorted(source["key_stats"].keys())
+    if not source["ok"]:
+        summary["error_type"] = source["error_type"]
+        summary["error"] = source["error"]
+    return summary
 
 
 def inspect_dataset_schema(
     dataset_path: str = "",
     sample_size: int = 20,
     dataset: Dict[str, Any] | None = None,
+    sampling: str = "head",
+    seed: int | None = None,
+    cache_dir: str | Path | None = None,
+    refresh: bool = False,
+    full_profile: bool = False,
+    profile_workers: int | None = None,
+    validate_media: bool = False,
+    media_time_budget: float = DEFAULT_MEDIA_TIME_BUDGET,
 ) -> Dict[str, Any]:
     """Inspect a small sample of a dataset and infer keys/modality for planning.
 
@@ -197,11 +664,50 @@ def inspect_dataset_schema(
     (the ``{"configs": [...]}`` format).  When *dataset_path* is provided it
     is automatically converted to the standard dataset config format so that
     all sources are handled uniformly.
+
+    A source path may be a file, a directory of shards or a glob pattern
+    such as ``data/part-*.jsonl``; sharded sources are listed lazily and
+    only a bounded subset of shards is opened (see ``sampling.shards``).
+
+    Every local source in the config is inspected, concurrently when there
+    is more than one, with *sample_size* split between them.  Their
+    ``key_stats`` are merged (with per-source ``source_counts``) and
+    sources whose schemas disagree are listed under ``schema_conflicts``.
+
+    *sampling* selects how records are picked: ``"head"`` reads the first
+    rows, ``"random"`` seeks to random offsets (random row groups for
+    Parquet) for a sample that covers the whole file.  *seed* makes random
+    sampling reproducible.  The method and coverage are reported under
+    ``"sampling"`` in the result.
+
+    When *cache_dir* is given (normally ``.djx/profiles``), successful
+    profiles are persisted there and returned without re-reading the data
+    while the sources and sampling parameters are unchanged; *refresh*
+    forces a new inspection.  The outcome is reported under
+    ``"profile_cache"``.
+
+    With *full_profile* every record of every source (all shards) is also
+    streamed through :func:`.full_profile.profile_dataset` on
+    *profile_workers* processes, adding row counts, null rates, text length
+    quantiles and distinct/duplicate estimates under ``"full_profile"``.
+
+    With *validate_media* the local image references found in the sampled
+    rows are checked for existence, size and header magic (see
+    :mod:`.media_check`) within *media_time_budget* seconds; missing and
+    invalid rates are reported under ``"media_validation"``.  The check is
+    re-run on cache hits, since media files are not part of the cache key.
     """
+    if sampling not in SAMPLING_MODES:
+        return {
+            "ok": False,
+            "error_type": "invalid_sampling_mode",
+            "error": f"sampling must be one of {list(SAMPLING_MODES)}, got {sampling!r}",
+            "message": f"Unsupported sampling mode: {sampling!r}",
+        }
     resolved_config = _resolve_dataset_config(dataset_path, dataset)
-    inspectable_path = _pick_inspectable_path(resolved_config)
+    inspectable_paths = _pick_inspectable_paths(resolved_config)
 
-    if inspectable_path is None:
+    if not inspectable_paths:
         # No local path available to inspect
         configs = resolved_config.get("configs", [])
         if configs:
@@ -226,35 +732,141 @@ def inspect_dataset_schema(
             "message": "No dataset source provided.",
         }
 
-    path = Path(inspectable_path)
-    if not path.exists():
-        return {
-            "ok": False,
-            "error_type": "dataset_path_not_found",
-            "error": f"dataset_path does not exist: {inspectable_path}",
-            "message": f"dataset_path does not exist: {inspectable_path}",
-            "dataset": resolved_config,
-        }
     if sample_size <= 0:
         sample_size = 20
 
-    rows: List[Dict[str, Any]]
-    scanned: int
-
-    suffix = path.suffix.lower()
-    if suffix == ".json":
-        rows, scanned = _load_json_records(path, sample_size=sample_size)
-    elif suffix == ".csv":
-        rows, scanned = _load_csv_records(path, sample_size=sample_size)
-    elif suffix == ".tsv":
-        rows, scanned = _load_csv_records(path, sample_size=sample_size, delimiter="\t")
-    elif suffix == ".parquet":
-        rows, scanned = _load_parquet_records(path, sample_size=sample_size)
-    else:
-        rows, scanned = _load_jsonl_records(path, sample_size=sample_size)
-
-    if not rows:
-        return {
+    if cache_dir is None:
+        payload, media_refs = _profile_sources(
+            resolved_config, inspectable_paths, sample_size, sampling, seed
+        )
+        if full_profile:
+            _attach_full_profile(payload, inspectable_paths, profile_workers)
+        if validate_media and payload.get("ok"):
+            payload["media_validation"] = validate_media_refs(media_refs, time_budget=media_time_budget)
+        return payload
+
+    # Only the sampled media refs are cached; their validation is recomputed.
+    cache = ProfileCache(cache_dir)
+    cache_key = profile_cache_key(
+        resolved_config,
+        inspectable_paths,
+        sample_size,
+        sampling,
+        seed,
+        full_profile=full_profile,
+        list_shards=_iter_shard_paths,
+        max_shards=_MAX_LISTED_SHARDS,
+    )
+    if cache_key is not None and not refresh:
+        cached = cache.get(cache_key)
+        if cached is not None and cached.get("ok"):
+            media_refs = [tuple(item) for item in cached.pop("_media_refs", None) or []]
+            if validate_media:
+                cached["media_validation"] = validate_media_refs(media_refs, time_budget=media_time_budget)
+            cached["profile_cache"] = {"hit": True, "path": str(cache.path_for(cache_key))}
+            return cached
+
+    payload, media_refs = _profile_sources(
+        resolved_config, inspectable_paths, sample_size, sampling, seed
+    )
+    if full_profile:
+        _attach_full_profile(payload, inspectable_paths, profile_workers)
+    stored = None
+    if cache_key is not None and payload.get("ok"):
+        stored = cache.put(cache_key, {**payload, "_media_refs": [list(ref) for ref in media_refs]})
+    if validate_media and payload.get("ok"):
+        payload["media_validation"] = validate_media_refs(media_refs, time_budget=media_time_budget)
+    payload["profile_cache"] = {"hit": False, "path": str(stored) if stored else None}
+    return payload
+
+
+def _attach_full_profile(
+    payload: Dict[str, Any],
+    inspectable_paths: List[str],
+    workers: int | None,
+) -> None:
+    """Stream every file of *inspectable_paths* into ``payload["full_profile"]``."""
+    if not payload.get("ok"):
+        return
+    files: List[str] = []
+    for path_value in inspectable_paths:
+        if _is_glob_pattern(path_value) or os.path.isdir(path_value):
+            files.extend(_iter_shard_paths(path_value))
+        elif os.path.isfile(path_value):
+            files.append(path_value)
+    text_keys = payload.get("candidate_text_keys") or []
+    try:
+        payload["full_profile"] = profile_dataset(
+            files,
+            dedup_key=text_keys[0] if text_keys else None,
+            workers=workers,
+        )
+    except Exception as exc:
+        _logger.warning("full dataset profile failed: %s", exc)
+        payload["full_profile"] = {"ok": False, "error": str(exc)}
+
+
+def _media_base_dir(path_value: str) -> str:
+    """Directory that relative media references of a source resolve against."""
+    if os.path.isdir(path_value):
+        return path_value
+    parent = os.path.dirname(path_value)
+    while _is_glob_pattern(parent):
+        parent = os.path.dirname(parent)
+    return parent or "."
+
+
+def _collect_media_refs(sources: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """Return distinct ``(reference, base_dir)`` image refs from sampled rows.
+
+    Both plain string fields and lists of strings (Data-Juicer's ``images``
+    layout) are scanned.  Parquet sources only keep preview rows.
+    """
+    refs: List[Tuple[str, str]] = []
+    seen = set()
+    for source in sources:
+        base_dir = _media_base_dir(source["path"])
+        for row in source.get("rows", []):
+            for value in row.values():
+                values = value if isinstance(value, list) else [value]
+                for item in values:
+                    if not isinstance(item, str) or not _looks_like_image_value(item):
+                        continue
+                    ref = (item.strip(), base_dir)
+                    if ref in seen:
+                        continue
+                    seen.add(ref)
+                    refs.append(ref)
+                    if len(refs) >= _MAX_MEDIA_REFS:
+                        return refs
+    return refs
+
+
+def _profile_sources(
+    resolved_config: Dict[str, Any],
+    inspectable_paths: List[str],
+    sample_size: int,
+    sampling: str,
+    seed: int | None,
+) -> Tuple[Dict[str, Any], List[Tuple[str, str]]]:
+    """Sample *inspectable_paths*; return the inspection payload and sampled media refs."""
+    sources = _inspect_sources(inspectable_paths, sample_size, sampling, seed)
+    inspected = [source for source in sources if source["ok"]]
+    multi_source = len(sources) > 1
+
+    if not inspected:
+        first = sources[0]
+        inspectable_path = first["path"]
+        if first["error_type"] == "dataset_path_not_found" and not multi_source:
+            return {
+                "ok": False,
+                "error_type": "dataset_path_not_found",
+                "error": first["error"],
+                "message": first["error"],
+                "dataset": resolved_config,
+            }, []
+        scanned = sum(int(source.get("scanned", 0)) for source in sources)
+        payload = {
             "ok": False,
             "error_type": "inspect_failed",
             "error": (
@@ -272,27 +884,21 @@ def inspect_dataset_schema(
             "dataset": resolved_config,
             "sampled_records": 0,
             "scanned_lines": scanned,
+            "sampling": first.get("sampling", {"method": sampling}),
         }
-
-    key_stats: Dict[str, Dict[str, Any]] = {}
-    for row in rows:
-        for key, value in row.items():
-            stat = key_stats.setdefault(
-                key,
-                {
-                    "count": 0,
-                    "kinds": {},
-                    "avg_text_len": 0.0,
-                },
-            )
-            stat["count"] += 1
-            kind = _value_kind(value)
-            stat["kinds"][kind] = int(stat["kinds"].get(kind, 0)) + 1
-            if kind == "text":
-                prev_avg = float(stat["avg_text_len"])
-                text_count = int(stat["kinds"]["text"])
-                new_len = len(str(value))
-                stat["avg_text_len"] = prev_avg + (new_len - prev_avg) / text_count
+        if multi_source:
+            payload["sources"] = [_source_summary(source) for source in sources]
+        return payload, []
+
+    rows: List[Dict[str, Any]] = [row for source in inspected for row in source["rows"][:2]]
+    scanned = sum(int(source.get("scanned", 0)) for source in sources)
+    if multi_source:
+        key_stats = _merge_key_stats(
+            [source["key_stats"] for source in inspected],
+            source_names=[source["path"] for source in inspected],
+        )
+    else:
+        key_stats = inspected[0]["key_stats"]
 
     def text_score(item: Tuple[str, Dict[str, Any]]) -> float:
         key, stat = item
@@ -342,13 +948,14 @@ def inspect_dataset_schema(
                 one[k] = v
         preview.append(one)
 
-    return {
+    payload = {
         "ok": True,
         "message": "dataset inspected",
         "dataset": resolved_config,
-        "inspected_path": inspectable_path,
-        "sampled_records": len(rows),
+        "inspected_path": inspected[0]["path"],
+        "sampled_records": sum(int(source["sampled"]) for source in inspected),
         "scanned_lines": scanned,
+        "sampling": inspected[0]["sampling"],
         "modality": modality,
         "keys": sorted(key_stats.keys()),
         "candidate_text_keys": candidate_text_keys,
@@ -356,3 +963,10 @@ def inspect_dataset_schema(
         "key_stats": key_stats,
         "sample_preview": preview,
     }
+    if not multi_source and "parquet" in inspected[0]:
+        payload["parquet_metadata"] = inspected[0]["parquet"]
+    if multi_source:
+        payload["inspected_paths"] = [source["path"] for source in inspected]
+        payload["sources"] = [_source_summary(source) for source in sources]
+        payload["schema_conflicts"] = _find_schema_conflicts(inspected)
+    return payload, _collect_media_refs(inspected)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Validation of sampled local media references.
+
+``_looks_like_image_value`` classifies ``image_ref`` values by suffix only,
+so a dataset whose image paths are broken inspects cleanly and the plan
+fails later inside ``dj-process``.  :func:`validate_media_refs` checks each
+sampled local reference for existence, a non-zero size and a header whose
+magic bytes match an image format, concurrently in a bounded thread pool
+and within a wall-clock budget.  Remote URLs are counted but not fetched.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_MEDIA_TIME_BUDGET = 5.0
+_MAX_MEDIA_WORKERS = 16
+_MAX_REPORTED_EXAMPLES = 5
+_HEADER_BYTES = 16
+
+_IMAGE_MAGIC: Tuple[bytes, ...] = (
+    b"\xff\xd8\xff",  # JPEG
+    b"\x89PNG\r\n\x1a\n",
+    b"GIF87a",
+    b"GIF89a",
+    b"BM",
+    b"II*\x00",  # TIFF little-endian
+    b"MM\x00*",  # TIFF big-endian
+)
+
+
+def _looks_like_image_header(header: bytes, path: str) -> bool:
+    if header.startswith(_IMAGE_MAGIC):
+        return True
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return True
+    if path.lower().endswith(".svg"):
+        # SVG is XML text; accept anything that starts like markup.
+        return header.lstrip().startswith(b"<")
+    return False
+
+
+def _resolve(ref: str, base_dir: Optional[str]) -> str:
+    expanded = os.path.expanduser(ref)
+    if os.path.isabs(expanded) or not base_dir:
+        return expanded
+    candidate = os.path.join(base_dir, expanded)
+    # Data-Juicer resolves relative paths against the dataset directory; fall
+    # back to the working directory for datasets written with cwd-relative paths.
+    return candidate if os.path.exists(candidate) or not os.path.exists(expanded) else expanded
+
+
+def check_media_ref(ref: str, base_dir: Optional[str] = None) -> str:
+    """Return ``"ok"``, ``"missing"``, ``"empty"``, ``"invalid"`` or ``"unreadable"``."""
+    path = _resolve(ref.strip(), base_dir)
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        return "missing"
+    except OSError:
+        return "unreadable"
+    if size <= 0:
+        return "empty"
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_BYTES)
+    except OSError:
+        return "unreadable"
+    return "ok" if _looks_like_image_header(header, path) else "invalid"
+
+
+def validate_media_refs(
+    refs: Sequence[Tuple[str, Optional[str]]],
+    time_budget: float = DEFAULT_MEDIA_TIME_BUDGET,
+    max_workers: int = _MAX_MEDIA_WORKERS,
+) -> Dict[str, Any]:
+    """Check ``(reference, base_dir)`` pairs and summarise the outcome.
+
+    References still pending when *time_budget* seconds have elapsed are
+    reported as ``unchecked`` and rates are computed over checked ones only.
+    """
+    started = time.monotonic()
+    local: List[Tuple[str, Optional[str]]] = []
+    remote = 0
+    for ref, base_dir in refs:
+        if ref.strip().lower().startswith(("http://", "https://")):
+            remote += 1
+        else:
+            local.append((ref, base_dir))
+
+    counts = {"ok": 0, "missing": 0, "empty": 0, "invalid": 0, "unreadable": 0}
+    examples: List[Dict[str, str]] = []
+    timed_out = False
+    if local:
+        pool = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(local))),
+            thread_name_prefix="djx-media",
+        )
+        futures = {pool.submit(check_media_ref, ref, base_dir): ref for ref, base_dir in local}
+        pending = set(futures)
+        deadline = started + max(float(time_budget), 0.0)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    status = future.result()
+                    counts[status] += 1
+                    if status != "ok" and len(examples) < _MAX_REPORTED_EXAMPLES:
+                        examples.append({"ref": futures[future], "status": status})
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    checked = sum(counts.values())
+    invalid = counts["empty"] + counts["invalid"] + counts["unreadable"]
+    return {
+        "checked": checked,
+        "unchecked": len(local) - checked,
+        "remote_skipped": remote,
+        **counts,
+        "missing_rate": round(counts["missing"] / checked, 4) if checked else 0.0,
+        "invalid_rate": round(invalid / checked, 4) if checked else 0.0,
+        "examples": examples,
+        "timed_out": timed_out,
+        "elapsed_sec": round(time.monotonic() - started, 3),
+    }
+
+
+__all__ = [
+    "DEFAULT_MEDIA_TIME_BUDGET",
+    "check_media_ref",
+    "validate_media_refs",
+]
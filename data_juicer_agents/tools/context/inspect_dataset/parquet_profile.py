@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Metadata-first Parquet profiling.
+
+Parquet files carry their schema, row-group row counts and per-column
+min/max/null statistics and byte sizes in the footer.  :func:`profile_parquet`
+reads that footer, then reads a single small batch (or a few random row
+groups) and computes field kinds and text lengths with Arrow kernels via
+:mod:`.columnar`.  Only the two preview rows are ever converted to Python
+objects.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .columnar import arrow_key_stats, arrow_type_kind
+
+# Row-group statistics values longer than this are truncated in the report.
+_MAX_STAT_VALUE_CHARS = 120
+# Rows taken from each randomly chosen row group in random sampling mode.
+_ROWS_PER_ROW_GROUP = 4
+_PREVIEW_ROWS = 2
+
+
+def _json_safe(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, bytes):
+        value = value.decode("utf-8", errors="replace")
+    text = value if isinstance(value, str) else str(value)
+    if len(text) > _MAX_STAT_VALUE_CHARS:
+        text = text[: _MAX_STAT_VALUE_CHARS - 3] + "..."
+    return text
+
+
+def _merge_bound(current: Any, candidate: Any, pick_max: bool) -> Any:
+    if current is None:
+        return candidate
+    try:
+        if pick_max:
+            return candidate if candidate > current else current
+        return candidate if candidate < current else current
+    except TypeError:
+        return current
+
+
+def parquet_footer_profile(parquet_file: Any) -> Dict[str, Any]:
+    """Summarise a ``pyarrow.parquet.ParquetFile`` from its footer alone."""
+    metadata = parquet_file.metadata
+    schema = parquet_file.schema_arrow
+    group_rows = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+
+    columns: Dict[str, Dict[str, Any]] = {}
+    for field in schema:
+        columns[field.name] = {
+            "type": str(field.type),
+            "kind": arrow_type_kind(field.type),
+            "null_count": 0,
+            "min": None,
+            "max": None,
+            "compressed_bytes": 0,
+            "uncompressed_bytes": 0,
+        }
+    complete_nulls = {name: True for name in columns}
+    complete_bounds = {name: True for name in columns}
+
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+        for idx in range(row_group.num_columns):
+            chunk = row_group.column(idx)
+            path = chunk.path_in_schema
+            name = path.split(".", 1)[0]
+            entry = columns.get(name)
+            if entry is None:
+                continue
+            entry["compressed_bytes"] += int(chunk.total_compressed_size)
+            entry["uncompressed_bytes"] += int(chunk.total_uncompressed_size)
+            if path != name:
+                # Nested leaves: sizes roll up, statistics do not.
+                complete_nulls[name] = False
+                complete_bounds[name] = False
+                continue
+            stats = chunk.statistics
+            if stats is None or not stats.has_null_count:
+                complete_nulls[name] = False
+            else:
+                entry["null_count"] += int(stats.null_count)
+            if stats is None or not stats.has_min_max:
+                complete_bounds[name] = False
+            else:
+                entry["min"] = _merge_bound(entry["min"], stats.min, pick_max=False)
+                entry["max"] = _merge_bound(entry["max"], stats.max, pick_max=True)
+
+    num_rows = int(metadata.num_rows)
+    for name, entry in columns.items():
+        if complete_nulls[name]:
+            entry["null_rate"] = round(entry["null_count"] / num_rows, 4) if num_rows else 0.0
+        else:
+            entry["null_count"] = None
+        if complete_bounds[name]:
+            entry["min"] = _json_safe(entry["min"])
+            entry["max"] = _json_safe(entry["max"])
+        else:
+            entry["min"] = entry["max"] = None
+
+    return {
+        "num_rows": num_rows,
+        "num_row_groups": int(metadata.num_row_groups),
+        "row_group_rows": {
+            "min": min(group_rows) if group_rows else 0,
+            "max": max(group_rows) if group_rows else 0,
+        },
+        "serialized_footer_bytes": int(metadata.serialized_size),
+        "columns": columns,
+    }
+
+
+def _head_table(parquet_file: Any, sample_size: int) -> Any:
+    import pyarrow as pa
+
+    batches = parquet_file.iter_batches(batch_size=sample_size)
+    try:
+        batch = next(batches)
+    except StopIteration:
+        return pa.Table.from_batches([], schema=parquet_file.schema_arrow)
+    return pa.Table.from_batches([batch])
+
+
+def _random_table(
+    parquet_file: Any,
+    sample_size: int,
+    rng: random.Random,
+) -> tuple:
+    import pyarrow as pa
+
+    total_groups = parquet_file.num_row_groups
+    wanted = min(total_groups, max(1, math.ceil(sample_size / _ROWS_PER_ROW_GROUP)))
+    groups = rng.sample(range(total_groups), wanted)
+    per_group = math.ceil(sample_size / wanted)
+
+    pieces: List[Any] = []
+    taken = 0
+    rows_in_groups = 0
+    groups_read = 0
+    for group in groups:
+        if taken >= sample_size:
+            break
+        table = parquet_file.read_row_group(group)
+        groups_read += 1
+        rows_in_groups += table.num_rows
+        take = min(per_group, table.num_rows, sample_size - taken)
+        if take <= 0:
+            continue
+        picked = sorted(rng.sample(range(table.num_rows), take))
+        pieces.append(table.take(picked))
+        taken += take
+    if pieces:
+        sample = pa.concat_tables(pieces)
+    else:
+        sample = pa.Table.from_batches([], schema=parquet_file.schema_arrow)
+    return sample, groups_read, rows_in_groups
+
+
+def profile_parquet(
+    path: Path,
+    sample_size: int,
+    sampling: str = "head",
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Profile a Parquet file from its footer plus one small Arrow sample.
+
+    Returns ``{"rows", "sampled", "scanned", "sampling", "key_stats",
+    "parquet"}`` where ``rows`` holds only the preview rows.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(str(path))
+    footer = parquet_footer_profile(parquet_file)
+    total_rows = footer["num_rows"]
+
+    if sampling == "random" and parquet_file.num_row_groups > 0 and total_rows > 0:
+        sample, groups_read, rows_in_groups = _random_table(
+            parquet_file, sample_size, random.Random(seed)
+        )
+        sampling_info: Dict[str, Any] = {
+            "method": "random_row_groups",
+            "seed": seed,
+            "row_groups_read": groups_read,
+            "row_groups_total": parquet_file.num_row_groups,
+            "rows_total": total_rows,
+            "coverage": round(min(rows_in_groups / total_rows, 1.0), 4),
+        }
+    else:
+        sample = _head_table(parquet_file, sample_size)
+        sampling_info = {"method": "head"}
+        if total_rows:
+            sampling_info["coverage"] = round(min(sample.num_rows / total_rows, 1.0), 4)
+
+    return {
+        "rows": sample.slice(0, _PREVIEW_ROWS).to_pylist(),
+        "sampled": sample.num_rows,
+        "scanned": sample.num_rows,
+        "sampling": sampling_info,
+        "key_stats": arrow_key_stats(sample) if sample.num_rows else {},
+        "parquet": footer,
+    }
+
+
+__all__ = ["parquet_footer_profile", "profile_parquet"]
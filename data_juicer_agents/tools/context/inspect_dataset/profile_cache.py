@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Persistent cache of dataset inspection profiles.
+
+Planning inspects the same dataset several times (retrieval tag inference,
+``PlanOrchestrator.generate_plan``, the session ``inspect_dataset`` tool),
+and each call used to re-read the files.  Successful profiles are stored as
+JSON under ``.djx/profiles/`` keyed by the resolved dataset config, the
+absolute path, size and mtime of every inspected source, and the sampling
+parameters, so any change to the data or the request yields a new key.
+
+Entries are evicted least-recently-used once the directory exceeds its
+entry or byte cap; a hit refreshes the entry's mtime.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Bump when the profile payload shape changes so stale entries are ignored.
+PROFILE_FORMAT_VERSION = 3
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_profile_cache_dir() -> Path:
+    """Return the profile cache directory (``DJX_PROFILE_CACHE_DIR`` or ``./.djx/profiles``)."""
+    raw = str(os.environ.get("DJX_PROFILE_CACHE_DIR", "")).strip()
+    return Path(raw or "./.djx/profiles").expanduser()
+
+
+def _fingerprint_path(
+    path_value: str,
+    list_shards: Optional[Callable[[str], Iterable[str]]] = None,
+    max_shards: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """Return ``{path, size, mtime_ns}`` for a source, or ``None`` if missing.
+
+    Directories and glob patterns also get ``shards``: ``[path, size,
+    mtime_ns]`` for every data file *list_shards* yields (at most
+    *max_shards*), so a shard rewritten in place changes the key.  Without
+    *list_shards* such sources are uncacheable.
+    """
+    target = Path(path_value).expanduser()
+    is_glob = any(ch in path_value for ch in "*?[")
+    if is_glob:
+        literal = []
+        for part in target.parts:
+            if any(ch in part for ch in "*?["):
+                break
+            literal.append(part)
+        target = Path(*literal) if literal else Path(".")
+    try:
+        stat = target.stat()
+    except OSError:
+        return None
+    fingerprint: Dict[str, Any] = {
+        "path": os.path.abspath(path_value),
+        "size": int(stat.st_size),
+        "mtime_ns": int(stat.st_mtime_ns),
+    }
+    if not is_glob and not target.is_dir():
+        return fingerprint
+    if list_shards is None:
+        return None
+    shards: List[List[Any]] = []
+    for shard in itertools.islice(list_shards(path_value), max_shards):
+        try:
+            shard_stat = os.stat(shard)
+        except OSError:
+            return None
+        shards.append([os.path.abspath(shard), int(shard_stat.st_size), int(shard_stat.st_mtime_ns)])
+    fingerprint["shards"] = sorted(shards)
+    return fingerprint
+
+
+def profile_cache_key(
+    dataset_config: Dict[str, Any],
+    paths: List[str],
+    sample_size: int,
+    sampling: str,
+    seed: Optional[int],
+    full_profile: bool = False,
+    list_shards: Optional[Callable[[str], Iterable[str]]] = None,
+    max_shards: Optional[int] = None,
+) -> Optional[str]:
+    """Return the cache key for an inspection request, or ``None`` if uncacheable.
+
+    *list_shards* / *max_shards* are passed to the fingerprint of directory
+    and glob sources (see :func:`_fingerprint_path`).
+    """
+    fingerprints = []
+    for path_value in paths:
+        fingerprint = _fingerprint_path(path_value, list_shards, max_shards)
+        if fingerprint is None:
+            return None
+        fingerprints.append(fingerprint)
+    material = {
+        "version": PROFILE_FORMAT_VERSION,
+        "dataset": dataset_config,
+        "sources": fingerprints,
+        "sample_size": int(sample_size),
+        "sampling": sampling,
+        "seed": seed,
+        "full_profile": bool(full_profile),
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ProfileCache:
+    """Directory of JSON profiles with an LRU entry/byte cap."""
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.root = Path(root).expanduser()
+        self.max_entries = max(int(max_entries), 1)
+        self.max_bytes = max(int(max_bytes), 1)
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self.path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return payload
+
+    def put(self, key: str, payload: Dict[str, Any]) -> Optional[Path]:
+        """Store *payload*; returns ``None`` if it is not JSON-serializable."""
+        try:
+            encoded = json.dumps(payload, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+        path = self.path_for(key)
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=str(self.root), prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(encoded)
+            os.replace(tmp, path)
+        except OSError as exc:
+            _logger.debug("profile cache write failed for %s: %s", path, exc)
+            return None
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries beyond the caps; returns the count removed."""
+        entries = []
+        try:
+            for entry in os.scandir(self.root):
+                if entry.is_file() and entry.name.endswith(".json") and not entry.name.startswith("."):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return 0
+        entries.sort(reverse=True)
+        removed = 0
+        kept = 0
+        kept_bytes = 0
+        full = False
+        for _mtime, size, path in entries:
+            if not full and kept < self.max_entries and kept_bytes + size <= self.max_bytes:
+                kept += 1
+                kept_bytes += size
+                continue
+            full = True
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_MAX_ENTRIES",
+    "PROFILE_FORMAT_VERSION",
+    "ProfileCache",
+    "default_profile_cache_dir",
+    "profile_cache_key",
+]
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from data_juicer_agents.core.tool import ToolContext, ToolResult, ToolSpec
 from data_juicer_agents.utils.runtime_helpers import to_int
 
@@ -10,11 +12,19 @@ from .input import GenericOutput, InspectDatasetInput
 from .logic import inspect_dataset_schema
 
 
-def _inspect_dataset(_ctx: ToolContext, args: InspectDatasetInput) -> ToolResult:
+def _inspect_dataset(ctx: ToolContext, args: InspectDatasetInput) -> ToolResult:
     payload = inspect_dataset_schema(
         dataset_path=args.dataset_path.strip(),
         sample_size=max(to_int(args.sample_size, 20), 1),
         dataset=args.dataset,
+        sampling=args.sampling,
+        seed=args.seed,
+        cache_dir=Path(ctx.working_dir).expanduser() / "profiles",
+        refresh=args.refresh,
+        full_profile=args.full_profile,
+        profile_workers=args.profile_workers,
+        validate_media=args.validate_media,
+        media_time_budget=args.media_time_budget,
     )
     if payload.get("ok"):
         return ToolResult.success(summary=str(payload.get("message", "dataset inspected")), data=payload)
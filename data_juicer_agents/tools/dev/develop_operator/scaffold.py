@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import re
 import subprocess
@@ -373,11 +374,22 @@ def run_smoke_check(scaffold: ScaffoldResult) -> Tuple[bool, str]:
         encoding="utf-8",
     )
 
-    command = ["dj-process", "--config", str(recipe_path)]
-    proc = subprocess.run(command, capture_output=True, text=True)
-    if proc.returncode == 0:
+    if importlib.util.find_spec("data_juicer") is not None:
+        # Fork from the warm Data-Juicer server instead of paying a full
+        # dj-process start-up for a one-row recipe.
+        from data_juicer_agents.tools.apply.apply_recipe.forkserver import run_recipe_captured
+
+        returncode, _, stderr = run_recipe_captured(
+            str(recipe_path),
+            custom_operator_paths=[str(scaffold.output_dir)],
+        )
+    else:
+        command = ["dj-process", "--config", str(recipe_path)]
+        proc = subprocess.run(command, capture_output=True, text=True)
+        returncode, stderr = proc.returncode, proc.stderr or ""
+    if returncode == 0:
         return True, "Smoke check passed."
-    stderr = (proc.stderr or "").strip()
+    stderr = stderr.strip()
     if len(stderr) > 3000:
         stderr = stderr[-3000:]
-    return False, f"Smoke check failed (exit={proc.returncode}).\n{stderr}"
+    return False, f"Smoke check failed (exit={returncode}).\n{stderr}"
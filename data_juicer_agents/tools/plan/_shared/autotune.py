@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""Auto-tuning of parallelism settings for system specs.
+
+``build_system_spec`` used to leave ``np`` and the related executor fields
+at Data-Juicer's defaults (``np: 4``, 256 MB partitions) unless the
+planner set them, so small datasets paid for worker start-up they could
+not use and big hosts ran four workers.  :func:`autotune_system_config`
+derives them from:
+
+* the host: CPUs this process may run on and the memory available to it
+  (``MemAvailable``, bounded by a cgroup v2 limit when there is one);
+* the dataset size from an ``inspect_dataset`` profile: exact rows from a
+  full profile, else an estimate from the local file sizes and the
+  average sampled row size; callers that know the size can pass rows
+  and bytes directly instead;
+* the operator mix: catalog tags split operators into CPU, model-backed
+  (``gpu``/``hf``/``vllm``, one model copy per worker) and API-backed ones.
+
+The rules are deliberately simple: ``np`` is the smallest of the CPU
+count, the workers that fit in memory and one worker per
+:data:`MIN_ROWS_PER_WORKER` rows; model operators turn on
+``adaptive_batch_size``; ``ray_partitioned`` runs get a
+``partition.target_size_mb`` small enough to give every worker a
+partition.  ``ray`` and ``ray_partitioned`` runs execute on a Ray
+cluster, not on this host, so for them the host is ignored and ``np`` is
+left alone.  Fields the caller set explicitly are never changed.  Each
+decision is returned as an ``[auto-tuned]`` note that ends up in the
+spec's warnings, and hence in the plan.
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+_logger = logging.getLogger(__name__)
+
+# Below this many rows per worker, worker start-up and pickling cost more
+# than the extra parallelism saves.
+MIN_ROWS_PER_WORKER = 1000
+# Memory one worker needs for CPU operators, and for model-backed ones
+# (each worker loads its own copy of the model).
+CPU_WORKER_BYTES = 512 * 1024 * 1024
+MODEL_WORKER_BYTES = 4 * 1024 * 1024 * 1024
+# Share of the available memory the run may plan for.
+MEMORY_HEADROOM = 0.8
+# Partition size bounds for ray_partitioned runs.
+MIN_PARTITION_MB = 32
+MAX_PARTITION_MB = 512
+
+_MODEL_TAGS = frozenset({"gpu", "hf", "vllm"})
+_API_TAGS = frozenset({"api"})
+_MODEL_PARAM_HINTS = ("hf_", "model_key", "enable_vllm")
+_API_PARAM_HINTS = ("api_model", "api_endpoint")
+_GIB = 1024 ** 3
+_MIB = 1024 ** 2
+# Executors whose workers run on a Ray cluster rather than this host.
+_CLUSTER_EXECUTORS = frozenset({"ray", "ray_partitioned"})
+
+
+@dataclass
+class HostResources:
+    """CPUs and memory available to this process."""
+
+    cpus: int
+    memory_bytes: Optional[int] = None
+
+
+@dataclass
+class DatasetSize:
+    """Row count and byte size of a dataset; ``estimated`` unless counted."""
+
+    rows: Optional[int] = None
+    bytes: Optional[int] = None
+    source: str = "unknown"
+    estimated: bool = True
+
+
+def _available_cpus() -> int:
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except (AttributeError, OSError):
+        return max(os.cpu_count() or 1, 1)
+
+
+def _meminfo_available(path: str = "/proc/meminfo") -> Optional[int]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return int(os.sysconf("SC_AVPHYS_PAGES")) * int(os.sysconf("SC_PAGE_SIZE"))
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _cgroup_headroom(root: str = "/sys/fs/cgroup") -> Optional[int]:
+    """Bytes left under a cgroup v2 memory limit, ``None`` when unlimited."""
+    try:
+        with open(os.path.join(root, "memory.max"), "r", encoding="utf-8") as handle:
+            limit = handle.read().strip()
+        if limit == "max":
+            return None
+        with open(os.path.join(root, "memory.current"), "r", encoding="utf-8") as handle:
+            current = int(handle.read().strip())
+        return max(int(limit) - current, 0)
+    except (OSError, ValueError):
+        return None
+
+
+def detect_host_resources() -> HostResources:
+    memory = _meminfo_available()
+    headroom = _cgroup_headroom()
+    if headroom is not None:
+        memory = headroom if memory is None else min(memory, headroom)
+    return HostResources(cpus=_available_cpus(), memory_bytes=memory)
+
+
+def _local_source_paths(profile: Mapping[str, Any]) -> List[str]:
+    dataset = profile.get("dataset")
+    configs = dataset.get("configs") if isinstance(dataset, Mapping) else None
+    paths: List[str] = []
+    for cfg in configs or []:
+        if not isinstance(cfg, Mapping) or str(cfg.get("type", "local")).strip() != "local":
+            continue
+        path_value = str(cfg.get("path", "")).strip()
+        if path_value:
+            paths.append(path_value)
+    return paths
+
+
+def _source_bytes(path_value: str) -> Optional[int]:
+    expanded = os.path.expanduser(path_value)
+    if any(ch in path_value for ch in "*?["):
+        files = [item for item in glob.glob(expanded, recursive=True) if os.path.isfile(item)]
+    elif os.path.isdir(expanded):
+        files = [
+            os.path.join(root, name)
+            for root, _dirs, names in os.walk(expanded)
+            for name in names
+        ]
+    elif os.path.isfile(expanded):
+        files = [expanded]
+    else:
+        return None
+    total = 0
+    for item in files:
+        try:
+            total += os.path.getsize(item)
+        except OSError:
+            continue
+    return total
+
+
+def _average_row_bytes(profile: Mapping[str, Any]) -> Optional[float]:
+    """Approximate serialized row size from the sampled ``key_stats``."""
+    key_stats = profile.get("key_stats")
+    if not isinstance(key_stats, Mapping) or not key_stats:
+        return None
+    total = 0.0
+    for key, stats in key_stats.items():
+        # Quotes, colon and separator around every key/value pair.
+        total += len(str(key)) + 6
+        avg_len = stats.get("avg_text_len") if isinstance(stats, Mapping) else None
+        total += float(avg_len) if isinstance(avg_len, (int, float)) else 16.0
+    return max(total, 1.0)
+
+
+def estimate_dataset_size(profile: Optional[Mapping[str, Any]]) -> DatasetSize:
+    """Size of the profiled dataset, counted when the profile has it."""
+    if not isinstance(profile, Mapping) or not profile.get("ok"):
+        return DatasetSize()
+    paths = _local_source_paths(profile)
+    sizes = [_source_bytes(path) for path in paths]
+    total_bytes = sum(sizes) if paths and all(size is not None for size in sizes) else None
+
+    full = profile.get("full_profile")
+    if isinstance(full, Mapping) and isinstance(full.get("rows"), int):
+        return DatasetSize(rows=full["rows"], bytes=total_bytes, source="full_profile", estimated=False)
+    sampling = profile.get("sampling")
+    if isinstance(sampling, Mapping) and isinstance(sampling.get("rows_total"), int):
+        return DatasetSize(rows=sampling["rows_total"], bytes=total_bytes, source="parquet_footer", estimated=False)
+    if total_bytes is None:
+        return DatasetSize()
+    row_bytes = _average_row_bytes(profile)
+    rows = int(math.ceil(total_bytes / row_bytes)) if row_bytes else None
+    return DatasetSize(rows=rows, bytes=total_bytes, source="file_size")
+
+
+def _operator_entries(operators: Iterable[Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """``(name, params)`` for process-spec items and DJ-native ``{name: params}``."""
+    entries: List[Tuple[str, Dict[str, Any]]] = []
+    for item in operators or []:
+        if isinstance(item, Mapping) and "name" in item:
+            params = item.get("params")
+            entries.append((str(item["name"]).strip(), dict(params) if isinstance(params, Mapping) else {}))
+        elif isinstance(item, Mapping) and len(item) == 1:
+            name, params = next(iter(item.items()))
+            entries.append((str(name).strip(), dict(params) if isinstance(params, Mapping) else {}))
+        elif hasattr(item, "name"):
+            params = getattr(item, "params", None)
+            entries.append((str(item.name).strip(), dict(params) if isinstance(params, Mapping) else {}))
+    return [entry for entry in entries if entry[0]]
+
+
+def _catalog_tags(names: Set[str]) -> Dict[str, Tuple[str, ...]]:
+    try:
+        from data_juicer_agents.tools.retrieve._shared.backend import get_op_catalog, init_op_catalog
+        from data_juicer_agents.tools.retrieve._shared.backend.record import index_operator_records
+
+        init_op_catalog()
+        _records, name_map = index_operator_records(get_op_catalog())
+    except Exception as exc:
+        _logger.debug("operator catalog unavailable for auto-tuning: %s", exc)
+        return {}
+    return {name: name_map[name].class_tags for name in names if name in name_map}
+
+
+def classify_operators(
+    operators: Iterable[Any],
+    operator_tags: Optional[Mapping[str, Sequence[str]]] = None,
+) -> Dict[str, str]:
+    """Map each operator to ``"cpu"``, ``"model"`` or ``"api"``.
+
+    Tags come from *operator_tags*, then the operator catalog; operators
+    without tags (e.g. custom ones) are judged by their parameter names.
+    """
+    entries = _operator_entries(operators)
+    tags: Dict[str, Tuple[str, ...]] = {
+        name: tuple(values) for name, values in (operator_tags or {}).items()
+    }
+    missing = {name for name, _params in entries if name not in tags}
+    if missing:
+        tags.update(_catalog_tags(missing))
+
+    rank = {"cpu": 0, "api": 1, "model": 2}
+    kinds: Dict[str, str] = {}
+    for name, params in entries:
+        op_tags = set(tags.get(name, ()))
+        param_names = [str(key) for key in params]
+        if op_tags & _MODEL_TAGS or any(key.startswith(_MODEL_PARAM_HINTS) for key in param_names):
+            kind = "model"
+        elif op_tags & _API_TAGS or any(key.startswith(_API_PARAM_HINTS) for key in param_names):
+            kind = "api"
+        else:
+            kind = "cpu"
+        # An operator used twice counts with its heaviest configuration.
+        if rank[kind] >= rank[kinds.get(name, "cpu")]:
+            kinds[name] = kind
+    return kinds
+
+
+def _format_bytes(value: float) -> str:
+    return f"{value / _GIB:.1f} GiB" if value >= _GIB else f"{value / _MIB:.0f} MiB"
+
+
+def _pow2_ceil(value: float) -> int:
+    return 1 << max(int(math.ceil(value)) - 1, 0).bit_length()
+
+
+def autotune_system_config(
+    config: Mapping[str, Any],
+    *,
+    explicit: Iterable[str] = (),
+    dataset_profile: Optional[Mapping[str, Any]] = None,
+    operators: Optional[Iterable[Any]] = None,
+    operator_tags: Optional[Mapping[str, Sequence[str]]] = None,
+    host: Optional[HostResources] = None,
+    dataset_rows: Optional[int] = None,
+    dataset_bytes: Optional[int] = None,
+) -> Tuple[Dict[str, Any], List[str], Dict[str, Any]]:
+    """Derive parallelism settings for a DJ system *config*.
+
+    Returns ``(updates, notes, details)``: the fields to change, one
+    ``[auto-tuned]`` note per decision and the inputs the decisions were
+    based on.  Fields named in *explicit* are left alone; *host* defaults
+    to :func:`detect_host_resources`.  *dataset_rows* / *dataset_bytes*
+    override the size estimated from *dataset_profile*.
+    """
+    explicit = set(explicit)
+    executor_type = str(config.get("executor_type") or "default").strip()
+    on_cluster = executor_type in _CLUSTER_EXECUTORS
+    if not on_cluster:
+        host = host or detect_host_resources()
+    dataset = estimate_dataset_size(dataset_profile)
+    if dataset_rows is not None or dataset_bytes is not None:
+        dataset = DatasetSize(
+            rows=dataset_rows if dataset_rows is not None else dataset.rows,
+            bytes=dataset_bytes if dataset_bytes is not None else dataset.bytes,
+            source="caller",
+            estimated=dataset_rows is None and dataset.estimated,
+        )
+    kinds = classify_operators(operators or [], operator_tags)
+    model_ops = sorted(name for name, kind in kinds.items() if kind == "model")
+    api_ops = sorted(name for name, kind in kinds.items() if kind == "api")
+
+    updates: Dict[str, Any] = {}
+    notes: List[str] = []
+
+    # --- np -----------------------------------------------------------------
+    worker_bytes = MODEL_WORKER_BYTES if model_ops else CPU_WORKER_BYTES
+    current_np = int(config.get("np") or 1)
+    if "np" in explicit:
+        notes.append(f"[auto-tuned] kept np={current_np} set by the caller")
+        np_value = current_np
+    elif on_cluster:
+        notes.append(
+            f"[auto-tuned] kept np={current_np}: executor_type={executor_type} runs on a Ray cluster "
+            "whose resources this host does not reflect; set np to the cluster's worker count"
+        )
+        np_value = current_np
+    else:
+        limits = [(host.cpus, f"{host.cpus} CPUs")]
+        if host.memory_bytes:
+            by_memory = max(int(host.memory_bytes * MEMORY_HEADROOM // worker_bytes), 1)
+            limits.append(
+                (
+                    by_memory,
+                    f"{by_memory} by memory ({_format_bytes(host.memory_bytes)} available, "
+                    f"{_format_bytes(worker_bytes)} per {'model ' if model_ops else ''}worker)",
+                )
+            )
+        if dataset.rows is not None:
+            by_rows = max(int(math.ceil(dataset.rows / MIN_ROWS_PER_WORKER)), 1)
+            limits.append(
+                (
+                    by_rows,
+                    f"{by_rows} by data ({'~' if dataset.estimated else ''}{dataset.rows:,} rows, "
+                    f"{MIN_ROWS_PER_WORKER:,} per worker)",
+                )
+            )
+        else:
+            limits.append((current_np, f"default np={current_np} (dataset size unknown)"))
+        np_value = max(min(limit for limit, _reason in limits), 1)
+        updates["np"] = np_value
+        notes.append(
+            f"[auto-tuned] np={np_value}: min of " + ", ".join(reason for _limit, reason in limits)
+        )
+    if api_ops:
+        notes.append(
+            "[auto-tuned] API-backed operators ("
+            + ", ".join(api_ops)
+            + ") are bound by the remote service; raise np only if its rate limit allows"
+        )
+
+    # --- batch sizes --------------------------------------------------------
+    if model_ops and "adaptive_batch_size" not in explicit and not config.get("adaptive_batch_size"):
+        updates["adaptive_batch_size"] = True
+        notes.append(
+            "[auto-tuned] adaptive_batch_size=true: model operators ("
+            + ", ".join(model_ops)
+            + ") get the largest batch that fits instead of a fixed one"
+        )
+
+    # --- partitions (ray_partitioned only) -----------------------------------
+    # Sized from the data alone; the partitions are processed on cluster nodes.
+    if executor_type == "ray_partitioned" and "partition.target_size_mb" not in explicit and dataset.bytes:
+        current_mb = int(config.get("partition.target_size_mb") or MAX_PARTITION_MB)
+        per_worker_mb = min(max(_pow2_ceil(dataset.bytes / _MIB / np_value), MIN_PARTITION_MB), MAX_PARTITION_MB)
+        if per_worker_mb < current_mb:
+            updates["partition.target_size_mb"] = per_worker_mb
+            notes.append(
+                f"[auto-tuned] partition.target_size_mb={per_worker_mb}: "
+                f"{_format_bytes(dataset.bytes)} of data split across {np_value} workers"
+            )
+
+    details = {
+        "host": None if on_cluster else {"cpus": host.cpus, "memory_bytes": host.memory_bytes},
+        "dataset": {
+            "rows": dataset.rows,
+            "bytes": dataset.bytes,
+            "source": dataset.source,
+            "estimated": dataset.estimated,
+        },
+        "operators": kinds,
+        "settings": dict(updates),
+    }
+    return updates, notes, details
+
+
+__all__ = [
+    "CPU_WORKER_BYTES",
+    "DatasetSize",
+    "HostResources",
+    "MIN_ROWS_PER_WORKER",
+    "MODEL_WORKER_BYTES",
+    "autotune_system_config",
+    "classify_operators",
+    "detect_host_resources",
+    "estimate_dataset_size",
+]
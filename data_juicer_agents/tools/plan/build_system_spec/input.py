@@ -3,7 +3,7 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -32,6 +32,43 @@ class BuildSystemSpecInput(BaseModel):
         default_factory=list,
         description="Paths to custom operator modules or packages."
     )
+
+    auto_tune: bool = Field(
+        True,
+        description=(
+            "Derive np, adaptive_batch_size and (for ray_partitioned) partition.target_size_mb "
+            "from the host CPUs/memory, the dataset size and the operator mix. "
+            "Fields passed explicitly are never changed."
+        ),
+    )
+
+    dataset_profile: Dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Dataset inspection payload returned by inspect_dataset, used to size np. "
+            "Prefer dataset_path, which reuses the cached inspect_dataset profile."
+        ),
+    )
+
+    dataset_path: Optional[str] = Field(
+        None,
+        description="Dataset path to size np from when dataset_profile is not given; reuses the cached inspect_dataset profile.",
+    )
+
+    dataset_rows: Optional[int] = Field(
+        None,
+        description="Known dataset row count; overrides the estimate from the profile.",
+    )
+
+    dataset_bytes: Optional[int] = Field(
+        None,
+        description="Known dataset size in bytes; overrides the estimate from the profile.",
+    )
+
+    operators: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Operators of the process spec returned by build_process_spec, used to detect model-heavy operators.",
+    )
     
     # All other system parameters (open_tracer, use_cache, checkpoint, etc.)
     # can be passed directly as kwargs - they will be validated by DJ bridge
\ No newline at end of file
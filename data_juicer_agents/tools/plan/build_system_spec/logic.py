@@ -3,8 +3,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping
 
+from .._shared.autotune import autotune_system_config
 from .._shared.normalize import normalize_string_list
 from .._shared.schema import SystemSpec
 from .._shared.system_spec import validate_system_spec_payload
@@ -35,6 +37,13 @@ def build_system_spec(
     custom_operator_paths: Iterable[Any] | None = None,
     np: int | None = None,
     executor_type: str | None = None,
+    auto_tune: bool = True,
+    dataset_profile: Mapping[str, Any] | None = None,
+    dataset_path: str | None = None,
+    dataset_rows: int | None = None,
+    dataset_bytes: int | None = None,
+    operators: Iterable[Any] | None = None,
+    profile_cache_dir: str | Path | None = None,
     **kwargs: Any
 ) -> Dict[str, Any]:
     """Build system spec with complete config dynamically loaded from Data-Juicer.
@@ -46,6 +55,19 @@ def build_system_spec(
         custom_operator_paths: Optional list of custom operator paths
         np: Optional number of processes
         executor_type: Optional executor type
+        auto_tune: Derive ``np``, ``adaptive_batch_size`` and partition
+                   settings the caller did not set from the host, the
+                   dataset size in *dataset_profile* and the operator mix
+                   in *operators* (see ``_shared.autotune``)
+        dataset_profile: Optional ``inspect_dataset`` payload
+        dataset_path: Dataset to size when no *dataset_profile* is given;
+                      it is inspected through the profile cache in
+                      *profile_cache_dir*, so an earlier ``inspect_dataset``
+                      call is reused
+        dataset_rows: Optional row count, overriding the estimate
+        dataset_bytes: Optional dataset size in bytes, overriding the estimate
+        operators: Optional process-spec operators (``{"name", "params"}``)
+        profile_cache_dir: Optional profile cache directory for *dataset_path*
         **kwargs: Any additional system config options (must be valid DJ system
                   config fields — unknown keys will raise ValueError)
         
@@ -75,19 +97,49 @@ def build_system_spec(
             )
         dj_system_config.update(kwargs)
 
+    autotune: Dict[str, Any] = {}
+    tuning_notes: List[str] = []
+    if auto_tune:
+        explicit = set(kwargs)
+        if np is not None:
+            explicit.add("np")
+        try:
+            if not dataset_profile and dataset_path:
+                from data_juicer_agents.tools.context.inspect_dataset import inspect_dataset_schema
+
+                dataset_profile = inspect_dataset_schema(
+                    dataset_path=dataset_path,
+                    cache_dir=profile_cache_dir,
+                )
+            updates, tuning_notes, autotune = autotune_system_config(
+                dj_system_config,
+                explicit=explicit,
+                dataset_profile=dataset_profile,
+                operators=operators,
+                dataset_rows=dataset_rows,
+                dataset_bytes=dataset_bytes,
+            )
+            dj_system_config.update(updates)
+        except Exception as exc:
+            tuning_notes = [f"[auto-tuned] skipped: {exc}"]
+
     # Create SystemSpec from DJ config (dynamically handles all fields)
     spec = SystemSpec.from_dj_config(dj_system_config)
+    spec.warnings.extend(tuning_notes)
 
     # Validate using DJ-aware validation
     errors, warnings = validate_system_spec_payload(spec)
 
-    return {
+    result = {
         "ok": len(errors) == 0,
         "system_spec": spec.to_dict(),
         "validation_errors": errors,
         "warnings": warnings,
         "message": "system spec built" if not errors else "system spec build failed",
     }
+    if autotune:
+        result["autotune"] = autotune
+    return result
 
 
 __all__ = ["build_system_spec"]
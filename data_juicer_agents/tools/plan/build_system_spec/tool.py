@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from pydantic import BaseModel
 
 from data_juicer_agents.core.tool import ToolContext, ToolResult, ToolSpec
@@ -13,10 +15,11 @@ from .logic import build_system_spec
 class GenericOutput(BaseModel):
     ok: bool = True
 
-def _build_system_spec(_ctx: ToolContext, args: BuildSystemSpecInput) -> ToolResult:
+def _build_system_spec(ctx: ToolContext, args: BuildSystemSpecInput) -> ToolResult:
     
     result = build_system_spec(
         **args.model_dump(exclude_none=True),
+        profile_cache_dir=Path(ctx.working_dir).expanduser() / "profiles",
     )
     if result.get("ok"):
         return ToolResult.success(summary=str(result.get("message", "system spec built")), data=result)
@@ -32,6 +35,9 @@ BUILD_SYSTEM_SPEC = ToolSpec(
     description=(
         "Build a system spec with Data-Juicer configuration. "
         "Core parameters: np, executor_type, custom_operator_paths. "
+        "Pass dataset_path (the cached inspect_dataset profile is reused; or dataset_rows/dataset_bytes) "
+        "and the process_spec operators so that np, adaptive_batch_size and "
+        "partition settings not given explicitly are auto-tuned to the host and dataset. "
         "Advanced parameters (open_tracer, use_cache, checkpoint, etc.) can be passed directly. "
         "Use list_system_config to discover all available system configuration options."
     ),
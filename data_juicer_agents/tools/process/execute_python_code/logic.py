@@ -4,12 +4,18 @@
 from __future__ import annotations
 
 import sys
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional
 
 from data_juicer_agents.utils.runtime_helpers import run_interruptible_subprocess, to_int
 
 
-def execute_python_code(*, code: str, timeout: int = 120) -> Dict[str, Any]:
+def execute_python_code(
+    *,
+    code: str,
+    timeout: int = 120,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
     snippet = str(code or "")
     if not snippet.strip():
         return {
@@ -19,6 +25,11 @@ def execute_python_code(*, code: str, timeout: int = 120) -> Dict[str, Any]:
             "message": "code is required for execute_python_code",
         }
     timeout_sec = max(to_int(timeout, 120), 1)
-    payload = run_interruptible_subprocess([sys.executable, "-c", snippet], timeout_sec=timeout_sec, shell=False)
+    payload = run_interruptible_subprocess(
+        [sys.executable, "-c", snippet],
+        timeout_sec=timeout_sec,
+        shell=False,
+        cancel_event=cancel_event,
+    )
     payload["action"] = "execute_python_code"
     return payload
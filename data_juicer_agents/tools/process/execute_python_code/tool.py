@@ -9,8 +9,12 @@ from .input import ExecutePythonCodeInput, GenericOutput
 from .logic import execute_python_code
 
 
-def _execute_python_code(_ctx: ToolContext, args: ExecutePythonCodeInput) -> ToolResult:
-    payload = execute_python_code(code=args.code, timeout=args.timeout)
+def _execute_python_code(ctx: ToolContext, args: ExecutePythonCodeInput) -> ToolResult:
+    payload = execute_python_code(
+        code=args.code,
+        timeout=args.timeout,
+        cancel_event=ctx.runtime_values.get("cancel_event"),
+    )
     if payload.get("ok"):
         return ToolResult.success(summary=str(payload.get("message", "python finished")), data=payload)
     return ToolResult.failure(
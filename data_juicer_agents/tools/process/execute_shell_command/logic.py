@@ -3,12 +3,18 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional
 
 from data_juicer_agents.utils.runtime_helpers import run_interruptible_subprocess, to_int
 
 
-def execute_shell_command(*, command: str, timeout: int = 120) -> Dict[str, Any]:
+def execute_shell_command(
+    *,
+    command: str,
+    timeout: int = 120,
+    cancel_event: Optional[threading.Event] = None,
+) -> Dict[str, Any]:
     cmd = str(command or "").strip()
     if not cmd:
         return {
@@ -18,6 +24,11 @@ def execute_shell_command(*, command: str, timeout: int = 120) -> Dict[str, Any]
             "message": "command is required for execute_shell_command",
         }
     timeout_sec = max(to_int(timeout, 120), 1)
-    payload = run_interruptible_subprocess(cmd, timeout_sec=timeout_sec, shell=True)
+    payload = run_interruptible_subprocess(
+        cmd,
+        timeout_sec=timeout_sec,
+        shell=True,
+        cancel_event=cancel_event,
+    )
     payload["action"] = "execute_shell_command"
     return payload
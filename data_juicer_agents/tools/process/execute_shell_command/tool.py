@@ -9,8 +9,12 @@ from .input import ExecuteShellCommandInput, GenericOutput
 from .logic import execute_shell_command
 
 
-def _execute_shell_command(_ctx: ToolContext, args: ExecuteShellCommandInput) -> ToolResult:
-    payload = execute_shell_command(command=args.command, timeout=args.timeout)
+def _execute_shell_command(ctx: ToolContext, args: ExecuteShellCommandInput) -> ToolResult:
+    payload = execute_shell_command(
+        command=args.command,
+        timeout=args.timeout,
+        cancel_event=ctx.runtime_values.get("cancel_event"),
+    )
     if payload.get("ok"):
         return ToolResult.success(summary=str(payload.get("message", "command finished")), data=payload)
     return ToolResult.failure(
@@ -9,10 +9,12 @@ from ._shared import (
     get_available_operator_names,
     get_operator_info,
     list_operator_catalog,
+    register_custom_operators,
     resolve_operator_name,
     retrieve_operator_candidates,
     retrieve_operator_candidates_api,
     retrieve_operator_candidates_local,
+    watch_custom_operators,
 )
 from .retrieve_operators import RetrieveOperatorsInput
 from .retrieve_operators_api import RetrieveOperatorsAPIInput
@@ -31,8 +33,10 @@ __all__ = [
     "get_available_operator_names",
     "get_operator_info",
     "list_operator_catalog",
+    "register_custom_operators",
     "resolve_operator_name",
     "retrieve_operator_candidates",
     "retrieve_operator_candidates_api",
     "retrieve_operator_candidates_local",
+    "watch_custom_operators",
 ]
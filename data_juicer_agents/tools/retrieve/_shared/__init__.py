@@ -9,6 +9,7 @@ from .logic import (
     retrieve_operator_candidates_api,
     retrieve_operator_candidates_local,
 )
+from .backend import register_custom_operators, watch_custom_operators
 from .operator_registry import get_available_operator_names, resolve_operator_name
 
 __all__ = [
@@ -16,8 +17,10 @@ __all__ = [
     "get_available_operator_names",
     "get_operator_info",
     "list_operator_catalog",
+    "register_custom_operators",
     "resolve_operator_name",
     "retrieve_operator_candidates",
     "retrieve_operator_candidates_api",
     "retrieve_operator_candidates_local",
+    "watch_custom_operators",
 ]
@@ -6,6 +6,9 @@ This package contains the backend modules for operator retrieval:
 * ``backend``      – thin coordination layer and public API
 * ``cache``        – thread-safe cache manager
 * ``catalog``      – operator catalog initialization
+* ``custom_ops``   – incremental custom-operator registration and watcher
+* ``partitions``   – op_type/tag partitions of the operator vector index
+* ``record``       – compact immutable ``OperatorRecord`` catalog entries
 * ``retriever``    – retrieval backend abstraction and strategy manager
 * ``result_builder`` – shared helpers for building result/trace dicts
 """
@@ -14,26 +17,32 @@ from .backend import (
     get_op_catalog,
     init_op_catalog,
     refresh_op_catalog,
+    register_custom_operators,
     retrieve_ops,
     retrieve_ops_bm25_items,
     retrieve_ops_lm_items,
     retrieve_ops_regex_items,
     retrieve_ops_vector_items,
     retrieve_ops_with_meta,
+    watch_custom_operators,
 )
 from .cache import cache_manager
+from .record import OperatorRecord
 from .result_builder import names_from_items
 
 __all__ = [
+    "OperatorRecord",
     "cache_manager",
     "get_op_catalog",
     "init_op_catalog",
     "names_from_items",
     "refresh_op_catalog",
+    "register_custom_operators",
     "retrieve_ops",
     "retrieve_ops_bm25_items",
     "retrieve_ops_lm_items",
     "retrieve_ops_regex_items",
     "retrieve_ops_vector_items",
     "retrieve_ops_with_meta",
+    "watch_custom_operators",
 ]
@@ -6,6 +6,7 @@ moved to dedicated modules:
 
 * ``cache.py``         – thread-safe cache manager (replaces global variables)
 * ``result_builder.py``– shared helpers for building result/trace dicts
+* ``custom_ops.py``    – incremental custom-operator registration/watcher
 * ``retriever.py``     – RetrieverBackend ABC, four concrete backends,
                           and RetrievalStrategy (replaces the large
                           if/elif block in retrieve_ops_with_meta)
@@ -26,6 +27,11 @@ import logging
 from typing import Any, List, Optional
 
 from .cache import CK_OP_CATALOG, CK_OP_SEARCHER, cache_manager
+from .custom_ops import (
+    _custom_index,
+    register_custom_operators,
+    watch_custom_operators,
+)
 from .retriever import _strategy
 
 # ---------------------------------------------------------------------------
@@ -48,11 +54,24 @@ def init_op_catalog() -> bool:
         logging.error(f"Failed to initialize op_catalog: {e}")
         return False
 
-def refresh_op_catalog() -> bool:
-    """Refresh op_catalog during agent runtime (for manual updates)."""
+def refresh_op_catalog(custom_operator_paths: Optional[List[str]] = None) -> bool:
+    """Refresh op_catalog during agent runtime (for manual updates).
+
+    When *custom_operator_paths* is given, only the changed custom operator
+    files are loaded and patched into the existing catalog and retrieval
+    indexes (see :func:`register_custom_operators`).  Without it, the
+    built-in operator modules and the catalog are fully reloaded.
+    """
+    if custom_operator_paths is not None:
+        return bool(register_custom_operators(custom_operator_paths).get("ok"))
+
     try:
         logging.info("Refreshing op_catalog...")
 
+        # Custom operators live outside the Data-Juicer tree and cannot be
+        # scanned by OPSearcher; drop them before the full rebuild.
+        _custom_index.reset()
+
         # Clear all caches to force rebuild
         cache_manager.invalidate_all()
 
@@ -63,9 +63,11 @@ class RetrievalCacheManager:
 # ---------------------------------------------------------------------------
 
 CK_VECTOR_STORE = "vector_store"
+CK_VECTOR_PARTITIONS = "vector_partitions"
 CK_TOOLS_INFO = "tools_info"
 CK_OP_SEARCHER = "op_searcher"
 CK_OP_CATALOG = "op_catalog"
+CK_OP_INDEX = "op_index"
 
 # ---------------------------------------------------------------------------
 # Module-level singleton
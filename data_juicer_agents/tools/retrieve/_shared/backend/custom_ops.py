@@ -0,0 +1,578 @@
+# -*- coding: utf-8 -*-
+"""Incremental custom-operator registration for the retrieval catalog.
+
+``refresh_op_catalog()`` without arguments reloads ``data_juicer.ops`` and the
+catalog module, which re-imports every built-in operator.  This module
+provides the incremental path used for ``custom_operator_paths``:
+
+* only custom operator files whose ``(mtime, size)`` signature changed since
+  the previous sync are executed;
+* operators they register are wrapped into ``OPRecord`` objects and patched
+  into the shared ``OPSearcher``, the in-memory catalog and the vector store
+  in place;
+* :class:`CustomOperatorWatcher` polls the paths in a background thread and
+  re-syncs after a quiet period, so rapid edits during ``djx dev`` iterations
+  trigger a single re-index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import inspect
+import linecache
+import logging
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .cache import (
+    CK_OP_INDEX,
+    CK_OP_SEARCHER,
+    CK_TOOLS_INFO,
+    CK_VECTOR_PARTITIONS,
+    CK_VECTOR_STORE,
+    cache_manager,
+)
+from .record import build_operator_record
+
+_logger = logging.getLogger(__name__)
+
+_MODULE_PREFIX = "_djx_custom_op_"
+
+Signature = Tuple[int, int]
+
+
+# ---------------------------------------------------------------------------
+# File discovery
+# ---------------------------------------------------------------------------
+
+
+def _is_operator_file(path: Path) -> bool:
+    name = path.name
+    return (
+        name.endswith(".py")
+        and name != "__init__.py"
+        and not name.startswith("test_")
+        and not name.startswith(".")
+    )
+
+
+def iter_custom_operator_files(paths: Iterable[Any]) -> List[str]:
+    """Expand custom operator paths into a sorted list of operator ``.py`` files.
+
+    Directories are walked recursively; hidden directories (e.g. the
+    ``.djx_dev_smoke`` sandbox), ``__pycache__``, ``__init__.py`` and
+    ``test_*.py`` files are skipped.
+    """
+    files: set[str] = set()
+    for raw in paths or []:
+        text = str(raw or "").strip()
+        if not text:
+            continue
+        root = Path(text).expanduser().resolve()
+        if root.is_file():
+            if root.suffix == ".py":
+                files.add(str(root))
+            continue
+        if not root.is_dir():
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                d for d in dirnames if not d.startswith(".") and d != "__pycache__"
+            ]
+            for filename in filenames:
+                candidate = Path(dirpath) / filename
+                if _is_operator_file(candidate):
+                    files.add(str(candidate))
+    return sorted(files)
+
+
+def _file_signature(path: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def snapshot_custom_operator_files(paths: Iterable[Any]) -> Dict[str, Signature]:
+    """Return ``{file: (mtime_ns, size)}`` for every custom operator file."""
+    snapshot: Dict[str, Signature] = {}
+    for path in iter_custom_operator_files(paths):
+        signature = _file_signature(path)
+        if signature is not None:
+            snapshot[path] = signature
+    return snapshot
+
+
+# ---------------------------------------------------------------------------
+# Module loading and OPRecord construction
+# ---------------------------------------------------------------------------
+
+
+def _module_name_for(path: str) -> str:
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:10]
+    return f"{_MODULE_PREFIX}{digest}_{Path(path).stem}"
+
+
+def _operators_registry():
+    from data_juicer.ops import OPERATORS
+
+    return OPERATORS
+
+
+def _unregister_module_ops(module_name: str) -> List[str]:
+    registry = _operators_registry().modules
+    names = [
+        name
+        for name, cls in list(registry.items())
+        if getattr(cls, "__module__", "") == module_name
+    ]
+    for name in names:
+        registry.pop(name, None)
+    return names
+
+
+def _load_operator_file(path: str) -> Dict[str, type]:
+    """Execute *path* as a fresh module and return the operators it registered."""
+    module_name = _module_name_for(path)
+    _unregister_module_ops(module_name)
+    linecache.checkcache(path)
+
+    registry = _operators_registry().modules
+    before = set(registry)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"failed to create module spec for {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(module_name, None)
+        _unregister_module_ops(module_name)
+        raise
+    return {
+        name: cls
+        for name, cls in registry.items()
+        if name not in before or getattr(cls, "__module__", "") == module_name
+    }
+
+
+# ---------------------------------------------------------------------------
+# Upstream op_search adapter
+#
+# In-place patching relies on private parts of data_juicer.tools.op_search:
+# OPRecord._search_mro_for_type / _parse_param_desc to build records for
+# files outside the Data-Juicer tree, and OPSearcher's lazily built
+# ``_bm25_index``.  They are only touched through the helpers below; when
+# an installed version lacks any of them, sync falls back to the full
+# ``refresh_op_catalog()`` rebuild (custom operators are then left out of
+# the retrieval index, but still run through custom_operator_paths).
+# ---------------------------------------------------------------------------
+
+_RECORD_INTERNALS = ("_search_mro_for_type", "_parse_param_desc")
+_SEARCHER_INTERNALS = ("_build_bm25_index",)
+
+
+@lru_cache(maxsize=1)
+def missing_upstream_internals() -> Tuple[str, ...]:
+    """Private op_search attributes incremental patching needs but cannot find."""
+    try:
+        from data_juicer.tools.op_search import OPRecord, OPSearcher
+    except Exception as exc:
+        return (f"data_juicer.tools.op_search ({exc})",)
+    missing = [f"OPRecord.{name}" for name in _RECORD_INTERNALS if not hasattr(OPRecord, name)]
+    missing.extend(
+        f"OPSearcher.{name}" for name in _SEARCHER_INTERNALS if not hasattr(OPSearcher, name)
+    )
+    return tuple(missing)
+
+
+def _record_op_type(record: Any, op_cls: type) -> str:
+    return record._search_mro_for_type(op_cls)
+
+
+def _record_param_desc_map(record: Any) -> Dict[str, Any]:
+    return record._parse_param_desc()
+
+
+def _reset_search_index(searcher: Any) -> None:
+    # OPSearcher rebuilds its BM25 index lazily on the next query.
+    searcher._bm25_index = None
+
+
+@lru_cache(maxsize=1)
+def _custom_record_cls():
+    from data_juicer.tools.op_search import (
+        OPRecord,
+        analyze_tag_from_cls,
+        extract_param_docstring,
+    )
+
+    class CustomOPRecord(OPRecord):
+        """``OPRecord`` for operators living outside the Data-Juicer tree.
+
+        The upstream constructor derives the op type from the module path and
+        requires the source file to live under the Data-Juicer project root,
+        neither of which holds for custom operator files.
+        """
+
+        def __init__(self, name: str, op_cls: type, source_path: str):
+            self.name = name
+            self.type = _record_op_type(self, op_cls)
+            self.desc = op_cls.__doc__ or ""
+            try:
+                self.tags = analyze_tag_from_cls(op_cls, name)
+            except (OSError, TypeError):
+                self.tags = ["cpu"]
+            self.sig = inspect.signature(op_cls.__init__)
+            self.init_func = op_cls.__init__
+            self.param_desc = extract_param_docstring(op_cls.__init__.__doc__ or "")
+            self.param_desc_map = _record_param_desc_map(self)
+            self.source_path = source_path
+            test_path = Path(source_path).with_name(f"test_{name}.py")
+            self.test_path = str(test_path) if test_path.exists() else ""
+
+    return CustomOPRecord
+
+
+# ---------------------------------------------------------------------------
+# In-place patching of searcher, catalog and vector store
+# ---------------------------------------------------------------------------
+
+
+def _get_searchers() -> List[Any]:
+    from . import catalog as catalog_mod
+
+    searchers = [catalog_mod.searcher]
+    cached = cache_manager.get(CK_OP_SEARCHER)
+    if cached is not None and cached is not catalog_mod.searcher:
+        searchers.append(cached)
+    return searchers
+
+
+def _patch_searcher(searcher: Any, upserts: Dict[str, Any], removed: set[str]) -> None:
+    for name in removed:
+        searcher.all_ops.pop(name, None)
+    records: List[Any] = []
+    seen: set[str] = set()
+    for record in searcher.op_records:
+        if record.name in removed:
+            continue
+        if record.name in upserts:
+            record = upserts[record.name]
+        seen.add(record.name)
+        records.append(record)
+    records.extend(rec for name, rec in upserts.items() if name not in seen)
+    searcher.op_records = records
+    searcher.all_ops.update(upserts)
+    _reset_search_index(searcher)
+
+
+def _patch_vector_store(vector_store: Any, records: List[Any]) -> bool:
+    """Replace/add embeddings for *records* in a LangChain FAISS store."""
+    if not records:
+        return True
+    try:
+        targets = {record.index for record in records}
+        stale_ids = []
+        for doc_id in list(vector_store.index_to_docstore_id.values()):
+            doc = vector_store.docstore.search(doc_id)
+            if getattr(doc, "metadata", {}).get("index") in targets:
+                stale_ids.append(doc_id)
+        if stale_ids:
+            vector_store.delete(stale_ids)
+        vector_store.add_texts(
+            [f"{r.class_name}: {r.class_desc}" for r in records],
+            metadatas=[{"index": r.index} for r in records],
+        )
+        return True
+    except Exception as exc:
+        _logger.warning("Failed to patch vector index in place: %s", exc)
+        return False
+
+
+def _patch_catalog(upserts: Dict[str, Any], removed: set[str]) -> None:
+    from .backend import get_op_catalog
+    from .retriever import _get_content_hash
+
+    catalog = get_op_catalog()
+    for searcher in _get_searchers():
+        _patch_searcher(searcher, upserts, removed)
+
+    positions = {record.class_name: pos for pos, record in enumerate(catalog)}
+    shifted = any(name in positions for name in removed)
+    if shifted:
+        kept = [record for record in catalog if record.class_name not in removed]
+        catalog[:] = [
+            record if record.index == pos else record.with_index(pos)
+            for pos, record in enumerate(kept)
+        ]
+        positions = {record.class_name: pos for pos, record in enumerate(catalog)}
+
+    changed_records = []
+    for name, op_record in upserts.items():
+        pos = positions.get(name)
+        if pos is None:
+            pos = len(catalog)
+            catalog.append(build_operator_record(pos, op_record.to_dict()))
+            positions[name] = pos
+        else:
+            catalog[pos] = build_operator_record(pos, op_record.to_dict())
+        changed_records.append(catalog[pos])
+
+    # Name/record index and available-name cache are keyed on catalog
+    # identity, which in-place patching preserves.
+    cache_manager.invalidate(CK_OP_INDEX)
+    from ..operator_registry import get_available_operator_names
+
+    get_available_operator_names.cache_clear()
+
+    vector_store = cache_manager.get(CK_VECTOR_STORE)
+    if vector_store is None:
+        return
+    if shifted or not _patch_vector_store(vector_store, changed_records):
+        cache_manager.invalidate(CK_VECTOR_STORE)
+        cache_manager.invalidate(CK_TOOLS_INFO)
+        cache_manager.invalidate(CK_VECTOR_PARTITIONS)
+        return
+    cache_manager.set(CK_VECTOR_STORE, vector_store, content_hash=_get_content_hash(catalog))
+    cache_manager.set(CK_TOOLS_INFO, catalog)
+    # Partitions are derived from the stored vectors; rebuild lazily.
+    cache_manager.invalidate(CK_VECTOR_PARTITIONS)
+
+
+# ---------------------------------------------------------------------------
+# Incremental index
+# ---------------------------------------------------------------------------
+
+
+class CustomOperatorIndex:
+    """Track custom operator files and sync only the changed ones."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._signatures: Dict[str, Signature] = {}
+        self._ops_by_file: Dict[str, List[str]] = {}
+
+    def sync(self, paths: Iterable[Any]) -> Dict[str, Any]:
+        """Bring the catalog in line with the files under *paths*.
+
+        *paths* is treated as the complete set of custom operator paths:
+        files that were indexed before but are no longer present (or no
+        longer under *paths*) have their operators removed.
+        """
+        with self._lock:
+            current = snapshot_custom_operator_files(paths)
+            changed = [p for p, sig in current.items() if self._signatures.get(p) != sig]
+            removed_files = [p for p in self._signatures if p not in current]
+
+            result: Dict[str, Any] = {
+                "ok": True,
+                "scanned_files": len(current),
+                "changed_files": changed,
+                "removed_files": removed_files,
+                "registered": [],
+                "unregistered": [],
+                "errors": [],
+            }
+            if not changed and not removed_files:
+                return result
+
+            missing = missing_upstream_internals()
+            if missing:
+                return self._full_refresh(result, current, missing)
+
+            # Materialize the built-in catalog first: OPSearcher cannot scan
+            # custom operators, so they must not be registered before it runs.
+            from .backend import get_op_catalog
+
+            get_op_catalog()
+            _get_searchers()
+
+            stale: set[str] = set()
+            for path in removed_files:
+                stale.update(self._ops_by_file.pop(path, []))
+                _unregister_module_ops(_module_name_for(path))
+                sys.modules.pop(_module_name_for(path), None)
+                self._signatures.pop(path, None)
+
+            record_cls = _custom_record_cls()
+            upserts: Dict[str, Any] = {}
+            for path in changed:
+                previous = set(self._ops_by_file.get(path, []))
+                self._signatures[path] = current[path]
+                try:
+                    loaded = _load_operator_file(path)
+                    built = {
+                        name: record_cls(name, cls, path) for name, cls in loaded.items()
+                    }
+                except Exception as exc:
+                    _logger.warning("Failed to load custom operator file %s: %s", path, exc)
+                    result["errors"].append({"path": path, "error": str(exc)})
+                    self._ops_by_file.pop(path, None)
+                    stale.update(previous)
+                    continue
+                self._ops_by_file[path] = sorted(built)
+                stale.update(previous - set(built))
+                upserts.update(built)
+
+            stale -= set(upserts)
+            _patch_catalog(upserts, stale)
+
+            result["registered"] = sorted(upserts)
+            result["unregistered"] = sorted(stale)
+            result["ok"] = not result["errors"]
+            _logger.info(
+                "Custom operator sync: %d registered, %d unregistered, %d errors",
+                len(upserts),
+                len(stale),
+                len(result["errors"]),
+            )
+            return result
+
+    def _full_refresh(
+        self,
+        result: Dict[str, Any],
+        current: Dict[str, Signature],
+        missing: Tuple[str, ...],
+    ) -> Dict[str, Any]:
+        """Rebuild the built-in catalog when incremental patching is unsupported.
+
+        The current file signatures are recorded so unchanged files do not
+        trigger another full rebuild on the next sync.
+        """
+        from .backend import refresh_op_catalog
+
+        _logger.warning(
+            "Installed Data-Juicer lacks %s; rebuilding the operator catalog "
+            "without custom operators",
+            ", ".join(missing),
+        )
+        self.reset()
+        result["ok"] = bool(refresh_op_catalog())
+        result["full_refresh"] = True
+        self._signatures = dict(current)
+        return result
+
+    def reset(self) -> List[str]:
+        """Unregister every tracked custom operator and forget all files."""
+        with self._lock:
+            names: List[str] = []
+            for path in list(self._signatures):
+                names.extend(_unregister_module_ops(_module_name_for(path)))
+                sys.modules.pop(_module_name_for(path), None)
+            self._signatures.clear()
+            self._ops_by_file.clear()
+            return names
+
+
+# ---------------------------------------------------------------------------
+# Debounced watcher
+# ---------------------------------------------------------------------------
+
+
+class CustomOperatorWatcher:
+    """Poll custom operator paths and re-sync after changes settle.
+
+    A change starts a quiet-period timer; further changes restart it.  Once
+    no change has been observed for *debounce* seconds the index is synced
+    once and *on_change* receives the sync result.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Any],
+        on_change: Optional[Callable[[Dict[str, Any]], None]] = None,
+        interval: float = 0.5,
+        debounce: float = 1.0,
+        index: Optional[CustomOperatorIndex] = None,
+    ) -> None:
+        self.paths = [str(p) for p in (paths or []) if str(p or "").strip()]
+        self.on_change = on_change
+        self.interval = max(float(interval), 0.05)
+        self.debounce = max(float(debounce), 0.0)
+        self._index = index or _custom_index
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> Dict[str, Any]:
+        """Run an initial sync and start watching; returns the initial result."""
+        result = self._index.sync(self.paths)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="djx-custom-op-watcher", daemon=True
+            )
+            self._thread.start()
+        return result
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "CustomOperatorWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        last = snapshot_custom_operator_files(self.paths)
+        pending_since: Optional[float] = None
+        while not self._stop.wait(self.interval):
+            current = snapshot_custom_operator_files(self.paths)
+            if current != last:
+                last = current
+                pending_since = time.monotonic()
+                continue
+            if pending_since is None:
+                continue
+            if time.monotonic() - pending_since < self.debounce:
+                continue
+            pending_since = None
+            try:
+                result = self._index.sync(self.paths)
+            except Exception as exc:
+                _logger.warning("Custom operator re-index failed: %s", exc)
+                continue
+            if self.on_change is not None:
+                try:
+                    self.on_change(result)
+                except Exception as exc:
+                    _logger.warning("Custom operator on_change callback failed: %s", exc)
+
+
+# ---------------------------------------------------------------------------
+# Module-level singleton and public helpers
+# ---------------------------------------------------------------------------
+
+_custom_index = CustomOperatorIndex()
+
+
+def register_custom_operators(paths: Iterable[Any]) -> Dict[str, Any]:
+    """Incrementally register operators from *paths* into the catalog."""
+    return _custom_index.sync(paths)
+
+
+def watch_custom_operators(
+    paths: Iterable[Any],
+    on_change: Optional[Callable[[Dict[str, Any]], None]] = None,
+    interval: float = 0.5,
+    debounce: float = 1.0,
+) -> CustomOperatorWatcher:
+    """Start a debounced watcher over *paths*; call ``stop()`` when done."""
+    watcher = CustomOperatorWatcher(
+        paths, on_change=on_change, interval=interval, debounce=debounce
+    )
+    watcher.start()
+    return watcher
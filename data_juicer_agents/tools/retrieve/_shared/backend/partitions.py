@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Per-op_type / per-tag partitions of the operator vector index.
+
+``VectorRetriever`` used to search the whole FAISS index and post-filter by
+``op_type``/``tags``, over-fetching ``limit * 3`` and still returning fewer
+than ``limit`` hits when the nearest neighbours belonged to other types.
+
+:class:`VectorPartitions` is built alongside the main index from the vectors
+already stored in it (no re-embedding): one contiguous matrix per op_type
+plus row-id sets per tag.  Filtered queries embed the query once and score
+only the matching partition, so they always return
+``min(limit, partition size)`` results.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_logger = logging.getLogger(__name__)
+
+
+def _normalize(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def embed_query(vector_store: Any, query: str) -> List[float]:
+    """Embed *query* with the embedding function attached to *vector_store*."""
+    embed = getattr(vector_store, "_embed_query", None)
+    if callable(embed):
+        return embed(query)
+    function = getattr(vector_store, "embedding_function", None)
+    if hasattr(function, "embed_query"):
+        return function.embed_query(query)
+    if callable(function):
+        return function(query)
+    raise RuntimeError("vector store has no query embedding function")
+
+
+class VectorPartitions:
+    """Row-partitioned view over the vectors of an operator FAISS index."""
+
+    def __init__(
+        self,
+        matrix: Any,
+        row_catalog_index: Any,
+        type_rows: Dict[str, Any],
+        tag_rows: Dict[str, Any],
+        inner_product: bool = False,
+    ) -> None:
+        import numpy as np
+
+        self.matrix = matrix
+        self.row_catalog_index = row_catalog_index
+        self.type_rows = type_rows
+        self.tag_rows = tag_rows
+        self.inner_product = inner_product
+        # Contiguous per-type sub-matrices so type-only queries do not copy.
+        self.type_matrices = {
+            op_type: np.ascontiguousarray(matrix[rows])
+            for op_type, rows in type_rows.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_vector_store(
+        cls,
+        vector_store: Any,
+        catalog: Sequence[Any],
+        tag_partitions: bool = True,
+    ) -> "VectorPartitions":
+        """Build partitions from a LangChain FAISS store and the op catalog."""
+        import numpy as np
+
+        index = vector_store.index
+        total = int(index.ntotal)
+        vectors = np.asarray(index.reconstruct_n(0, total), dtype="float32")
+
+        row_catalog_index = np.full(total, -1, dtype="int64")
+        for row, doc_id in vector_store.index_to_docstore_id.items():
+            doc = vector_store.docstore.search(doc_id)
+            catalog_index = getattr(doc, "metadata", {}).get("index")
+            if isinstance(catalog_index, int) and 0 <= catalog_index < len(catalog):
+                row_catalog_index[int(row)] = catalog_index
+
+        type_buckets: Dict[str, List[int]] = {}
+        tag_buckets: Dict[str, List[int]] = {}
+        for row in range(total):
+            catalog_index = int(row_catalog_index[row])
+            if catalog_index < 0:
+                continue
+            entry = catalog[catalog_index]
+            op_type = _normalize(entry.get("class_type", ""))
+            if op_type:
+                type_buckets.setdefault(op_type, []).append(row)
+            if tag_partitions:
+                for tag in entry.get("class_tags") or ():
+                    key = _normalize(tag)
+                    if key:
+                        tag_buckets.setdefault(key, []).append(row)
+
+        strategy = str(getattr(vector_store, "distance_strategy", "") or "")
+        return cls(
+            matrix=vectors,
+            row_catalog_index=row_catalog_index,
+            type_rows={k: np.asarray(v, dtype="int64") for k, v in type_buckets.items()},
+            tag_rows={k: np.asarray(v, dtype="int64") for k, v in tag_buckets.items()},
+            inner_product=strategy.upper().endswith("MAX_INNER_PRODUCT"),
+        )
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def route(
+        self,
+        op_type: Optional[str] = None,
+        tags: Optional[Sequence[str]] = None,
+    ) -> Tuple[Any, Any]:
+        """Return ``(matrix, rows)`` for the partition matching the filters.
+
+        Filters that match nothing are ignored, mirroring the fall-back
+        semantics of ``filter_by_op_type``/``filter_by_tags``.
+        """
+        import numpy as np
+
+        type_key = _normalize(op_type)
+        rows = self.type_rows.get(type_key) if type_key else None
+        matrix = self.type_matrices.get(type_key) if rows is not None else None
+
+        expected = [_normalize(t) for t in (tags or []) if _normalize(t)]
+        if expected:
+            tag_sets = [self.tag_rows.get(tag) for tag in expected]
+            if all(s is not None for s in tag_sets):
+                tagged = tag_sets[0]
+                for other in tag_sets[1:]:
+                    tagged = np.intersect1d(tagged, other, assume_unique=True)
+                if rows is not None:
+                    tagged = np.intersect1d(rows, tagged, assume_unique=True)
+                if tagged.size:
+                    rows = tagged
+                    matrix = self.matrix[rows]
+
+        if rows is None:
+            return self.matrix, np.arange(self.matrix.shape[0], dtype="int64")
+        return matrix, rows
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        limit: int,
+        op_type: Optional[str] = None,
+        tags: Optional[Sequence[str]] = None,
+    ) -> List[int]:
+        """Return catalog indices of the *limit* nearest operators."""
+        import numpy as np
+
+        matrix, rows = self.route(op_type, tags)
+        if not len(rows) or limit <= 0:
+            return []
+        query = np.asarray(query_vector, dtype="float32").reshape(-1)
+        if self.inner_product:
+            scores = -(matrix @ query)
+        else:
+            diff = matrix - query
+            scores = np.einsum("ij,ij->i", diff, diff)
+        k = min(int(limit), scores.shape[0])
+        if k < scores.shape[0]:
+            top = np.argpartition(scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.shape[0])
+        top = top[np.argsort(scores[top], kind="stable")]
+        result: List[int] = []
+        for pos in top:
+            catalog_index = int(self.row_catalog_index[rows[pos]])
+            if catalog_index >= 0:
+                result.append(catalog_index)
+        return result
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""Compact, immutable operator record used by the in-memory catalog.
+
+The catalog used to be a list of plain dicts that every retrieval request
+copied and re-wrapped.  ``OperatorRecord`` keeps one slotted instance per
+operator with interned name/type/tag strings and an integer ``index`` id.
+Conversion to dicts happens only at the tool output boundary via
+:meth:`OperatorRecord.to_dict`.
+
+For backward-compatibility the record also exposes a read-only mapping
+surface (``record["class_name"]``, ``record.get(...)``, ``"key" in record``)
+so callers and tests written against the dict catalog keep working.
+"""
+
+from __future__ import annotations
+
+import inspect
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
+
+from .cache import CK_OP_INDEX, cache_manager
+
+_FIELDS: Tuple[str, ...] = (
+    "index",
+    "class_name",
+    "class_desc",
+    "class_type",
+    "class_tags",
+    "arguments",
+)
+_FIELD_SET = frozenset(_FIELDS)
+
+
+def _intern(value: Any) -> str:
+    return sys.intern(str(value or "").strip())
+
+
+class OperatorRecord:
+    """Immutable catalog entry for a single Data-Juicer operator."""
+
+    __slots__ = _FIELDS
+
+    index: int
+    class_name: str
+    class_desc: str
+    class_type: str
+    class_tags: Tuple[str, ...]
+    arguments: str
+
+    def __init__(
+        self,
+        index: int,
+        class_name: str,
+        class_desc: str = "",
+        class_type: str = "",
+        class_tags: Iterable[str] = (),
+        arguments: str = "",
+    ) -> None:
+        setter = object.__setattr__
+        setter(self, "index", int(index))
+        setter(self, "class_name", _intern(class_name))
+        setter(self, "class_desc", str(class_desc or ""))
+        setter(self, "class_type", _intern(class_type))
+        setter(
+            self,
+            "class_tags",
+            tuple(_intern(tag) for tag in (class_tags or ()) if str(tag).strip()),
+        )
+        setter(self, "arguments", str(arguments or ""))
+
+    @classmethod
+    def from_dict(cls, row: Mapping[str, Any], index: int = 0) -> "OperatorRecord":
+        """Build a record from a legacy catalog dict."""
+        tags = row.get("class_tags") or ()
+        if isinstance(tags, str):
+            tags = (tags,)
+        return cls(
+            index=row.get("index", index),
+            class_name=row.get("class_name", ""),
+            class_desc=row.get("class_desc", ""),
+            class_type=row.get("class_type", ""),
+            class_tags=tags,
+            arguments=row.get("arguments", ""),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the legacy dict representation (for output/hashing only)."""
+        return {
+            "index": self.index,
+            "class_name": self.class_name,
+            "class_desc": self.class_desc,
+            "class_type": self.class_type,
+            "class_tags": list(self.class_tags),
+            "arguments": self.arguments,
+        }
+
+    def with_index(self, index: int) -> "OperatorRecord":
+        """Return a copy of this record renumbered to *index*."""
+        return type(self)(
+            index=index,
+            class_name=self.class_name,
+            class_desc=self.class_desc,
+            class_type=self.class_type,
+            class_tags=self.class_tags,
+            arguments=self.arguments,
+        )
+
+    # ------------------------------------------------------------------
+    # Immutability
+    # ------------------------------------------------------------------
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, field) for field in _FIELDS))
+
+    # ------------------------------------------------------------------
+    # Read-only mapping compatibility
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in _FIELD_SET:
+            return default
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_SET
+
+    def keys(self) -> Tuple[str, ...]:
+        return _FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    # ------------------------------------------------------------------
+    # Value semantics
+    # ------------------------------------------------------------------
+
+    def _key(self) -> tuple:
+        return tuple(getattr(self, field) for field in _FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OperatorRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"OperatorRecord(index={self.index!r}, class_name={self.class_name!r}, "
+            f"class_type={self.class_type!r}, class_tags={self.class_tags!r})"
+        )
+
+
+def _format_arguments(op: Mapping[str, Any]) -> str:
+    param_desc = op.get("param_desc") or ""
+    param_desc_map = {}
+    args = ""
+    for item in param_desc.split(":param"):
+        _item = item.split(":")
+        if len(_item) < 2:
+            continue
+        param_desc_map[_item[0].strip()] = ":".join(_item[1:]).strip()
+
+    sig = op.get("sig")
+    if sig:
+        for param_name, param in sig.parameters.items():
+            if param_name in ["self", "args", "kwargs"]:
+                continue
+            if param.kind in (
+                inspect.Parameter.VAR_POSITIONAL,
+                inspect.Parameter.VAR_KEYWORD,
+            ):
+                continue
+            if param_name in param_desc_map:
+                args += f"        {param_name} ({param.annotation}): {param_desc_map[param_name]}\n"
+            else:
+                args += f"        {param_name} ({param.annotation})\n"
+    return args
+
+
+def build_operator_record(index: int, op: Mapping[str, Any]) -> OperatorRecord:
+    """Build a catalog record from an ``OPSearcher`` result dict."""
+    return OperatorRecord(
+        index=index,
+        class_name=op["name"],
+        class_desc=op["desc"],
+        class_type=op.get("type", ""),
+        class_tags=op.get("tags", []),
+        arguments=_format_arguments(op),
+    )
+
+
+def as_operator_record(item: Any, index: int = 0) -> OperatorRecord | None:
+    """Coerce a catalog entry (record or legacy dict) into an ``OperatorRecord``.
+
+    Returns ``None`` for unsupported entries or entries without a name.
+    """
+    if isinstance(item, OperatorRecord):
+        record = item
+    elif isinstance(item, Mapping):
+        record = OperatorRecord.from_dict(item, index=index)
+    else:
+        return None
+    return record if record.class_name else None
+
+
+def coerce_operator_records(items: Iterable[Any]) -> List[OperatorRecord]:
+    """Coerce a catalog list into records, dropping invalid entries."""
+    records: List[OperatorRecord] = []
+    for idx, item in enumerate(items or []):
+        record = as_operator_record(item, index=idx)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def records_to_dicts(items: Iterable[Any]) -> List[Any]:
+    """Convert records back to plain dicts, leaving other entries untouched."""
+    return [
+        item.to_dict() if isinstance(item, OperatorRecord) else item
+        for item in items or []
+    ]
+
+
+def index_operator_records(
+    catalog: List[Any],
+) -> Tuple[List[OperatorRecord], Dict[str, OperatorRecord]]:
+    """Return ``(records, name_map)`` for *catalog*, reusing the cached index.
+
+    The index is rebuilt only when *catalog* is a different list object (or
+    its length changed), so repeated retrieval requests against the same
+    catalog share one record list and one name lookup table.
+    """
+    cached = cache_manager.get(CK_OP_INDEX)
+    if cached is not None:
+        source, size, records, name_map = cached
+        if source is catalog and size == len(catalog):
+            return records, name_map
+    records = coerce_operator_records(catalog)
+    name_map: Dict[str, OperatorRecord] = {}
+    for record in records:
+        name_map.setdefault(record.class_name, record)
+    cache_manager.set(CK_OP_INDEX, (catalog, len(catalog), records, name_map))
+    return records, name_map
@@ -81,7 +81,8 @@ def filter_by_op_type(
     always receive a non-empty list as long as *info_list* itself is non-empty.
 
     Args:
-        info_list: List of operator info dicts (e.g. from ``get_op_catalog()``).
+        info_list: List of operator records or info dicts (e.g. from
+                   ``get_op_catalog()``).
         op_type: Operator type string to match (e.g. ``"filter"``).  When
                  ``None`` or empty the full list is returned unchanged.
         type_key: Dict key used to read the operator type from each entry.
@@ -107,7 +108,8 @@ def filter_by_tags(
     consistent with :func:`filter_by_op_type`.
 
     Args:
-        info_list: List of operator info dicts (e.g. from ``get_op_catalog()``).
+        info_list: List of operator records or info dicts (e.g. from
+                   ``get_op_catalog()``).
         tags: Tag strings to match.  When ``None`` or empty the full list is
               returned unchanged.
         tags_key: Dict key used to read the tag list from each entry.
@@ -5,7 +5,8 @@ Architecture
 ------------
 RetrieverBackend (ABC)
     ├── LLMRetriever      – uses DashScope LLM for semantic ranking
-    ├── VectorRetriever   – uses FAISS + DashScope embeddings
+    ├── VectorRetriever   – uses FAISS + DashScope embeddings, with
+    │                       op_type/tag partitions for filtered queries
     ├── BM25Retriever     – uses Data-Juicer OPSearcher BM25
     └── RegexRetriever    – uses Data-Juicer OPSearcher regex
 
@@ -27,12 +28,17 @@ import time
 from abc import ABC, abstractmethod
 from typing import Any
 
+from data_juicer_agents.utils import json_codec
+
 from .cache import (
     CK_OP_SEARCHER,
     CK_TOOLS_INFO,
+    CK_VECTOR_PARTITIONS,
     CK_VECTOR_STORE,
     cache_manager,
 )
+from .partitions import VectorPartitions, embed_query
+from .record import index_operator_records, records_to_dicts
 from .result_builder import (
     build_retrieval_item,
     filter_by_op_type,
@@ -122,7 +128,7 @@ def _extract_key_match(query: str, name: str, desc: str, tags: list[str]) -> lis
 
 def _get_content_hash(op_catalog: list) -> str:
     try:
-        content_str = json.dumps(op_catalog, sort_keys=True, ensure_ascii=False)
+        content_str = json_codec.dumps(records_to_dicts(op_catalog), sort_keys=True)
         return hashlib.sha256(content_str.encode("utf-8")).hexdigest()
     except Exception as e:
         logging.warning(f"Failed to compute content hash: {e}")
@@ -181,13 +187,11 @@ class LLMRetriever(RetrieverBackend):
     ) -> list[dict[str, Any]]:
         from .backend import get_op_catalog  # avoid circular at module level
 
-        op_catalog = get_op_catalog()
+        op_catalog, _name_map = index_operator_records(get_op_catalog())
         op_catalog = filter_by_op_type(op_catalog, op_type)
         op_catalog = filter_by_tags(op_catalog, tags)
 
-        tool_descriptions = [
-            f"{t['class_name']}: {t['class_desc']}" for t in op_catalog
-        ]
+        tool_descriptions = [f"{t.class_name}: {t.class_desc}" for t in op_catalog]
         tools_string = "\n".join(tool_descriptions)
 
         from agentscope.formatter import DashScopeChatFormatter
@@ -213,8 +217,7 @@ class LLMRetriever(RetrieverBackend):
         retrieved_tools = json.loads(msg.get_text_content())
 
         # Build a fast lookup for class_type
-        type_map = {t["class_name"]: t.get("class_type", "") for t in op_catalog}
-        name_set = {t["class_name"] for t in op_catalog}
+        type_map = {t.class_name: t.class_type for t in op_catalog}
 
         valid_tools: list[dict[str, Any]] = []
         for tool_info in retrieved_tools:
@@ -224,7 +227,7 @@ class LLMRetriever(RetrieverBackend):
             tool_name = str(tool_info["tool_name"]).strip()
             if not tool_name:
                 continue
-            if tool_name not in name_set:
+            if tool_name not in type_map:
                 logging.error(f"Tool not found: `{tool_name}`, skipping!")
                 continue
             valid_tools.append(
@@ -233,7 +236,7 @@ class LLMRetriever(RetrieverBackend):
                     description=tool_info.get("description", ""),
                     relevance_score=tool_info.get("relevance_score", 0.0),
                     score_source="llm",
-                    operator_type=type_map.get(tool_name, ""),
+                    operator_type=type_map[tool_name],
                     key_match=tool_info.get("key_match", []),
                 )
             )
@@ -246,7 +249,15 @@ class LLMRetriever(RetrieverBackend):
 
 
 class VectorRetriever(RetrieverBackend):
-    """Retrieval via FAISS vector similarity search."""
+    """Retrieval via FAISS vector similarity search.
+
+    Filtered queries (``op_type``/``tags``) are routed to per-type and
+    per-tag partitions of the index (see :class:`VectorPartitions`) instead
+    of over-fetching from the full index and post-filtering.
+    """
+
+    def __init__(self, tag_partitions: bool = True) -> None:
+        self.tag_partitions = tag_partitions
 
     @property
     def name(self) -> str:
@@ -265,6 +276,29 @@ class VectorRetriever(RetrieverBackend):
     def _get_tools_info(self):
         return cache_manager.get(CK_TOOLS_INFO)
 
+    def _get_partitions(self) -> VectorPartitions | None:
+        """Return partitions for the current vector store, building them lazily.
+
+        Returns ``None`` when the store does not expose its raw vectors, in
+        which case callers fall back to post-filtering.
+        """
+        vector_store = self._get_vector_store()
+        tools_info = self._get_tools_info()
+        if vector_store is None or tools_info is None:
+            return None
+        cached = cache_manager.get(CK_VECTOR_PARTITIONS)
+        if cached is not None and cached[0] is vector_store and cached[1] == len(tools_info):
+            return cached[2]
+        try:
+            partitions = VectorPartitions.from_vector_store(
+                vector_store, tools_info, tag_partitions=self.tag_partitions
+            )
+        except Exception as e:
+            logging.warning(f"Failed to build vector partitions: {e}")
+            partitions = None
+        cache_manager.set(CK_VECTOR_PARTITIONS, (vector_store, len(tools_info), partitions))
+        return partitions
+
     def _ensure_index(self) -> None:
         """Load from disk cache or build a fresh index."""
         if self._get_vector_store() is not None and self._get_tools_info() is not None:
@@ -316,6 +350,7 @@ class VectorRetriever(RetrieverBackend):
             )
             cache_manager.set(CK_VECTOR_STORE, vector_store, content_hash=current_hash)
             cache_manager.set(CK_TOOLS_INFO, op_catalog)
+            self._get_partitions()
             logging.info("Successfully loaded cached vector index")
             return True
 
@@ -345,6 +380,7 @@ class VectorRetriever(RetrieverBackend):
         content_hash = _get_content_hash(op_catalog)
         cache_manager.set(CK_VECTOR_STORE, vector_store, content_hash=content_hash)
         cache_manager.set(CK_TOOLS_INFO, op_catalog)
+        self._get_partitions()
 
         # Persist to disk
         try:
@@ -374,6 +410,19 @@ class VectorRetriever(RetrieverBackend):
         vector_store = self._get_vector_store()
         tools_info = self._get_tools_info()
 
+        partitions = self._get_partitions() if (op_type or tags) else None
+        if partitions is not None:
+            indices = partitions.search(
+                embed_query(vector_store, query), limit, op_type=op_type, tags=tags
+            )
+            return [
+                build_retrieval_item(
+                    tool_name=tools_info[idx]["class_name"],
+                    score_source="vector",
+                )
+                for idx in indices
+            ]
+
         # Over-fetch when filtering to compensate for post-filter drops
         search_k = limit * 3 if (op_type or tags) else limit
         retrieved_docs = vector_store.similarity_search(query, k=search_k)
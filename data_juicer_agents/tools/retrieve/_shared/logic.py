@@ -8,12 +8,14 @@ import inspect
 import logging
 import re
 import threading
+from pathlib import Path
 from typing import Any, Dict, List
 
 from .operator_registry import (
     get_available_operator_names,
     resolve_operator_name,
 )
+from .backend.record import OperatorRecord, index_operator_records
 from .backend.result_builder import trace_step
 
 _logger = logging.getLogger(__name__)
@@ -190,14 +192,14 @@ def _looks_like_regex_pattern(text: str) -> bool:
 
 
 def _lexical_fallback(
-    intent: str, info_rows: List[Dict[str, Any]], top_k: int
+    intent: str, info_rows: List[OperatorRecord], top_k: int
 ) -> List[str]:
     scored: List[tuple[float, str]] = []
     for row in info_rows:
-        name = str(row.get("class_name", "")).strip()
+        name = row.class_name
         if not name:
             continue
-        score = _keyword_score(intent, name, str(row.get("class_desc", "")))
+        score = _keyword_score(intent, name, row.class_desc)
         scored.append((score, name))
 
     scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
@@ -212,14 +214,14 @@ def _build_candidate_row(
     rank: int,
     name: str,
     intent: str,
-    info_map: Dict[str, Dict[str, Any]],
+    info_map: Dict[str, OperatorRecord],
     retrieval_item: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
-    row = info_map.get(name, {})
-    desc = str(row.get("class_desc", "")).strip()
-    args_text = str(row.get("arguments", "")).strip()
+    row = info_map.get(name)
+    desc = row.class_desc.strip() if row is not None else ""
+    args_text = row.arguments.strip() if row is not None else ""
     args_lines = [line.strip() for line in args_text.splitlines() if line.strip()]
-    class_type = str(row.get("class_type", "")).strip()
+    class_type = row.class_type if row is not None else ""
     item_desc = str((retrieval_item or {}).get("description", "")).strip()
     item_score = (retrieval_item or {}).get("relevance_score")
     item_score_source = str((retrieval_item or {}).get("score_source", "")).strip()
@@ -256,18 +258,24 @@ _MODALITY_TAG_MAP: Dict[str, List[str]] = {
 def _infer_tags_from_dataset(
     dataset_path: str,
     dataset: dict | None = None,
+    profile_cache_dir: str | Path | None = None,
 ) -> List[str]:
     """Probe dataset and return modality tags inferred from its schema.
 
     Accepts either a plain *dataset_path* or a structured *dataset* config.
+    The probe is cached under *profile_cache_dir* when one is given.
     Returns an empty list when the dataset cannot be inspected or the modality
     is unknown, so the caller can fall back to unfiltered retrieval.
     """
     try:
-        from data_juicer_agents.tools.context.inspect_dataset.logic import (
-            inspect_dataset_schema,
+        from data_juicer_agents.tools.context.inspect_dataset import inspect_dataset_schema
+
+        result = inspect_dataset_schema(
+            dataset_path=dataset_path,
+            sample_size=20,
+            dataset=dataset,
+            cache_dir=profile_cache_dir,
         )
-        result = inspect_dataset_schema(dataset_path=dataset_path, sample_size=20, dataset=dataset)
         if not result.get("ok"):
             return []
         modality = str(result.get("modality", "")).strip().lower()
@@ -282,14 +290,19 @@ def _prepare_retrieval_inputs(
     tags: list | None = None,
     dataset_path: str | None = None,
     dataset: dict | None = None,
+    profile_cache_dir: str | Path | None = None,
 ) -> Dict[str, Any]:
     requested_tags = [str(tag).strip() for tag in (tags or []) if str(tag).strip()]
     inferred_tags: List[str] = []
     # Priority: dataset (multi-source config) > dataset_path (plain path)
     if dataset:
-        inferred_tags = _infer_tags_from_dataset(dataset_path="", dataset=dataset)
+        inferred_tags = _infer_tags_from_dataset(
+            dataset_path="", dataset=dataset, profile_cache_dir=profile_cache_dir
+        )
     elif dataset_path:
-        inferred_tags = _infer_tags_from_dataset(dataset_path=dataset_path, dataset=None)
+        inferred_tags = _infer_tags_from_dataset(
+            dataset_path=dataset_path, dataset=None, profile_cache_dir=profile_cache_dir
+        )
 
     effective_tags = list(requested_tags)
     for tag in inferred_tags:
@@ -301,19 +314,16 @@ def _prepare_retrieval_inputs(
         normalized_top_k = 10
     normalized_top_k = min(normalized_top_k, 200)
 
-    info_rows: List[Dict[str, Any]] = []
+    info_rows: List[OperatorRecord] = []
+    info_map: Dict[str, OperatorRecord] = {}
     funcs = _load_op_retrieval_funcs()
     if funcs is not None:
         get_op_catalog, _init_op_catalog, _retrieve_ops, _retrieve_ops_with_meta = funcs
         try:
-            info_rows = [
-                item
-                for item in get_op_catalog()
-                if isinstance(item, dict) and str(item.get("class_name", "")).strip()
-            ]
+            info_rows, info_map = index_operator_records(get_op_catalog())
         except Exception as exc:
             _logger.debug("get_op_catalog failed: %s", exc)
-            info_rows = []
+            info_rows, info_map = [], {}
 
     return {
         "top_k": normalized_top_k,
@@ -321,7 +331,7 @@ def _prepare_retrieval_inputs(
         "inferred_tags": inferred_tags,
         "effective_tags": effective_tags,
         "info_rows": info_rows,
-        "info_map": {str(item.get("class_name", "")).strip(): item for item in info_rows},
+        "info_map": info_map,
     }
 
 
@@ -355,8 +365,8 @@ def _finalize_candidate_payload(
     requested_tags: List[str],
     inferred_tags: List[str],
     effective_tags: List[str],
-    info_rows: List[Dict[str, Any]],
-    info_map: Dict[str, Dict[str, Any]],
+    info_rows: List[OperatorRecord],
+    info_map: Dict[str, OperatorRecord],
     retrieve_meta: Dict[str, Any],
     allow_lexical_fallback: bool,
     fallback_note: str | None = None,
@@ -445,6 +455,7 @@ def retrieve_operator_candidates(
     tags: list | None = None,
     dataset_path: str | None = None,
     dataset: dict | None = None,
+    profile_cache_dir: str | Path | None = None,
 ) -> Dict[str, Any]:
     """Retrieve operators and return a structured payload for CLI/agent usage.
 
@@ -461,12 +472,15 @@ def retrieve_operator_candidates(
                       tags are merged with any explicit *tags*.
         dataset: Optional structured dataset config (``{"configs": [...]}``).
                  Used for modality probing when *dataset_path* is not provided.
+        profile_cache_dir: Optional profile cache directory for the modality
+                 probe; ``None`` (the default) does not cache.
     """
     prepared = _prepare_retrieval_inputs(
         top_k=top_k,
         tags=tags,
         dataset_path=dataset_path,
         dataset=dataset,
+        profile_cache_dir=profile_cache_dir,
     )
     effective_tags = prepared["effective_tags"] or None
     retrieve_meta = _safe_async_retrieve(
@@ -499,6 +513,7 @@ def retrieve_operator_candidates_local(
     tags: list | None = None,
     dataset_path: str | None = None,
     dataset: dict | None = None,
+    profile_cache_dir: str | Path | None = None,
 ) -> Dict[str, Any]:
     normalized_mode = str(mode or "auto").strip().lower() or "auto"
     if normalized_mode not in _LOCAL_RETRIEVAL_MODES:
@@ -511,6 +526,7 @@ def retrieve_operator_candidates_local(
         tags=tags,
         dataset_path=dataset_path,
         dataset=dataset,
+        profile_cache_dir=profile_cache_dir,
     )
     effective_tags = prepared["effective_tags"] or None
     effective_mode = normalized_mode
@@ -547,6 +563,7 @@ def retrieve_operator_candidates_api(
     tags: list | None = None,
     dataset_path: str | None = None,
     dataset: dict | None = None,
+    profile_cache_dir: str | Path | None = None,
 ) -> Dict[str, Any]:
     normalized_mode = str(mode or "auto").strip().lower() or "auto"
     if normalized_mode not in _API_RETRIEVAL_MODES:
@@ -559,6 +576,7 @@ def retrieve_operator_candidates_api(
         tags=tags,
         dataset_path=dataset_path,
         dataset=dataset,
+        profile_cache_dir=profile_cache_dir,
     )
     effective_tags = prepared["effective_tags"] or None
 
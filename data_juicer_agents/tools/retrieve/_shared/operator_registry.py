@@ -28,13 +28,11 @@ def get_available_operator_names() -> Set[str]:
             init_op_catalog,
         )
 
+        from .backend.record import index_operator_records
+
         init_op_catalog()
-        info = get_op_catalog()
-        return {
-            str(item.get("class_name", "")).strip()
-            for item in info
-            if isinstance(item, dict) and str(item.get("class_name", "")).strip()
-        }
+        _records, name_map = index_operator_records(get_op_catalog())
+        return set(name_map)
     except Exception as exc:
         _logger.debug("get_available_operator_names failed: %s", exc)
         return set()
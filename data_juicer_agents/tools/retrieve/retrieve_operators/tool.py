@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from data_juicer_agents.core.tool import ToolContext, ToolResult, ToolSpec
 from data_juicer_agents.utils.runtime_helpers import to_int
 
@@ -10,7 +12,7 @@ from .input import GenericOutput, RetrieveOperatorsInput
 from .logic import retrieve_operator_candidates_local
 
 
-def _retrieve_operators(_ctx: ToolContext, args: RetrieveOperatorsInput) -> ToolResult:
+def _retrieve_operators(ctx: ToolContext, args: RetrieveOperatorsInput) -> ToolResult:
     if not args.intent.strip():
         return ToolResult.failure(
             summary="intent is required for retrieve_operators",
@@ -33,6 +35,7 @@ def _retrieve_operators(_ctx: ToolContext, args: RetrieveOperatorsInput) -> Tool
             op_type=(args.op_type.strip() or None),
             tags=parsed_tags,
             dataset_path=dataset_path,
+            profile_cache_dir=Path(ctx.working_dir).expanduser() / "profiles",
         )
     except Exception as exc:
         return ToolResult.failure(
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
 from data_juicer_agents.core.tool import ToolContext, ToolResult, ToolSpec
 from data_juicer_agents.utils.runtime_helpers import to_int
 
@@ -24,7 +26,7 @@ def _api_retrieval_is_unavailable(payload: dict) -> bool:
     )
 
 
-def _retrieve_operators_api(_ctx: ToolContext, args: RetrieveOperatorsAPIInput) -> ToolResult:
+def _retrieve_operators_api(ctx: ToolContext, args: RetrieveOperatorsAPIInput) -> ToolResult:
     if not args.intent.strip():
         return ToolResult.failure(
             summary="intent is required for retrieve_operators_api",
@@ -47,6 +49,7 @@ def _retrieve_operators_api(_ctx: ToolContext, args: RetrieveOperatorsAPIInput)
             op_type=(args.op_type.strip() or None),
             tags=parsed_tags,
             dataset_path=dataset_path,
+            profile_cache_dir=Path(ctx.working_dir).expanduser() / "profiles",
         )
     except Exception as exc:
         return ToolResult.failure(
@@ -10,6 +10,7 @@ from typing import Dict
 from typing import Iterable
 from typing import Optional
 
+from data_juicer_agents.tools.apply.apply_recipe.progress import format_progress_event
 from data_juicer_agents.tui.models import ToolCallState
 from data_juicer_agents.tui.models import TuiState
 from data_juicer_agents.tui.noise_filter import sanitize_reasoning_text
@@ -167,6 +168,20 @@ def apply_event(state: TuiState, event: Dict[str, Any]) -> None:
         )
         return
 
+    if event_type == "apply_progress":
+        text = format_progress_event(event)
+        state.status_line = f"Applying: {text}"
+        if event.get("kind") == "op_done":
+            state.add_timeline(
+                kind="tool",
+                title="apply progress",
+                text=text,
+                status="running",
+                tool="apply_recipe",
+                timestamp=ts,
+            )
+        return
+
     if event_type == "reasoning_step":
         step = str(event.get("step", "")).strip()
         thinking = sanitize_reasoning_text(
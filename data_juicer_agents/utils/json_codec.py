@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""JSON codec used on hot serialization paths.
+
+Uses ``orjson`` when it is installed and falls back to the stdlib ``json``
+module otherwise (or when ``DJX_JSON_BACKEND=json``).  Both backends produce
+the same text: compact separators, non-ASCII characters left unescaped,
+insertion order preserved unless ``sort_keys`` is set, and two-space
+indentation when ``indent=2``.  The stdlib path writes floats the way
+``orjson`` does (non-finite values as ``null``, ``1e20`` rather than
+``1e+20``, ``0.00001`` rather than ``1e-05``), so content hashes built on
+:func:`dumps` do not depend on which backend is active.
+
+Inputs ``orjson`` rejects (integers wider than 64 bits, lone surrogates,
+``ensure_ascii``, other indent widths) are handled by the stdlib path.
+:func:`loads` raises ``json.JSONDecodeError`` on bad input; under ``orjson``
+integer literals wider than 64 bits are parsed as floats.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from typing import Any, Callable, Optional
+
+JSONDecodeError = json.JSONDecodeError
+
+try:
+    if str(os.environ.get("DJX_JSON_BACKEND", "")).strip().lower() == "json":
+        raise ImportError("stdlib json backend forced by DJX_JSON_BACKEND")
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+BACKEND = "orjson" if _orjson is not None else "json"
+
+_COMPACT_SEPARATORS = (",", ":")
+
+# Float literals the stdlib writes differently from ``orjson`` (``1e+20``,
+# ``1e-05``).  Matches inside strings only cost a slower, still exact, encode.
+_STDLIB_EXPONENT = re.compile(r"\de[+-]\d")
+
+
+def _format_float(value: float) -> str:
+    """Render *value* like ``orjson``: shortest repr, ``null`` for non-finite."""
+    if value != value or value in (float("inf"), float("-inf")):
+        return "null"
+    text = float.__repr__(value)
+    if "e" not in text:
+        return text
+    mantissa, exponent = text.split("e")
+    if exponent == "-05":
+        sign = "-" if mantissa.startswith("-") else ""
+        return sign + "0.0000" + mantissa.lstrip("-").replace(".", "")
+    return f"{mantissa}e{int(exponent)}"
+
+
+class _OrjsonFloatEncoder(json.JSONEncoder):
+    """Pure-Python stdlib encoder using :func:`_format_float` for floats."""
+
+    def iterencode(self, o: Any, _one_shot: bool = False):
+        encoder = (
+            json.encoder.encode_basestring_ascii
+            if self.ensure_ascii
+            else json.encoder.encode_basestring
+        )
+        return json.encoder._make_iterencode(
+            {} if self.check_circular else None,
+            self.default,
+            encoder,
+            self.indent,
+            _format_float,
+            self.key_separator,
+            self.item_separator,
+            self.sort_keys,
+            self.skipkeys,
+            _one_shot,
+        )(o, 0)
+
+
+def _stdlib_dumps(
+    obj: Any,
+    *,
+    indent: Optional[int],
+    sort_keys: bool,
+    ensure_ascii: bool,
+    default: Optional[Callable[[Any], Any]],
+) -> str:
+    options = {
+        "ensure_ascii": ensure_ascii,
+        "indent": indent,
+        "sort_keys": sort_keys,
+        "default": default,
+        "separators": (",", ": ") if indent is not None else _COMPACT_SEPARATORS,
+    }
+    if indent is None:
+        # The C encoder is exact unless a float needs orjson's formatting.
+        try:
+            text = json.dumps(obj, allow_nan=False, **options)
+        except ValueError:
+            text = None
+        if text is not None and not _STDLIB_EXPONENT.search(text):
+            return text
+    return json.dumps(obj, cls=_OrjsonFloatEncoder, **options)
+
+
+def dumps(
+    obj: Any,
+    *,
+    indent: Optional[int] = None,
+    sort_keys: bool = False,
+    ensure_ascii: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """Serialize *obj* to a JSON string (compact unless *indent* is given)."""
+    if _orjson is not None and not ensure_ascii and indent in (None, 2):
+        # Datetimes and dataclasses go through ``default`` like in the stdlib.
+        option = (
+            _orjson.OPT_NON_STR_KEYS
+            | _orjson.OPT_PASSTHROUGH_DATETIME
+            | _orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        if indent == 2:
+            option |= _orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        try:
+            return _orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except (TypeError, _orjson.JSONEncodeError):
+            pass
+    return _stdlib_dumps(
+        obj,
+        indent=indent,
+        sort_keys=sort_keys,
+        ensure_ascii=ensure_ascii,
+        default=default,
+    )
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """Parse JSON text; raises ``json.JSONDecodeError`` on invalid input."""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+__all__ = ["BACKEND", "JSONDecodeError", "dumps", "loads"]
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""Event-driven supervision of child processes.
+
+Both ``ApplyUseCase.execute`` and :func:`run_interruptible_subprocess` need
+to wait for a child until it exits, a deadline passes, or the caller asks
+to cancel.  Polling ``proc.poll()`` every 100ms adds up to a tick of
+latency to each of those and keeps the waiting thread busy for the whole
+run.  :func:`wait_for_process` instead blocks in ``select`` on:
+
+* a pidfd for the child (``os.pidfd_open``, Linux 5.3+), or, where pidfds
+  are unavailable, a self-pipe written by a watcher thread blocked in
+  ``proc.wait()``;
+* the same self-pipe, written by :meth:`CancelEvent.set`;
+* the select timeout, which is the remaining time to the deadline.
+
+so every wake-up corresponds to an actual state change.
+With ``reap=False`` the exit is detected with ``waitid(..., WNOWAIT)``
+and the child stays a zombie, so :func:`reap_process` can collect its
+``rusage`` (which includes every descendant it waited for).
+:func:`wait_for_readable` applies the same loop to arbitrary descriptors,
+such as a worker connection and its process sentinel.  Plain
+``threading.Event`` objects and ``cancel_check`` callables are still
+accepted; they cannot wake the selector and are checked every
+``_CANCEL_CHECK_INTERVAL`` seconds.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import select
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+EXITED = "exited"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+
+_CANCEL_CHECK_INTERVAL = 0.25
+
+
+class CancelEvent(threading.Event):
+    """``threading.Event`` that wakes supervisors waiting on it when set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._listeners: List[Callable[[], None]] = []
+        self._listeners_lock = threading.Lock()
+
+    def set(self) -> None:
+        super().set()
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            with contextlib.suppress(Exception):
+                listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        with self._listeners_lock:
+            self._listeners.append(listener)
+        if self.is_set():
+            listener()
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        with self._listeners_lock:
+            with contextlib.suppress(ValueError):
+                self._listeners.remove(listener)
+
+
+def terminate_process_group(
+    proc: subprocess.Popen,
+    grace_seconds: float = 2.0,
+    signum: int = signal.SIGTERM,
+) -> None:
+    """Terminate a subprocess (and its session) gracefully with fallback to SIGKILL.
+
+    *signum* is sent first; e.g. ``SIGINT`` lets Python children unwind
+    through ``finally`` blocks before the SIGKILL after *grace_seconds*.
+    """
+    try:
+        os.killpg(proc.pid, signum)
+    except Exception:
+        with contextlib.suppress(Exception):
+            proc.send_signal(signum)
+    with contextlib.suppress(Exception):
+        proc.wait(timeout=grace_seconds)
+    if proc.poll() is None:
+        with contextlib.suppress(Exception):
+            os.killpg(proc.pid, signal.SIGKILL)
+        with contextlib.suppress(Exception):
+            proc.kill()
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        return pidfd_open(pid)
+    except OSError as exc:
+        _logger.debug("pidfd_open(%s) unavailable: %s", pid, exc)
+        return None
+
+
+def _can_peek() -> bool:
+    return all(hasattr(os, name) for name in ("waitid", "P_PID", "WNOWAIT"))
+
+
+def _exited(proc: subprocess.Popen, reap: bool) -> bool:
+    if proc.returncode is not None:
+        return True
+    if reap or not _can_peek():
+        return proc.poll() is not None
+    try:
+        info = os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+    except ChildProcessError:
+        return proc.poll() is not None
+    return info is not None
+
+
+def _watch_exit(proc: subprocess.Popen, wake: Callable[[], None], reap: bool = True) -> None:
+    with contextlib.suppress(Exception):
+        if reap or not _can_peek():
+            proc.wait()
+        else:
+            os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+    wake()
+
+
+def _supervise(
+    done: Callable[[], bool],
+    fds: List[int],
+    *,
+    timeout: Optional[float],
+    cancel_event: Optional[threading.Event],
+    cancel_check: Optional[Callable[[], bool]],
+    watcher: Optional[Callable[[Callable[[], None]], None]] = None,
+) -> str:
+    deadline = None if timeout is None else time.monotonic() + float(timeout)
+
+    def cancelled() -> bool:
+        if cancel_event is not None and cancel_event.is_set():
+            return True
+        return callable(cancel_check) and bool(cancel_check())
+
+    if done():
+        return EXITED
+    if cancelled():
+        return CANCELLED
+
+    polled_cancel = callable(cancel_check) or (
+        cancel_event is not None and not isinstance(cancel_event, CancelEvent)
+    )
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.set_blocking(write_fd, False)
+    wake_lock = threading.Lock()
+    closed = False
+
+    def wake() -> None:
+        # Late wake-ups (watcher thread, cancel listener) must not write to
+        # a descriptor number that has been closed and possibly reused.
+        with wake_lock:
+            if closed:
+                return
+            with contextlib.suppress(OSError):
+                os.write(write_fd, b"\0")
+
+    selector = selectors.DefaultSelector()
+    selector.register(read_fd, selectors.EVENT_READ)
+    for fd in fds:
+        selector.register(fd, selectors.EVENT_READ)
+    if watcher is not None:
+        threading.Thread(target=watcher, args=(wake,), name="djx-watch", daemon=True).start()
+    if isinstance(cancel_event, CancelEvent):
+        cancel_event.add_listener(wake)
+
+    try:
+        while True:
+            if done():
+                return EXITED
+            if cancelled():
+                return CANCELLED
+            wait = None
+            if deadline is not None:
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    return TIMEOUT
+            if polled_cancel:
+                wait = _CANCEL_CHECK_INTERVAL if wait is None else min(wait, _CANCEL_CHECK_INTERVAL)
+            selector.select(wait)
+            with contextlib.suppress(OSError):
+                while os.read(read_fd, 4096):
+                    pass
+    finally:
+        if isinstance(cancel_event, CancelEvent):
+            cancel_event.remove_listener(wake)
+        with wake_lock:
+            closed = True
+        selector.close()
+        for fd in (read_fd, write_fd):
+            with contextlib.suppress(OSError):
+                os.close(fd)
+
+
+def wait_for_process(
+    proc: subprocess.Popen,
+    *,
+    timeout: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    reap: bool = True,
+) -> str:
+    """Block until *proc* exits, *timeout* elapses or cancellation is requested.
+
+    Returns :data:`EXITED`, :data:`TIMEOUT` or :data:`CANCELLED`.  The child
+    is left untouched in every case; callers decide how to stop it (see
+    :func:`terminate_process_group`).  With *reap* false an exited child is
+    not waited for, where the platform allows it; call
+    :func:`reap_process` afterwards.
+    """
+    if _exited(proc, reap):
+        return EXITED
+    pidfd = _open_pidfd(proc.pid)
+    try:
+        return _supervise(
+            lambda: _exited(proc, reap),
+            [pidfd] if pidfd is not None else [],
+            timeout=timeout,
+            cancel_event=cancel_event,
+            cancel_check=cancel_check,
+            watcher=None if pidfd is not None else (lambda wake: _watch_exit(proc, wake, reap)),
+        )
+    finally:
+        if pidfd is not None:
+            with contextlib.suppress(OSError):
+                os.close(pidfd)
+
+
+def reap_process(proc: subprocess.Popen) -> Optional[Any]:
+    """Wait for *proc* and return its ``resource.struct_rusage``.
+
+    Sets ``proc.returncode``.  Returns ``None`` when the child had already
+    been reaped (e.g. by ``proc.poll()``) or ``os.wait4`` is unavailable.
+    """
+    if proc.returncode is not None or not hasattr(os, "wait4"):
+        proc.wait()
+        return None
+    try:
+        _pid, status, usage = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        proc.wait()
+        return None
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return usage
+
+
+def wait_for_readable(
+    fds: List[int],
+    *,
+    timeout: Optional[float] = None,
+    cancel_event: Optional[threading.Event] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+) -> str:
+    """Like :func:`wait_for_process` for arbitrary descriptors.
+
+    Returns :data:`EXITED` as soon as any of *fds* is readable (e.g. a
+    ``multiprocessing`` connection or process sentinel).
+    """
+
+    def ready() -> bool:
+        return bool(select.select(fds, [], [], 0)[0])
+
+    return _supervise(
+        ready,
+        list(fds),
+        timeout=timeout,
+        cancel_event=cancel_event,
+        cancel_check=cancel_check,
+    )
+
+
+__all__ = [
+    "CANCELLED",
+    "CancelEvent",
+    "EXITED",
+    "TIMEOUT",
+    "reap_process",
+    "terminate_process_group",
+    "wait_for_process",
+    "wait_for_readable",
+]
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""Resource accounting for recipe runs.
+
+``ApplyResult.duration_seconds`` says how long a plan took but not what it
+cost.  Two sources fill that gap:
+
+* the ``rusage`` returned by ``wait4`` when the run's root process is
+  reaped (see :func:`.process_supervisor.reap_process`): user/system CPU,
+  max RSS, block I/O and context switches of that process plus every
+  worker it waited for;
+* :class:`ProcessGroupSampler`, which sums the RSS of all live processes
+  in the run's process group.  ``ru_maxrss`` is the largest *single*
+  process, so for ``np > 1`` recipes the sampled group peak is the number
+  that matters for sizing a machine.  RSS comes from ``/proc/<pid>/stat``,
+  which the scan reads anyway.  Summed RSS counts pages shared by forked
+  workers once per worker, so whenever the group RSS reaches a new peak the
+  proportional set size (``Pss`` from the much slower ``smaps_rollup``) is
+  read as well and reported separately.  The interval starts at
+  ``DEFAULT_SAMPLE_INTERVAL`` and backs off to ``MAX_SAMPLE_INTERVAL``,
+  so long runs are not charged for a ``/proc`` scan twice a second.
+
+Sampling reads ``/proc`` and is a no-op where it does not exist; runs that
+are killed on timeout or cancellation are reaped without ``rusage`` and
+only report sampled values.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_INTERVAL = 0.5
+MAX_SAMPLE_INTERVAL = 5.0
+_INTERVAL_BACKOFF = 1.5
+
+_PROC_ROOT = "/proc"
+
+
+def rusage_to_dict(usage: Any) -> Dict[str, Any]:
+    """Flatten a ``resource.struct_rusage`` into JSON-friendly fields."""
+    if usage is None:
+        return {}
+    max_rss = int(usage.ru_maxrss)
+    if sys.platform == "darwin":
+        # macOS reports bytes, Linux kilobytes.
+        max_rss //= 1024
+    return {
+        "user_cpu_seconds": round(float(usage.ru_utime), 3),
+        "sys_cpu_seconds": round(float(usage.ru_stime), 3),
+        "max_rss_kb": max_rss,
+        "block_input_ops": int(usage.ru_inblock),
+        "block_output_ops": int(usage.ru_oublock),
+        "voluntary_context_switches": int(usage.ru_nvcsw),
+        "involuntary_context_switches": int(usage.ru_nivcsw),
+    }
+
+
+def _page_size() -> int:
+    with contextlib.suppress(AttributeError, OSError, ValueError):
+        return int(os.sysconf("SC_PAGE_SIZE"))
+    return 4096
+
+
+def _pss_kb(proc_dir: str) -> Optional[int]:
+    try:
+        with open(os.path.join(proc_dir, "smaps_rollup"), "rb") as handle:
+            for line in handle:
+                if line.startswith(b"Pss:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _group_members(pgid: int, proc_root: str) -> List[Tuple[str, int]]:
+    """Return ``(proc_dir, rss_kb)`` for every live process in group *pgid*."""
+    page_kb = _page_size() // 1024
+    members: List[Tuple[str, int]] = []
+    try:
+        entries = os.scandir(proc_root)
+    except OSError:
+        return members
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(os.path.join(entry.path, "stat"), "rb") as handle:
+                    raw = handle.read()
+            except OSError:
+                continue
+            # Fields after "(comm)": state ppid pgrp ... rss is field 24 overall.
+            fields = raw.rpartition(b")")[2].split()
+            if len(fields) < 22 or int(fields[2]) != pgid:
+                continue
+            members.append((entry.path, int(fields[21]) * page_kb))
+    return members
+
+
+def _members_pss_kb(members: List[Tuple[str, int]]) -> int:
+    total = 0
+    for proc_dir, rss_kb in members:
+        pss = _pss_kb(proc_dir)
+        total += pss if pss is not None else rss_kb
+    return total
+
+
+def group_rss_kb(pgid: int, proc_root: str = _PROC_ROOT) -> Tuple[int, int]:
+    """Return ``(total_rss_kb, processes)`` for process group *pgid*."""
+    members = _group_members(pgid, proc_root)
+    return sum(rss_kb for _path, rss_kb in members), len(members)
+
+
+def group_pss_kb(pgid: int, proc_root: str = _PROC_ROOT) -> Tuple[int, int]:
+    """Return ``(total_kb, processes)`` for *pgid* counted by PSS, else RSS."""
+    members = _group_members(pgid, proc_root)
+    return _members_pss_kb(members), len(members)
+
+
+class ProcessGroupSampler:
+    """Background thread tracking the peak RSS and PSS of one process group.
+
+    *pgid* may be a callable returning ``None`` until the group exists
+    (e.g. a fork-server child whose pid is not known yet).  The wait
+    between samples grows from *interval* to *max_interval*.
+    """
+
+    def __init__(
+        self,
+        pgid: Union[int, Callable[[], Optional[int]]],
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        max_interval: float = MAX_SAMPLE_INTERVAL,
+    ) -> None:
+        self._pgid = pgid
+        self.interval = float(interval)
+        self.max_interval = max(float(max_interval), self.interval)
+        self.peak_rss_kb = 0
+        self.peak_pss_kb = 0
+        self.peak_processes = 0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _resolve_pgid(self) -> Optional[int]:
+        return self._pgid() if callable(self._pgid) else self._pgid
+
+    def sample(self) -> None:
+        pgid = self._resolve_pgid()
+        if pgid is None:
+            return
+        members = _group_members(pgid, _PROC_ROOT)
+        if not members:
+            return
+        self.samples += 1
+        rss_kb = sum(member_rss for _path, member_rss in members)
+        if rss_kb > self.peak_rss_kb:
+            self.peak_rss_kb = rss_kb
+            self.peak_pss_kb = max(self.peak_pss_kb, _members_pss_kb(members))
+        self.peak_processes = max(self.peak_processes, len(members))
+
+    def _run(self) -> None:
+        interval = self.interval
+        while True:
+            try:
+                self.sample()
+            except Exception as exc:
+                _logger.debug("rss sampling stopped: %s", exc)
+                return
+            if self._stop.wait(interval):
+                return
+            interval = min(interval * _INTERVAL_BACKOFF, self.max_interval)
+
+    def start(self) -> "ProcessGroupSampler":
+        if os.path.isdir(_PROC_ROOT):
+            self._thread = threading.Thread(target=self._run, name="djx-rss", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop sampling and return the peak fields (empty if nothing was seen)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(max(self.interval, 1.0) * 2)
+        if not self.samples:
+            return {}
+        return {
+            "peak_group_rss_kb": self.peak_rss_kb,
+            "peak_group_pss_kb": self.peak_pss_kb,
+            "peak_group_processes": self.peak_processes,
+            "rss_samples": self.samples,
+        }
+
+
+def _format_kb(value: Any) -> str:
+    amount = float(value or 0) / 1024
+    return f"{amount / 1024:.2f} GiB" if amount >= 1024 else f"{amount:.1f} MiB"
+
+
+def format_resources(resources: Dict[str, Any]) -> str:
+    """One-line summary of an ``ApplyResult.resources`` payload."""
+    parts = []
+    if "user_cpu_seconds" in resources:
+        parts.append(
+            f"cpu user={resources['user_cpu_seconds']:.2f}s sys={resources.get('sys_cpu_seconds', 0.0):.2f}s"
+        )
+    if "max_rss_kb" in resources:
+        parts.append(f"max rss={_format_kb(resources['max_rss_kb'])}")
+    if "peak_group_rss_kb" in resources:
+        parts.append(
+            f"group peak rss={_format_kb(resources['peak_group_rss_kb'])} "
+            f"({resources.get('peak_group_processes', 0)} procs)"
+        )
+    if "peak_group_pss_kb" in resources:
+        parts.append(f"group peak pss={_format_kb(resources['peak_group_pss_kb'])}")
+    if "block_input_ops" in resources:
+        parts.append(f"block io in={resources['block_input_ops']} out={resources.get('block_output_ops', 0)}")
+    if "voluntary_context_switches" in resources:
+        parts.append(
+            f"ctx switches vol={resources['voluntary_context_switches']} "
+            f"invol={resources.get('involuntary_context_switches', 0)}"
+        )
+    return ", ".join(parts)
+
+
+__all__ = [
+    "DEFAULT_SAMPLE_INTERVAL",
+    "MAX_SAMPLE_INTERVAL",
+    "ProcessGroupSampler",
+    "format_resources",
+    "group_pss_kb",
+    "group_rss_kb",
+    "rusage_to_dict",
+]
@@ -3,13 +3,23 @@
 
 from __future__ import annotations
 
+import contextlib
 import json
-import os
 import re
-import signal
 import subprocess
+import threading
 import time
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
+
+from data_juicer_agents.utils import json_codec
+from data_juicer_agents.utils.process_supervisor import (
+    CANCELLED,
+    EXITED,
+    TIMEOUT,
+    terminate_process_group,
+    wait_for_process,
+)
+from data_juicer_agents.utils.stream_capture import StreamCapture
 
 
 def to_int(value: Any, default: int) -> int:
@@ -102,7 +112,7 @@ def to_event_result_preview(value: Any, max_chars: int = 6000) -> str:
     if value is None:
         return ""
     try:
-        rendered = json.dumps(value, ensure_ascii=False, indent=2, default=str)
+        rendered = json_codec.dumps(value, indent=2, default=str)
     except Exception:
         rendered = str(value)
     return truncate_text(rendered, limit=max_chars).strip()
@@ -114,7 +124,7 @@ def to_text_response(payload: Dict[str, Any]):
 
     return ToolResponse(
         metadata={"ok": True},
-        content=[TextBlock(type="text", text=json.dumps(payload, ensure_ascii=False))],
+        content=[TextBlock(type="text", text=json_codec.dumps(payload))],
     )
 
 
@@ -123,58 +133,77 @@ def run_interruptible_subprocess(
     *,
     timeout_sec: int,
     shell: bool,
+    cancel_event: threading.Event | None = None,
+    cancel_check: Callable[[], bool] | None = None,
 ) -> Dict[str, Any]:
-    proc = subprocess.Popen(
-        command,
-        shell=shell,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        start_new_session=True,
-    )
-    deadline = time.monotonic() + float(timeout_sec)
+    captures: List[StreamCapture] = []
+    try:
+        proc = subprocess.Popen(
+            command,
+            shell=shell,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+    except Exception as exc:
+        return {
+            "ok": False,
+            "error_type": "execution_failed",
+            "returncode": -1,
+            "stdout": "",
+            "stderr": "",
+            "message": f"process execution failed: {exc}",
+        }
     try:
-        while True:
-            rc = proc.poll()
-            if rc is not None:
-                out, err = proc.communicate()
-                return {
-                    "ok": int(rc) == 0,
-                    "returncode": int(rc),
-                    "stdout": truncate_text(out or "", 8000),
-                    "stderr": truncate_text(err or "", 8000),
-                    "message": f"process finished with returncode={int(rc)}",
-                }
-
-            if time.monotonic() >= deadline:
-                try:
-                    os.killpg(proc.pid, signal.SIGTERM)
-                except Exception:
-                    pass
-                try:
-                    proc.wait(timeout=2)
-                except Exception:
-                    pass
-                if proc.poll() is None:
-                    try:
-                        os.killpg(proc.pid, signal.SIGKILL)
-                    except Exception:
-                        pass
-                    try:
-                        proc.kill()
-                    except Exception:
-                        pass
-                out, err = proc.communicate(timeout=2)
-                return {
-                    "ok": False,
-                    "error_type": "timeout",
-                    "returncode": -1,
-                    "stdout": truncate_text(out or "", 8000),
-                    "stderr": truncate_text((err or "").strip(), 8000),
-                    "message": f"process timeout after {timeout_sec}s",
-                }
-            time.sleep(0.1)
+        # Drain both pipes while waiting so a chatty child cannot block on a
+        # full pipe buffer and run into the timeout.
+        captures = [
+            StreamCapture(proc.stdout, name="stdout").start(),
+            StreamCapture(proc.stderr, name="stderr").start(),
+        ]
+        outcome = wait_for_process(
+            proc,
+            timeout=float(timeout_sec),
+            cancel_event=cancel_event,
+            cancel_check=cancel_check,
+        )
+        if outcome != EXITED:
+            terminate_process_group(proc)
+        else:
+            proc.wait()
+        deadline = time.monotonic() + 2.0
+        for capture in captures:
+            capture.join(max(deadline - time.monotonic(), 0.0))
+        out, err = captures[0].text(), captures[1].text()
+
+        if outcome == TIMEOUT:
+            return {
+                "ok": False,
+                "error_type": "timeout",
+                "returncode": -1,
+                "stdout": truncate_text(out, 8000),
+                "stderr": truncate_text(err.strip(), 8000),
+                "message": f"process timeout after {timeout_sec}s",
+            }
+        if outcome == CANCELLED:
+            return {
+                "ok": False,
+                "error_type": "interrupted",
+                "returncode": -1,
+                "stdout": truncate_text(out, 8000),
+                "stderr": truncate_text(err.strip(), 8000),
+                "message": "process interrupted",
+            }
+        rc = int(proc.returncode)
+        return {
+            "ok": rc == 0,
+            "returncode": rc,
+            "stdout": truncate_text(out, 8000),
+            "stderr": truncate_text(err, 8000),
+            "message": f"process finished with returncode={rc}",
+        }
     except Exception as exc:
+        terminate_process_group(proc)
         return {
             "ok": False,
             "error_type": "execution_failed",
@@ -183,6 +212,10 @@ def run_interruptible_subprocess(
             "stderr": "",
             "message": f"process execution failed: {exc}",
         }
+    finally:
+        for pipe in (proc.stdout, proc.stderr):
+            with contextlib.suppress(Exception):
+                pipe.close()
 
 
 __all__ = [
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""Incremental capture of subprocess output pipes.
+
+Redirecting a child's output to temporary files and reading them after it
+exits leaves callers blind for the whole run.  :class:`StreamCapture`
+drains one binary pipe on a daemon thread as data arrives, keeps the
+decoded text, and hands every completed line to an optional callback.
+Both ``\\n`` and ``\\r`` end a line so that tqdm-style progress bars, which
+redraw with carriage returns, are reported as they update.
+
+Long runs can print far more than is worth holding in memory.  With
+``max_chars`` the kept text is a ring buffer of the most recent output
+only, and ``spill`` receives every raw byte so the full log survives on
+disk.  Lines longer than ``_MAX_LINE_CHARS`` are handed to the callback in
+pieces of at most that size, so output without line breaks cannot grow the
+pending line without bound.
+"""
+
+from __future__ import annotations
+
+import codecs
+import logging
+import re
+import threading
+from collections import deque
+from typing import IO, Callable, Deque, Optional
+
+_logger = logging.getLogger(__name__)
+
+_READ_SIZE = 64 * 1024
+_MAX_LINE_CHARS = 64 * 1024
+_LINE_BREAK = re.compile(r"[\r\n]")
+
+
+class StreamCapture:
+    """Drain a binary pipe on a background thread."""
+
+    def __init__(
+        self,
+        stream: IO[bytes],
+        *,
+        name: str = "stdout",
+        on_line: Optional[Callable[[str, str], None]] = None,
+        max_chars: Optional[int] = None,
+        spill: Optional[IO[bytes]] = None,
+    ) -> None:
+        self.name = name
+        self._stream = stream
+        self._on_line = on_line
+        self._max_chars = max_chars if max_chars and max_chars > 0 else None
+        self._spill = spill
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._chunks: Deque[str] = deque()
+        self._size = 0
+        self.dropped_chars = 0
+        self._partial = ""
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"djx-capture-{name}",
+            daemon=True,
+        )
+
+    def start(self) -> "StreamCapture":
+        self._thread.start()
+        return self
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for EOF; returns ``False`` if the reader is still running."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def text(self) -> str:
+        """Captured text; only the last ``max_chars`` characters when bounded."""
+        with self._lock:
+            return "".join(self._chunks)
+
+    def _read(self) -> bytes:
+        read1 = getattr(self._stream, "read1", None)
+        if read1 is not None:
+            return read1(_READ_SIZE)
+        return self._stream.read(_READ_SIZE)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                data = self._read()
+                if not data:
+                    break
+                self._write_spill(data)
+                self._feed(self._decoder.decode(data))
+            self._feed(self._decoder.decode(b"", final=True))
+            if self._partial:
+                self._emit(self._partial)
+                self._partial = ""
+        except (OSError, ValueError) as exc:
+            # The pipe was closed underneath us (e.g. after a forced kill).
+            _logger.debug("%s capture stopped: %s", self.name, exc)
+
+    def _write_spill(self, data: bytes) -> None:
+        if self._spill is None:
+            return
+        try:
+            self._spill.write(data)
+        except (OSError, ValueError) as exc:
+            # A full disk must not stop the pipe from being drained.
+            _logger.debug("%s spill stopped: %s", self.name, exc)
+            self._spill = None
+
+    def _append(self, text: str) -> None:
+        with self._lock:
+            self._chunks.append(text)
+            self._size += len(text)
+            if self._max_chars is None:
+                return
+            while self._size > self._max_chars:
+                excess = self._size - self._max_chars
+                head = self._chunks[0]
+                if len(head) <= excess:
+                    self._chunks.popleft()
+                    self._size -= len(head)
+                    self.dropped_chars += len(head)
+                else:
+                    self._chunks[0] = head[excess:]
+                    self._size -= excess
+                    self.dropped_chars += excess
+
+    def _feed(self, text: str) -> None:
+        if not text:
+            return
+        self._append(text)
+        if self._on_line is None:
+            return
+        pieces = _LINE_BREAK.split(text)
+        pieces[0] = self._partial + pieces[0]
+        self._partial = pieces.pop()
+        for piece in pieces:
+            self._emit(piece)
+        while len(self._partial) > _MAX_LINE_CHARS:
+            self._emit(self._partial[:_MAX_LINE_CHARS])
+            self._partial = self._partial[_MAX_LINE_CHARS:]
+
+    def _emit(self, line: str) -> None:
+        if self._on_line is None or not line.strip():
+            return
+        try:
+            self._on_line(self.name, line)
+        except Exception as exc:
+            _logger.debug("%s line callback failed: %s", self.name, exc)
+
+
+__all__ = ["StreamCapture"]
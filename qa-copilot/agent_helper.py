@@ -38,6 +38,8 @@ from redis.asyncio import ConnectionPool
 
 from agentscope_runtime.engine.schemas.agent_schemas import AgentRequest
 
+from data_juicer_agents.utils import json_codec
+
 from operator_tools_adapter import register_qa_operator_tools
 
 
@@ -85,7 +87,7 @@ class JSONSessionHistoryService(object):
                 encoding="utf-8",
                 errors="surrogatepass",
             ) as file:
-                memory_states = json.load(file)["agent"]["memory"]
+                memory_states = json_codec.loads(file.read())["agent"]["memory"]
                 temp_memory = InMemoryMemory()
                 temp_memory.load_state_dict(memory_states)
                 memory = await temp_memory.get_memory()
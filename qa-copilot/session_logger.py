@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 import os
-import json
 import asyncio
 import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from data_juicer_agents.utils import json_codec
+
 # Beijing timezone (UTC+8)
 BEIJING_TZ = datetime.timezone(datetime.timedelta(hours=8))
 
@@ -60,7 +61,7 @@ class SessionLogger:
         record.setdefault("session_id", self.session_id)
         record.setdefault("user_id", self.user_id)
 
-        line = json.dumps(record, ensure_ascii=False)
+        line = json_codec.dumps(record)
         # Fire-and-forget to avoid blocking main coroutine
         asyncio.create_task(self._async_write(line))
 
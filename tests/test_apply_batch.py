@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import yaml
+
+from data_juicer_agents.commands.apply_cmd import run_apply
+from data_juicer_agents.tools.apply import (
+    ApplyResult,
+    BatchPlan,
+    load_batch_plans,
+    read_batch_file,
+    run_apply_batch,
+)
+from data_juicer_agents.tools.plan import PlanModel
+
+
+def _plan(tmp_path: Path, plan_id: str, np: int = 1) -> dict:
+    return PlanModel(
+        plan_id=plan_id,
+        user_intent="filter",
+        modality="text",
+        recipe={
+            "dataset_path": str(tmp_path / "data.jsonl"),
+            "export_path": str(tmp_path / f"{plan_id}.jsonl"),
+            "np": np,
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    ).to_dict()
+
+
+class _RecordingUseCase:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.peak = 0
+        self.granted = {}
+
+    def execute(self, plan_payload, runtime_dir, cancel_event=None, **kwargs):
+        np = plan_payload["recipe"]["np"]
+        with self.lock:
+            self.in_use += np
+            self.peak = max(self.peak, self.in_use)
+            self.granted[plan_payload["plan_id"]] = np
+        time.sleep(0.05)
+        with self.lock:
+            self.in_use -= np
+        if plan_payload["plan_id"] == "plan_boom":
+            raise ValueError("boom")
+        result = ApplyResult(
+            execution_id=ApplyResult.new_id(),
+            plan_id=plan_payload["plan_id"],
+            start_time="",
+            end_time="",
+            duration_seconds=0.05,
+            model_info={},
+            generated_recipe_path="",
+            command="",
+            status="success",
+            artifacts={},
+            error_type="none",
+            error_message="",
+            retry_level="none",
+            next_actions=[],
+        )
+        return result, 0, "", ""
+
+
+def test_batch_keeps_concurrent_np_within_cpu_budget(tmp_path: Path):
+    plans = [BatchPlan(f"p{idx}.yaml", _plan(tmp_path, f"plan_{idx}", np=2)) for idx in range(6)]
+    plans.append(BatchPlan("big.yaml", _plan(tmp_path, "plan_big", np=16)))
+    plans.append(BatchPlan("boom.yaml", _plan(tmp_path, "plan_boom")))
+    plans.append(BatchPlan("missing.yaml", error="failed to load plan file: missing.yaml"))
+    plans.append(BatchPlan("dup.yaml", _plan(tmp_path, "plan_0")))
+    use_case = _RecordingUseCase()
+    output = tmp_path / "batch" / "results.jsonl"
+
+    records = run_apply_batch(plans, tmp_path / "runtime", output, cpu_budget=4, use_case=use_case)
+
+    assert use_case.peak == 4
+    assert use_case.granted["plan_big"] == 4
+    assert [record["index"] for record in records] == list(range(len(plans)))
+    by_path = {record["plan_path"]: record for record in records}
+    assert by_path["p0.yaml"]["status"] == "success" and by_path["p0.yaml"]["np"] == 2
+    assert by_path["boom.yaml"]["error_type"] == "apply_failed"
+    assert by_path["missing.yaml"]["error_type"] == "plan_not_found"
+    assert by_path["dup.yaml"]["error_type"] == "duplicate_plan_id"
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted(line["index"] for line in lines) == list(range(len(plans)))
+
+
+def test_batch_cancel_skips_queued_plans(tmp_path: Path):
+    cancel = threading.Event()
+
+    class _CancellingUseCase(_RecordingUseCase):
+        def execute(self, plan_payload, runtime_dir, cancel_event=None, **kwargs):
+            cancel_event.set()
+            time.sleep(0.3)
+            return super().execute(plan_payload, runtime_dir, cancel_event=cancel_event, **kwargs)
+
+    plans = [
+        BatchPlan("a.yaml", _plan(tmp_path, "plan_a", np=4)),
+        BatchPlan("b.yaml", _plan(tmp_path, "plan_b", np=4)),
+    ]
+
+    records = run_apply_batch(
+        plans,
+        tmp_path / "runtime",
+        tmp_path / "out.jsonl",
+        cpu_budget=4,
+        cancel_event=cancel,
+        use_case=_CancellingUseCase(),
+    )
+
+    assert records[0]["status"] == "success"
+    assert records[1]["status"] == "interrupted"
+    assert records[1]["returncode"] == 130
+
+
+def test_apply_cli_batch_dry_run_writes_consolidated_jsonl(tmp_path: Path, capsys, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.jsonl").write_text('{"text": "hello world"}\n', encoding="utf-8")
+    plans_dir = tmp_path / "plans"
+    plans_dir.mkdir()
+    for plan_id in ("plan_batch_a", "plan_batch_b"):
+        with open(plans_dir / f"{plan_id}.yaml", "w", encoding="utf-8") as handle:
+            yaml.safe_dump(_plan(tmp_path, plan_id), handle)
+    batch = tmp_path / "plans.txt"
+    batch.write_text(
+        "# nightly\nplans/plan_batch_a.yaml\n\nplans/plan_batch_b.yaml  # second\nplans/missing.yaml\n",
+        encoding="utf-8",
+    )
+    assert read_batch_file(batch)[0] == str(plans_dir / "plan_batch_a.yaml")
+    assert load_batch_plans(read_batch_file(batch))[2].error
+    output = tmp_path / "results.jsonl"
+
+    code = run_apply(
+        SimpleNamespace(
+            plan=None,
+            batch=str(batch),
+            batch_output=str(output),
+            cpu_budget=2,
+            yes=True,
+            dry_run=True,
+            timeout=30,
+            output_level="quiet",
+        )
+    )
+    stdout = capsys.readouterr().out
+
+    assert code == 1
+    assert "Batch Summary:" in stdout
+    assert "Status: failed=1, success=2" in stdout
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert {record.get("plan_id") for record in records} == {"plan_batch_a", "plan_batch_b", ""}
+    assert all("returncode" in record for record in records)
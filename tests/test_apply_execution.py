@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
+import io
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
 import yaml
 
 from data_juicer_agents.adapters.agentscope import invoke_tool_spec
@@ -12,7 +14,8 @@ from data_juicer_agents.core.tool import ToolContext, build_default_tool_registr
 from data_juicer_agents.tools.apply import ApplyUseCase
 from data_juicer_agents.tools.plan import PlanModel
 
-def test_apply_dry_run_prints_execution_summary_without_trace(tmp_path: Path, capsys):
+def test_apply_dry_run_prints_execution_summary_without_trace(tmp_path: Path, capsys, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     dataset = tmp_path / "data.jsonl"
     dataset.write_text('{"text": "hello world"}\n', encoding="utf-8")
     export_path = tmp_path / "out" / "result.jsonl"
@@ -81,6 +84,8 @@ def test_apply_exec_uses_shell_free_command_with_spaced_recipe_path(tmp_path: Pa
             self.returncode = 0
             self.pid = 12345
             self._polled = False
+            self.stdout = io.BytesIO(b"")
+            self.stderr = io.BytesIO(b"")
 
         def poll(self):
             if not self._polled:
@@ -97,10 +102,9 @@ def test_apply_exec_uses_shell_free_command_with_spaced_recipe_path(tmp_path: Pa
         def kill(self):
             return None
 
-    def fake_popen(command, shell, stdout, stderr, text, start_new_session):
+    def fake_popen(command, shell, stdout, stderr, start_new_session, **kwargs):
         captured["command"] = command
         captured["shell"] = shell
-        captured["text"] = text
         captured["start_new_session"] = start_new_session
         return DummyProc()
 
@@ -153,3 +157,844 @@ def test_format_dataset_source_prefers_dataset_config_over_dataset_path():
         },
     }
     assert _format_dataset_source(recipe) == "local: /tmp/secondary.jsonl"
+
+
+def test_progress_parser_reads_tqdm_bars_and_op_done_lines():
+    from data_juicer_agents.tools.apply.apply_recipe.progress import parse_progress_line
+
+    bar = parse_progress_line(
+        "text_length_filter_compute_stats (num_proc=4):  45%|####5     | 450/1000 "
+        "[00:01<00:02, 300.00 examples/s]"
+    )
+    assert bar == {
+        "kind": "op_progress",
+        "op": "text_length_filter",
+        "stage": "compute_stats",
+        "percent": 45,
+        "processed": 450,
+        "total": 1000,
+        "rate": 300.0,
+        "rate_unit": "examples/s",
+    }
+
+    done = parse_progress_line(
+        "2026-01-01 10:00:00 | INFO | [2/3] OP [text_length_filter] Done in 1.234s. Left 950 samples."
+    )
+    assert done == {
+        "kind": "op_done",
+        "op": "text_length_filter",
+        "seconds": 1.234,
+        "samples_left": 950,
+        "index": 2,
+        "count": 3,
+    }
+    assert parse_progress_line("Loading dataset from disk") is None
+
+
+def test_progress_tracker_throttles_bar_updates():
+    from data_juicer_agents.tools.apply.apply_recipe.progress import ApplyProgressTracker
+
+    now = [0.0]
+    events = []
+    tracker = ApplyProgressTracker(events.append, min_interval=1.0, clock=lambda: now[0])
+    for done in (10, 20, 30):
+        tracker.feed("stderr", f"clean_mapper_process: {done}%|#| {done}/100 [00:01<00:02, 9.0 examples/s]")
+        now[0] += 0.6
+    tracker.feed("stderr", "clean_mapper_process: 100%|#| 100/100 [00:03<00:00, 9.0 examples/s]")
+
+    assert [event["processed"] for event in events] == [10, 30, 100]
+    assert all(event["stream"] == "stderr" for event in events)
+
+
+def test_stream_capture_splits_carriage_returns_and_keeps_text():
+    from data_juicer_agents.utils.stream_capture import StreamCapture
+
+    lines = []
+    raw = "a 10%\ra 50%\ra 100%\nfinal café".encode("utf-8")
+    capture = StreamCapture(io.BytesIO(raw), name="stderr", on_line=lambda name, line: lines.append((name, line)))
+    assert capture.start().join(5)
+    assert capture.text() == raw.decode("utf-8")
+    assert lines == [
+        ("stderr", "a 10%"),
+        ("stderr", "a 50%"),
+        ("stderr", "a 100%"),
+        ("stderr", "final café"),
+    ]
+
+
+def test_stream_capture_bounds_lines_without_breaks(monkeypatch):
+    from data_juicer_agents.utils import stream_capture
+    from data_juicer_agents.utils.stream_capture import StreamCapture
+
+    monkeypatch.setattr(stream_capture, "_MAX_LINE_CHARS", 10)
+    monkeypatch.setattr(stream_capture, "_READ_SIZE", 4)
+    raw = b"x" * 25 + b"\nend"
+
+    lines = []
+    capture = StreamCapture(io.BytesIO(raw), on_line=lambda name, line: lines.append(line))
+    assert capture.start().join(5)
+    assert lines == ["x" * 10, "x" * 10, "x" * 5, "end"]
+
+    silent = StreamCapture(io.BytesIO(raw))
+    assert silent.start().join(5)
+    assert silent.text() == raw.decode("utf-8")
+    assert silent._partial == ""
+
+
+def test_apply_exec_streams_progress_events_while_running(tmp_path: Path):
+    import sys
+
+    plan = PlanModel(
+        plan_id="plan_apply_progress",
+        user_intent="filter short rows",
+        modality="text",
+        recipe={
+            "dataset_path": str(tmp_path / "data.jsonl"),
+            "export_path": str(tmp_path / "out.jsonl"),
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    )
+    script = (
+        "import sys\n"
+        "sys.stderr.write('words_num_filter_compute_stats: 100%|##| 4/4 [00:00<00:00, 80.00 examples/s]\\n')\n"
+        "sys.stderr.flush()\n"
+        "print('[1/1] OP [words_num_filter] Done in 0.050s. Left 3 samples.')\n"
+    )
+    events = []
+
+    result, code, stdout, stderr = ApplyUseCase().execute(
+        plan_payload=plan.to_dict(),
+        runtime_dir=tmp_path / "runtime",
+        timeout_seconds=30,
+        command_override=[sys.executable, "-c", script],
+        progress_callback=events.append,
+    )
+
+    assert code == 0
+    assert result.status == "success"
+    assert "Left 3 samples" in stdout
+    assert "4/4" in stderr
+    kinds = {(event["kind"], event["op"]) for event in events}
+    assert ("op_progress", "words_num_filter") in kinds
+    assert ("op_done", "words_num_filter") in kinds
+
+
+def test_apply_recipe_tool_forwards_progress_to_runtime_events(tmp_path: Path, monkeypatch):
+    plan = PlanModel(
+        plan_id="plan_apply_events",
+        user_intent="filter short rows",
+        modality="text",
+        recipe={
+            "dataset_path": str(tmp_path / "data.jsonl"),
+            "export_path": str(tmp_path / "out.jsonl"),
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    )
+    plan_path = tmp_path / "plan.yaml"
+    with open(plan_path, "w", encoding="utf-8") as handle:
+        yaml.safe_dump(plan.to_dict(), handle, allow_unicode=False, sort_keys=False)
+
+    original_execute = ApplyUseCase.execute
+
+    def fake_execute(self, *args, **kwargs):
+        kwargs["progress_callback"]({"kind": "op_done", "op": "words_num_filter", "seconds": 0.1, "samples_left": 1})
+        kwargs["dry_run"] = True
+        return original_execute(self, *args, **kwargs)
+
+    monkeypatch.setattr(ApplyUseCase, "execute", fake_execute)
+    emitted = []
+    ctx = ToolContext(
+        working_dir=str(tmp_path),
+        artifacts_dir=str(tmp_path / "artifacts"),
+        runtime_values={"emit_event": lambda event_type, **payload: emitted.append((event_type, payload))},
+    )
+
+    result = invoke_tool_spec(
+        build_default_tool_registry().get("apply_recipe"),
+        ctx=ctx,
+        raw_kwargs={"plan_path": str(plan_path), "confirm": True, "dry_run": True, "timeout": 30},
+    )
+
+    assert result["ok"] is True
+    assert emitted[0][0] == "apply_progress"
+    assert emitted[0][1]["plan_id"] == "plan_apply_events"
+    assert emitted[0][1]["op"] == "words_num_filter"
+
+
+def test_apply_exec_reports_process_group_resource_usage(tmp_path: Path):
+    import sys
+
+    from data_juicer_agents.utils.resource_usage import format_resources
+
+    plan = PlanModel(
+        plan_id="plan_apply_resources",
+        user_intent="filter",
+        modality="text",
+        recipe={
+            "dataset_path": str(tmp_path / "data.jsonl"),
+            "export_path": str(tmp_path / "out.jsonl"),
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    )
+    # A worker holding ~64 MiB, like a dj-process pool member, plus CPU in the root.
+    worker = "import time; block = bytearray(64 * 1024 * 1024); time.sleep(1.5)"
+    script = (
+        "import subprocess, sys, time\n"
+        f"worker = subprocess.Popen([sys.executable, '-c', {worker!r}])\n"
+        "deadline = time.time() + 0.3\n"
+        "while time.time() < deadline:\n"
+        "    sum(range(1000))\n"
+        "worker.wait()\n"
+    )
+
+    result, code, _stdout, stderr = ApplyUseCase().execute(
+        plan_payload=plan.to_dict(),
+        runtime_dir=tmp_path / "runtime",
+        timeout_seconds=30,
+        command_override=[sys.executable, "-c", script],
+    )
+
+    assert code == 0, stderr
+    resources = result.to_dict()["resources"]
+    assert resources["user_cpu_seconds"] + resources["sys_cpu_seconds"] > 0.1
+    # rusage covers the reaped worker; the sampler sees both processes at once.
+    assert resources["max_rss_kb"] >= 60 * 1024
+    assert resources["peak_group_processes"] == 2
+    assert resources["peak_group_rss_kb"] >= 60 * 1024
+    assert 0 < resources["peak_group_pss_kb"] <= resources["peak_group_rss_kb"]
+    assert "voluntary_context_switches" in resources
+    assert "group peak rss=" in format_resources(resources)
+
+
+def test_apply_exec_cancel_event_interrupts_running_process(tmp_path: Path):
+    import sys
+    import threading
+    import time
+
+    from data_juicer_agents.utils.process_supervisor import CancelEvent
+
+    plan = PlanModel(
+        plan_id="plan_apply_cancel",
+        user_intent="filter short rows",
+        modality="text",
+        recipe={
+            "dataset_path": str(tmp_path / "data.jsonl"),
+            "export_path": str(tmp_path / "out.jsonl"),
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    )
+    cancel = CancelEvent()
+    timer = threading.Timer(0.3, cancel.set)
+    timer.start()
+    started = time.monotonic()
+    try:
+        result, code, _, stderr = ApplyUseCase().execute(
+            plan_payload=plan.to_dict(),
+            runtime_dir=tmp_path / "runtime",
+            timeout_seconds=60,
+            command_override=[sys.executable, "-c", "import time; time.sleep(60)"],
+            cancel_event=cancel,
+        )
+    finally:
+        timer.cancel()
+
+    assert code == 130
+    assert result.status == "interrupted"
+    assert "Interrupted by user." in stderr
+    assert time.monotonic() - started < 10
+
+
+def test_stream_capture_keeps_bounded_tail_and_spills_everything():
+    from data_juicer_agents.utils.stream_capture import StreamCapture
+
+    spill = io.BytesIO()
+    raw = b"".join(f"line {idx}\n".encode("utf-8") for idx in range(5000))
+    capture = StreamCapture(io.BytesIO(raw), name="stdout", max_chars=100, spill=spill)
+    assert capture.start().join(5)
+
+    assert spill.getvalue() == raw
+    assert len(capture.text()) == 100
+    assert capture.text().endswith("line 4999\n")
+    assert capture.dropped_chars == len(raw) - 100
+
+
+def test_apply_exec_spills_full_log_and_classifies_from_tail(tmp_path: Path):
+    import sys
+
+    plan = PlanModel(
+        plan_id="plan_apply_logs",
+        user_intent="filter short rows",
+        modality="text",
+        recipe={
+            "dataset_path": str(tmp_path / "data.jsonl"),
+            "export_path": str(tmp_path / "out.jsonl"),
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    )
+    script = (
+        "import sys\n"
+        "sys.stderr.write('noise\\n' * 40000)\n"
+        "sys.stderr.write('FileNotFoundError: No such file or directory: data.jsonl\\n')\n"
+        "sys.exit(1)\n"
+    )
+
+    result, code, _, stderr = ApplyUseCase().execute(
+        plan_payload=plan.to_dict(),
+        runtime_dir=tmp_path / "runtime",
+        timeout_seconds=30,
+        command_override=[sys.executable, "-c", script],
+    )
+
+    assert code == 1
+    assert result.error_type == "missing_path"
+    assert len(stderr) < 70 * 1024
+    assert "earlier chars omitted" in stderr
+    log_path = Path(result.artifacts["stderr_log"])
+    assert log_path.parent == tmp_path / "runtime" / "logs"
+    assert log_path.name == f"{result.execution_id}.stderr.log"
+    full = log_path.read_text(encoding="utf-8")
+    assert full.count("noise\n") == 40000
+    assert full.endswith("No such file or directory: data.jsonl\n")
+    assert Path(result.artifacts["stdout_log"]).exists()
+
+
+_FORK_RUNNER = '''
+import os
+import sys
+import time
+
+
+def run(recipe_path):
+    text = open(recipe_path, encoding="utf-8").read()
+    print(f"child pid={os.getpid()} parent={os.getppid()}", flush=True)
+    sys.stderr.write("[1/1] OP [words_num_filter] Done in 0.010s. Left 2 samples.\\n")
+    if "boom" in text:
+        raise RuntimeError("No such file or directory: boom.jsonl")
+    if "sleepy" in text:
+        time.sleep(60)
+'''
+
+
+def _fork_plan(tmp_path: Path, plan_id: str, **recipe) -> dict:
+    base = {
+        "dataset_path": str(tmp_path / "data.jsonl"),
+        "export_path": str(tmp_path / "out.jsonl"),
+        "process": [{"words_num_filter": {"min_words": 10}}],
+    }
+    base.update(recipe)
+    return PlanModel(plan_id=plan_id, user_intent="filter", modality="text", recipe=base).to_dict()
+
+
+def _use_test_runner(tmp_path: Path, monkeypatch):
+    import functools
+
+    from data_juicer_agents.tools.apply.apply_recipe import forkserver, logic
+
+    (tmp_path / "djx_fork_runner.py").write_text(_FORK_RUNNER, encoding="utf-8")
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    monkeypatch.setattr(
+        logic,
+        "run_recipe_forked",
+        functools.partial(forkserver.run_recipe_forked, runner="djx_fork_runner:run"),
+    )
+    return forkserver
+
+
+def _child_line(stdout: str) -> dict:
+    line = next(item for item in stdout.splitlines() if item.startswith("child pid="))
+    return dict(part.split("=") for part in line[len("child "):].split())
+
+
+def test_apply_inprocess_forks_each_run_from_warm_server(tmp_path: Path, monkeypatch):
+    forkserver = _use_test_runner(tmp_path, monkeypatch)
+    events = []
+    try:
+        first, code, stdout, stderr = ApplyUseCase().execute(
+            plan_payload=_fork_plan(tmp_path, "plan_fs_1"),
+            runtime_dir=tmp_path / "runtime",
+            timeout_seconds=60,
+            executor="inprocess",
+            progress_callback=events.append,
+        )
+        assert code == 0, stderr
+        assert first.model_info["executor"] == "deterministic-inprocess"
+        assert first.resources["max_rss_kb"] > 0
+        assert "user_cpu_seconds" in first.to_dict()["resources"]
+        assert ("op_done", "words_num_filter") in {(e["kind"], e["op"]) for e in events}
+        assert "Left 2 samples" in Path(first.artifacts["stderr_log"]).read_text(encoding="utf-8")
+
+        failed, code, stdout_again, stderr = ApplyUseCase().execute(
+            plan_payload=_fork_plan(tmp_path, "plan_fs_2", project_name="boom"),
+            runtime_dir=tmp_path / "runtime",
+            timeout_seconds=60,
+            executor="inprocess",
+        )
+        assert code == 1
+        assert failed.error_type == "missing_path"
+        assert "RuntimeError" in stderr
+        # A fresh child per run, forked from the same server.
+        first_child, second_child = _child_line(stdout), _child_line(stdout_again)
+        assert first_child["pid"] != second_child["pid"]
+        assert first_child["parent"] == second_child["parent"] == str(forkserver._server.pid)
+    finally:
+        forkserver.shutdown_fork_server()
+
+
+def test_apply_inprocess_timeout_and_cancel_keep_server_warm(tmp_path: Path, monkeypatch):
+    import threading
+
+    from data_juicer_agents.utils.process_supervisor import CancelEvent
+
+    forkserver = _use_test_runner(tmp_path, monkeypatch)
+    try:
+        result, code, _, stderr = ApplyUseCase().execute(
+            plan_payload=_fork_plan(tmp_path, "plan_fs_sleep", project_name="sleepy"),
+            runtime_dir=tmp_path / "runtime",
+            timeout_seconds=1,
+            executor="inprocess",
+        )
+        assert code == 124
+        assert "Timeout after 1s" in stderr
+        server = forkserver._server
+        assert server.is_alive()
+
+        cancel = CancelEvent()
+        timer = threading.Timer(0.5, cancel.set)
+        timer.start()
+        try:
+            result, code, _, stderr = ApplyUseCase().execute(
+                plan_payload=_fork_plan(tmp_path, "plan_fs_cancel", project_name="sleepy"),
+                runtime_dir=tmp_path / "runtime",
+                timeout_seconds=60,
+                executor="inprocess",
+                cancel_event=cancel,
+            )
+        finally:
+            timer.cancel()
+        assert code == 130
+        assert result.status == "interrupted"
+        assert forkserver._server is server and server.is_alive()
+    finally:
+        forkserver.shutdown_fork_server()
+
+
+def test_fork_server_pool_queues_runs_beyond_pool_size(tmp_path: Path, monkeypatch):
+    import threading
+    import time
+
+    forkserver = _use_test_runner(tmp_path, monkeypatch)
+    recipe = tmp_path / "recipe.yaml"
+    recipe.write_text("project_name: sleepy\n", encoding="utf-8")
+    monkeypatch.setenv(forkserver.POOL_SIZE_ENV, "1")
+    server = forkserver.get_fork_server(runner="djx_fork_runner:run")
+    assert server.pool_size == 1
+    outcomes = []
+
+    def run(timeout):
+        code, _, _ = forkserver.run_recipe_captured(
+            str(recipe),
+            timeout=timeout,
+            runner="djx_fork_runner:run",
+        )
+        outcomes.append(code)
+
+    try:
+        first = threading.Thread(target=run, args=(1.5,))
+        first.start()
+        time.sleep(0.3)
+        started = time.monotonic()
+        # Queued behind the first run, so it times out without ever starting.
+        run(0.5)
+        assert time.monotonic() - started < 1.5
+        first.join(10)
+        assert outcomes == [124, 124]
+        assert forkserver._server is server and server.is_alive()
+    finally:
+        forkserver.shutdown_fork_server()
+
+
+def test_fork_server_restarts_when_custom_operators_change(tmp_path: Path, monkeypatch):
+    import os
+
+    forkserver = _use_test_runner(tmp_path, monkeypatch)
+    ops = tmp_path / "ops"
+    ops.mkdir()
+    (ops / "__init__.py").write_text("", encoding="utf-8")
+    op_file = ops / "my_mapper.py"
+    op_file.write_text("VALUE = 1\n", encoding="utf-8")
+    spec = "djx_fork_runner:run"
+    try:
+        plain = forkserver.get_fork_server(runner=spec)
+        assert forkserver.get_fork_server(runner=spec) is plain
+        with_ops = forkserver.get_fork_server(custom_operator_paths=[str(ops)], runner=spec)
+        assert with_ops is not plain
+        assert forkserver.get_fork_server(custom_operator_paths=[str(ops)], runner=spec) is with_ops
+
+        op_file.write_text("VALUE = 22\n", encoding="utf-8")
+        stat = op_file.stat()
+        os.utime(op_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert forkserver.get_fork_server(custom_operator_paths=[str(ops)], runner=spec) is not with_ops
+    finally:
+        forkserver.shutdown_fork_server()
+
+
+def test_apply_rejects_unknown_executor(tmp_path: Path):
+    import pytest
+
+    with pytest.raises(ValueError):
+        ApplyUseCase().execute(
+            plan_payload=_fork_plan(tmp_path, "plan_bad_executor"),
+            runtime_dir=tmp_path / "runtime",
+            executor="threads",
+        )
+
+
+def test_pilot_estimate_fits_fixed_and_per_row_cost_from_two_samples():
+    from data_juicer_agents.tools.apply.apply_recipe.pilot import estimate_full_run
+
+    def run(rows, filter_seconds, mapper_seconds, total_seconds):
+        return {
+            "sample_rows": rows,
+            "pilot_seconds": total_seconds,
+            "events": [
+                {"kind": "op_progress", "op": "a_filter", "stage": "process", "percent": 100},
+                {"kind": "op_done", "op": "a_filter", "seconds": filter_seconds, "samples_left": rows // 2},
+                {"kind": "op_done", "op": "b_mapper", "seconds": mapper_seconds, "samples_left": rows // 2},
+            ],
+            "export_bytes": rows * 50,
+        }
+
+    estimate = estimate_full_run(
+        dataset_rows=10000,
+        # filter: 1s + 10ms/row; mapper: 0.5s flat; overhead: 2s + 1ms/row.
+        measurements=[run(20, 1.2, 0.5, 3.72), run(100, 2.0, 0.5, 4.6)],
+        time_budget_seconds=100.0,
+    )
+
+    first, second = estimate["ops"]
+    assert (first["fixed_seconds"], first["seconds_per_row"]) == (1.0, 0.01)
+    assert first["est_seconds"] == 101.0
+    assert (second["fixed_seconds"], second["seconds_per_row"]) == (0.5, 0.0)
+    assert second["est_seconds"] == 0.5
+    assert estimate["calibration_rows"] == 20
+    assert estimate["est_overhead_seconds"] == 12.0
+    assert estimate["est_seconds"] == 113.5
+    assert estimate["est_output_rows"] == 5000
+    assert estimate["est_output_bytes"] == 500000
+    assert estimate["within_budget"] is False
+
+    single = estimate_full_run(dataset_rows=1000, measurements=[run(100, 2.0, 0.5, 4.6)])
+    assert single["ops"][0]["est_seconds"] == 20.0
+    assert single["within_budget"] is None
+
+
+def _pilot_plan(tmp_path: Path, rows: int) -> dict:
+    dataset = tmp_path / "data.jsonl"
+    dataset.write_text("".join(f'{{"text": "row {idx}"}}\n' for idx in range(rows)), encoding="utf-8")
+    return PlanModel(
+        plan_id="plan_pilot",
+        user_intent="filter",
+        modality="text",
+        recipe={
+            "dataset_path": str(dataset),
+            "export_path": str(tmp_path / "out.jsonl"),
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    ).to_dict()
+
+
+def _pilot_command(tmp_path: Path) -> list:
+    import sys
+
+    script = (
+        "import sys\n"
+        f"open({str(tmp_path / 'runs.txt')!r}, 'a').write(sys.argv[-1] + '\\n')\n"
+        "sys.stderr.write('words_num_filter_process: 100%|##| 10/10 [00:00<00:00, 1000.00 examples/s]\\n')\n"
+        "sys.stderr.write('[1/1] OP [words_num_filter] Done in 0.020s. Left 4 samples.\\n')\n"
+    )
+    return [sys.executable, "-c", script]
+
+
+def test_apply_pilot_samples_rows_and_gates_full_run_on_budget(tmp_path: Path):
+    from data_juicer_agents.tools.apply.apply_recipe.pilot import BUDGET_EXCEEDED_RETURNCODE
+
+    plan = _pilot_plan(tmp_path, 100)
+    runs = tmp_path / "runs.txt"
+
+    result, code, _stdout, _stderr = ApplyUseCase().execute(
+        plan_payload=plan,
+        runtime_dir=tmp_path / "runtime",
+        timeout_seconds=30,
+        command_override=_pilot_command(tmp_path),
+        pilot_rows=10,
+        pilot_only=True,
+    )
+
+    assert code == 0
+    assert result.status == "pilot"
+    assert result.plan_id == "plan_pilot"
+    sample = Path(result.pilot["sample_path"])
+    assert len(sample.read_text(encoding="utf-8").splitlines()) == 10
+    assert result.pilot["dataset_rows"] == 100
+    assert result.pilot["ops"][0]["rows_out"] == 4
+    assert result.pilot["est_output_rows"] == 40
+    assert result.pilot["calibration_rows"] == 2
+    assert result.to_dict()["pilot"]["sample_rows"] == 10
+    assert len(runs.read_text(encoding="utf-8").splitlines()) == 2
+
+    result, code, _stdout, stderr = ApplyUseCase().execute(
+        plan_payload=plan,
+        runtime_dir=tmp_path / "runtime",
+        timeout_seconds=30,
+        command_override=_pilot_command(tmp_path),
+        pilot_rows=10,
+        time_budget_seconds=1e-6,
+    )
+
+    assert code == BUDGET_EXCEEDED_RETURNCODE
+    assert result.status == "blocked"
+    assert result.error_type == "time_budget_exceeded"
+    assert "exceeds budget" in stderr
+    assert len(runs.read_text(encoding="utf-8").splitlines()) == 4
+
+    result, code, _stdout, _stderr = ApplyUseCase().execute(
+        plan_payload=plan,
+        runtime_dir=tmp_path / "runtime",
+        timeout_seconds=30,
+        command_override=_pilot_command(tmp_path),
+        pilot_rows=10,
+        time_budget_seconds=3600,
+    )
+
+    assert code == 0
+    assert result.status == "success"
+    assert result.pilot["within_budget"] is True
+    assert len(runs.read_text(encoding="utf-8").splitlines()) == 7
+
+
+def test_pilot_count_rows_parses_quoted_csv_newlines(tmp_path: Path):
+    from data_juicer_agents.tools.apply.apply_recipe.pilot import count_rows
+
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text('text,id\n"multi\nline",1\n\nplain,2', encoding="utf-8")
+    assert count_rows(csv_path) == 2
+    jsonl_path = tmp_path / "data.jsonl"
+    jsonl_path.write_text('{"a": 1}\n{"a": 2}', encoding="utf-8")
+    assert count_rows(jsonl_path) == 2
+
+
+def test_apply_pilot_rejects_unsupported_dataset_sources(tmp_path: Path):
+    import pytest
+
+    from data_juicer_agents.tools.apply.apply_recipe import PilotError
+
+    plan = _pilot_plan(tmp_path, 5)
+    plan["recipe"]["dataset"] = {"configs": [{"type": "local", "path": "a.jsonl"}]}
+
+    with pytest.raises(PilotError):
+        ApplyUseCase().execute(
+            plan_payload=plan,
+            runtime_dir=tmp_path / "runtime",
+            command_override=_pilot_command(tmp_path),
+            pilot_only=True,
+        )
+
+
+_CACHE_RUNNER = '''
+import yaml
+
+
+def run(recipe_path):
+    recipe = yaml.safe_load(open(recipe_path, encoding="utf-8"))
+    with open(recipe["dataset_path"], encoding="utf-8") as src, open(recipe["export_path"], "w", encoding="utf-8") as dst:
+        dst.write(src.read().upper())
+    with open(recipe["export_path"] + ".runs", "a", encoding="utf-8") as counter:
+        counter.write("run\\n")
+'''
+
+
+def test_apply_cache_reuses_unchanged_runs_and_invalidates_on_change(tmp_path: Path, monkeypatch):
+    import functools
+    import os
+
+    from data_juicer_agents.tools.apply.apply_recipe import forkserver, logic
+    from data_juicer_agents.tools.apply.apply_recipe.cache import apply_cache_key
+
+    (tmp_path / "djx_cache_runner.py").write_text(_CACHE_RUNNER, encoding="utf-8")
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    monkeypatch.setattr(
+        logic,
+        "run_recipe_forked",
+        functools.partial(forkserver.run_recipe_forked, runner="djx_cache_runner:run"),
+    )
+    dataset = tmp_path / "data.jsonl"
+    dataset.write_text('{"text": "a"}\n', encoding="utf-8")
+    export = tmp_path / "out.jsonl"
+    counter = tmp_path / "out.jsonl.runs"
+    plan = _fork_plan(tmp_path, "plan_cache")
+
+    def apply(**kwargs):
+        return ApplyUseCase().execute(
+            plan_payload=plan,
+            runtime_dir=tmp_path / "runtime",
+            timeout_seconds=30,
+            executor="inprocess",
+            **kwargs,
+        )
+
+    def runs() -> int:
+        return len(counter.read_text(encoding="utf-8").splitlines())
+
+    try:
+        first, code, _stdout, _stderr = apply()
+        assert code == 0 and first.status == "success"
+        assert export.read_text(encoding="utf-8") == '{"TEXT": "A"}\n'
+
+        cached, code, stdout, _stderr = apply()
+        assert code == 0 and cached.status == "cached"
+        assert cached.execution_id == first.execution_id
+        assert Path(cached.artifacts["cache_entry"]).exists()
+        assert "unchanged" in stdout
+        assert runs() == 1
+
+        dataset.write_text('{"text": "b"}\n', encoding="utf-8")
+        changed, _code, _stdout, _stderr = apply()
+        assert changed.status == "success" and runs() == 2
+
+        export.unlink()
+        rerun, _code, _stdout, _stderr = apply()
+        assert rerun.status == "success" and runs() == 3
+
+        stat = export.stat()
+        os.utime(export, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        touched, _code, _stdout, _stderr = apply()
+        assert touched.status == "success" and runs() == 4
+
+        forced, _code, _stdout, _stderr = apply(use_cache=False)
+        assert forced.status == "success" and runs() == 5
+        refreshed, _code, _stdout, _stderr = apply()
+        assert refreshed.status == "cached" and refreshed.execution_id == forced.execution_id
+
+        piloted, code, _stdout, _stderr = apply(pilot_rows=4, pilot_only=True)
+        assert code == 0 and piloted.status == "pilot"
+        assert not list((tmp_path / "runtime" / "pilot").rglob("cache"))
+    finally:
+        forkserver.shutdown_fork_server()
+
+    generated = dict(plan["recipe"], generated_dataset_config={"type": "demo"})
+    assert apply_cache_key(Path(first.generated_recipe_path), generated) is None
+
+
+_CHECKPOINT_SCRIPT = '''
+import json, os, sys, time, yaml
+recipe = yaml.safe_load(open(sys.argv[1], encoding="utf-8"))
+assert recipe["use_checkpoint"] is True and recipe["job_id"] == os.path.basename(recipe["work_dir"])
+ckpt = os.path.join(recipe["work_dir"], "ckpt")
+if os.path.isdir(os.path.join(ckpt, "latest")):
+    print("loaded checkpoint")
+    sys.exit(0)
+try:
+    time.sleep(30)
+except KeyboardInterrupt:
+    os.makedirs(os.path.join(ckpt, "latest"))
+    with open(os.path.join(ckpt, "ckpt_op.json"), "w") as handle:
+        json.dump([{"words_num_filter": {"min_words": 10}}], handle)
+    sys.exit(1)
+'''
+
+
+def test_apply_checkpoint_decision_follows_estimate_and_executor():
+    from data_juicer_agents.tools.apply.apply_recipe.checkpoint import should_checkpoint
+
+    recipe = {"process": []}
+    # A timeout is an upper bound, not an estimate; only a pilot estimate counts.
+    assert not should_checkpoint(recipe)
+    assert should_checkpoint(recipe, estimated_seconds=3600)
+    assert not should_checkpoint(recipe, estimated_seconds=30)
+    assert should_checkpoint(recipe, requested=True)
+    assert should_checkpoint({"use_checkpoint": True})
+    assert not should_checkpoint({"executor_type": "ray"}, requested=True)
+    assert not should_checkpoint({"op_fusion": True}, estimated_seconds=3600)
+
+
+def test_apply_checkpoint_keeps_recipe_work_dir(tmp_path: Path):
+    from data_juicer_agents.tools.apply.apply_recipe.checkpoint import (
+        checkpoint_work_dir,
+        with_checkpoint,
+    )
+
+    runtime_dir = tmp_path / "runtime"
+    default_dir = checkpoint_work_dir(runtime_dir, "plan_x", {})
+    assert default_dir == runtime_dir.resolve() / "checkpoints" / "plan_x"
+    assert with_checkpoint({}, default_dir)["work_dir"] == str(default_dir)
+
+    recipe = {"work_dir": str(tmp_path / "outputs")}
+    work_dir = checkpoint_work_dir(runtime_dir, "plan_x", recipe)
+    assert work_dir == (tmp_path / "outputs" / "plan_x").resolve()
+    pinned = with_checkpoint(recipe, work_dir)
+    assert pinned["work_dir"] == recipe["work_dir"]
+    assert pinned["job_id"] == "plan_x" and pinned["use_checkpoint"] is True
+
+    own = {"work_dir": str(tmp_path / "outputs" / "{job_id}"), "job_id": "nightly"}
+    work_dir = checkpoint_work_dir(runtime_dir, "plan_x", own)
+    assert work_dir == (tmp_path / "outputs" / "nightly").resolve()
+    assert with_checkpoint(own, work_dir)["job_id"] == "nightly"
+
+
+def test_apply_checkpoints_interrupted_runs_and_resumes(tmp_path: Path):
+    import sys
+
+    plan = PlanModel(
+        plan_id="plan_apply_ckpt",
+        user_intent="filter",
+        modality="text",
+        recipe={
+            "dataset_path": str(tmp_path / "data.jsonl"),
+            "export_path": str(tmp_path / "out.jsonl"),
+            "process": [{"words_num_filter": {"min_words": 10}}],
+        },
+    ).to_dict()
+    runtime_dir = tmp_path / "runtime"
+    command = [sys.executable, "-c", _CHECKPOINT_SCRIPT, str(runtime_dir / "plan_apply_ckpt.yaml")]
+
+    timed_out, code, _stdout, _stderr = ApplyUseCase().execute(
+        plan_payload=plan,
+        runtime_dir=runtime_dir,
+        timeout_seconds=1,
+        command_override=command,
+        checkpoint=True,
+    )
+    assert code == 124
+    ckpt = Path(timed_out.artifacts["checkpoint_dir"])
+    assert (ckpt / "latest").is_dir()
+    assert "resume" in timed_out.next_actions[0]
+
+    resumed, code, stdout, _stderr = ApplyUseCase().execute(
+        plan_payload=plan,
+        runtime_dir=runtime_dir,
+        timeout_seconds=30,
+        command_override=command,
+        resume=True,
+    )
+    assert code == 0
+    assert "loaded checkpoint" in stdout
+    assert resumed.artifacts["resumed_from"] == str(ckpt)
+    # Served its purpose; a later run must not pick up stale operator output.
+    assert not ckpt.exists()
+
+    (ckpt / "latest").mkdir(parents=True)
+    fresh, code, stdout, _stderr = ApplyUseCase().execute(
+        plan_payload=plan,
+        runtime_dir=runtime_dir,
+        timeout_seconds=1,
+        command_override=command,
+        checkpoint=True,
+    )
+    assert code == 124 and "resumed_from" not in fresh.artifacts
+
+    with pytest.raises(ValueError, match="cannot resume"):
+        ApplyUseCase().execute(
+            plan_payload={**plan, "recipe": {**plan["recipe"], "executor_type": "ray"}},
+            runtime_dir=runtime_dir,
+            resume=True,
+        )
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Tests for incremental custom-operator registration."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from data_juicer_agents.tools.retrieve._shared.backend import (
+    get_op_catalog,
+    retrieve_ops_regex_items,
+)
+from data_juicer_agents.tools.retrieve._shared.backend.custom_ops import (
+    CustomOperatorIndex,
+    CustomOperatorWatcher,
+    iter_custom_operator_files,
+)
+from data_juicer_agents.tools.retrieve._shared.logic import get_operator_info
+
+
+_OP_TEMPLATE = '''# -*- coding: utf-8 -*-
+from data_juicer.ops.base_op import Mapper, OPERATORS
+
+
+@OPERATORS.register_module("{name}")
+class {cls}(Mapper):
+    """{doc}"""
+
+    def __init__(self, enabled: bool = True, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enabled = enabled
+
+    def process_single(self, sample):
+        return sample
+'''
+
+
+def _write_op(path: Path, name: str, cls: str, doc: str) -> None:
+    path.write_text(_OP_TEMPLATE.format(name=name, cls=cls, doc=doc), encoding="utf-8")
+    # Guarantee a distinct mtime even on coarse-grained filesystems.
+    stamp = time.time() + len(doc)
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.fixture()
+def index():
+    idx = CustomOperatorIndex()
+    yield idx
+    idx.sync([])
+
+
+def test_iter_custom_operator_files_skips_tests_and_hidden(tmp_path):
+    (tmp_path / "a_mapper.py").write_text("", encoding="utf-8")
+    (tmp_path / "test_a_mapper.py").write_text("", encoding="utf-8")
+    (tmp_path / "__init__.py").write_text("", encoding="utf-8")
+    hidden = tmp_path / ".djx_dev_smoke"
+    hidden.mkdir()
+    (hidden / "b_mapper.py").write_text("", encoding="utf-8")
+
+    files = iter_custom_operator_files([tmp_path])
+    assert files == [str((tmp_path / "a_mapper.py").resolve())]
+
+
+def test_sync_registers_updates_and_removes_custom_operator(tmp_path, index):
+    op_file = tmp_path / "djx_incremental_mapper.py"
+    _write_op(op_file, "djx_incremental_mapper", "DjxIncrementalMapper", "First version.")
+
+    result = index.sync([tmp_path])
+    assert result["ok"] is True
+    assert result["registered"] == ["djx_incremental_mapper"]
+
+    catalog = get_op_catalog()
+    record = next(r for r in catalog if r.class_name == "djx_incremental_mapper")
+    assert record.class_type == "mapper"
+    assert catalog.index(record) == record.index
+    items = retrieve_ops_regex_items("djx_incremental", limit=5)
+    assert [item["tool_name"] for item in items] == ["djx_incremental_mapper"]
+    info = get_operator_info("djx_incremental_mapper")
+    assert info["ok"] is True
+    assert info["source_path"] == str(op_file.resolve())
+
+    # Unchanged files are not reloaded.
+    again = index.sync([tmp_path])
+    assert again["changed_files"] == []
+    assert again["registered"] == []
+
+    _write_op(op_file, "djx_incremental_mapper", "DjxIncrementalMapper", "Second version, edited.")
+    updated = index.sync([tmp_path])
+    assert updated["registered"] == ["djx_incremental_mapper"]
+    size = len(get_op_catalog())
+    record = next(r for r in get_op_catalog() if r.class_name == "djx_incremental_mapper")
+    assert record.class_desc == "Second version, edited."
+    assert len(get_op_catalog()) == size
+
+    op_file.unlink()
+    removed = index.sync([tmp_path])
+    assert removed["unregistered"] == ["djx_incremental_mapper"]
+    assert all(r.class_name != "djx_incremental_mapper" for r in get_op_catalog())
+    assert [r.index for r in get_op_catalog()] == list(range(len(get_op_catalog())))
+    assert retrieve_ops_regex_items("djx_incremental", limit=5) == []
+
+
+def test_sync_reports_load_errors(tmp_path, index):
+    (tmp_path / "broken_mapper.py").write_text("raise RuntimeError('boom')\n", encoding="utf-8")
+    result = index.sync([tmp_path])
+    assert result["ok"] is False
+    assert result["errors"][0]["path"].endswith("broken_mapper.py")
+    assert "boom" in result["errors"][0]["error"]
+
+
+def test_watcher_debounces_changes(tmp_path):
+    calls = []
+
+    class FakeIndex:
+        def sync(self, paths):
+            calls.append(list(paths))
+            return {"ok": True, "registered": []}
+
+    seen = []
+    watcher = CustomOperatorWatcher(
+        [tmp_path],
+        on_change=seen.append,
+        interval=0.05,
+        debounce=0.3,
+        index=FakeIndex(),
+    )
+    watcher.start()
+    try:
+        assert len(calls) == 1
+        for i in range(3):
+            (tmp_path / "burst_mapper.py").write_text("x = %d\n" % i, encoding="utf-8")
+            time.sleep(0.08)
+        deadline = time.monotonic() + 3.0
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+    assert len(seen) == 1
+    assert len(calls) == 2
+
+
+def test_patch_vector_store_replaces_stale_embeddings():
+    from data_juicer_agents.tools.retrieve._shared.backend.custom_ops import (
+        _patch_vector_store,
+    )
+    from data_juicer_agents.tools.retrieve._shared.backend.record import OperatorRecord
+
+    class Doc:
+        def __init__(self, index):
+            self.metadata = {"index": index}
+
+    class FakeStore:
+        def __init__(self):
+            self.docs = {"a": Doc(0), "b": Doc(1)}
+            self.index_to_docstore_id = {0: "a", 1: "b"}
+            self.docstore = self
+            self.added = []
+
+        def search(self, doc_id):
+            return self.docs[doc_id]
+
+        def delete(self, ids):
+            for doc_id in ids:
+                self.docs.pop(doc_id)
+
+        def add_texts(self, texts, metadatas):
+            self.added.extend(zip(texts, metadatas))
+
+    store = FakeStore()
+    record = OperatorRecord(index=1, class_name="b_mapper", class_desc="new desc")
+    assert _patch_vector_store(store, [record]) is True
+    assert set(store.docs) == {"a"}
+    assert store.added == [("b_mapper: new desc", {"index": 1})]
+
+
+def test_sync_falls_back_to_full_refresh_without_upstream_internals(tmp_path, monkeypatch, index):
+    from data_juicer_agents.tools.retrieve._shared.backend import backend as backend_mod
+    from data_juicer_agents.tools.retrieve._shared.backend import custom_ops as custom_ops_mod
+
+    refreshes = []
+    monkeypatch.setattr(
+        custom_ops_mod,
+        "missing_upstream_internals",
+        lambda: ("OPRecord._search_mro_for_type",),
+    )
+    monkeypatch.setattr(backend_mod, "refresh_op_catalog", lambda: refreshes.append(True) or True)
+    _write_op(tmp_path / "fallback_mapper.py", "fallback_mapper", "FallbackMapper", "Fallback op.")
+
+    result = index.sync([str(tmp_path)])
+    assert result["full_refresh"] is True
+    assert result["registered"] == []
+    assert refreshes == [True]
+    # Unchanged files do not trigger another rebuild.
+    assert "full_refresh" not in index.sync([str(tmp_path)])
+    assert refreshes == [True]
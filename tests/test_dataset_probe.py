@@ -59,6 +59,35 @@ def test_inspect_dataset_schema_json(tmp_path: Path):
     assert out["sampled_records"] == 5
 
 
+def test_inspect_dataset_schema_json_stops_after_sample(tmp_path: Path):
+    dataset = tmp_path / "big.json"
+    rows = [{"text": f"row {i}", "id": i} for i in range(50)]
+    # Trailing garbage past the sampled prefix must never be parsed.
+    dataset.write_text(json.dumps(rows)[:-1] + ", {broken", encoding="utf-8")
+
+    out = inspect_dataset_schema(str(dataset), sample_size=5)
+    assert out["ok"] is True
+    assert out["sampled_records"] == 5
+    assert out["sample_preview"][0]["id"] == 0
+
+
+def test_iter_json_array_items_small_chunks():
+    import io
+
+    from data_juicer_agents.tools.context.inspect_dataset.logic import (
+        _iter_json_array_items,
+    )
+
+    payload = [12345, {"a": "x, ]"}, [1, 2], "s", None, 3.5e10, {"b": {"c": []}}]
+    text = " \n" + json.dumps(payload)
+    for chunk_size in (1, 2, 3, 7, 64):
+        items = list(_iter_json_array_items(io.StringIO(text), chunk_size=chunk_size))
+        assert items == payload
+    assert list(_iter_json_array_items(io.StringIO("[]"))) == []
+    with pytest.raises(json.JSONDecodeError):
+        list(_iter_json_array_items(io.StringIO("[1, 2"), chunk_size=2))
+
+
 def test_inspect_dataset_schema_csv(tmp_path: Path):
     dataset = tmp_path / "data.csv"
     lines = ["text,id"] + [f"row {i},{i}" for i in range(10)]
@@ -83,6 +112,552 @@ def test_inspect_dataset_schema_tsv(tmp_path: Path):
     assert out["sampled_records"] == 5
 
 
+# ---------------------------------------------------------------------------
+# Multi-source configs
+# ---------------------------------------------------------------------------
+
+def _write_jsonl(path: Path, rows):
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+
+
+def test_inspect_dataset_schema_merges_all_local_sources(tmp_path: Path):
+    first = tmp_path / "a.jsonl"
+    second = tmp_path / "b.jsonl"
+    _write_jsonl(first, [{"text": f"a {i}", "id": i} for i in range(10)])
+    _write_jsonl(second, [{"text": f"b {i}", "image": f"img_{i}.jpg", "id": str(i)} for i in range(10)])
+    config = {
+        "configs": [
+            {"type": "local", "path": str(first)},
+            {"type": "huggingface", "path": "org/name"},
+            {"type": "local", "path": str(second)},
+        ]
+    }
+
+    out = inspect_dataset_schema(dataset=config, sample_size=10)
+    assert out["ok"] is True
+    assert out["inspected_path"] == str(first)
+    assert out["inspected_paths"] == [str(first), str(second)]
+    assert out["sampled_records"] == 10
+    assert out["modality"] == "multimodal"
+
+    text_stat = out["key_stats"]["text"]
+    assert text_stat["count"] == 10
+    assert text_stat["source_counts"] == {str(first): 5, str(second): 5}
+    assert out["key_stats"]["image"]["source_counts"] == {str(second): 5}
+
+    conflicts = out["schema_conflicts"]
+    assert {"type": "missing_keys", "source": str(first), "keys": ["image"]} in conflicts
+    mismatch = [c for c in conflicts if c["type"] == "kind_mismatch"]
+    assert mismatch == [
+        {"type": "kind_mismatch", "key": "id", "kinds": {str(first): "number", str(second): "text"}}
+    ]
+
+
+def test_inspect_dataset_schema_reports_failed_sources(tmp_path: Path):
+    good = tmp_path / "good.jsonl"
+    _write_jsonl(good, [{"text": "x"}])
+    missing = tmp_path / "missing.jsonl"
+    config = {"configs": [{"path": str(missing)}, {"path": str(good)}]}
+
+    out = inspect_dataset_schema(dataset=config)
+    assert out["ok"] is True
+    assert out["inspected_path"] == str(good)
+    assert out["schema_conflicts"] == []
+    by_path = {s["path"]: s for s in out["sources"]}
+    assert by_path[str(missing)]["ok"] is False
+    assert by_path[str(missing)]["error_type"] == "dataset_path_not_found"
+    assert by_path[str(good)]["sampled_records"] == 1
+
+
+def test_inspect_dataset_schema_single_source_shape_unchanged(tmp_path: Path):
+    dataset = tmp_path / "one.jsonl"
+    _write_jsonl(dataset, [{"text": "x"}])
+
+    out = inspect_dataset_schema(str(dataset))
+    assert "sources" not in out
+    assert "source_counts" not in out["key_stats"]["text"]
+
+
+def test_inspect_dataset_schema_directory_of_shards(tmp_path: Path):
+    from data_juicer_agents.tools.context.inspect_dataset import logic
+
+    shard_dir = tmp_path / "corpus"
+    shard_dir.mkdir()
+    for i in range(20):
+        _write_jsonl(shard_dir / f"part-{i:05d}.jsonl", [{"text": f"s{i} r{j}"} for j in range(5)])
+    (shard_dir / "_SUCCESS").write_text("", encoding="utf-8")
+    (shard_dir / "README.md").write_text("not data", encoding="utf-8")
+
+    opened = []
+    real_sample_file = logic._sample_file
+
+    def spy(path, *args, **kwargs):
+        opened.append(path)
+        return real_sample_file(path, *args, **kwargs)
+
+    with patch.object(logic, "_sample_file", side_effect=spy):
+        out = inspect_dataset_schema(str(shard_dir), sample_size=16)
+    assert out["ok"] is True
+    assert out["inspected_path"] == str(shard_dir)
+    assert out["sampled_records"] == 16
+    shards = out["sampling"]["shards"]
+    assert shards["listed"] == 20
+    assert shards["sampled"] == logic._MAX_SAMPLED_SHARDS
+    assert sorted(opened) == shards["paths"]
+    assert all(p.endswith(".jsonl") for p in opened)
+
+
+def test_inspect_dataset_schema_glob_pattern(tmp_path: Path):
+    _write_jsonl(tmp_path / "part-0.jsonl", [{"text": "a"}])
+    _write_jsonl(tmp_path / "part-1.jsonl", [{"text": "b", "image": "b.png"}])
+    _write_jsonl(tmp_path / "other.jsonl", [{"unrelated": 1}])
+
+    out = inspect_dataset_schema(str(tmp_path / "part-*.jsonl"))
+    assert out["ok"] is True
+    assert out["sampling"]["shards"]["listed"] == 2
+    assert out["modality"] == "multimodal"
+    assert "unrelated" not in out["keys"]
+
+
+def test_inspect_dataset_schema_empty_glob(tmp_path: Path):
+    out = inspect_dataset_schema(str(tmp_path / "missing-*.jsonl"))
+    assert out["ok"] is False
+    assert out["error_type"] == "dataset_path_not_found"
+
+
+# ---------------------------------------------------------------------------
+# Random sampling
+# ---------------------------------------------------------------------------
+
+def test_inspect_dataset_schema_random_sampling_sees_tail(tmp_path: Path):
+    from data_juicer_agents.tools.context.inspect_dataset import sampling
+
+    dataset = tmp_path / "drift.jsonl"
+    rows = [{"text": f"row {i}"} for i in range(500)]
+    rows += [{"text": f"row {i}", "image": f"img_{i}.png"} for i in range(500)]
+    dataset.write_text(
+        "\n".join(json.dumps(r) for r in rows) + "\n",
+        encoding="utf-8",
+    )
+
+    head = inspect_dataset_schema(str(dataset), sample_size=20)
+    assert head["modality"] == "text"
+    assert head["sampling"]["method"] == "head"
+
+    with patch.object(sampling, "_FULL_READ_BYTES", 0):
+        out = inspect_dataset_schema(str(dataset), sample_size=20, sampling="random", seed=7)
+    assert out["ok"] is True
+    assert out["modality"] == "multimodal"
+    assert out["sampled_records"] == 20
+    info = out["sampling"]
+    assert info["method"] == "random_offset"
+    assert info["seed"] == 7
+    assert 0 < info["coverage"] < 0.5
+    assert info["bytes_read"] < dataset.stat().st_size
+
+
+def test_inspect_dataset_schema_random_sampling_csv(tmp_path: Path):
+    from data_juicer_agents.tools.context.inspect_dataset import sampling
+
+    dataset = tmp_path / "data.csv"
+    lines = ["text,id"] + [f"row {i},{i}" for i in range(300)]
+    dataset.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    with patch.object(sampling, "_FULL_READ_BYTES", 0):
+        out = inspect_dataset_schema(str(dataset), sample_size=10, sampling="random", seed=1)
+    assert out["ok"] is True
+    assert out["sampled_records"] == 10
+    assert all(set(row) == {"text", "id"} for row in out["sample_preview"])
+    assert all(row["text"] == f"row {row['id']}" for row in out["sample_preview"])
+
+    small = inspect_dataset_schema(str(dataset), sample_size=10, sampling="random", seed=1)
+    assert small["sampling"]["method"] == "random_full_read"
+    assert small["sampling"]["coverage"] == 1.0
+
+
+def test_inspect_dataset_schema_random_sampling_json_falls_back(tmp_path: Path):
+    dataset = tmp_path / "data.json"
+    dataset.write_text(json.dumps([{"text": "a"}, {"text": "b"}]), encoding="utf-8")
+
+    out = inspect_dataset_schema(str(dataset), sampling="random")
+    assert out["ok"] is True
+    assert out["sampling"]["method"] == "head"
+    assert "fallback_reason" in out["sampling"]
+
+
+def test_inspect_dataset_schema_rejects_unknown_sampling(tmp_path: Path):
+    dataset = tmp_path / "data.jsonl"
+    dataset.write_text('{"text": "a"}\n', encoding="utf-8")
+
+    out = inspect_dataset_schema(str(dataset), sampling="tail")
+    assert out["ok"] is False
+    assert out["error_type"] == "invalid_sampling_mode"
+
+
+# ---------------------------------------------------------------------------
+# Compressed inputs
+# ---------------------------------------------------------------------------
+
+def _jsonl_bytes(rows) -> bytes:
+    return ("\n".join(json.dumps(r) for r in rows) + "\n").encode("utf-8")
+
+
+def test_inspect_dataset_schema_gzip_jsonl_streams(tmp_path: Path):
+    import gzip
+
+    payload = _jsonl_bytes([{"text": f"row {i}", "id": i} for i in range(20000)])
+    dataset = tmp_path / "data.jsonl.gz"
+    compressed = gzip.compress(payload)
+    # Chop the stream: only the sampled prefix may be decompressed.
+    dataset.write_bytes(compressed[: len(compressed) // 2])
+
+    out = inspect_dataset_schema(str(dataset), sample_size=5)
+    assert out["ok"] is True
+    assert out["sampled_records"] == 5
+    assert out["sampling"]["compression"] == "gzip"
+
+
+def test_inspect_dataset_schema_bz2_csv_and_json_xz(tmp_path: Path):
+    import bz2
+    import lzma
+
+    csv_path = tmp_path / "data.csv.bz2"
+    csv_path.write_bytes(bz2.compress(("text,id\n" + "".join(f"row {i},{i}\n" for i in range(10))).encode()))
+    out = inspect_dataset_schema(str(csv_path), sample_size=5)
+    assert out["ok"] is True
+    assert out["keys"] == ["id", "text"]
+    assert out["sampling"]["compression"] == "bz2"
+
+    json_path = tmp_path / "data.json.xz"
+    json_path.write_bytes(lzma.compress(json.dumps([{"text": "a"}, {"text": "b"}]).encode()))
+    out = inspect_dataset_schema(str(json_path), sample_size=5, sampling="random")
+    assert out["ok"] is True
+    assert out["sampled_records"] == 2
+    assert out["sampling"]["compression"] == "xz"
+    assert "compressed" in out["sampling"]["fallback_reason"]
+
+
+def test_inspect_dataset_schema_detects_compression_by_magic(tmp_path: Path):
+    import gzip
+
+    dataset = tmp_path / "mislabelled.jsonl"
+    dataset.write_bytes(gzip.compress(_jsonl_bytes([{"text": "x"}])))
+
+    out = inspect_dataset_schema(str(dataset))
+    assert out["ok"] is True
+    assert out["sampling"]["compression"] == "gzip"
+
+
+def test_inspect_dataset_schema_zstd_jsonl(tmp_path: Path):
+    zstandard = pytest.importorskip("zstandard")
+
+    dataset = tmp_path / "data.jsonl.zst"
+    dataset.write_bytes(zstandard.ZstdCompressor().compress(_jsonl_bytes([{"text": "x"}] * 3)))
+    out = inspect_dataset_schema(str(dataset))
+    assert out["ok"] is True
+    assert out["sampled_records"] == 3
+    assert out["sampling"]["compression"] == "zstd"
+
+
+def test_inspect_dataset_schema_compressed_shards(tmp_path: Path):
+    import gzip
+
+    for i in range(3):
+        (tmp_path / f"part-{i}.jsonl.gz").write_bytes(gzip.compress(_jsonl_bytes([{"text": str(i)}])))
+    out = inspect_dataset_schema(str(tmp_path))
+    assert out["ok"] is True
+    assert out["sampling"]["shards"]["listed"] == 3
+
+
+# ---------------------------------------------------------------------------
+# Persistent profile cache
+# ---------------------------------------------------------------------------
+
+def test_inspect_dataset_schema_profile_cache_roundtrip(tmp_path: Path):
+    import os
+
+    from data_juicer_agents.tools.context.inspect_dataset import logic
+
+    dataset = tmp_path / "data.jsonl"
+    _write_jsonl(dataset, [{"text": "x"}])
+    cache_dir = tmp_path / "profiles"
+
+    first = inspect_dataset_schema(str(dataset), cache_dir=cache_dir)
+    assert first["profile_cache"]["hit"] is False
+    assert Path(first["profile_cache"]["path"]).parent == cache_dir
+
+    with patch.object(logic, "_inspect_sources", side_effect=AssertionError("re-read")):
+        second = inspect_dataset_schema(str(dataset), cache_dir=cache_dir)
+    assert second["profile_cache"]["hit"] is True
+    assert second["key_stats"] == first["key_stats"]
+
+    # Different sampling parameters use a different entry.
+    other = inspect_dataset_schema(str(dataset), sample_size=3, cache_dir=cache_dir)
+    assert other["profile_cache"]["hit"] is False
+
+    # Touching the data invalidates the entry.
+    _write_jsonl(dataset, [{"text": "x", "image": "a.png"}])
+    stat = dataset.stat()
+    os.utime(dataset, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    changed = inspect_dataset_schema(str(dataset), cache_dir=cache_dir)
+    assert changed["profile_cache"]["hit"] is False
+    assert changed["modality"] == "multimodal"
+
+    refreshed = inspect_dataset_schema(str(dataset), cache_dir=cache_dir, refresh=True)
+    assert refreshed["profile_cache"]["hit"] is False
+
+
+def test_inspect_dataset_schema_profile_cache_skips_failures(tmp_path: Path):
+    dataset = tmp_path / "empty.jsonl"
+    dataset.write_text("\n", encoding="utf-8")
+
+    out = inspect_dataset_schema(str(dataset), cache_dir=tmp_path / "profiles")
+    assert out["ok"] is False
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_profile_cache_detects_shards_rewritten_in_place(tmp_path: Path):
+    import os
+
+    shards = tmp_path / "shards"
+    shards.mkdir()
+    shard = shards / "part-0.jsonl"
+    _write_jsonl(shard, [{"text": "hello"}])
+    cache_dir = tmp_path / "profiles"
+
+    for source in (str(shards), str(shards / "*.jsonl")):
+        _write_jsonl(shard, [{"text": "hello"}])
+        first = inspect_dataset_schema(source, cache_dir=cache_dir)
+        assert first["keys"] == ["text"]
+        assert inspect_dataset_schema(source, cache_dir=cache_dir)["profile_cache"]["hit"] is True
+
+        dir_stat = shards.stat()
+        _write_jsonl(shard, [{"image": "a.png", "caption": "a cat"}])
+        os.utime(shards, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+        rewritten = inspect_dataset_schema(source, cache_dir=cache_dir)
+        assert rewritten["profile_cache"]["hit"] is False
+        assert rewritten["keys"] == ["caption", "image"]
+
+
+def test_profile_cache_lru_eviction(tmp_path: Path):
+    import os
+
+    from data_juicer_agents.tools.context.inspect_dataset.profile_cache import ProfileCache
+
+    cache = ProfileCache(tmp_path, max_entries=2)
+    for idx, key in enumerate(["a", "b"]):
+        cache.put(key, {"ok": True, "n": idx})
+        os.utime(cache.path_for(key), ns=(idx * 10**9, idx * 10**9))
+    assert cache.get("a") == {"ok": True, "n": 0}  # refreshes "a"
+    cache.put("c", {"ok": True, "n": 2})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+    small = ProfileCache(tmp_path / "small", max_bytes=60)
+    small.put("x", {"ok": True, "payload": "y" * 20})
+    small.put("z", {"ok": True, "payload": "w" * 20})
+    assert sorted(p.name for p in (tmp_path / "small").iterdir()) == ["z.json"]
+
+
+def test_inspect_dataset_tool_uses_working_dir_profiles(tmp_path: Path):
+    from data_juicer_agents.core.tool import ToolContext
+    from data_juicer_agents.tools.context import INSPECT_DATASET, InspectDatasetInput
+
+    dataset = tmp_path / "data.jsonl"
+    _write_jsonl(dataset, [{"text": "x"}])
+    ctx = ToolContext(working_dir=str(tmp_path / "wd"))
+
+    result = INSPECT_DATASET.executor(ctx, InspectDatasetInput(dataset_path=str(dataset)))
+    assert result.ok
+    assert Path(result.data["profile_cache"]["path"]).parent == tmp_path / "wd" / "profiles"
+    again = INSPECT_DATASET.executor(ctx, InspectDatasetInput(dataset_path=str(dataset)))
+    assert again.data["profile_cache"]["hit"] is True
+    fresh = INSPECT_DATASET.executor(ctx, InspectDatasetInput(dataset_path=str(dataset), refresh=True))
+    assert fresh.data["profile_cache"]["hit"] is False
+
+
+# ---------------------------------------------------------------------------
+# Full streaming profile
+# ---------------------------------------------------------------------------
+
+def test_inspect_dataset_schema_full_profile(tmp_path: Path):
+    dataset = tmp_path / "data.jsonl"
+    rows = [{"text": "a" * (i + 1), "label": i % 3} for i in range(100)]
+    rows += [{"text": "duplicated document body", "label": None}] * 20
+    _write_jsonl(dataset, rows)
+
+    out = inspect_dataset_schema(str(dataset), sample_size=5, full_profile=True, profile_workers=1)
+    assert out["ok"] is True
+    full = out["full_profile"]
+    assert full["rows"] == 120
+    assert full["partitions"] == 1
+    label = full["fields"]["label"]
+    assert label["null_count"] == 20
+    assert label["null_rate"] == round(20 / 120, 4)
+    assert label["distinct_estimate"] == 3
+    text = full["fields"]["text"]["text_length"]
+    assert (text["min_len"], text["max_len"]) == (1, 100)
+    assert 38 <= text["quantiles"]["p50"] <= 43  # 20 duplicates of length 24 pull it down
+    assert sum(text["histogram"]["counts"]) == 120
+    assert 99 <= full["fields"]["text"]["distinct_estimate"] <= 103
+    assert full["duplicate_row_rate"] > 0.1
+    near = full["near_duplicates"]
+    assert near["key"] == "text"
+    assert near["documents_seen"] == 120
+    assert near["near_duplicate_rate"] >= 20 / 120
+
+    plain = inspect_dataset_schema(str(dataset), sample_size=5)
+    assert "full_profile" not in plain
+
+
+def test_full_profile_partitions_merge_like_single_scan(tmp_path: Path):
+    from data_juicer_agents.tools.context.inspect_dataset import full_profile as fp
+
+    dataset = tmp_path / "data.jsonl"
+    _write_jsonl(dataset, [{"text": "x" * (i % 37), "id": i} for i in range(500)])
+
+    with patch.object(fp, "_MIN_SPLIT_BYTES", 1024):
+        partitions = fp._plan_partitions([str(dataset)], workers=4)
+    assert len(partitions) > 1
+    merged = fp.PartialProfile(dedup_key="text")
+    for idx, partition in enumerate(partitions):
+        merged.merge(fp._profile_partition(partition, "text", idx))
+    single = fp.profile_dataset([str(dataset)], dedup_key="text", workers=1)
+    split = fp._finalize(merged)
+    assert split["rows"] == single["rows"] == 500
+    assert split["fields"] == single["fields"]
+
+
+def test_full_profile_worker_processes(tmp_path: Path):
+    from data_juicer_agents.tools.context.inspect_dataset.full_profile import profile_dataset
+
+    shards = tmp_path / "shards"
+    shards.mkdir()
+    _write_jsonl(shards / "part-0.jsonl", [{"text": f"a{i}"} for i in range(30)])
+    _write_jsonl(shards / "part-1.jsonl", [{"text": f"b{i}"} for i in range(40)])
+
+    out = profile_dataset(
+        [str(shards / "part-0.jsonl"), str(shards / "part-1.jsonl")],
+        dedup_key="text",
+        workers=2,
+    )
+    assert out["workers"] == 2
+    assert out["rows"] == 70
+    assert out["fields"]["text"]["distinct_estimate"] == 70
+
+    via_dir = inspect_dataset_schema(str(shards), full_profile=True, profile_workers=2)
+    assert via_dir["full_profile"]["rows"] == 70
+    assert via_dir["full_profile"]["files"] == 2
+
+
+def test_hyperloglog_estimate_and_merge():
+    from data_juicer_agents.tools.context.inspect_dataset.full_profile import (
+        HyperLogLog,
+        _hash64,
+    )
+
+    left, right = HyperLogLog(), HyperLogLog()
+    for i in range(20000):
+        (left if i % 2 else right).add_hash(_hash64(str(i % 10000).encode()))
+    left.merge(right)
+    assert abs(left.estimate() - 10000) < 500
+
+
+def test_full_profile_cache_key_separates_modes(tmp_path: Path):
+    dataset = tmp_path / "data.jsonl"
+    _write_jsonl(dataset, [{"text": "x"}])
+    cache_dir = tmp_path / "profiles"
+
+    inspect_dataset_schema(str(dataset), cache_dir=cache_dir)
+    full = inspect_dataset_schema(str(dataset), cache_dir=cache_dir, full_profile=True, profile_workers=1)
+    assert full["profile_cache"]["hit"] is False
+    assert full["full_profile"]["rows"] == 1
+    again = inspect_dataset_schema(str(dataset), cache_dir=cache_dir, full_profile=True)
+    assert again["profile_cache"]["hit"] is True
+    assert again["full_profile"]["rows"] == 1
+
+
+# ---------------------------------------------------------------------------
+# Media reference validation
+# ---------------------------------------------------------------------------
+
+def test_inspect_dataset_schema_validate_media(tmp_path: Path):
+    images = tmp_path / "images"
+    images.mkdir()
+    (images / "ok.png").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 8)
+    (images / "ok.jpg").write_bytes(b"\xff\xd8\xff\xe0" + b"\x00" * 8)
+    (images / "fake.jpg").write_text("not an image", encoding="utf-8")
+    (images / "empty.png").write_bytes(b"")
+    dataset = tmp_path / "data.jsonl"
+    _write_jsonl(
+        dataset,
+        [
+            {"text": "a", "image": "images/ok.png"},
+            {"text": "b", "image": "images/missing.png"},
+            {"text": "c", "images": ["images/ok.jpg", "images/fake.jpg"]},
+            {"text": "d", "image": "images/empty.png"},
+            {"text": "e", "image": "https://example.com/x.jpg"},
+        ],
+    )
+
+    out = inspect_dataset_schema(str(dataset), validate_media=True)
+    assert out["ok"] is True
+    media = out["media_validation"]
+    assert media["checked"] == 5
+    assert media["remote_skipped"] == 1
+    assert (media["ok"], media["missing"], media["invalid"], media["empty"]) == (2, 1, 1, 1)
+    assert media["missing_rate"] == 0.2
+    assert media["invalid_rate"] == 0.4
+    assert {item["status"] for item in media["examples"]} == {"missing", "invalid", "empty"}
+    assert media["timed_out"] is False
+
+    assert "media_validation" not in inspect_dataset_schema(str(dataset))
+
+
+def test_validate_media_is_rechecked_on_profile_cache_hit(tmp_path: Path):
+    image = tmp_path / "ok.png"
+    image.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 8)
+    dataset = tmp_path / "data.jsonl"
+    _write_jsonl(dataset, [{"text": "a", "image": "ok.png"}])
+    cache_dir = tmp_path / "profiles"
+
+    first = inspect_dataset_schema(str(dataset), cache_dir=cache_dir, validate_media=True)
+    assert first["profile_cache"]["hit"] is False
+    assert first["media_validation"]["ok"] == 1
+    cached = json.loads(Path(first["profile_cache"]["path"]).read_text(encoding="utf-8"))
+    assert "media_validation" not in cached
+
+    image.unlink()
+    again = inspect_dataset_schema(str(dataset), cache_dir=cache_dir, validate_media=True)
+    assert again["profile_cache"]["hit"] is True
+    assert again["media_validation"]["missing"] == 1
+    assert "_media_refs" not in again
+
+    plain = inspect_dataset_schema(str(dataset), cache_dir=cache_dir)
+    assert plain["profile_cache"]["hit"] is True
+    assert "media_validation" not in plain
+
+
+def test_validate_media_refs_respects_time_budget(tmp_path: Path):
+    import time
+
+    from data_juicer_agents.tools.context.inspect_dataset import media_check
+
+    def slow_check(ref, base_dir=None):
+        time.sleep(0.5)
+        return "ok"
+
+    refs = [(f"img_{i}.png", str(tmp_path)) for i in range(4)]
+    started = time.monotonic()
+    with patch.object(media_check, "check_media_ref", side_effect=slow_check):
+        out = media_check.validate_media_refs(refs, time_budget=0.05, max_workers=1)
+    assert time.monotonic() - started < 0.4
+    assert out["timed_out"] is True
+    assert out["unchecked"] == 4 - out["checked"]
+    assert out["unchecked"] >= 3
+
+
 pyarrow = pytest.importorskip("pyarrow", reason="pyarrow not installed")
 
 
@@ -101,4 +676,124 @@ def test_inspect_dataset_schema_parquet(tmp_path: Path):
     assert out["ok"] is True
     assert out["modality"] == "text"
     assert "text" in out["candidate_text_keys"]
-    assert out["sampled_records"] == 5
\ No newline at end of file
+    assert out["sampled_records"] == 5
+
+
+def test_inspect_dataset_schema_parquet_random_row_groups(tmp_path: Path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({
+        "text": [f"row {i}" for i in range(1000)],
+        "id": list(range(1000)),
+    })
+    dataset = tmp_path / "data.parquet"
+    pq.write_table(table, str(dataset), row_group_size=100)
+
+    out = inspect_dataset_schema(str(dataset), sample_size=8, sampling="random", seed=3)
+    assert out["ok"] is True
+    assert out["sampled_records"] == 8
+    info = out["sampling"]
+    assert info["method"] == "random_row_groups"
+    assert info["row_groups_total"] == 10
+    assert info["row_groups_read"] == 2
+    assert info["coverage"] == 0.2
+
+
+def test_inspect_dataset_schema_parquet_footer_profile(tmp_path: Path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.table({
+        "text": [f"row {i}" if i % 5 else None for i in range(100)],
+        "image": [f"imgs/{i}.JPG" for i in range(100)],
+        "score": [float(i) for i in range(100)],
+        "tags": [["a", "b"]] * 100,
+    })
+    dataset = tmp_path / "data.parquet"
+    pq.write_table(table, str(dataset), row_group_size=25)
+
+    out = inspect_dataset_schema(str(dataset), sample_size=10)
+    assert out["ok"] is True
+    assert out["modality"] == "multimodal"
+    assert out["sampled_records"] == 10
+    assert len(out["sample_preview"]) == 2
+    assert out["key_stats"]["text"]["kinds"] == {"null": 2, "text": 8}
+    assert out["key_stats"]["image"]["kinds"] == {"image_ref": 10}
+    assert out["key_stats"]["tags"]["kinds"] == {"array": 10}
+
+    meta = out["parquet_metadata"]
+    assert meta["num_rows"] == 100
+    assert meta["num_row_groups"] == 4
+    assert meta["row_group_rows"] == {"min": 25, "max": 25}
+    score = meta["columns"]["score"]
+    assert score["kind"] == "number"
+    assert (score["min"], score["max"]) == (0.0, 99.0)
+    assert meta["columns"]["text"]["null_count"] == 20
+    assert meta["columns"]["text"]["null_rate"] == 0.2
+    assert meta["columns"]["tags"]["kind"] == "array"
+    assert meta["columns"]["tags"]["compressed_bytes"] > 0
+
+
+def test_arrow_key_stats_match_row_loop():
+    import pyarrow as pa
+
+    from data_juicer_agents.tools.context.inspect_dataset.columnar import arrow_key_stats
+    from data_juicer_agents.tools.context.inspect_dataset.logic import _compute_key_stats
+
+    rows = [
+        {"a": " Photo.PNG ", "b": 1, "c": True, "d": {"x": 1}, "e": [1]},
+        {"a": "https://x.org/p.jpg?size=2", "b": 2.5, "c": None, "d": None, "e": None},
+        {"a": "https://x.org/p?f=a.jpg", "b": None, "c": False, "d": {"x": 2}, "e": []},
+        {"a": "plain text here", "b": 3, "c": True, "d": {"x": 3}, "e": [2, 3]},
+        {"a": None, "b": 4, "c": True, "d": {"x": 4}, "e": [4]},
+        {"a": "ünïcødé", "b": 5, "c": True, "d": {"x": 5}, "e": [5]},
+    ]
+    expected = _compute_key_stats(rows)
+    actual = arrow_key_stats(pa.Table.from_pylist(rows))
+    assert actual.keys() == expected.keys()
+    for key, stat in expected.items():
+        assert actual[key]["count"] == stat["count"]
+        assert actual[key]["kinds"] == stat["kinds"], key
+        assert actual[key]["avg_text_len"] == pytest.approx(stat["avg_text_len"])
+
+
+def test_python_key_stats_match_row_loop():
+    import random
+
+    from data_juicer_agents.tools.context.inspect_dataset.columnar import python_key_stats
+    from data_juicer_agents.tools.context.inspect_dataset.logic import _loop_key_stats
+
+    rng = random.Random(7)
+    pool = [
+        " Photo.PNG ", "https://x.org/p.jpg?size=2", "https://x.org/p?f=a.jpg",
+        "plain text here", "ünïcødé", "dir\\img.jpeg", "", None, 1, 2.5, True,
+        False, [1], {"x": 1}, "a.svg",
+    ]
+    rows = []
+    for _ in range(3000):
+        row = {"mixed": rng.choice(pool), "text": "t" * rng.randrange(50)}
+        if rng.random() < 0.3:
+            row["sparse"] = rng.choice(pool)
+        rows.append(row)
+    rows.append({"bad": "\ud800 lone surrogate"})
+
+    expected = _loop_key_stats(rows)
+    actual = python_key_stats(rows)
+    assert list(actual) == list(expected)
+    assert actual == expected
+
+
+def test_compute_key_stats_uses_columnar_for_large_samples(tmp_path: Path):
+    from data_juicer_agents.tools.context.inspect_dataset import columnar, logic
+
+    dataset = tmp_path / "data.jsonl"
+    _write_jsonl(dataset, [{"text": f"row {i}", "image": f"{i}.png"} for i in range(50)])
+
+    with patch.object(logic, "_COLUMNAR_MIN_ROWS", 10), patch.object(
+        columnar, "python_key_stats", wraps=columnar.python_key_stats
+    ) as spy:
+        out = inspect_dataset_schema(str(dataset), sample_size=50)
+    assert spy.called
+    assert out["key_stats"]["image"]["kinds"] == {"image_ref": 50}
+    assert out["modality"] == "multimodal"
@@ -79,3 +79,90 @@ def test_dev_command_smoke_check(monkeypatch, tmp_path: Path):
         ]
     )
     assert code == 0
+
+
+def test_dev_command_watch_starts_incremental_watcher(monkeypatch, tmp_path: Path):
+    from data_juicer_agents.commands import dev_cmd as dev_mod
+
+    out_dir = tmp_path / "ops"
+    monkeypatch.setattr(
+        dev_mod.DevUseCase,
+        "execute",
+        staticmethod(
+            lambda **_kwargs: {
+                "ok": True,
+                "operator_name": "sample_mapper",
+                "operator_type": "mapper",
+                "class_name": "SampleMapper",
+                "output_dir": str(out_dir),
+                "generated_files": [],
+                "summary_path": str(out_dir / "sample_mapper_SUMMARY.md"),
+                "notes": [],
+            }
+        ),
+    )
+    captured = {}
+
+    def _fake_watch(output_dir, debounce, result=None, code=0):
+        captured["output_dir"] = output_dir
+        captured["debounce"] = debounce
+        return code
+
+    monkeypatch.setattr(dev_mod, "_watch_output_dir", _fake_watch)
+    monkeypatch.chdir(tmp_path)
+
+    code = main(
+        [
+            "dev",
+            "sample",
+            "--operator-name",
+            "sample_mapper",
+            "--output-dir",
+            str(out_dir),
+            "--watch",
+            "--watch-debounce",
+            "0.5",
+        ]
+    )
+    assert code == 0
+    assert captured == {"output_dir": str(out_dir), "debounce": 0.5}
+
+
+def test_dev_watch_reruns_smoke_check_and_returns_last_result(monkeypatch, tmp_path: Path):
+    from data_juicer_agents.commands import dev_cmd as dev_mod
+    import data_juicer_agents.tools.retrieve as retrieve_mod
+
+    outcomes = iter([(False, "Smoke check failed (exit=1)."), (True, "Smoke check passed.")])
+    checked = []
+
+    def _fake_smoke(scaffold):
+        checked.append(scaffold.operator_name)
+        return next(outcomes)
+
+    class _FakeWatcher:
+        def stop(self):
+            pass
+
+    def _fake_watch_ops(paths, on_change=None, debounce=1.0):
+        _FakeWatcher.on_change = staticmethod(on_change)
+        return _FakeWatcher()
+
+    def _two_edits_then_ctrl_c():
+        _FakeWatcher.on_change({"registered": ["sample_mapper"]})
+        _FakeWatcher.on_change({"registered": ["sample_mapper"]})
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(dev_mod, "run_smoke_check", _fake_smoke)
+    monkeypatch.setattr(retrieve_mod, "watch_custom_operators", _fake_watch_ops)
+    monkeypatch.setattr(dev_mod, "_wait_until_interrupted", _two_edits_then_ctrl_c)
+    result = {"operator_name": "sample_mapper", "summary_path": str(tmp_path / "s.md")}
+
+    assert dev_mod._watch_output_dir(str(tmp_path), 0.1, result=result, code=1) == 0
+    assert checked == ["sample_mapper", "sample_mapper"]
+
+    monkeypatch.setattr(
+        dev_mod,
+        "run_smoke_check",
+        lambda scaffold: (False, "Smoke check failed (exit=1)."),
+    )
+    assert dev_mod._watch_output_dir(str(tmp_path), 0.1, result=result, code=0) == 1
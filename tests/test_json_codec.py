@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import dataclasses
+import datetime
+import json
+
+import pytest
+
+from data_juicer_agents.utils import json_codec
+
+
+@dataclasses.dataclass
+class _Record:
+    name: str
+
+
+_PAYLOADS = [
+    {"b": 1, "a": [1, 2.5, {"c": "ünï"}], "e": {}, "f": []},
+    {"z": {"y": None, "b": True}, "a": "x"},
+    {1: "int key"},
+    {"when": datetime.datetime(2024, 1, 2, 3, 4, 5)},
+    {"record": _Record("x")},
+    [2 ** 70],
+    {"s": "\ud800"},
+    {"nan": float("nan"), "inf": [float("inf"), float("-inf")]},
+    [1e20, 1e16, 1e15, -2.5e-10, 1e-05, -1.5e-05, 1e-04, 1.2345678901234568e17, 5e-324, 0.1],
+]
+
+
+@pytest.mark.parametrize("payload", _PAYLOADS)
+@pytest.mark.parametrize("kwargs", [{}, {"indent": 2}, {"sort_keys": True}])
+def test_dumps_matches_stdlib_path(payload, kwargs):
+    expected = json_codec._stdlib_dumps(
+        payload,
+        indent=kwargs.get("indent"),
+        sort_keys=kwargs.get("sort_keys", False),
+        ensure_ascii=False,
+        default=str,
+    )
+    assert json_codec.dumps(payload, default=str, **kwargs) == expected
+
+
+def test_stdlib_path_formats_floats_like_orjson():
+    payload = {"nan": float("nan"), "big": 1e20, "small": 1e-05, "tiny": 1.5e-07, "s": "1e+20"}
+    expected = '{"nan":null,"big":1e20,"small":0.00001,"tiny":1.5e-7,"s":"1e+20"}'
+    assert json_codec._stdlib_dumps(
+        payload, indent=None, sort_keys=False, ensure_ascii=False, default=None
+    ) == expected
+    assert json_codec.dumps(payload) == expected
+    assert json_codec.dumps(payload, ensure_ascii=True) == expected
+
+
+def test_dumps_is_compact_and_ordered():
+    assert json_codec.dumps({"b": 1, "a": [1, 2]}) == '{"b":1,"a":[1,2]}'
+    assert json_codec.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+    assert json_codec.dumps({"a": "é"}, ensure_ascii=True) == '{"a":"\\u00e9"}'
+    with pytest.raises(TypeError):
+        json_codec.dumps({"x": object()})
+
+
+def test_loads_falls_back_to_stdlib_semantics():
+    assert json_codec.loads('{"a": [1, "x"]}') == {"a": [1, "x"]}
+    assert json_codec.loads(b'{"a": 1}') == {"a": 1}
+    assert json_codec.loads('"\\ud800"') == "\ud800"
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads("{broken")
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for the compact OperatorRecord catalog entries."""
+
+import pickle
+
+import pytest
+
+from data_juicer_agents.tools.retrieve._shared.backend.cache import (
+    CK_OP_INDEX,
+    cache_manager,
+)
+from data_juicer_agents.tools.retrieve._shared.backend.record import (
+    OperatorRecord,
+    as_operator_record,
+    coerce_operator_records,
+    index_operator_records,
+    records_to_dicts,
+)
+from data_juicer_agents.tools.retrieve._shared.backend.result_builder import (
+    filter_by_op_type,
+    filter_by_tags,
+)
+
+
+@pytest.fixture()
+def record():
+    return OperatorRecord(
+        index=3,
+        class_name=" text_length_filter ",
+        class_desc="Filter by length",
+        class_type="filter",
+        class_tags=["text", "cpu", ""],
+        arguments="        min_len (int): min length\n",
+    )
+
+
+def test_record_is_slotted_and_immutable(record):
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.class_name = "other"
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_record_interns_identifier_strings(record):
+    other = OperatorRecord(index=4, class_name="text_length_filter", class_type="filter")
+    assert record.class_name == "text_length_filter"
+    assert record.class_name is other.class_name
+    assert record.class_type is other.class_type
+    assert record.class_tags == ("text", "cpu")
+
+
+def test_record_supports_read_only_mapping_access(record):
+    assert "class_name" in record
+    assert "missing" not in record
+    assert record["class_type"] == "filter"
+    assert record.get("missing", "x") == "x"
+    with pytest.raises(KeyError):
+        record["missing"]
+
+
+def test_record_dict_roundtrip(record):
+    payload = record.to_dict()
+    assert payload == {
+        "index": 3,
+        "class_name": "text_length_filter",
+        "class_desc": "Filter by length",
+        "class_type": "filter",
+        "class_tags": ["text", "cpu"],
+        "arguments": "        min_len (int): min length\n",
+    }
+    assert OperatorRecord.from_dict(payload) == record
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_coerce_operator_records_accepts_dicts_and_drops_invalid():
+    rows = [
+        {"class_name": "a_mapper", "class_type": "mapper"},
+        {"class_name": "  "},
+        "not-a-row",
+        OperatorRecord(index=9, class_name="b_filter"),
+    ]
+    records = coerce_operator_records(rows)
+    assert [r.class_name for r in records] == ["a_mapper", "b_filter"]
+    assert records[0].index == 0
+    assert as_operator_record(None) is None
+    assert records_to_dicts(records)[1]["index"] == 9
+
+
+def test_index_operator_records_reuses_cached_index():
+    catalog = [
+        OperatorRecord(index=0, class_name="a_mapper"),
+        OperatorRecord(index=1, class_name="b_filter"),
+    ]
+    try:
+        records, name_map = index_operator_records(catalog)
+        again_records, again_map = index_operator_records(catalog)
+        assert again_records is records
+        assert again_map is name_map
+        assert name_map["b_filter"] is catalog[1]
+
+        catalog.append(OperatorRecord(index=2, class_name="c_filter"))
+        _, rebuilt_map = index_operator_records(catalog)
+        assert "c_filter" in rebuilt_map
+    finally:
+        cache_manager.invalidate(CK_OP_INDEX)
+
+
+def test_filters_accept_records():
+    records = [
+        OperatorRecord(index=0, class_name="a_mapper", class_type="mapper", class_tags=["text"]),
+        OperatorRecord(index=1, class_name="b_filter", class_type="filter", class_tags=["image"]),
+    ]
+    assert [r.class_name for r in filter_by_op_type(records, "filter")] == ["b_filter"]
+    assert [r.class_name for r in filter_by_tags(records, ["TEXT"])] == ["a_mapper"]
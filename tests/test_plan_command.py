@@ -32,6 +32,7 @@ def _args(tmp_path: Path) -> SimpleNamespace:
 
 def test_execute_plan_uses_retrieval_and_writes_new_schema(monkeypatch, tmp_path):
     args = _args(tmp_path)
+    monkeypatch.chdir(tmp_path)
     monkeypatch.setattr(
         service_mod,
         "retrieve_operator_candidates",
@@ -71,6 +72,7 @@ def test_execute_plan_uses_retrieval_and_writes_new_schema(monkeypatch, tmp_path
 
 def test_run_plan_prints_modality_not_workflow(monkeypatch, tmp_path, capsys):
     args = _args(tmp_path)
+    monkeypatch.chdir(tmp_path)
     monkeypatch.setattr(
         service_mod,
         "retrieve_operator_candidates",
@@ -94,3 +96,25 @@ def test_run_plan_prints_modality_not_workflow(monkeypatch, tmp_path, capsys):
     assert code == 0
     assert "Modality: text" in output
     assert "Workflow:" not in output
+
+
+def test_execute_plan_caches_profiles_under_cwd_djx(monkeypatch, tmp_path):
+    args = _args(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("DJX_PROFILE_CACHE_DIR", raising=False)
+    captured = {}
+
+    def _fake_retrieve(**kwargs):
+        captured.update(kwargs)
+        return {"ok": True, "retrieval_source": "lexical", "candidates": [{"operator_name": "words_num_filter"}]}
+
+    monkeypatch.setattr(service_mod, "retrieve_operator_candidates", _fake_retrieve)
+    monkeypatch.setattr(
+        generator_mod,
+        "call_model_json",
+        lambda *_args, **_kwargs: {"operators": [{"name": "words_num_filter", "params": {}}]},
+    )
+
+    assert execute_plan(args)["ok"] is True
+    assert captured["profile_cache_dir"] == Path(".djx/profiles")
+    assert list((tmp_path / ".djx" / "profiles").glob("*.json"))
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from data_juicer_agents.capabilities.plan import service as service_mod
+from data_juicer_agents.capabilities.plan.generator import ProcessOperatorGenerator
 
 
 def test_resolve_retrieval_forwards_dataset_config(monkeypatch):
@@ -33,4 +34,49 @@ def test_resolve_retrieval_forwards_dataset_config(monkeypatch):
     assert captured["mode"] == "auto"
     assert captured["dataset_path"] is None
     assert captured["dataset"] == dataset
+    assert captured["profile_cache_dir"] is None
 
+
+
+def test_generator_prompt_summarizes_full_profile():
+    profile = {
+        "ok": True,
+        "modality": "text",
+        "full_profile": {
+            "rows": 1000,
+            "duplicate_row_rate": 0.02,
+            "fields": {
+                "text": {
+                    "null_rate": 0.0,
+                    "distinct_estimate": 980,
+                    "text_length": {
+                        "min_len": 3,
+                        "max_len": 9000,
+                        "quantiles": {"p5": 40, "p50": 600, "p95": 4000},
+                        "histogram": {"edges": [0, 64], "counts": [10, 990]},
+                    },
+                }
+            },
+            "near_duplicates": {"key": "text", "near_duplicate_rate": 0.07},
+        },
+    }
+    prompt = ProcessOperatorGenerator._prompt(
+        user_intent="filter short text",
+        retrieval_payload={"candidates": []},
+        dataset_spec={},
+        dataset_profile=profile,
+    )
+
+    assert "dataset_statistics" in prompt
+    assert '"p5": 40' in prompt
+    assert '"near_duplicate_rate": 0.07' in prompt
+    assert "histogram" not in prompt
+    assert "full_profile" in profile  # caller's dict is not mutated
+
+    plain = ProcessOperatorGenerator._prompt(
+        user_intent="filter short text",
+        retrieval_payload={"candidates": []},
+        dataset_spec={},
+        dataset_profile={"ok": True},
+    )
+    assert "dataset_statistics" not in plain
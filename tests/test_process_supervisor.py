@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from data_juicer_agents.utils import process_supervisor
+from data_juicer_agents.utils.process_supervisor import (
+    CANCELLED,
+    EXITED,
+    TIMEOUT,
+    CancelEvent,
+    reap_process,
+    terminate_process_group,
+    wait_for_process,
+)
+from data_juicer_agents.utils.runtime_helpers import run_interruptible_subprocess
+
+
+def _spawn(code: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", code], start_new_session=True)
+
+
+@pytest.fixture(params=["pidfd", "watcher"])
+def exit_source(request, monkeypatch):
+    if request.param == "watcher":
+        monkeypatch.setattr(process_supervisor, "_open_pidfd", lambda pid: None)
+    return request.param
+
+
+def test_wait_for_process_reports_exit(exit_source):
+    proc = _spawn("import time; time.sleep(0.2)")
+    assert wait_for_process(proc, timeout=30) == EXITED
+    assert proc.returncode == 0
+
+
+def test_wait_for_process_can_leave_child_for_rusage(exit_source):
+    proc = _spawn("import time\nend = time.time() + 0.2\nwhile time.time() < end: pass\nraise SystemExit(3)")
+    assert wait_for_process(proc, timeout=30, reap=False) == EXITED
+    usage = reap_process(proc)
+    assert proc.returncode == 3
+    assert usage is not None and usage.ru_utime + usage.ru_stime > 0.1
+
+
+def test_wait_for_process_reports_timeout_and_leaves_child_running(exit_source):
+    proc = _spawn("import time; time.sleep(30)")
+    try:
+        started = time.monotonic()
+        assert wait_for_process(proc, timeout=0.3) == TIMEOUT
+        assert time.monotonic() - started < 5
+        assert proc.poll() is None
+    finally:
+        terminate_process_group(proc)
+    assert proc.poll() is not None
+
+
+def test_cancel_event_wakes_supervisor_without_polling(exit_source, monkeypatch):
+    # A huge check interval proves the wake-up comes from the event itself.
+    monkeypatch.setattr(process_supervisor, "_CANCEL_CHECK_INTERVAL", 3600.0)
+    proc = _spawn("import time; time.sleep(30)")
+    cancel = CancelEvent()
+    timer = threading.Timer(0.2, cancel.set)
+    try:
+        started = time.monotonic()
+        timer.start()
+        assert wait_for_process(proc, timeout=60, cancel_event=cancel) == CANCELLED
+        assert time.monotonic() - started < 5
+    finally:
+        timer.cancel()
+        terminate_process_group(proc)
+
+
+def test_cancel_check_callable_is_still_honoured():
+    proc = _spawn("import time; time.sleep(30)")
+    calls = {"n": 0}
+
+    def cancel_check():
+        calls["n"] += 1
+        return calls["n"] > 1
+
+    try:
+        assert wait_for_process(proc, timeout=60, cancel_check=cancel_check) == CANCELLED
+    finally:
+        terminate_process_group(proc)
+
+
+def test_run_interruptible_subprocess_drains_large_output():
+    payload = run_interruptible_subprocess(
+        [sys.executable, "-c", "import sys; sys.stdout.write('x' * 1_000_000)"],
+        timeout_sec=30,
+        shell=False,
+    )
+    assert payload["ok"] is True
+    assert payload["returncode"] == 0
+    assert payload["stdout"].startswith("xxxx")
+
+
+def test_run_interruptible_subprocess_cancel_and_timeout():
+    cancel = CancelEvent()
+    cancel.set()
+    cancelled = run_interruptible_subprocess(
+        [sys.executable, "-c", "import time; time.sleep(30)"],
+        timeout_sec=30,
+        shell=False,
+        cancel_event=cancel,
+    )
+    assert cancelled["ok"] is False
+    assert cancelled["error_type"] == "interrupted"
+
+    timed_out = run_interruptible_subprocess(
+        [sys.executable, "-c", "print('started', flush=True); import time; time.sleep(30)"],
+        timeout_sec=1,
+        shell=False,
+    )
+    assert timed_out["error_type"] == "timeout"
+    assert "started" in timed_out["stdout"]
+
+
+def test_session_tool_context_shares_runtime_cancel_event():
+    from data_juicer_agents.capabilities.session.runtime import SessionState, SessionToolRuntime
+    from data_juicer_agents.capabilities.session.toolkit import _build_tool_context
+
+    runtime = SessionToolRuntime(state=SessionState())
+    ctx = _build_tool_context(runtime)
+    assert ctx.runtime_values["cancel_event"] is runtime.cancel_event
+
+    runtime.cancel_event.set()
+    seen = runtime.invoke_tool("noop", {}, lambda: {"ok": True, "cancelled": runtime.cancel_event.is_set()})
+    assert seen["cancelled"] is False
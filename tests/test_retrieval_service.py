@@ -196,7 +196,7 @@ def test_prepare_retrieval_inputs_uses_dataset_config_when_dataset_path_missing(
 
     captured: dict = {}
 
-    def _fake_infer(dataset_path: str, dataset: dict | None = None):
+    def _fake_infer(dataset_path: str, dataset: dict | None = None, profile_cache_dir=None):
         captured["dataset_path"] = dataset_path
         captured["dataset"] = dataset
         return ["image"]
@@ -219,7 +219,7 @@ def test_prepare_retrieval_inputs_prefers_dataset_config_over_dataset_path(monke
 
     captured: dict = {}
 
-    def _fake_infer(dataset_path: str, dataset: dict | None = None):
+    def _fake_infer(dataset_path: str, dataset: dict | None = None, profile_cache_dir=None):
         captured["dataset_path"] = dataset_path
         captured["dataset"] = dataset
         return ["text"]
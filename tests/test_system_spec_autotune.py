@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+import json
+from pathlib import Path
+
+from data_juicer_agents.tools.context.inspect_dataset.logic import inspect_dataset_schema
+from data_juicer_agents.tools.plan import build_system_spec
+from data_juicer_agents.tools.plan._shared.autotune import (
+    HostResources,
+    autotune_system_config,
+    classify_operators,
+    estimate_dataset_size,
+)
+
+_GIB = 1024 ** 3
+_TAGS = {
+    "words_num_filter": ("cpu", "text"),
+    "image_captioning_mapper": ("gpu", "hf", "multimodal"),
+    "llm_analysis_filter": ("cpu", "api"),
+    "custom_model_mapper": (),
+}
+
+
+def _profile(tmp_path: Path, rows: int) -> dict:
+    dataset = tmp_path / "data.jsonl"
+    with open(dataset, "w", encoding="utf-8") as handle:
+        for idx in range(rows):
+            handle.write(json.dumps({"text": f"row {idx:06d} " + "x" * 40}) + "\n")
+    return inspect_dataset_schema(dataset_path=str(dataset), sample_size=20)
+
+
+def test_autotune_np_follows_host_and_dataset_size(tmp_path: Path):
+    host = HostResources(cpus=16, memory_bytes=64 * _GIB)
+    operators = [{"name": "words_num_filter", "params": {"min_words": 5}}]
+
+    small, notes, details = autotune_system_config(
+        {"np": 4},
+        dataset_profile=_profile(tmp_path, 300),
+        operators=operators,
+        operator_tags=_TAGS,
+        host=host,
+    )
+    assert small == {"np": 1}
+    assert details["dataset"]["source"] == "file_size"
+    assert 250 <= details["dataset"]["rows"] <= 350
+    assert "by data" in notes[0]
+
+    large, _notes, _details = autotune_system_config(
+        {"np": 4},
+        dataset_profile={"ok": True, "full_profile": {"rows": 1_000_000}},
+        operators=operators,
+        operator_tags=_TAGS,
+        host=host,
+    )
+    assert large == {"np": 16}
+
+    unknown, notes, _details = autotune_system_config({"np": 4}, host=host)
+    assert unknown == {"np": 4}
+    assert "dataset size unknown" in notes[0]
+
+
+def test_autotune_model_operators_bound_np_by_memory_and_enable_adaptive_batches():
+    host = HostResources(cpus=32, memory_bytes=20 * _GIB)
+    operators = [
+        {"name": "words_num_filter", "params": {}},
+        {"name": "image_captioning_mapper", "params": {}},
+        {"name": "llm_analysis_filter", "params": {}},
+        {"custom_model_mapper": {"hf_model": "Qwen/Qwen2.5-0.5B"}},
+    ]
+    assert classify_operators(operators, _TAGS) == {
+        "words_num_filter": "cpu",
+        "image_captioning_mapper": "model",
+        "llm_analysis_filter": "api",
+        "custom_model_mapper": "model",
+    }
+
+    updates, notes, _details = autotune_system_config(
+        {"np": 16},
+        dataset_profile={"ok": True, "full_profile": {"rows": 1_000_000}},
+        operators=operators,
+        operator_tags=_TAGS,
+        host=host,
+    )
+
+    # 20 GiB * 0.8 / 4 GiB per model worker.
+    assert updates["np"] == 4
+    assert updates["adaptive_batch_size"] is True
+    assert any("rate limit" in note for note in notes)
+
+
+def test_autotune_ray_executors_ignore_the_local_host(monkeypatch):
+    def fail():
+        raise AssertionError("host resources must not be read for Ray executors")
+
+    monkeypatch.setattr(
+        "data_juicer_agents.tools.plan._shared.autotune.detect_host_resources", fail
+    )
+    operators = [{"name": "image_captioning_mapper", "params": {}}]
+
+    updates, notes, details = autotune_system_config(
+        {"np": 4, "executor_type": "ray_partitioned", "partition.target_size_mb": 256},
+        operators=operators,
+        operator_tags=_TAGS,
+        dataset_rows=1_000_000,
+        dataset_bytes=512 * 1024 * 1024,
+    )
+
+    assert "np" not in updates
+    assert any("Ray cluster" in note for note in notes)
+    assert updates["adaptive_batch_size"] is True
+    # 512 MiB of data over 4 workers.
+    assert updates["partition.target_size_mb"] == 128
+    assert details["host"] is None
+    assert details["dataset"] == {"rows": 1_000_000, "bytes": 512 * 1024 * 1024, "source": "caller", "estimated": False}
+
+    ray, _notes, _details = autotune_system_config({"np": 4, "executor_type": "ray"}, dataset_rows=10)
+    assert ray == {}
+
+
+def test_build_system_spec_keeps_explicit_fields_and_records_rationale(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(
+        "data_juicer_agents.tools.plan._shared.autotune.detect_host_resources",
+        lambda: HostResources(cpus=8, memory_bytes=32 * _GIB),
+    )
+    profile = _profile(tmp_path, 50)
+
+    result = build_system_spec(np=3, adaptive_batch_size=False, dataset_profile=profile)
+    assert result["ok"] is True
+    assert result["system_spec"]["np"] == 3
+    assert "[auto-tuned] kept np=3 set by the caller" in result["system_spec"]["warnings"]
+
+    tuned = build_system_spec(dataset_profile=profile)
+    assert tuned["system_spec"]["np"] == 1
+    assert any(item.startswith("[auto-tuned] np=1") for item in tuned["warnings"])
+    assert tuned["autotune"]["settings"] == {"np": 1}
+
+    full = build_system_spec(dataset_profile={"ok": True, "full_profile": {"rows": 1_000_000}})
+    assert full["system_spec"]["np"] == 8
+
+    from_path = build_system_spec(dataset_path=str(tmp_path / "data.jsonl"), profile_cache_dir=tmp_path / "profiles")
+    assert from_path["autotune"]["dataset"] == tuned["autotune"]["dataset"]
+    assert build_system_spec(dataset_rows=1_000_000)["system_spec"]["np"] == 8
+
+    untuned = build_system_spec(auto_tune=False, dataset_profile=profile)
+    assert "autotune" not in untuned
+    assert not any("[auto-tuned]" in item for item in untuned["warnings"])
+
+
+def test_estimate_dataset_size_without_local_sources():
+    assert estimate_dataset_size({}).rows is None
+    size = estimate_dataset_size({"ok": True, "dataset": {"configs": [{"type": "remote", "path": "s3://x"}]}})
+    assert size.rows is None and size.bytes is None
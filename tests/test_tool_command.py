@@ -135,7 +135,8 @@ def test_tool_schema_harness_profile_rejects_dev_tool(monkeypatch, capsys):
     assert payload["profile"] == "harness"
 
 
-def test_tool_run_read_tool_success(tmp_path: Path, capsys):
+def test_tool_run_read_tool_success(monkeypatch, tmp_path: Path, capsys):
+    monkeypatch.chdir(tmp_path)
     dataset = tmp_path / "data.jsonl"
     dataset.write_text('{"text": "hello world"}\n', encoding="utf-8")
 
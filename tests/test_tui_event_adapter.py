@@ -201,3 +201,42 @@ def test_apply_event_adds_reasoning_note_with_planned_tools():
     tool_items = [item for item in state.timeline if item.kind == "tool" and item.status == "planned"]
     assert not tool_items
     assert state.timeline[-1].kind == "reasoning"
+
+
+def test_apply_event_reports_apply_progress_without_timeline_spam():
+    state = TuiState()
+
+    apply_event(
+        state,
+        {
+            "type": "apply_progress",
+            "kind": "op_progress",
+            "op": "text_length_filter",
+            "stage": "compute_stats",
+            "percent": 45,
+            "processed": 450,
+            "total": 1000,
+            "rate": 300.0,
+            "rate_unit": "examples/s",
+        },
+    )
+
+    assert "text_length_filter" in state.status_line
+    assert "450/1000" in state.status_line
+    assert not state.timeline
+
+    apply_event(
+        state,
+        {
+            "type": "apply_progress",
+            "kind": "op_done",
+            "op": "text_length_filter",
+            "seconds": 1.5,
+            "samples_left": 950,
+            "index": 1,
+            "count": 2,
+        },
+    )
+
+    assert len(state.timeline) == 1
+    assert "950 samples left" in state.timeline[-1].text
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Tests for op_type/tag partitions of the operator vector index."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from data_juicer_agents.tools.retrieve._shared.backend.cache import (
+    CK_TOOLS_INFO,
+    CK_VECTOR_PARTITIONS,
+    CK_VECTOR_STORE,
+    cache_manager,
+)
+from data_juicer_agents.tools.retrieve._shared.backend.partitions import VectorPartitions
+from data_juicer_agents.tools.retrieve._shared.backend.record import OperatorRecord
+from data_juicer_agents.tools.retrieve._shared.backend.retriever import VectorRetriever
+
+
+# Mappers sit closest to the query; filters are far away.
+_CATALOG = [
+    OperatorRecord(0, "a_mapper", "", "mapper", ["text"]),
+    OperatorRecord(1, "b_mapper", "", "mapper", ["image"]),
+    OperatorRecord(2, "c_mapper", "", "mapper", ["text"]),
+    OperatorRecord(3, "d_filter", "", "filter", ["text"]),
+    OperatorRecord(4, "e_filter", "", "filter", ["image"]),
+    OperatorRecord(5, "f_filter", "", "filter", ["text", "image"]),
+]
+_VECTORS = np.array(
+    [[0.0, 0.0], [0.1, 0.0], [0.2, 0.0], [5.0, 0.0], [6.0, 0.0], [7.0, 0.0]],
+    dtype="float32",
+)
+
+
+class _Doc:
+    def __init__(self, index):
+        self.metadata = {"index": index}
+
+
+class _FlatIndex:
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.ntotal = len(vectors)
+
+    def reconstruct_n(self, start, count):
+        return self.vectors[start:start + count]
+
+
+class _FakeStore:
+    """Minimal LangChain-FAISS-like store with rows in reversed catalog order."""
+
+    def __init__(self):
+        order = list(reversed(range(len(_CATALOG))))
+        self.index = _FlatIndex(_VECTORS[order])
+        self.index_to_docstore_id = {row: f"doc-{idx}" for row, idx in enumerate(order)}
+        self.docstore = self
+        self._docs = {f"doc-{idx}": _Doc(idx) for idx in order}
+        self.global_calls = 0
+
+    def search(self, doc_id):
+        return self._docs[doc_id]
+
+    def _embed_query(self, query):
+        return [0.0, 0.0]
+
+    def similarity_search(self, query, k=10):
+        self.global_calls += 1
+        order = np.argsort(((self.index.vectors) ** 2).sum(axis=1))[:k]
+        return [self._docs[self.index_to_docstore_id[int(i)]] for i in order]
+
+
+@pytest.fixture()
+def store():
+    fake = _FakeStore()
+    cache_manager.set(CK_VECTOR_STORE, fake)
+    cache_manager.set(CK_TOOLS_INFO, _CATALOG)
+    yield fake
+    for key in (CK_VECTOR_STORE, CK_TOOLS_INFO, CK_VECTOR_PARTITIONS):
+        cache_manager.invalidate(key)
+
+
+def test_partitions_route_by_type_and_tags(store):
+    partitions = VectorPartitions.from_vector_store(store, _CATALOG)
+    assert partitions.search([0.0, 0.0], 2, op_type="filter") == [3, 4]
+    assert partitions.search([0.0, 0.0], 5, op_type="FILTER", tags=["image"]) == [4, 5]
+    assert partitions.search([0.0, 0.0], 3, tags=["text", "image"]) == [5]
+    # Unknown filters fall back to the wider partition.
+    assert partitions.search([0.0, 0.0], 2, op_type="filter", tags=["audio"]) == [3, 4]
+    assert partitions.search([0.0, 0.0], 2, op_type="grouper") == [0, 1]
+
+
+def test_tag_partitions_can_be_disabled(store):
+    partitions = VectorPartitions.from_vector_store(store, _CATALOG, tag_partitions=False)
+    assert partitions.tag_rows == {}
+    assert partitions.search([0.0, 0.0], 2, op_type="filter", tags=["image"]) == [3, 4]
+
+
+def test_vector_retriever_filtered_query_fills_limit(store):
+    retriever = VectorRetriever()
+    items = asyncio.run(retriever.retrieve_items("q", limit=3, op_type="filter"))
+    assert [item["tool_name"] for item in items] == ["d_filter", "e_filter", "f_filter"]
+    assert store.global_calls == 0
+
+    unfiltered = asyncio.run(retriever.retrieve_items("q", limit=2))
+    assert [item["tool_name"] for item in unfiltered] == ["a_mapper", "b_mapper"]
+    assert store.global_calls == 1
+
+
+def test_vector_retriever_falls_back_without_raw_vectors(store, monkeypatch):
+    monkeypatch.setattr(
+        VectorPartitions,
+        "from_vector_store",
+        classmethod(lambda cls, *a, **k: (_ for _ in ()).throw(RuntimeError("no vectors"))),
+    )
+    items = asyncio.run(VectorRetriever().retrieve_items("q", limit=3, op_type="filter"))
+    # Post-filter path over-fetches limit * 3 from the global ranking.
+    assert [item["tool_name"] for item in items] == ["d_filter", "e_filter", "f_filter"]
+    assert store.global_calls == 1